@@ -10,7 +10,7 @@ Lance le workflow complet sur chaque ticket SAUF:
 Analyse la cohérence des réponses générées avec les données et threads.
 
 Usage:
-    python analyze_tickets_bulk.py [--limit N] [--department DOC]
+    python analyze_tickets_bulk.py [--limit N] [--department DOC] [--batch]
 """
 
 import sys
@@ -88,6 +88,23 @@ class BulkWorkflowAnalyzer:
         - Création de draft
         - Mise à jour CRM
         """
+        result, ctx = self._load_ticket(ticket_id)
+        if ctx is not None:
+            try:
+                triage_result = self.triage_agent.triage_ticket(**self._triage_inputs(ctx))
+            except Exception as e:
+                self._record_exception(result, e)
+                return result
+            self._complete_workflow(result, ctx, triage_result)
+        return result
+
+    def _load_ticket(self, ticket_id: str):
+        """
+        Étapes 1-2: ticket, threads, liaison deal (appels Zoho, pas de LLM).
+
+        Returns:
+            (résultat, contexte pour la suite) - contexte None si l'analyse s'arrête
+        """
         result = {
             'ticket_id': ticket_id,
             'success': False,
@@ -142,7 +159,7 @@ class BulkWorkflowAnalyzer:
                     'message': "Aucun deal CRM trouvé pour ce ticket",
                     'details': f"Email: {result['data']['contact_email']}"
                 })
-                return result
+                return result, None
 
             # Vérifier doublon Uber
             if linking_result.get('has_duplicate_uber_offer'):
@@ -153,11 +170,46 @@ class BulkWorkflowAnalyzer:
                     'details': f"{len(linking_result.get('duplicate_deals', []))} deals 20€ GAGNÉ"
                 })
 
+            return result, {
+                'ticket': ticket,
+                'threads': threads,
+                'customer_message': customer_message,
+                'linking_result': linking_result,
+                'deal_data': deal_data,
+            }
+
+        except Exception as e:
+            self._record_exception(result, e)
+            return result, None
+
+    def _triage_inputs(self, ctx: Dict) -> Dict[str, Any]:
+        """Arguments de TriageAgent.triage_ticket pour ce ticket."""
+        return {
+            'ticket_subject': ctx['ticket'].get('subject', ''),
+            'thread_content': ctx['customer_message'],
+            'deal_data': ctx['deal_data'],
+            'current_department': "DOC",
+        }
+
+    @staticmethod
+    def _record_exception(result: Dict, e: Exception):
+        result['error'] = str(e)
+        result['ecarts'].append({
+            'type': 'EXCEPTION',
+            'message': str(e)[:200]
+        })
+
+    def _complete_workflow(self, result: Dict, ctx: Dict, triage_result: Dict):
+        """Étapes 3-10 à partir du triage (direct ou en lot)."""
+        try:
+            threads = ctx['threads']
+            customer_message = ctx['customer_message']
+            linking_result = ctx['linking_result']
+            deal_data = ctx['deal_data']
+
             # ============================================================
             # STEP 3: Triage IA
             # ============================================================
-            triage_result = self.triage_agent.triage_ticket(ticket_id)
-
             result['data']['triage_action'] = triage_result.get('action')
             result['data']['triage_intention'] = triage_result.get('detected_intent')
             result['data']['triage_confidence'] = triage_result.get('confidence')
@@ -316,13 +368,26 @@ class BulkWorkflowAnalyzer:
             result['step_reached'] = 'COMPLETED'
 
         except Exception as e:
-            result['error'] = str(e)
-            result['ecarts'].append({
-                'type': 'EXCEPTION',
-                'message': str(e)[:200]
-            })
-
-        return result
+            self._record_exception(result, e)
+
+    def _run_batch(self, ticket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Chargement de tous les tickets, triage en lot, puis fin du workflow ticket par ticket."""
+        results = {}
+        loaded = {}
+        for i, ticket_id in enumerate(ticket_ids, 1):
+            print(f"   [{i}/{len(ticket_ids)}] Chargement {ticket_id}...")
+            results[ticket_id], ctx = self._load_ticket(ticket_id)
+            if ctx is not None:
+                loaded[ticket_id] = ctx
+
+        print(f"\n🤖 Triage en lot de {len(loaded)} tickets...")
+        triage_results = self.triage_agent.triage_many(
+            {ticket_id: self._triage_inputs(ctx) for ticket_id, ctx in loaded.items()}
+        )
+
+        for ticket_id, ctx in loaded.items():
+            self._complete_workflow(results[ticket_id], ctx, triage_results[ticket_id])
+        return results
 
     def _analyze_coherence(
         self,
@@ -408,8 +473,13 @@ class BulkWorkflowAnalyzer:
 
         result['analysis'] = analysis
 
-    def run_analysis(self, department: str = "DOC", limit: int = 20):
-        """Lance l'analyse en masse."""
+    def run_analysis(self, department: str = "DOC", limit: int = 20, batch: bool = False):
+        """
+        Lance l'analyse en masse.
+
+        batch=True: triage de tous les tickets en un seul passage LLM
+        (TriageAgent.triage_many) au lieu d'un appel par ticket.
+        """
         print("=" * 80)
         print("🔍 ANALYSE EN MASSE - WORKFLOW COMPLET DRY RUN")
         print("   ✅ Workflow complet exécuté")
@@ -435,13 +505,16 @@ class BulkWorkflowAnalyzer:
             'ecarts_details': []
         }
 
+        if batch:
+            batch_results = self._run_batch([ticket.get('id') for ticket in tickets])
+
         for i, ticket in enumerate(tickets, 1):
             ticket_id = ticket.get('id')
             subject = ticket.get('subject', '')[:40]
 
             print(f"\n[{i}/{len(tickets)}] {ticket_id}: {subject}...")
 
-            result = self.run_workflow_dry_run(ticket_id)
+            result = batch_results[ticket_id] if batch else self.run_workflow_dry_run(ticket_id)
             self.results.append(result)
 
             # Collecter stats
@@ -565,11 +638,13 @@ def main():
     parser = argparse.ArgumentParser(description="Analyse en masse - Workflow complet DRY RUN")
     parser.add_argument('--limit', type=int, default=10, help="Nombre max de tickets")
     parser.add_argument('--department', type=str, default="DOC", help="Département")
+    parser.add_argument('--batch', action='store_true',
+                        help="Triage de tous les tickets en un seul passage LLM (voir LLM_BATCH_MODE)")
 
     args = parser.parse_args()
 
     analyzer = BulkWorkflowAnalyzer()
-    analyzer.run_analysis(department=args.department, limit=args.limit)
+    analyzer.run_analysis(department=args.department, limit=args.limit, batch=args.batch)
 
 
 if __name__ == "__main__":
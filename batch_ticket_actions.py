@@ -20,6 +20,9 @@ Exemples:
 
     # Clôturer tous les tickets avec un statut spécifique
     python batch_ticket_actions.py data/lot2_analysis_11_20.json --action close --filter "status=SPAM_TO_CLOSE" --dry-run
+
+    # Source = historique du job store (dernier traitement de chaque ticket)
+    python batch_ticket_actions.py --from-store --action close --filter "triage_action=SPAM" --dry-run
 """
 
 import json
@@ -35,6 +38,7 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.zoho_client import ZohoDeskClient
+from src.utils.ticket_job_store import get_ticket_job_store
 
 
 class BatchTicketActions:
@@ -50,6 +54,14 @@ class BatchTicketActions:
         with open(analysis_file, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    def load_from_store(self, triage_action: Optional[str] = None) -> List[Dict]:
+        """Charge le dernier traitement de chaque ticket depuis le job store."""
+        records = get_ticket_job_store().history(triage_action=triage_action, latest_only=True)
+        return [
+            {**r, "ticket_id": r.get("id"), "ticket_number": r.get("ticketNumber", "?")}
+            for r in records
+        ]
+
     def filter_tickets(self, tickets: List[Dict], filter_expr: Optional[str] = None) -> List[Dict]:
         """
         Filtre les tickets selon une expression.
@@ -188,7 +200,9 @@ class BatchTicketActions:
 
 def main():
     parser = argparse.ArgumentParser(description="Actions en masse sur les tickets analysés")
-    parser.add_argument("analysis_file", help="Fichier JSON d'analyse")
+    parser.add_argument("analysis_file", nargs="?", help="Fichier JSON d'analyse")
+    parser.add_argument("--from-store", action="store_true",
+                        help="Utiliser l'historique du job store (doc_tickets.db) au lieu d'un fichier")
     parser.add_argument("--action", required=True, choices=["close-spam", "route-prospects", "close", "route"],
                         help="Action à effectuer")
     parser.add_argument("--filter", help="Filtre (ex: 'status=SPAM_TO_CLOSE')")
@@ -197,9 +211,13 @@ def main():
     parser.add_argument("--dry-run", "-n", action="store_true", help="Mode preview (pas de modification)")
     args = parser.parse_args()
 
-    if not os.path.exists(args.analysis_file):
-        print(f"Erreur: Fichier non trouve: {args.analysis_file}")
-        sys.exit(1)
+    if not args.from_store:
+        if not args.analysis_file:
+            print("Erreur: fichier d'analyse ou --from-store requis")
+            sys.exit(1)
+        if not os.path.exists(args.analysis_file):
+            print(f"Erreur: Fichier non trouve: {args.analysis_file}")
+            sys.exit(1)
 
     print("=" * 80)
     print(f"BATCH TICKET ACTIONS - {'DRY RUN' if args.dry_run else 'PRODUCTION'}")
@@ -207,7 +225,10 @@ def main():
     print("=" * 80)
 
     batch = BatchTicketActions(dry_run=args.dry_run)
-    tickets = batch.load_analysis(args.analysis_file)
+    if args.from_store:
+        tickets = batch.load_from_store()
+    else:
+        tickets = batch.load_analysis(args.analysis_file)
 
     print(f"Tickets dans le fichier: {len(tickets)}")
 
@@ -238,7 +259,7 @@ def main():
     # Sauvegarder le rapport
     report = {
         "timestamp": datetime.now().isoformat(),
-        "source_file": args.analysis_file,
+        "source_file": "job_store" if args.from_store else args.analysis_file,
         "action": args.action,
         "filter": args.filter,
         "dry_run": args.dry_run,
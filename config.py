@@ -36,6 +36,17 @@ class Settings(BaseSettings):
     zoho_crm_client_secret: Optional[str] = None
     zoho_crm_refresh_token: Optional[str] = None
 
+    # Zoho rate limiting (token buckets, see src/zoho_rate_limiter.py)
+    # None = default budget from DEFAULT_BUDGETS
+    zoho_desk_requests_per_second: Optional[float] = None
+    zoho_desk_burst: Optional[float] = None
+    zoho_desk_search_requests_per_second: Optional[float] = None
+    zoho_desk_search_burst: Optional[float] = None
+    zoho_crm_requests_per_second: Optional[float] = None
+    zoho_crm_burst: Optional[float] = None
+    zoho_crm_search_requests_per_second: Optional[float] = None
+    zoho_crm_search_burst: Optional[float] = None
+
     # Anthropic
     anthropic_api_key: str
 
@@ -44,6 +55,23 @@ class Settings(BaseSettings):
     agent_max_tokens: int = 4096
     agent_temperature: float = 0.7
 
+    # LLM gateway (see src/llm_client.py)
+    # Model aliases: "fast" (extraction, summaries), "precise" (triage, rédaction), "agent" = agent_model
+    llm_model_fast: str = "claude-3-5-haiku-20241022"
+    llm_model_precise: str = "claude-sonnet-4-20250514"
+    llm_max_concurrency: int = 8
+    llm_max_retries: int = 4
+    # Opt-in on-disk cache of deterministic LLM responses (see src/llm_response_cache.py)
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = "llm_cache.db"
+    llm_cache_ttl_seconds: float = 7 * 24 * 3600
+    llm_cache_max_mb: float = 200
+    # Batch mode of bulk runs: "auto", "batch" (Message Batches) or "fanout" (see src/llm_batch.py)
+    llm_batch_mode: str = "auto"
+    llm_batch_min_requests: int = 20
+    llm_batch_poll_seconds: float = 10.0
+    llm_batch_timeout_seconds: float = 6 * 3600
+
     # Logging
     log_level: str = "INFO"
 
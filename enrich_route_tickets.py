@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-Enrichit les tickets ROUTE dans doc_tickets_processed.json avec le contenu client
-récupéré depuis Zoho Desk (sujet + message client).
+Enrichit les tickets ROUTE de l'historique du job store (doc_tickets.db) avec le
+contenu client récupéré depuis Zoho Desk (sujet + message client).
 
 Usage:
     python enrich_route_tickets.py              # Enrichir tous les ROUTE
@@ -10,7 +10,6 @@ Usage:
 """
 
 import argparse
-import json
 import os
 import sys
 import time
@@ -27,19 +26,18 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.zoho_client import ZohoDeskClient
 from src.utils.text_utils import get_clean_thread_content
-
-PROCESSED_FILE = "doc_tickets_processed.json"
+from src.utils.ticket_job_store import get_ticket_job_store
 
 
 def enrich_route_tickets(limit=None, dry_run=False):
-    # Charger les tickets
-    with open(PROCESSED_FILE, 'r', encoding='utf-8') as f:
-        all_tickets = json.load(f)
+    # Charger les tickets ROUTE (dernier traitement de chaque ticket)
+    store = get_ticket_job_store()
+    route_tickets = store.history(triage_action='ROUTE', latest_only=True)
 
     # Filtrer les ROUTE sans message
     to_enrich = [
-        (i, t) for i, t in enumerate(all_tickets)
-        if t.get('triage_action') == 'ROUTE' and not t.get('customer_message')
+        (t['_history_id'], t) for t in route_tickets
+        if not t.get('customer_message')
     ]
 
     if limit:
@@ -58,7 +56,7 @@ def enrich_route_tickets(limit=None, dry_run=False):
     enriched_count = 0
     error_count = 0
 
-    for idx, (pos, ticket) in enumerate(to_enrich, 1):
+    for idx, (history_id, ticket) in enumerate(to_enrich, 1):
         ticket_id = ticket['id']
         ticket_num = ticket.get('ticketNumber', 'N/A')
 
@@ -85,9 +83,11 @@ def enrich_route_tickets(limit=None, dry_run=False):
                 ticket_data = client.get_ticket(ticket_id)
                 ticket_subject = ticket_data.get('subject', '')
 
-            # Mettre a jour
-            all_tickets[pos]['customer_message'] = customer_message[:3000] if customer_message else ''
-            all_tickets[pos]['ticket_subject'] = ticket_subject
+            # Mettre a jour (écriture atomique de l'enregistrement)
+            store.update_history_record(history_id, {
+                'customer_message': customer_message[:3000] if customer_message else '',
+                'ticket_subject': ticket_subject,
+            })
 
             enriched_count += 1
             msg_preview = (customer_message or '')[:80].replace('\n', ' ')
@@ -100,16 +100,6 @@ def enrich_route_tickets(limit=None, dry_run=False):
         # Rate limit
         time.sleep(0.5)
 
-        # Sauvegarder tous les 50 tickets (pour ne pas perdre la progression)
-        if idx % 50 == 0:
-            with open(PROCESSED_FILE, 'w', encoding='utf-8') as f:
-                json.dump(all_tickets, f, ensure_ascii=False, indent=2)
-            print(f"  [Sauvegarde intermediaire: {enriched_count} enrichis]")
-
-    # Sauvegarde finale
-    with open(PROCESSED_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_tickets, f, ensure_ascii=False, indent=2)
-
     print(f"\nTermine: {enriched_count} enrichis, {error_count} erreurs")
 
 
@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration for webhook_server (loaded automatically from the
+working directory: gunicorn ... webhook_server:app).
+
+Threads do not survive fork(): the webhook worker pool is started in each
+gunicorn worker once the app is loaded, never in the master process.
+"""
+
+
+def post_worker_init(worker):
+    import webhook_server
+
+    webhook_server.start_background_services()
@@ -4,18 +4,35 @@ Exécution continue du workflow DOC - traite tous les tickets puis boucle sur le
 
 Usage:
     python run_workflow_continuous.py
+    python run_workflow_continuous.py --workers 4   # 4 tickets en parallèle
 
 Le script:
-1. Traite tous les tickets dans doc_tickets_pending.json
+1. Traite tous les tickets en attente du job store (doc_tickets.db)
 2. Re-synchronise avec Zoho Desk pour détecter les nouveaux tickets
 3. Traite les nouveaux tickets
 4. Répète jusqu'à ce qu'il n'y ait plus de nouveaux tickets (ou max 3 cycles)
+
+Mode parallèle (--workers N, ou WORKFLOW_WORKERS):
+- N workers, chacun avec son propre DOCTicketWorkflow (clients, cache de requêtes)
+- Rate limiter et TokenManager Zoho partagés (singletons du process)
+- Les tickets d'un même candidat (contactId, sinon email) sont traités dans
+  l'ordre par le même worker: jamais deux mises à jour CRM concurrentes sur
+  le même deal
+
+Suivi: job store SQLite (src/utils/ticket_job_store.py) — états pending /
+in_flight / done / failed avec lease et tentatives, historique des traitements.
+Les anciens doc_tickets_pending.json / doc_tickets_processed.json sont importés
+au premier lancement.
 """
 
+import argparse
 import json
 import os
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Fix Windows encoding
@@ -30,7 +47,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.zoho_client import ZohoDeskClient
 from src.workflows.doc_ticket_workflow import DOCTicketWorkflow
+from src.utils.ticket_job_store import get_ticket_job_store
 
+# Fichiers JSON historiques (importés dans le job store au premier lancement)
 PENDING_FILE = "doc_tickets_pending.json"
 PROCESSED_FILE = "doc_tickets_processed.json"
 RESULTS_DIR = "data"
@@ -86,43 +105,32 @@ def sync_pending_from_zoho():
             'ticketNumber': t.get('ticketNumber'),
             'subject': t.get('subject'),
             'email': t.get('email'),
+            'contactId': t.get('contactId'),
             'createdTime': t.get('createdTime'),
             'status': t.get('status'),
         })
 
     # Sauvegarder
-    with open(PENDING_FILE, 'w', encoding='utf-8') as f:
-        json.dump(pending_tickets, f, ensure_ascii=False, indent=2)
+    pending_count = get_ticket_job_store().replace_pending(pending_tickets)
 
-    log(f"Synchronisation terminée: {len(pending_tickets)} tickets en attente")
-    return len(pending_tickets)
+    log(f"Synchronisation terminée: {pending_count} tickets en attente")
+    return pending_count
 
 def load_pending():
-    if not os.path.exists(PENDING_FILE):
-        return []
-    with open(PENDING_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_pending(tickets):
-    with open(PENDING_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tickets, f, ensure_ascii=False, indent=2)
+    return get_ticket_job_store().list_pending()
 
 def load_processed():
-    if not os.path.exists(PROCESSED_FILE):
-        return []
-    with open(PROCESSED_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_processed_ticket(ticket_info, result):
-    processed = load_processed()
+    return get_ticket_job_store().history()
 
+def build_processed_record(ticket_info, result):
+    """Enregistrement d'historique (format de l'ancien doc_tickets_processed.json)."""
     crm_updates = result.get('response_result', {}).get('crm_updates', {})
     analysis = result.get('analysis_result', {})
     response_result = result.get('response_result', {})
     state_engine = response_result.get('state_engine', {})
     ctx = state_engine.get('context', {})
 
-    processed.append({
+    return {
         **ticket_info,
         'processed_at': datetime.now().isoformat(),
         'deal_id': analysis.get('deal_id'),
@@ -135,10 +143,7 @@ def save_processed_ticket(ticket_info, result):
         'crm_updated': result.get('crm_updated', False),
         'crm_updates': crm_updates if crm_updates else None,
         'error': result.get('error'),
-    })
-
-    with open(PROCESSED_FILE, 'w', encoding='utf-8') as f:
-        json.dump(processed, f, ensure_ascii=False, indent=2)
+    }
 
 def save_batch_results(results, cycle_num):
     """Sauvegarde les résultats du batch."""
@@ -152,85 +157,154 @@ def save_batch_results(results, cycle_num):
     log(f"Résultats sauvegardés: {filename}")
     return filename
 
-def process_all_pending(workflow, cycle_num, delay_seconds=3.0):
-    """Traite tous les tickets pending."""
+def candidate_key(ticket_info):
+    """Clé d'ordonnancement: tickets d'un même candidat traités en série."""
+    if ticket_info.get('contactId'):
+        return f"contact:{ticket_info['contactId']}"
+    email = (ticket_info.get('email') or '').strip().lower()
+    if email:
+        return f"email:{email}"
+    return f"ticket:{ticket_info['id']}"
+
+def group_by_candidate(pending):
+    """Regroupe les tickets par candidat en conservant l'ordre d'arrivée."""
+    lanes = OrderedDict()
+    for ticket_info in pending:
+        lanes.setdefault(candidate_key(ticket_info), []).append(ticket_info)
+    return list(lanes.values())
+
+def process_one_ticket(workflow, ticket_info, position, total):
+    """Traite un ticket et retourne (entrée batch results, succès), ou (None, False) si déjà pris."""
+    ticket_id = ticket_info['id']
+    subject = (ticket_info.get('subject') or '')[:50]
+    store = get_ticket_job_store()
+
+    # Lease: un autre worker / process a pu prendre le ticket entre-temps
+    if not store.claim(ticket_id, owner=f"{os.getpid()}:{threading.current_thread().name}"):
+        log(f"[{position}/{total}] Ticket {ticket_id}: déjà pris ou terminé, skip")
+        return None, False
+
+    log(f"[{position}/{total}] Ticket {ticket_id}: {subject}")
+
+    try:
+        result = workflow.process_ticket(
+            ticket_id=ticket_id,
+            auto_create_draft=True,
+            auto_update_crm=True,
+            auto_update_ticket=True
+        )
+
+        success = result.get('success', False)
+        stage = result.get('workflow_stage', 'UNKNOWN')
+        triage_action = result.get('triage_result', {}).get('action', 'N/A')
+        intent = result.get('analysis_result', {}).get('primary_intent', 'N/A')
+
+        if success:
+            log(f"    [OK] {ticket_id} {stage} | {triage_action} | {intent}")
+        else:
+            log(f"    [ERREUR] {ticket_id} {result.get('error', 'Unknown')}")
+
+        # Sauvegarder dans l'historique (in_flight → done / failed)
+        store.complete(ticket_id, build_processed_record(ticket_info, result), success)
+
+        # Collecter pour batch results
+        analysis = result.get('analysis_result', {})
+        response = result.get('response_result', {})
+        triage = result.get('triage_result', {})
+        entry = {
+            'ticket_id': ticket_id,
+            'success': success,
+            'stage': stage,
+            'triage_action': triage_action,
+            'intent': intent,
+            'draft_created': result.get('draft_created', False),
+            'crm_updated': result.get('crm_updated', False),
+            'error': result.get('error'),
+            # Contenu original et réponse pour analyse demande/réponse
+            # Fallback sur triage_result pour les tickets ROUTE/SPAM (analyse non faite)
+            'ticket_subject': analysis.get('ticket_subject', '') or triage.get('ticket_subject', ''),
+            'customer_message': analysis.get('customer_message', '') or triage.get('customer_message', ''),
+            'draft_content': response.get('final_response', '') or response.get('raw_response', ''),
+        }
+        return entry, success
+
+    except Exception as e:
+        state = store.fail(ticket_id, str(e))
+        log(f"    [EXCEPTION] {ticket_id} {str(e)} → {state}")
+        return {
+            'ticket_id': ticket_id,
+            'success': False,
+            'error': str(e),
+        }, False
+
+def process_all_pending(workflows, cycle_num, delay_seconds=3.0):
+    """
+    Traite tous les tickets pending.
+
+    workflows: un DOCTicketWorkflow (traitement séquentiel, pause entre tickets)
+    ou une liste de workflows (un par worker, traitement parallèle).
+    """
+    if not isinstance(workflows, (list, tuple)):
+        workflows = [workflows]
+
     pending = load_pending()
 
     if not pending:
         log("Aucun ticket en attente.")
         return 0, 0
 
-    log(f"Cycle {cycle_num}: Traitement de {len(pending)} tickets...")
+    total = len(pending)
+    log(f"Cycle {cycle_num}: Traitement de {total} tickets ({len(workflows)} worker(s))...")
 
     results = []
     success_count = 0
     error_count = 0
 
-    for i, ticket_info in enumerate(pending, 1):
-        ticket_id = ticket_info['id']
-        subject = (ticket_info.get('subject') or '')[:50]
-
-        log(f"[{i}/{len(pending)}] Ticket {ticket_id}: {subject}")
-
-        try:
-            result = workflow.process_ticket(
-                ticket_id=ticket_id,
-                auto_create_draft=True,
-                auto_update_crm=True,
-                auto_update_ticket=True
-            )
-
-            success = result.get('success', False)
-            stage = result.get('workflow_stage', 'UNKNOWN')
-            triage_action = result.get('triage_result', {}).get('action', 'N/A')
-            intent = result.get('analysis_result', {}).get('primary_intent', 'N/A')
-
+    if len(workflows) == 1:
+        for i, ticket_info in enumerate(pending, 1):
+            entry, success = process_one_ticket(workflows[0], ticket_info, i, total)
+            if entry is None:
+                continue
+            results.append(entry)
             if success:
                 success_count += 1
-                log(f"    [OK] {stage} | {triage_action} | {intent}")
             else:
                 error_count += 1
-                log(f"    [ERREUR] {result.get('error', 'Unknown')}")
-
-            # Sauvegarder dans processed
-            save_processed_ticket(ticket_info, result)
-
-            # Collecter pour batch results
-            analysis = result.get('analysis_result', {})
-            response = result.get('response_result', {})
-            triage = result.get('triage_result', {})
-            results.append({
-                'ticket_id': ticket_id,
-                'success': success,
-                'stage': stage,
-                'triage_action': triage_action,
-                'intent': intent,
-                'draft_created': result.get('draft_created', False),
-                'crm_updated': result.get('crm_updated', False),
-                'error': result.get('error'),
-                # Contenu original et réponse pour analyse demande/réponse
-                # Fallback sur triage_result pour les tickets ROUTE/SPAM (analyse non faite)
-                'ticket_subject': analysis.get('ticket_subject', '') or triage.get('ticket_subject', ''),
-                'customer_message': analysis.get('customer_message', '') or triage.get('customer_message', ''),
-                'draft_content': response.get('final_response', '') or response.get('raw_response', ''),
-            })
-
-            # Retirer de pending
-            current_pending = load_pending()
-            current_pending = [t for t in current_pending if t['id'] != ticket_id]
-            save_pending(current_pending)
-
-        except Exception as e:
-            error_count += 1
-            log(f"    [EXCEPTION] {str(e)}")
-            results.append({
-                'ticket_id': ticket_id,
-                'success': False,
-                'error': str(e),
-            })
-
-        # Pause entre tickets
-        time.sleep(delay_seconds)
+
+            # Pause entre tickets
+            time.sleep(delay_seconds)
+    else:
+        # Un workflow par worker (isolation), pris dans un pool pour la durée d'une file
+        available = list(workflows)
+        pool_lock = threading.Lock()
+        counter = {'position': 0}
+
+        def run_lane(lane):
+            with pool_lock:
+                workflow = available.pop()
+            try:
+                lane_results = []
+                for ticket_info in lane:
+                    with pool_lock:
+                        counter['position'] += 1
+                        position = counter['position']
+                    lane_results.append(process_one_ticket(workflow, ticket_info, position, total))
+                return lane_results
+            finally:
+                with pool_lock:
+                    available.append(workflow)
+
+        lanes = group_by_candidate(pending)
+        with ThreadPoolExecutor(max_workers=len(workflows), thread_name_prefix="doc-worker") as executor:
+            for lane_results in executor.map(run_lane, lanes):
+                for entry, success in lane_results:
+                    if entry is None:
+                        continue
+                    results.append(entry)
+                    if success:
+                        success_count += 1
+                    else:
+                        error_count += 1
 
     # Sauvegarder les résultats du cycle
     save_batch_results(results, cycle_num)
@@ -238,14 +312,30 @@ def process_all_pending(workflow, cycle_num, delay_seconds=3.0):
     log(f"Cycle {cycle_num} terminé: {success_count} OK, {error_count} erreurs")
     return success_count, error_count
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Exécution continue du workflow DOC")
+    parser.add_argument(
+        '--workers', type=int, default=int(os.getenv('WORKFLOW_WORKERS', '1')),
+        help="Nombre de tickets traités en parallèle (défaut: 1, séquentiel)"
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    workers = max(1, args.workers)
+
     log("="*60)
-    log("WORKFLOW CONTINU - Démarrage (mode infini)")
+    log(f"WORKFLOW CONTINU - Démarrage (mode infini, {workers} worker(s))")
     log("="*60)
     log("Pour arrêter: Ctrl+C ou 'Stop-Process -Name python' dans PowerShell")
 
-    # Initialiser le workflow une seule fois
-    workflow = DOCTicketWorkflow()
+    # Import unique des anciens fichiers JSON dans le job store
+    imported = get_ticket_job_store().import_legacy_json(PENDING_FILE, PROCESSED_FILE)
+    if imported['pending'] or imported['history']:
+        log(f"Job store: {imported['pending']} pending et {imported['history']} traités importés depuis JSON")
+
+    # Initialiser les workflows une seule fois (un par worker)
+    workflows = [DOCTicketWorkflow() for _ in range(workers)]
 
     total_success = 0
     total_errors = 0
@@ -260,7 +350,7 @@ def main():
             log(f"{'='*60}")
 
             # Traiter les tickets pending
-            success, errors = process_all_pending(workflow, cycle, delay_seconds=3.0)
+            success, errors = process_all_pending(workflows, cycle, delay_seconds=3.0)
             total_success += success
             total_errors += errors
 
@@ -277,6 +367,9 @@ def main():
 
     except KeyboardInterrupt:
         log("\n\nArrêt demandé par l'utilisateur (Ctrl+C)")
+    finally:
+        for workflow in workflows:
+            workflow.close()
 
     log(f"\n{'='*60}")
     log("WORKFLOW CONTINU - Terminé")
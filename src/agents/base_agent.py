@@ -2,8 +2,8 @@
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
-from anthropic import Anthropic
 from config import settings
+from src.llm_client import create_message
 
 logger = logging.getLogger(__name__)
 
@@ -14,18 +14,8 @@ class BaseAgent(ABC):
     def __init__(self, name: str, system_prompt: str):
         self.name = name
         self.system_prompt = system_prompt
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
         self.conversation_history: List[Dict[str, str]] = []
 
-    def _build_messages(self, user_message: str) -> List[Dict[str, str]]:
-        """Build the message list for the API call."""
-        messages = self.conversation_history.copy()
-        messages.append({
-            "role": "user",
-            "content": user_message
-        })
-        return messages
-
     def ask(
         self,
         user_message: str,
@@ -46,26 +36,27 @@ class BaseAgent(ABC):
         if reset_history:
             self.conversation_history = []
 
-        # Add context to message if provided
+        # Context data goes after the message: the system prompt and the
+        # instructions form a static prefix that can be cached
         if context:
             context_str = "\n\n## Context Data:\n"
             for key, value in context.items():
                 context_str += f"**{key}**: {value}\n"
-            full_message = context_str + "\n" + user_message
+            full_message = user_message + "\n" + context_str
         else:
             full_message = user_message
 
-        messages = self._build_messages(full_message)
-
         try:
             logger.info(f"[{self.name}] Sending request to Claude")
 
-            response = self.client.messages.create(
-                model=settings.agent_model,
+            response = create_message(
+                stage=self.name,
+                model="agent",
                 max_tokens=settings.agent_max_tokens,
                 temperature=settings.agent_temperature,
                 system=self.system_prompt,
-                messages=messages
+                messages=self.conversation_history.copy(),
+                content=full_message
             )
 
             assistant_message = response.content[0].text
@@ -936,10 +936,7 @@ Always respond in JSON format with the following structure:
 
         # Utiliser l'IA pour extraire les emails alternatifs
         try:
-            from anthropic import Anthropic
-            import os
-
-            client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            from src.llm_client import create_message
 
             prompt = f"""Analyse cette conversation et trouve les adresses email alternatives mentionnées par le candidat.
 
@@ -957,10 +954,11 @@ INSTRUCTIONS:
 
 Emails alternatifs trouvés:"""
 
-            response = client.messages.create(
-                model="claude-3-5-haiku-20241022",
+            response = create_message(
+                stage="alternative_emails",
+                model="fast",
                 max_tokens=200,
-                messages=[{"role": "user", "content": prompt}]
+                content=prompt
             )
 
             result = response.content[0].text.strip()
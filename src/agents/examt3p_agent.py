@@ -6,7 +6,7 @@ Utilise les scripts exament3p_playwright.py pour l'extraction automatique.
 import logging
 import sys
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterable, Iterator, Tuple
 
 # Ajouter le chemin utils au PYTHONPATH
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'utils'))
@@ -32,25 +32,30 @@ class ExamT3PAgent(BaseAgent):
         )
         self.max_retries = max_retries
 
-    def extract_data(self, identifiant: str, password: str) -> Dict[str, Any]:
+    def extract_data(self, identifiant: str, password: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Extrait toutes les données du compte exament3p.
 
         Args:
             identifiant: IDENTIFIANT_EVALBOX (email)
             password: MDP_EVALBOX
+            force_refresh: Ignorer le cache des résultats (données fraîches requises)
 
         Returns:
             Dict avec toutes les données extraites
         """
         try:
             # Import dynamique du module playwright
-            from exament3p_playwright import extract_exament3p_sync
+            from exament3p_playwright import extract_exament3p_cached
 
             logger.info(f"Extracting data from exament3p.fr for {identifiant}")
 
-            # Extraction avec retry automatique
-            data = extract_exament3p_sync(identifiant, password, max_retries=self.max_retries)
+            # Extraction avec retry automatique (via le cache des résultats)
+            data = extract_exament3p_cached(
+                identifiant, password,
+                max_retries=self.max_retries,
+                force_refresh=force_refresh
+            )
 
             return data
 
@@ -70,12 +75,37 @@ class ExamT3PAgent(BaseAgent):
                 "extraction_requise": True
             }
 
+    def extract_many(
+        self,
+        credentials_list: Iterable[Any],
+        concurrency: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Extrait les données de plusieurs comptes exament3p en parallèle.
+
+        Args:
+            credentials_list: (identifiant, password) ou dicts username/password
+            concurrency: Extractions simultanées (défaut: DEFAULT_CONCURRENCY)
+
+        Yields:
+            (index, données avec flag success) au fur et à mesure des fins
+        """
+        from exament3p_playwright import extract_many, DEFAULT_CONCURRENCY
+
+        for index, data in extract_many(
+            credentials_list,
+            concurrency=concurrency or DEFAULT_CONCURRENCY,
+            max_retries=self.max_retries
+        ):
+            data["success"] = not data.get("error")
+            yield index, data
+
     def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process method requis par BaseAgent.
 
         Args:
-            data: Dict contenant username, password
+            data: Dict contenant username, password (et force_refresh optionnel)
 
         Returns:
             Dict avec les données extraites
@@ -90,7 +120,7 @@ class ExamT3PAgent(BaseAgent):
             }
 
         # Extract data
-        result = self.extract_data(username, password)
+        result = self.extract_data(username, password, force_refresh=data.get("force_refresh", False))
 
         # Ajouter success flag
         if not result.get("error"):
@@ -15,7 +15,7 @@ UTILISATION:
     # Retourne: action, target_department, reason, confidence, detected_intent, intent_context
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import json
 from pathlib import Path
 
@@ -25,6 +25,7 @@ project_root = Path(__file__).parent.parent.parent
 load_dotenv(project_root / ".env")
 
 from .base_agent import BaseAgent
+from src.utils.triage_fast_path import get_triage_fast_path
 
 # Import BusinessRules pour la détection d'envoi de documents
 try:
@@ -577,6 +578,8 @@ EXEMPLE PLAINTE - Message: "J'avais clairement indiqué mon choix pour une forma
             name="TriageAgent",
             system_prompt=self.SYSTEM_PROMPT
         )
+        # Classifieur par règles devant le LLM (None si TRIAGE_FAST_PATH=false)
+        self.fast_path = get_triage_fast_path()
 
     def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -624,7 +627,7 @@ EXEMPLE PLAINTE - Message: "J'avais clairement indiqué mon choix pour une forma
                 'target_department': str ou None,
                 'reason': str,
                 'confidence': float,
-                'method': 'ai',
+                'method': 'ai' | 'rule_fast_path' | 'rule_...',
                 'detected_intent': str ou None (REPORT_DATE, DEMANDE_IDENTIFIANTS, etc.),
                 'intent_context': {
                     'is_urgent': bool,
@@ -634,6 +637,98 @@ EXEMPLE PLAINTE - Message: "J'avais clairement indiqué mon choix pour une forma
                 }
             }
         """
+        rule_result, call = self._prepare_triage(
+            ticket_subject, thread_content, deal_data, current_department, conversation_summary
+        )
+        if rule_result is not None:
+            return rule_result
+
+        # Appeler Claude pour l'analyse
+        try:
+            from src.llm_client import create_message
+
+            response = create_message(**call)
+            return self._parse_triage_response(response.content[0].text, current_department)
+
+        except json.JSONDecodeError as e:
+            logger.warning(f"  ⚠️ TriageAgent JSON error: {e}")
+            # Fallback: rester dans le département actuel
+            return self._fallback_triage(current_department, 'Erreur parsing IA - fallback GO', 0.5)
+
+        except Exception as e:
+            logger.error(f"  ❌ TriageAgent error: {e}")
+            # Fallback: rester dans le département actuel
+            return self._fallback_triage(current_department, f'Erreur IA: {str(e)[:50]} - fallback GO', 0.3)
+
+    def triage_many(
+        self,
+        tickets: Dict[str, Dict[str, Any]],
+        mode: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Triage de plusieurs tickets en un seul passage LLM (scripts d'analyse en masse).
+
+        Les règles et le fast path s'appliquent ticket par ticket; les tickets
+        restants partent ensemble via LLMBatch (Message Batches ou appels
+        concurrents, voir src/llm_batch.py).
+
+        Args:
+            tickets: {ticket_id: arguments de triage_ticket (ticket_subject,
+                thread_content, deal_data, current_department, conversation_summary)}
+            mode: Mode LLMBatch ("auto", "batch", "fanout"; défaut: LLM_BATCH_MODE)
+
+        Returns:
+            {ticket_id: résultat au format triage_ticket}
+        """
+        from src.llm_batch import LLMBatch
+
+        tickets = {str(ticket_id): kwargs for ticket_id, kwargs in tickets.items()}
+        results: Dict[str, Dict[str, Any]] = {}
+        batch = LLMBatch(mode=mode)
+        for ticket_id, kwargs in tickets.items():
+            rule_result, call = self._prepare_triage(**kwargs)
+            if rule_result is not None:
+                results[ticket_id] = rule_result
+            else:
+                batch.add(ticket_id, **call)
+
+        if len(batch):
+            logger.info(f"  🤖 Triage IA en lot: {len(batch)} tickets ({len(results)} par règles)")
+            for ticket_id, outcome in batch.run().items():
+                current_department = tickets[ticket_id].get('current_department', 'DOC')
+                if not outcome.ok:
+                    results[ticket_id] = self._fallback_triage(
+                        current_department, f'Erreur IA: {str(outcome.error)[:50]} - fallback GO', 0.3
+                    )
+                    continue
+                # Même repli que triage_ticket: un ticket mal parsé ne perd pas le lot
+                try:
+                    results[ticket_id] = self._parse_triage_response(outcome.text, current_department)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"  ⚠️ TriageAgent JSON error ({ticket_id}): {e}")
+                    results[ticket_id] = self._fallback_triage(current_department, 'Erreur parsing IA - fallback GO', 0.5)
+                except Exception as e:
+                    logger.error(f"  ❌ TriageAgent error ({ticket_id}): {e}")
+                    results[ticket_id] = self._fallback_triage(
+                        current_department, f'Erreur IA: {str(e)[:50]} - fallback GO', 0.3
+                    )
+        return results
+
+    def _prepare_triage(
+        self,
+        ticket_subject: str,
+        thread_content: str,
+        deal_data: Optional[Dict[str, Any]] = None,
+        current_department: str = "DOC",
+        conversation_summary: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Règles déterministes + préparation de l'appel LLM.
+
+        Returns:
+            (résultat par règle, None) si une règle tranche,
+            sinon (None, arguments de create_message pour le triage IA)
+        """
         # Construire le contexte pour l'IA
         context_parts = [
             f"**Sujet du ticket:** {ticket_subject}",
@@ -711,7 +806,7 @@ EXEMPLE PLAINTE - Message: "J'avais clairement indiqué mon choix pour une forma
                         'secondary_intents': [],
                         'detected_intent': 'ENVOIE_IDENTIFIANTS',
                         'intent_context': {'has_credentials': True, 'evalbox_status': evalbox}
-                    }
+                    }, None
 
                 # Vérifier si le candidat ENVOIE des documents (intention TRANSMET_DOCUMENTS)
                 has_document_keywords = False
@@ -734,7 +829,7 @@ EXEMPLE PLAINTE - Message: "J'avais clairement indiqué mon choix pour une forma
                         'secondary_intents': [],
                         'detected_intent': 'TRANSMET_DOCUMENTS',
                         'intent_context': {'evalbox_status': evalbox}
-                    }
+                    }, None
                 else:
                     # Pas d'envoi de documents → rester en DOC, le workflow informera le candidat
                     logger.info(f"  🔍 Evalbox = '{evalbox}' MAIS pas d'envoi de documents → GO (workflow informera le candidat)")
@@ -764,137 +859,137 @@ EXEMPLE PLAINTE - Message: "J'avais clairement indiqué mon choix pour une forma
                     'secondary_intents': [],
                     'detected_intent': 'DEMANDE_CERTIFICAT_FORMATION',
                     'intent_context': {'for_france_travail': True}
-                }
+                }, None
+
+        # Fast path: intention évidente → pas d'appel LLM
+        # (seulement si le message ne contient pas de mots ambigus)
+        if self.fast_path and not self.should_use_ai_triage(ticket_subject or '', thread_content or ''):
+            fast_result = self.fast_path.classify(ticket_subject, thread_content, deal_data, current_department)
+            if self.fast_path.accepts(fast_result):
+                logger.info(
+                    f"  ⚡ Triage rapide: {fast_result['primary_intent'] or fast_result['action']} "
+                    f"(règle {fast_result['intent_context']['fast_path_rule']}, confiance {fast_result['confidence']:.0%})"
+                )
+                return fast_result, None
 
         context = "\n\n".join(context_parts)
 
-        # Appeler Claude pour l'analyse
-        try:
-            from anthropic import Anthropic
-
-            client = Anthropic()
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",  # Modèle précis pour ne pas rater les intentions
-                max_tokens=800,  # Sonnet peut être plus verbeux
-                system=self.SYSTEM_PROMPT,
-                messages=[
-                    {"role": "user", "content": f"Analyse ce ticket et détermine l'action de triage:\n\n{context}"}
-                ]
-            )
-
-            response_text = response.content[0].text.strip()
-            logger.info(f"  🤖 TriageAgent response: {response_text[:200]}...")
-
-            # Parser la réponse JSON
-            # Nettoyer le JSON si nécessaire
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-
-            # Extraire uniquement le JSON (ignorer le texte après)
-            # Chercher le premier { et le dernier } correspondant
-            start_idx = response_text.find('{')
-            if start_idx != -1:
-                brace_count = 0
-                end_idx = start_idx
-                for i, char in enumerate(response_text[start_idx:], start_idx):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            end_idx = i + 1
-                            break
-                response_text = response_text[start_idx:end_idx]
-
-            result = json.loads(response_text)
-
-            # Valider et normaliser
-            action = result.get('action', 'GO').upper()
-            if action not in ['GO', 'ROUTE', 'SPAM']:
-                action = 'GO'
-
-            target_dept = result.get('target_department')
-            if action == 'GO':
-                target_dept = current_department
-
-            # Extraire les intentions (support multi-intentions)
-            primary_intent = result.get('primary_intent') or result.get('detected_intent')
-            secondary_intents = result.get('secondary_intents', [])
-            intent_context = result.get('intent_context', {})
-
-            # Normaliser intent_context et secondary_intents
-            if not isinstance(intent_context, dict):
-                intent_context = {}
-            if not isinstance(secondary_intents, list):
-                secondary_intents = []
-
-            # Log les intentions détectées
-            if primary_intent:
-                logger.info(f"  🎯 Intention principale: {primary_intent}")
-            if secondary_intents:
-                logger.info(f"  🎯 Intentions secondaires: {secondary_intents}")
-            if intent_context.get('mentions_force_majeure'):
-                logger.info(f"  ⚠️ Force majeure mentionnée: {intent_context.get('force_majeure_type')} - {intent_context.get('force_majeure_details', 'N/A')}")
-            if intent_context.get('is_urgent'):
-                logger.info(f"  🚨 Situation urgente détectée")
-            if intent_context.get('current_session_dates'):
-                logger.info(f"  📅 Session actuelle (contexte): {intent_context.get('current_session_dates')}")
-            if intent_context.get('requested_training_dates'):
-                logger.info(f"  📅 Dates demandées par le candidat: {intent_context.get('requested_training_dates')}")
-            if intent_context.get('session_preference'):
-                logger.info(f"  ⏰ Préférence session: {intent_context.get('session_preference')}")
-            if intent_context.get('is_complaint'):
-                logger.info(f"  ⚠️ PLAINTE détectée: candidat signale une erreur d'inscription")
-                if intent_context.get('claimed_session'):
-                    logger.info(f"  📋 Session réclamée: {intent_context.get('claimed_session')}")
-                if intent_context.get('assigned_session_wrong'):
-                    logger.info(f"  ❌ Session erronée reçue: {intent_context.get('assigned_session_wrong')}")
-
-            return {
-                'action': action,
-                'target_department': target_dept,
-                'reason': result.get('reason', 'Analyse IA'),
-                'confidence': float(result.get('confidence', 0.8)),
-                'method': 'ai',
-                # Multi-intentions
-                'primary_intent': primary_intent,
-                'secondary_intents': secondary_intents,
-                # Rétrocompatibilité
-                'detected_intent': primary_intent,
-                'intent_context': intent_context
-            }
+        # SYSTEM_PROMPT et consigne en préfixe cacheable, contexte du ticket en dernier
+        return None, dict(
+            stage="triage",
+            model="precise",  # Modèle précis pour ne pas rater les intentions
+            max_tokens=800,  # Sonnet peut être plus verbeux
+            system=self.SYSTEM_PROMPT,
+            instructions="Analyse ce ticket et détermine l'action de triage:",
+            content=context,
+            cache=True  # même ticket inchangé → même triage
+        )
 
-        except json.JSONDecodeError as e:
-            logger.warning(f"  ⚠️ TriageAgent JSON error: {e}")
-            # Fallback: rester dans le département actuel
-            return {
-                'action': 'GO',
-                'target_department': current_department,
-                'reason': 'Erreur parsing IA - fallback GO',
-                'confidence': 0.5,
-                'method': 'fallback',
-                'primary_intent': None,
-                'secondary_intents': [],
-                'detected_intent': None,
-                'intent_context': {}
-            }
+    def _parse_triage_response(self, response_text: str, current_department: str) -> Dict[str, Any]:
+        """
+        Parse la réponse JSON du LLM en résultat de triage.
 
-        except Exception as e:
-            logger.error(f"  ❌ TriageAgent error: {e}")
-            # Fallback: rester dans le département actuel
-            return {
-                'action': 'GO',
-                'target_department': current_department,
-                'reason': f'Erreur IA: {str(e)[:50]} - fallback GO',
-                'confidence': 0.3,
-                'method': 'fallback',
-                'primary_intent': None,
-                'secondary_intents': [],
-                'detected_intent': None,
-                'intent_context': {}
-            }
+        Raises:
+            json.JSONDecodeError: réponse non parsable
+        """
+        response_text = response_text.strip()
+        logger.info(f"  🤖 TriageAgent response: {response_text[:200]}...")
+
+        # Parser la réponse JSON
+        # Nettoyer le JSON si nécessaire
+        if response_text.startswith("```"):
+            response_text = response_text.split("```")[1]
+            if response_text.startswith("json"):
+                response_text = response_text[4:]
+
+        # Extraire uniquement le JSON (ignorer le texte après)
+        # Chercher le premier { et le dernier } correspondant
+        start_idx = response_text.find('{')
+        if start_idx != -1:
+            brace_count = 0
+            end_idx = start_idx
+            for i, char in enumerate(response_text[start_idx:], start_idx):
+                if char == '{':
+                    brace_count += 1
+                elif char == '}':
+                    brace_count -= 1
+                    if brace_count == 0:
+                        end_idx = i + 1
+                        break
+            response_text = response_text[start_idx:end_idx]
+
+        result = json.loads(response_text)
+
+        # Valider et normaliser
+        action = result.get('action', 'GO').upper()
+        if action not in ['GO', 'ROUTE', 'SPAM']:
+            action = 'GO'
+
+        target_dept = result.get('target_department')
+        if action == 'GO':
+            target_dept = current_department
+
+        # Extraire les intentions (support multi-intentions)
+        primary_intent = result.get('primary_intent') or result.get('detected_intent')
+        secondary_intents = result.get('secondary_intents', [])
+        intent_context = result.get('intent_context', {})
+
+        # Normaliser intent_context et secondary_intents
+        if not isinstance(intent_context, dict):
+            intent_context = {}
+        if not isinstance(secondary_intents, list):
+            secondary_intents = []
+
+        # Log les intentions détectées
+        if primary_intent:
+            logger.info(f"  🎯 Intention principale: {primary_intent}")
+        if secondary_intents:
+            logger.info(f"  🎯 Intentions secondaires: {secondary_intents}")
+        if intent_context.get('mentions_force_majeure'):
+            logger.info(f"  ⚠️ Force majeure mentionnée: {intent_context.get('force_majeure_type')} - {intent_context.get('force_majeure_details', 'N/A')}")
+        if intent_context.get('is_urgent'):
+            logger.info(f"  🚨 Situation urgente détectée")
+        if intent_context.get('current_session_dates'):
+            logger.info(f"  📅 Session actuelle (contexte): {intent_context.get('current_session_dates')}")
+        if intent_context.get('requested_training_dates'):
+            logger.info(f"  📅 Dates demandées par le candidat: {intent_context.get('requested_training_dates')}")
+        if intent_context.get('session_preference'):
+            logger.info(f"  ⏰ Préférence session: {intent_context.get('session_preference')}")
+        if intent_context.get('is_complaint'):
+            logger.info(f"  ⚠️ PLAINTE détectée: candidat signale une erreur d'inscription")
+            if intent_context.get('claimed_session'):
+                logger.info(f"  📋 Session réclamée: {intent_context.get('claimed_session')}")
+            if intent_context.get('assigned_session_wrong'):
+                logger.info(f"  ❌ Session erronée reçue: {intent_context.get('assigned_session_wrong')}")
+
+        return {
+            'action': action,
+            'target_department': target_dept,
+            'reason': result.get('reason', 'Analyse IA'),
+            'confidence': float(result.get('confidence', 0.8)),
+            'method': 'ai',
+            # Multi-intentions
+            'primary_intent': primary_intent,
+            'secondary_intents': secondary_intents,
+            # Rétrocompatibilité
+            'detected_intent': primary_intent,
+            'intent_context': intent_context
+        }
+
+    @staticmethod
+    def _fallback_triage(current_department: str, reason: str, confidence: float) -> Dict[str, Any]:
+        """Résultat de repli: rester dans le département actuel."""
+        return {
+            'action': 'GO',
+            'target_department': current_department,
+            'reason': reason,
+            'confidence': confidence,
+            'method': 'fallback',
+            'primary_intent': None,
+            'secondary_intents': [],
+            'detected_intent': None,
+            'intent_context': {}
+        }
 
     def should_use_ai_triage(
         self,
@@ -0,0 +1,275 @@
+"""
+LLM Batch - Batch mode of the LLM layer for bulk runs.
+
+The bulk analysis scripts (test_lot_analysis.py) made one synchronous LLM
+call per ticket, so a re-analysis of a few hundred tickets took hours. In
+batch mode they first collect the requests of the whole run, execute them
+together, then join the results back to the tickets by id
+(TriageAgent.triage_many for triage):
+
+    batch = LLMBatch()
+    for ticket in tickets:
+        batch.add(ticket["id"], stage="triage", model="precise", max_tokens=800,
+                  system=SYSTEM_PROMPT, content=ticket_context(ticket))
+    results = batch.run()
+    text = results[ticket_id].text
+
+Execution modes (LLM_BATCH_MODE):
+- "batch": one Message Batches job (client.messages.batches), polled until
+  it ends. Half price, no rate limit pressure; results usually arrive
+  within minutes for a few hundred requests
+- "fanout": concurrent messages.create calls through the LLMGateway
+  (bounded by LLM_MAX_CONCURRENCY, same retries / backoff)
+- "auto" (default): "batch" from LLM_BATCH_MIN_REQUESTS requests, "fanout"
+  below or when the batch job cannot be created
+
+Requests are built exactly like LLMGateway.create_message (same cacheable
+prefixes, same model aliases): calls added with cache=True are answered by
+the response cache when possible and stored in it afterwards. Batch
+requests that errored / expired are retried once by fan-out. Metrics are
+recorded per stage in the gateway stats.
+
+Against a local stub server (tests, dry runs): ANTHROPIC_BASE_URL, see
+tests/llm_stub_server.py.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from src.llm_client import LLMGateway, LLMUsageStats, get_llm_gateway, response_text
+
+logger = logging.getLogger(__name__)
+
+MODES = ("auto", "batch", "fanout")
+
+
+class BatchResult:
+    """Outcome of one request of a batch (response or error)."""
+
+    def __init__(self, custom_id: str, response=None, error: Optional[str] = None):
+        self.custom_id = custom_id
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None
+
+    @property
+    def text(self) -> str:
+        """Text of the response ("" on error)."""
+        return response_text(self.response) if self.response is not None else ""
+
+
+class LLMBatch:
+    """
+    Collects the messages requests of a bulk run and executes them together.
+
+    Not thread-safe: one instance per run, filled then run() once.
+    """
+
+    # API limit is 100,000 requests per batch; smaller jobs start sooner
+    MAX_REQUESTS_PER_JOB = 10_000
+
+    def __init__(
+        self,
+        gateway: Optional[LLMGateway] = None,
+        mode: Optional[str] = None,
+        min_batch_requests: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+        max_workers: Optional[int] = None
+    ):
+        if mode is None or min_batch_requests is None or poll_seconds is None or timeout_seconds is None:
+            from config import settings
+            mode = mode or settings.llm_batch_mode
+            min_batch_requests = settings.llm_batch_min_requests if min_batch_requests is None else min_batch_requests
+            poll_seconds = settings.llm_batch_poll_seconds if poll_seconds is None else poll_seconds
+            timeout_seconds = settings.llm_batch_timeout_seconds if timeout_seconds is None else timeout_seconds
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM batch mode: {mode!r} (expected one of {MODES})")
+
+        self.gateway = gateway or get_llm_gateway()
+        self.mode = mode
+        self.min_batch_requests = min_batch_requests
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_workers = max_workers or self.gateway.max_concurrency
+        # custom_id -> create_message kwargs (insertion order kept)
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "cached": 0, "batched": 0, "fanout": 0, "errors": 0, "jobs": 0}
+
+    def add(self, custom_id: str, **call) -> None:
+        """
+        Queue a request.
+
+        Args:
+            custom_id: Id used to join the result back (e.g. the ticket id)
+            **call: LLMGateway.create_message arguments (stage, model,
+                max_tokens, system, instructions, content, cache...)
+        """
+        custom_id = str(custom_id)
+        if custom_id in self._calls:
+            raise ValueError(f"Duplicate batch custom_id: {custom_id}")
+        self._calls[custom_id] = call
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def run(self) -> Dict[str, BatchResult]:
+        """
+        Execute every queued request.
+
+        Returns:
+            Dict custom_id -> BatchResult (one entry per added request)
+        """
+        results: Dict[str, BatchResult] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        self.stats["requests"] = len(self._calls)
+
+        # Response cache first (calls opted in with cache=True)
+        for custom_id, call in self._calls.items():
+            cached = self._from_cache(call)
+            if cached is not None:
+                results[custom_id] = BatchResult(custom_id, cached)
+                self.stats["cached"] += 1
+            else:
+                pending[custom_id] = call
+
+        if pending:
+            started = time.perf_counter()
+            if self._use_batch_api(len(pending)):
+                try:
+                    results.update(self._run_batch_api(pending))
+                except Exception as e:
+                    logger.warning(f"LLM batch job failed ({type(e).__name__}: {e}) → fan-out")
+            retry = {cid: call for cid, call in pending.items() if cid not in results or not results[cid].ok}
+            if retry:
+                results.update(self._run_fanout(retry))
+            self.stats["errors"] = sum(1 for r in results.values() if not r.ok)
+            logger.info(
+                f"LLM batch: {len(self._calls)} requests ({self.stats['cached']} cached, "
+                f"{self.stats['batched']} batched, {self.stats['fanout']} fan-out, "
+                f"{self.stats['errors']} errors) in {time.perf_counter() - started:.1f}s"
+            )
+
+        return results
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _use_batch_api(self, count: int) -> bool:
+        if self.mode == "fanout":
+            return False
+        if self.mode == "auto" and count < self.min_batch_requests:
+            return False
+        return hasattr(getattr(self.gateway.client, "messages", None), "batches")
+
+    def _request(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        params = {k: v for k, v in call.items() if k not in ("stage", "cache")}
+        return self.gateway.build_request(**params)
+
+    def _cache_key(self, call: Dict[str, Any]) -> Optional[str]:
+        if not call.get("cache") or self.gateway.response_cache is None:
+            return None
+        from src.llm_response_cache import make_key
+        return make_key(self._request(call))
+
+    def _from_cache(self, call: Dict[str, Any]):
+        cache_key = self._cache_key(call)
+        if cache_key is None:
+            return None
+        return self.gateway.cached_response(call.get("stage", "batch"), cache_key)
+
+    def _run_batch_api(self, pending: Dict[str, Dict[str, Any]]) -> Dict[str, BatchResult]:
+        """Submit the requests as Message Batches jobs and collect their results."""
+        batches = self.gateway.client.messages.batches
+        ids = list(pending)
+        results: Dict[str, BatchResult] = {}
+
+        for offset in range(0, len(ids), self.MAX_REQUESTS_PER_JOB):
+            chunk = ids[offset:offset + self.MAX_REQUESTS_PER_JOB]
+            # custom_id must match ^[a-zA-Z0-9_-]{1,64}$: positional ids, mapped back below
+            requests = [{"custom_id": f"r{i}", "params": self._request(pending[cid])} for i, cid in enumerate(chunk)]
+            started = time.perf_counter()
+            job = batches.create(requests=requests)
+            self.stats["jobs"] += 1
+            logger.info(f"LLM batch job {job.id}: {len(requests)} requests submitted")
+
+            deadline = time.monotonic() + self.timeout_seconds
+            while job.processing_status != "ended":
+                if time.monotonic() > deadline:
+                    logger.warning(f"LLM batch job {job.id}: timeout, cancelling")
+                    batches.cancel(job.id)
+                    break
+                time.sleep(self.poll_seconds)
+                job = batches.retrieve(job.id)
+            latency_ms = int((time.perf_counter() - started) * 1000)
+
+            if job.processing_status != "ended":
+                continue  # unfinished requests are retried by fan-out
+            for entry in batches.results(job.id):
+                custom_id = chunk[int(entry.custom_id[1:])]
+                call = pending[custom_id]
+                stage = call.get("stage", "batch")
+                if entry.result.type == "succeeded":
+                    message = entry.result.message
+                    self.gateway.stats.record(stage, LLMUsageStats.usage_of(message), message.model, latency_ms)
+                    cache_key = self._cache_key(call)
+                    if cache_key is not None:
+                        self.gateway.store_response(cache_key, message, message.model)
+                    results[custom_id] = BatchResult(custom_id, message)
+                    self.stats["batched"] += 1
+                else:
+                    error = getattr(getattr(entry.result, "error", None), "error", None)
+                    detail = getattr(error, "type", None) or entry.result.type
+                    results[custom_id] = BatchResult(custom_id, error=detail)
+        return results
+
+    def _run_fanout(self, pending: Dict[str, Dict[str, Any]]) -> Dict[str, BatchResult]:
+        """Concurrent create_message calls (bounded by the gateway semaphore)."""
+        def call_one(custom_id: str) -> BatchResult:
+            # The response cache was already queried by run(): store only
+            call = dict(pending[custom_id])
+            cache_key = self._cache_key(call)
+            call.pop("cache", None)
+            try:
+                response = self.gateway.create_message(**call)
+                if cache_key is not None:
+                    self.gateway.store_response(cache_key, response, response.model)
+                return BatchResult(custom_id, response)
+            except Exception as e:
+                return BatchResult(custom_id, error=f"{type(e).__name__}: {str(e)[:100]}")
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="llm-batch") as pool:
+            outcomes = list(pool.map(call_one, pending))
+        self.stats["fanout"] += sum(1 for r in outcomes if r.ok)
+        return {r.custom_id: r for r in outcomes}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batch statistics for monitoring.
+
+        Returns:
+            Dict with mode and requests answered from cache / batch job / fan-out
+        """
+        return {"mode": self.mode, **self.stats}
+
+
+def run_batch(calls: Dict[str, Dict[str, Any]], **kwargs) -> Dict[str, BatchResult]:
+    """
+    Shortcut: execute {custom_id: create_message kwargs} in batch mode.
+
+    Args:
+        calls: Requests keyed by the id used to join results back
+        **kwargs: LLMBatch options (mode, gateway...)
+
+    Returns:
+        Dict custom_id -> BatchResult
+    """
+    batch = LLMBatch(**kwargs)
+    for custom_id, call in calls.items():
+        batch.add(custom_id, **call)
+    return batch.run()
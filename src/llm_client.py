@@ -0,0 +1,446 @@
+"""
+LLM Client - Gateway for every Anthropic messages call.
+
+LLM calls used to be scattered (BaseAgent.ask, anthropic.Anthropic() built
+ad hoc in the humanizer, the note generator and the inline thread
+summaries, DOCTicketWorkflow.anthropic_client...), each with a hard-coded
+model name. They all go through the LLMGateway:
+
+- One pooled anthropic.Anthropic client per process (keep-alive HTTP
+  connections, no per-call construction)
+- Bounded concurrency (LLM_MAX_CONCURRENCY simultaneous calls)
+- Retries with exponential backoff + jitter on 429 / overload / 5xx and
+  connection errors, honouring Retry-After (LLM_MAX_RETRIES)
+- Model aliases resolved from config.settings ("fast", "precise",
+  "agent"); full model names pass through unchanged
+- Prompt caching: the static system prompt and task instructions are sent
+  as cache_control blocks, the dynamic ticket data always last:
+
+    system        static, marked cacheable (cache_control: ephemeral)
+    instructions  static task instructions, marked cacheable (optional)
+    content       dynamic ticket data, always last (never cached)
+
+  Prefixes shorter than the model's minimum cacheable length are simply
+  not cached by the API (no error).
+- Metrics per call (stage, model, latency, tokens incl. cache read/write,
+  attempts), aggregated per stage for monitoring
+- Opt-in response cache (LLM_CACHE_ENABLED, see src/llm_response_cache.py)
+  for the calls made with cache=True: identical requests are answered
+  from disk without calling the API
+- Batch mode for bulk runs (src/llm_batch.py): the same requests submitted
+  as one Message Batches job, or fanned out concurrently
+
+Usage:
+    from src.llm_client import create_message, response_text
+
+    response = create_message(
+        stage="triage",
+        model="precise",
+        max_tokens=800,
+        system=SYSTEM_PROMPT,
+        instructions="Analyse ce ticket et détermine l'action de triage:",
+        content=context,
+    )
+    text = response_text(response)
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import anthropic
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# HTTP status codes worth retrying (rate limit, overload, transient server errors)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504, 529})
+
+
+def cacheable_text(text: str) -> Dict[str, Any]:
+    """Text content block marked as a cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}
+
+
+def build_system(system: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Static system prompt as a single cacheable block (None if empty)."""
+    if not system:
+        return None
+    return [cacheable_text(system)]
+
+
+def build_user_content(content: str, instructions: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    User turn with the static instructions first (cacheable) and the dynamic
+    data last.
+    """
+    blocks: List[Dict[str, Any]] = []
+    if instructions:
+        blocks.append(cacheable_text(instructions))
+    blocks.append({"type": "text", "text": content})
+    return blocks
+
+
+def response_text(response) -> str:
+    """Text of the first content block of a messages response."""
+    return response.content[0].text
+
+
+class CachedResponse:
+    """Messages response replayed from the response cache (text content only, no tokens)."""
+
+    from_cache = True
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.model = payload.get("model")
+        self.stop_reason = payload.get("stop_reason")
+        self.content = [SimpleNamespace(type="text", text=payload.get("text", ""))]
+        self.usage = SimpleNamespace(**dict.fromkeys(LLMUsageStats.TOKEN_FIELDS, 0))
+
+
+class LLMUsageStats:
+    """Thread-safe call metrics (tokens, latency, retries), aggregated per stage."""
+
+    TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+    FIELDS = ("calls", "cached", "errors", "retries", "latency_ms", "max_latency_ms") + TOKEN_FIELDS
+    # Derniers appels conservés pour le détail (stage, model, latence, tokens)
+    RECENT_CALLS = 200
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, int]] = {}
+        self._recent: "deque[Dict[str, Any]]" = deque(maxlen=self.RECENT_CALLS)
+
+    @staticmethod
+    def usage_of(response) -> Dict[str, int]:
+        """Token counts of a response (missing fields count as 0)."""
+        usage = getattr(response, "usage", None)
+        return {field: int(getattr(usage, field, 0) or 0) for field in LLMUsageStats.TOKEN_FIELDS}
+
+    def record(
+        self,
+        stage: str,
+        usage: Dict[str, int],
+        model: str = "",
+        latency_ms: int = 0,
+        attempts: int = 1,
+        error: Optional[str] = None,
+        cached: bool = False
+    ) -> None:
+        with self._lock:
+            totals = self._stages.setdefault(stage, dict.fromkeys(self.FIELDS, 0))
+            totals["calls"] += 1
+            totals["cached"] += 1 if cached else 0
+            totals["errors"] += 1 if error else 0
+            totals["retries"] += attempts - 1
+            totals["latency_ms"] += latency_ms
+            totals["max_latency_ms"] = max(totals["max_latency_ms"], latency_ms)
+            for field, value in usage.items():
+                totals[field] += value
+            self._recent.append({
+                "stage": stage,
+                "model": model,
+                "latency_ms": latency_ms,
+                "attempts": attempts,
+                "error": error,
+                "cached": cached,
+                "at": time.time(),
+                **usage,
+            })
+
+    def recent_calls(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent calls, newest last."""
+        with self._lock:
+            return list(self._recent)[-limit:]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get usage statistics for monitoring.
+
+        Returns:
+            Dict with per-stage counters (incl. average latency) and the
+            overall cache hit ratio (cached input tokens / all input tokens)
+        """
+        with self._lock:
+            stages = {stage: dict(totals) for stage, totals in self._stages.items()}
+        for totals in stages.values():
+            totals["avg_latency_ms"] = round(totals["latency_ms"] / totals["calls"]) if totals["calls"] else 0
+        cache_read = sum(s["cache_read_input_tokens"] for s in stages.values())
+        total_input = sum(
+            s["input_tokens"] + s["cache_read_input_tokens"] + s["cache_creation_input_tokens"]
+            for s in stages.values()
+        )
+        return {
+            "stages": stages,
+            "cache_read_ratio": round(cache_read / total_input, 3) if total_input else 0.0,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+
+
+class LLMGateway:
+    """
+    Shared Anthropic client with bounded concurrency, backoff and metrics.
+
+    Thread-safe: one instance per process (get_llm_gateway()).
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 8
+    DEFAULT_MAX_RETRIES = 4
+    DEFAULT_BACKOFF_SECONDS = 1.0
+    MAX_BACKOFF_SECONDS = 30.0
+
+    def __init__(
+        self,
+        client=None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        aliases: Optional[Dict[str, str]] = None,
+        response_cache=None
+    ):
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.max_concurrency = max(1, max_concurrency or self.DEFAULT_MAX_CONCURRENCY)
+        self.max_retries = self.DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = self.DEFAULT_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self._aliases = aliases
+        # LLMResponseCache (None = disabled)
+        self.response_cache = response_cache
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self.stats = LLMUsageStats()
+
+    @property
+    def client(self):
+        """Pooled anthropic.Anthropic client (created on first use; retries handled here)."""
+        with self._client_lock:
+            if self._client is None:
+                from config import settings
+                self._client = anthropic.Anthropic(api_key=settings.anthropic_api_key, max_retries=0)
+            return self._client
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        if self._aliases is None:
+            from config import settings
+            self._aliases = {
+                "fast": settings.llm_model_fast,
+                "precise": settings.llm_model_precise,
+                "agent": settings.agent_model,
+            }
+        return self._aliases
+
+    def resolve_model(self, model: str) -> str:
+        """Model name for an alias ("fast", "precise", "agent") or the name itself."""
+        return self.aliases.get(model, model)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying `error`, or None if it is not retryable."""
+        if isinstance(error, anthropic.APIStatusError):
+            if error.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+            retry_after = error.response.headers.get("retry-after") if error.response is not None else None
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.MAX_BACKOFF_SECONDS)
+                except ValueError:
+                    pass
+        elif not isinstance(error, anthropic.APIConnectionError):
+            return None
+        delay = min(self.backoff_seconds * (2 ** attempt), self.MAX_BACKOFF_SECONDS)
+        return delay + random.uniform(0, delay / 4)
+
+    def build_request(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        content: Optional[str] = None,
+        system: Optional[str] = None,
+        instructions: Optional[str] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        messages.create parameters with cacheable static prefixes (see create_message).
+
+        Also used as the "params" of Message Batches requests (src/llm_batch.py).
+        """
+        all_messages = list(messages or [])
+        if content is not None:
+            all_messages.append({"role": "user", "content": build_user_content(content, instructions)})
+
+        request: Dict[str, Any] = {"model": self.resolve_model(model), "max_tokens": max_tokens, "messages": all_messages}
+        system_blocks = build_system(system)
+        if system_blocks:
+            request["system"] = system_blocks
+        request.update(kwargs)
+        return request
+
+    def cached_response(self, stage: str, cache_key: str) -> Optional[CachedResponse]:
+        """Response cache lookup, recorded as a cached call of `stage` on a hit."""
+        started = time.perf_counter()
+        payload = self.response_cache.get(cache_key)
+        if payload is None:
+            return None
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        self.stats.record(stage, {}, payload.get("model") or "", latency_ms, cached=True)
+        logger.debug(f"LLM [{stage}] {payload.get('model')}: response cache hit")
+        return CachedResponse(payload)
+
+    def store_response(self, cache_key: str, response, model: str) -> None:
+        """
+        Store a response in the response cache.
+
+        Only complete responses (stop_reason "end_turn") are stored: a reply
+        cut at max_tokens or stopped early would be replayed until the TTL.
+        """
+        if getattr(response, "stop_reason", None) != "end_turn":
+            logger.debug(f"LLM {model}: response not cached (stop_reason={getattr(response, 'stop_reason', None)})")
+            return
+        self.response_cache.put(cache_key, {
+            "text": response_text(response),
+            "model": getattr(response, "model", model),
+            "stop_reason": getattr(response, "stop_reason", None),
+        })
+
+    def create_message(
+        self,
+        *,
+        stage: str,
+        model: str,
+        max_tokens: int,
+        content: Optional[str] = None,
+        system: Optional[str] = None,
+        instructions: Optional[str] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        cache: bool = False,
+        **kwargs
+    ):
+        """
+        Call messages.create with cacheable static prefixes.
+
+        Args:
+            stage: Call site name, used for metrics (e.g. "triage")
+            model: Model alias ("fast", "precise", "agent") or model name
+            max_tokens: Max output tokens
+            content: Dynamic data of the last user turn
+            system: Static system prompt (cached)
+            instructions: Static instructions placed before `content` (cached)
+            messages: Previous turns (conversation history), sent before the new turn
+            cache: Deterministic call: may be answered by the response cache
+            **kwargs: Passed through to messages.create (temperature...)
+
+        Returns:
+            The messages API response (CachedResponse on a response cache hit)
+
+        Raises:
+            anthropic.APIError: non-retryable error, or retries exhausted
+        """
+        request = self.build_request(
+            model=model, max_tokens=max_tokens, content=content, system=system,
+            instructions=instructions, messages=messages, **kwargs
+        )
+        model = request["model"]
+
+        started = time.perf_counter()
+        cache_key = None
+        if cache and self.response_cache is not None:
+            from src.llm_response_cache import make_key
+            cache_key = make_key(request)
+            cached = self.cached_response(stage, cache_key)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            try:
+                # Le sémaphore n'est tenu que pendant l'appel (pas pendant le backoff)
+                with self._semaphore:
+                    response = self.client.messages.create(**request)
+                break
+            except Exception as e:
+                delay = self._retry_delay(e, attempt) if attempt < self.max_retries else None
+                if delay is None:
+                    latency_ms = int((time.perf_counter() - started) * 1000)
+                    self.stats.record(stage, {}, model, latency_ms, attempt + 1, error=type(e).__name__)
+                    raise
+                attempt += 1
+                logger.warning(f"LLM [{stage}] {type(e).__name__}, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        usage = LLMUsageStats.usage_of(response)
+        self.stats.record(stage, usage, model, latency_ms, attempt + 1)
+        if cache_key is not None:
+            self.store_response(cache_key, response, model)
+        logger.debug(
+            f"LLM [{stage}] {model}: {latency_ms}ms input={usage['input_tokens']} "
+            f"cache_read={usage['cache_read_input_tokens']} "
+            f"cache_write={usage['cache_creation_input_tokens']} "
+            f"output={usage['output_tokens']}"
+        )
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get gateway statistics for monitoring.
+
+        Returns:
+            Dict with configuration and per-stage usage / latency
+        """
+        stats = self.stats.get_stats()
+        stats.update({
+            "max_concurrency": self.max_concurrency,
+            "max_retries": self.max_retries,
+            "response_cache": self.response_cache.get_stats() if self.response_cache is not None else None,
+        })
+        return stats
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Get the process-wide LLMGateway (sized from config.settings).
+
+    Returns:
+        LLMGateway instance
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            from config import settings
+            response_cache = None
+            if settings.llm_cache_enabled:
+                from src.llm_response_cache import get_llm_response_cache
+                response_cache = get_llm_response_cache(
+                    settings.llm_cache_path,
+                    ttl_seconds=settings.llm_cache_ttl_seconds,
+                    max_bytes=int(settings.llm_cache_max_mb * 1024 * 1024),
+                )
+            _gateway = LLMGateway(
+                max_concurrency=settings.llm_max_concurrency,
+                max_retries=settings.llm_max_retries,
+                response_cache=response_cache,
+            )
+        return _gateway
+
+
+def get_usage_stats() -> LLMUsageStats:
+    """Get the usage metrics of the process-wide gateway."""
+    return get_llm_gateway().stats
+
+
+def create_message(**kwargs):
+    """Shortcut for get_llm_gateway().create_message(...)."""
+    return get_llm_gateway().create_message(**kwargs)
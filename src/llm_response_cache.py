@@ -0,0 +1,211 @@
+"""
+LLM Response Cache - Opt-in on-disk cache of LLM responses.
+
+Several LLM calls are effectively deterministic for the same input (thread
+summaries, CRM date extraction, triage of an unchanged ticket, CRM note).
+Re-running a ticket (dry-run analysis, baseline capture, the continuous
+runner re-picking a ticket) repeated identical calls.
+
+When enabled (LLM_CACHE_ENABLED=true), the LLMGateway looks up the calls
+made with cache=True here before calling the API:
+- Key: sha256 of the full request (model, system prompt, messages,
+  max_tokens, temperature...)
+- TTL on entries (LLM_CACHE_TTL_SECONDS)
+- LRU + size-based eviction (LLM_CACHE_MAX_MB of stored responses)
+- Hit / miss / eviction counts for monitoring
+
+SQLite (WAL) so several processes (webhook workers, bulk scripts) share it.
+
+Usage:
+    from src.llm_response_cache import get_llm_response_cache, make_key
+
+    cache = get_llm_response_cache()
+    key = make_key(request)
+    payload = cache.get(key)
+    if payload is None:
+        cache.put(key, {"text": ..., "model": ...})
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "llm_cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses(last_access);
+"""
+
+
+def make_key(request: Dict[str, Any]) -> str:
+    """Stable key of a messages.create request (every parameter counts)."""
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of LLM responses with TTL and LRU / size eviction.
+
+    Thread-safe (RLock on a SQLite connection in WAL mode).
+    """
+
+    DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds or self.DEFAULT_TTL_SECONDS
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        # Monitoring (current process)
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached payload for `key`, or None (absent or expired)."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT payload, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            if now - row["created_at"] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._expired += 1
+                self._misses += 1
+                return None
+            conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+            self._hits += 1
+        return json.loads(row["payload"])
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        """Store a payload, then evict least recently used entries beyond max_bytes."""
+        data = json.dumps(payload, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_responses (key, model, payload, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, payload.get("model"), data, size, now, now)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for row in conn.execute("SELECT key, size FROM llm_responses ORDER BY last_access ASC").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (row["key"],))
+                total -= row["size"]
+                self._evictions += 1
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._expired += cursor.rowcount
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM llm_responses")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for monitoring.
+
+        Returns:
+            Dict with entries, stored bytes and hits / misses / evictions
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            lookups = self._hits + self._misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_response_cache(
+    db_path: Optional[str] = None,
+    ttl_seconds: Optional[float] = None,
+    max_bytes: Optional[int] = None
+) -> LLMResponseCache:
+    """
+    Get the LLMResponseCache for a database path (one instance per path and process).
+
+    Args:
+        db_path: Database path (default: llm_cache.db)
+        ttl_seconds: Entry lifetime (first call for a path only)
+        max_bytes: Max size of stored responses (first call for a path only)
+
+    Returns:
+        LLMResponseCache instance
+    """
+    path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = LLMResponseCache(path, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        return _caches[path]
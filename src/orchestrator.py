@@ -1,7 +1,7 @@
 """Orchestrator for coordinating multiple agents in automated workflows."""
 import logging
 from typing import Dict, Any, List, Optional
-from src.agents import DeskTicketAgent, CRMOpportunityAgent, TicketDispatcherAgent, DealLinkingAgent
+from src.agents import BaseAgent, DeskTicketAgent, CRMOpportunityAgent, TicketDispatcherAgent, DealLinkingAgent
 from src.zoho_client import ZohoDeskClient, ZohoCRMClient
 from src.ticket_deal_linker import TicketDealLinker
 
@@ -502,6 +502,15 @@ class ZohoAutomationOrchestrator:
         logger.info("Full automation cycle completed")
         return results
 
+    def reset_request_state(self):
+        """
+        Clear per-ticket state before the orchestrator is reused for another
+        ticket (component pool): agent conversation histories.
+        """
+        for component in vars(self).values():
+            if isinstance(component, BaseAgent):
+                component.conversation_history = []
+
     def close(self):
         """Clean up all resources."""
         self.dispatcher_agent.close()
@@ -12,16 +12,29 @@ Composants:
 - TemplateEngine: Génère les réponses à partir des templates
 - ResponseValidator: Valide les réponses générées
 - CRMUpdater: Applique les mises à jour CRM de manière déterministe
+
+Les composants sans état par ticket sont partagés par process via
+get_state_detector(), get_template_engine() et get_response_validator().
 """
 
 from .state_detector import StateDetector
 from .template_engine import TemplateEngine
 from .response_validator import ResponseValidator
 from .crm_updater import CRMUpdater
+from .shared import (
+    get_state_detector,
+    get_template_engine,
+    get_response_validator,
+    reset_shared_components,
+)
 
 __all__ = [
     'StateDetector',
     'TemplateEngine',
     'ResponseValidator',
-    'CRMUpdater'
+    'CRMUpdater',
+    'get_state_detector',
+    'get_template_engine',
+    'get_response_validator',
+    'reset_shared_components',
 ]
@@ -0,0 +1,403 @@
+"""
+Bundle précompilé du State Engine (démarrage rapide, rechargement à chaud).
+
+Construire un StateDetector + TemplateEngine parsait ~4k lignes de YAML
+(candidate_states.yaml, state_intention_matrix.yaml) et compilait ~200
+fichiers Handlebars avec pybars: ~6 s par process (scripts, tests,
+webhook).
+
+Le bundle est un artefact unique, construit une fois puis rechargé:
+- États et matrice déjà parsés
+- Sources nettoyées des partials et des templates principaux
+- Fonctions de rendu pybars compilées (code Python généré par
+  Compiler.precompile, sérialisé avec marshal)
+- Identifié par un hash du contenu des fichiers sources (content_hash) et
+  versionné (format, version Python, version pybars3): un bundle d'une
+  autre version est reconstruit
+
+Les conditions des états sont recompilées depuis la config parsée
+(StateRules, < 1 ms): des closures ne se sérialisent pas.
+
+Fraîcheur: le bundle enregistre mtime/taille de chaque fichier source.
+Tout changement (ajout, suppression, modification) → si le contenu a
+réellement changé, reconstruction; sinon (checkout, touch) simple mise à
+jour des mtimes. Les composants partagés (shared.py) vérifient la
+fraîcheur au plus toutes les STATE_ENGINE_RELOAD_SECONDS et se
+reconstruisent: une modification de template ne demande plus de
+redémarrer le webhook.
+
+Variables d'environnement:
+- STATE_ENGINE_BUNDLE=false: désactive le bundle (parse/compile direct)
+- STATE_ENGINE_BUNDLE_PATH: chemin du fichier (défaut: states/.build/state_engine.bundle)
+- STATE_ENGINE_RELOAD_SECONDS: intervalle de vérification (défaut 2, 0 = jamais)
+
+Build explicite (CI, déploiement):
+    python -m src.state_engine.bundle            # construit si périmé
+    python -m src.state_engine.bundle --force    # reconstruit
+    python -m src.state_engine.bundle --check    # code 1 si périmé
+"""
+import functools
+import hashlib
+import logging
+import marshal
+import os
+import pickle
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+STATE_ENGINE_BUNDLE = os.getenv('STATE_ENGINE_BUNDLE', 'true').lower() == 'true'
+STATE_ENGINE_BUNDLE_PATH = os.getenv('STATE_ENGINE_BUNDLE_PATH')
+STATE_ENGINE_RELOAD_SECONDS = float(os.getenv('STATE_ENGINE_RELOAD_SECONDS', '2'))
+
+# Incrémenter à chaque changement de structure du bundle
+BUNDLE_FORMAT = 1
+
+STATES_CONFIG_FILE = "candidate_states.yaml"
+MATRIX_FILE = "state_intention_matrix.yaml"
+
+
+def _pybars_version() -> str:
+    # Sans importer pybars (~1.5 s: construction de sa grammaire à l'import)
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version('pybars3')
+    except PackageNotFoundError:
+        import pybars
+        return pybars.__version__
+
+
+def _yaml_load(path: Path) -> Any:
+    """yaml.safe_load, avec le loader C quand libyaml est disponible."""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def template_files(states_path: Path) -> List[Path]:
+    """Templates principaux rendus par TemplateEngine (précompilés en plus des partials)."""
+    templates_root = states_path / "templates"
+    files = [p for p in templates_root.glob("*") if p.suffix in ('.html', '.md')]
+    files.extend((templates_root / "base_legacy").glob("*.html"))
+    return sorted(files)
+
+
+def source_files(states_path: Path) -> List[Path]:
+    """Tous les fichiers lus pour construire le bundle."""
+    from .pybars_renderer import PybarsRenderer
+
+    files = {states_path / STATES_CONFIG_FILE, states_path / MATRIX_FILE}
+    files.update(path for _, path in PybarsRenderer.partial_files(states_path))
+    files.update(template_files(states_path))
+    return sorted(p for p in files if p.exists())
+
+
+def source_signature(states_path: Path) -> Dict[str, Tuple[int, int]]:
+    """{chemin relatif: (mtime_ns, taille)} des fichiers sources."""
+    signature = {}
+    for path in source_files(states_path):
+        stat = path.stat()
+        signature[path.relative_to(states_path).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return signature
+
+
+def content_hash(states_path: Path, relpaths) -> str:
+    """sha256 du contenu (et des chemins) des fichiers sources."""
+    digest = hashlib.sha256()
+    for relpath in sorted(relpaths):
+        digest.update(relpath.encode('utf-8') + b'\0')
+        digest.update((states_path / relpath).read_bytes() + b'\0')
+    return digest.hexdigest()
+
+
+class StateEngineBundle:
+    """Contenu d'un bundle chargé (config parsée + rendus compilés)."""
+
+    def __init__(self, data: Dict[str, Any], path: Path):
+        self.data = data
+        self.path = path
+        self._functions: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def content_hash(self) -> str:
+        return self.data['content_hash']
+
+    @property
+    def signature(self) -> Dict[str, Tuple[int, int]]:
+        return self.data['signature']
+
+    @property
+    def states_config(self) -> Dict[str, Any]:
+        return self.data['states_config']
+
+    @property
+    def matrix(self) -> Dict[str, Any]:
+        return self.data['matrix']
+
+    def template_content(self, relpath: str) -> Optional[str]:
+        """Contenu nettoyé (TemplateEngine._clean_block_content) d'un template principal."""
+        entry = self.data['templates'].get(relpath)
+        return entry['content'] if entry else None
+
+    def partials(self) -> Tuple[Dict[str, Callable], Dict[str, str]]:
+        """({nom: fonction de rendu}, {nom: source nettoyée}) des partials."""
+        functions = _LazyRenderFunctions(
+            self, {name: entry['code'] for name, entry in self.data['partials'].items()}
+        )
+        sources = {name: entry['source'] for name, entry in self.data['partials'].items()}
+        return functions, sources
+
+    def templates(self) -> Dict[str, Tuple[str, Callable[[], Callable]]]:
+        """
+        {chemin relatif: (source prête pour pybars, chargeur)} des templates principaux.
+
+        Le chargeur (sans argument) retourne la fonction de rendu.
+        """
+        return {
+            relpath: (entry['source'], functools.partial(self._function, f"template:{relpath}", entry['code']))
+            for relpath, entry in self.data['templates'].items() if entry['code'] is not None
+        }
+
+    def _function(self, key: str, code: bytes) -> Callable:
+        """Fonction de rendu à partir du code marshalé (exécuté une fois par bundle)."""
+        with self._lock:
+            if key not in self._functions:
+                namespace = {'__name__': f"pybars._templates.bundle_{len(self._functions)}"}
+                exec(marshal.loads(code), namespace)
+                self._functions[key] = namespace['render']
+            return self._functions[key]
+
+
+class _LazyRenderFunctions(dict):
+    """
+    {nom: fonction de rendu} dont le code n'est exécuté qu'au premier accès.
+
+    Exécuter le code généré importe pybars: un State Engine construit sans
+    rendre de template (détection d'état seule) n'en paie pas le coût.
+    """
+
+    def __init__(self, bundle: StateEngineBundle, codes: Dict[str, bytes]):
+        super().__init__((name, None) for name in codes)
+        self._bundle = bundle
+        self._codes = codes
+
+    def __getitem__(self, name: str) -> Callable:
+        function = dict.__getitem__(self, name)
+        if function is None:
+            function = self._bundle._function(f"partial:{name}", self._codes[name])
+            dict.__setitem__(self, name, function)
+        return function
+
+    def get(self, name: str, default=None):
+        return self[name] if name in self else default
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+def _precompile(compiler, source: str, filename: str) -> bytes:
+    """Code Python généré par pybars pour `source`, compilé et marshalé."""
+    from .pybars_renderer import PybarsRenderer
+
+    with PybarsRenderer._compile_lock:
+        code = compiler.precompile(source)
+    return marshal.dumps(compile(code, filename, 'exec', dont_inherit=True))
+
+
+def build_bundle(states_path: Path) -> Dict[str, Any]:
+    """
+    Parse et compile toutes les sources du State Engine.
+
+    Args:
+        states_path: Dossier states/
+
+    Returns:
+        Données du bundle (sérialisables avec pickle)
+    """
+    from pybars import Compiler
+    from .pybars_renderer import PybarsRenderer
+    from .template_engine import TemplateEngine
+
+    started = time.perf_counter()
+    signature = source_signature(states_path)
+    compiler = Compiler()
+
+    states_config_path = states_path / STATES_CONFIG_FILE
+    matrix_path = states_path / MATRIX_FILE
+
+    partials = {}
+    for name, path in PybarsRenderer.partial_files(states_path):
+        source = PybarsRenderer._clean_content(path.read_text(encoding='utf-8'))
+        try:
+            partials[name] = {'source': source, 'code': _precompile(compiler, source, f"partial_{name}.py")}
+        except Exception as e:
+            logger.warning(f"Bundle: partial '{name}' non compilé ({path}): {e}")
+
+    templates = {}
+    for path in template_files(states_path):
+        relpath = path.relative_to(states_path).as_posix()
+        content = TemplateEngine._clean_block_content(path.read_text(encoding='utf-8'))
+        source = PybarsRenderer._clean_content(content)
+        try:
+            code = _precompile(compiler, source, f"template_{relpath}.py")
+        except Exception as e:
+            logger.warning(f"Bundle: template '{relpath}' non compilé: {e}")
+            code = None
+        templates[relpath] = {'content': content, 'source': source, 'code': code}
+
+    data = {
+        'format': BUNDLE_FORMAT,
+        'python': sys.implementation.cache_tag,
+        'pybars': _pybars_version(),
+        'built_at': time.time(),
+        'content_hash': content_hash(states_path, signature),
+        'signature': signature,
+        'states_config': _yaml_load(states_config_path) if states_config_path.exists() else {'states': {}, 'config': {}},
+        'matrix': (_yaml_load(matrix_path) or {}) if matrix_path.exists() else {},
+        'partials': partials,
+        'templates': templates,
+    }
+    logger.info(
+        f"Bundle State Engine construit en {time.perf_counter() - started:.1f}s: "
+        f"{len(partials)} partials, {len(templates)} templates ({data['content_hash'][:12]})"
+    )
+    return data
+
+
+def default_bundle_path(states_path: Path) -> Path:
+    if STATE_ENGINE_BUNDLE_PATH:
+        return Path(STATE_ENGINE_BUNDLE_PATH)
+    return states_path / ".build" / "state_engine.bundle"
+
+
+def _write(path: Path, data: Dict[str, Any]) -> None:
+    """Écriture atomique (un autre process peut lire le bundle en même temps)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _read(path: Path) -> Optional[Dict[str, Any]]:
+    """Bundle sur disque, ou None s'il est absent / illisible / d'une autre version."""
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Bundle State Engine illisible ({path}): {e}")
+        return None
+    if (data.get('format') != BUNDLE_FORMAT or data.get('python') != sys.implementation.cache_tag
+            or data.get('pybars') != _pybars_version()):
+        logger.info(f"Bundle State Engine d'une autre version ({path}): reconstruction")
+        return None
+    return data
+
+
+def load_bundle(states_path: Path, bundle_path: Optional[Path] = None, force: bool = False) -> StateEngineBundle:
+    """
+    Charge le bundle de `states_path`, en le (re)construisant si besoin.
+
+    Args:
+        states_path: Dossier states/
+        bundle_path: Fichier du bundle (défaut: default_bundle_path)
+        force: Reconstruire même si le bundle est à jour
+
+    Returns:
+        StateEngineBundle à jour
+    """
+    states_path = Path(states_path)
+    bundle_path = Path(bundle_path) if bundle_path else default_bundle_path(states_path)
+    data = None if force else _read(bundle_path)
+
+    if data is not None:
+        signature = source_signature(states_path)
+        if signature != data['signature']:
+            # mtimes changés: reconstruire seulement si le contenu a changé
+            if content_hash(states_path, signature) == data['content_hash']:
+                data['signature'] = signature
+                _write(bundle_path, data)
+            else:
+                logger.info("Sources du State Engine modifiées: reconstruction du bundle")
+                data = None
+
+    if data is None:
+        data = build_bundle(states_path)
+        try:
+            _write(bundle_path, data)
+        except OSError as e:
+            logger.warning(f"Bundle State Engine non écrit ({bundle_path}): {e}")
+
+    return StateEngineBundle(data, bundle_path)
+
+
+_bundles: Dict[Path, StateEngineBundle] = {}
+_bundles_lock = threading.Lock()
+
+
+def get_bundle(states_path: Path) -> Optional[StateEngineBundle]:
+    """
+    Bundle du process pour `states_path` (vérifié à chaque appel).
+
+    Returns:
+        StateEngineBundle, ou None si STATE_ENGINE_BUNDLE=false ou en cas
+        d'erreur (les composants parsent alors les sources eux-mêmes)
+    """
+    if not STATE_ENGINE_BUNDLE:
+        return None
+    key = Path(states_path).resolve()
+    with _bundles_lock:
+        bundle = _bundles.get(key)
+        try:
+            if bundle is None or is_stale(bundle, key):
+                bundle = load_bundle(key)
+                _bundles[key] = bundle
+        except Exception as e:
+            logger.error(f"Bundle State Engine indisponible: {e}")
+            return None
+        return bundle
+
+
+def is_stale(bundle: StateEngineBundle, states_path: Path) -> bool:
+    """True si un fichier source a changé depuis le chargement du bundle."""
+    return source_signature(Path(states_path)) != bundle.signature
+
+
+def main():
+    import argparse
+
+    from .template_engine import STATES_PATH
+
+    parser = argparse.ArgumentParser(description="Construit le bundle précompilé du State Engine")
+    parser.add_argument('--states', type=Path, default=STATES_PATH, help="Dossier states/")
+    parser.add_argument('--output', type=Path, default=None, help="Fichier du bundle")
+    parser.add_argument('--force', action='store_true', help="Reconstruire même si à jour")
+    parser.add_argument('--check', action='store_true', help="Code de sortie 1 si le bundle est absent ou périmé")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    bundle_path = args.output or default_bundle_path(args.states)
+
+    if args.check:
+        data = _read(bundle_path)
+        stale = data is None or source_signature(args.states) != data['signature']
+        print(f"{bundle_path}: {'périmé' if stale else 'à jour'}")
+        sys.exit(1 if stale else 0)
+
+    bundle = load_bundle(args.states, bundle_path, force=args.force)
+    print(f"{bundle.path}: {bundle.content_hash[:12]} "
+          f"({len(bundle.data['partials'])} partials, {len(bundle.data['templates'])} templates)")
+
+
+if __name__ == '__main__':
+    main()
@@ -82,31 +82,34 @@ class CRMUpdater:
     ]
 
     # Prompt pour extraction LLM (cas ambigus)
-    EXTRACTION_PROMPT = """Analyse le message du candidat et extrait les informations de confirmation.
-
-Message du candidat:
-"{message}"
-
-Dates d'examen proposées:
-{proposed_dates}
-
-Sessions de formation proposées:
-{proposed_sessions}
+    # Consignes statiques (préfixe cacheable), envoyées en system
+    EXTRACTION_INSTRUCTIONS = """Analyse le message du candidat et extrait les informations de confirmation.
 
 Extrais les informations suivantes (réponds UNIQUEMENT en JSON valide, sans markdown):
-{{
+{
   "date_examen": "YYYY-MM-DD ou null si non confirmée",
   "session_id": "ID de la session choisie ou null",
   "preference_horaire": "jour ou soir ou null si non précisé",
   "confiance": "haute/moyenne/basse",
   "raison": "explication courte"
-}}
+}
 
 IMPORTANT:
 - date_examen: La date de l'EXAMEN confirmée (PAS la clôture, PAS les dates de cours/session)
 - session_id: L'ID de la session si le candidat confirme une session spécifique
 - Si le candidat dit juste "ok" ou "je confirme" sans préciser de date, mets null pour date_examen
 - Distingue bien: date d'examen (ex: 28/04/2026) vs date de clôture (ex: après "clôture:") vs dates de session (ex: "du 13/04 au 24/04")
+"""
+
+    # Données du ticket (dynamiques), toujours en fin de prompt
+    EXTRACTION_PROMPT = """Message du candidat:
+"{message}"
+
+Dates d'examen proposées:
+{proposed_dates}
+
+Sessions de formation proposées:
+{proposed_sessions}
 """
 
     def __init__(self, crm_client=None):
@@ -469,15 +472,16 @@ IMPORTANT:
         )
 
         try:
-            import anthropic
             import json
+            from src.llm_client import create_message
 
-            client = anthropic.Anthropic()
-
-            response = client.messages.create(
-                model="claude-3-5-haiku-20241022",
+            response = create_message(
+                stage="crm_extraction",
+                model="fast",
                 max_tokens=256,
-                messages=[{"role": "user", "content": prompt}]
+                system=self.EXTRACTION_INSTRUCTIONS,
+                content=prompt,
+                cache=True
             )
 
             # Parser la réponse JSON
@@ -7,19 +7,49 @@ rendering with proper support for nested blocks, partials, and helpers.
 
 Architecture:
 - PybarsRenderer loads and compiles all partials at initialization
-- Templates are compiled once and cached by content hash
+  (precompiled from the state engine bundle when available, see bundle.py)
+- Templates are cleaned and compiled once, cached by their source string
+- Each template's referenced context keys are extracted once (through the
+  partials it includes): only those keys are prepared for rendering
 - Context is prepared to handle None values (converted to empty strings)
+- Outputs are memoized in a small LRU keyed by (template, referenced
+  context): re-rendering the same ticket data (bulk regression runs) is free
 - Supports: {{variable}}, {{> partial}}, {{#if}}, {{#unless}}, {{#each}}
 """
 import logging
+import os
+import pickle
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, FrozenSet, List, Optional, Tuple
 
-from pybars import Compiler
 
 logger = logging.getLogger(__name__)
 
+# Rendered outputs kept in memory (0 disables the output cache)
+PYBARS_RENDER_CACHE_SIZE = int(os.getenv('PYBARS_RENDER_CACHE_SIZE', '256'))
+
+_TAG_RE = re.compile(r'\{\{\{?~?(.*?)~?\}?\}\}', re.DOTALL)
+_STRING_RE = re.compile(r'"[^"]*"|\'[^\']*\'')
+_LITERALS = {'true', 'false', 'null', 'undefined', 'else'}
+_MISSING = object()
+
+
+def _context_key(context: Dict[str, Any]) -> bytes:
+    """
+    Exact key of a template context for the output cache.
+
+    pickle keeps types (1, 1.0 and True render differently) and key order
+    ({{#each}} over a dict), and serializes in C: much cheaper than
+    walking the context in Python.
+
+    Raises:
+        pickle.PicklingError, TypeError, AttributeError: Unpicklable values (not cached)
+    """
+    return pickle.dumps(context, protocol=pickle.HIGHEST_PROTOCOL)
+
 
 class PybarsRenderer:
     """
@@ -29,6 +59,10 @@ class PybarsRenderer:
     template rendering to replace the fragile regex-based implementation.
     """
 
+    # pybars' Compiler keeps its code builder at class level: compilations
+    # must be serialized when the renderer is shared between threads
+    _compile_lock = threading.Lock()
+
     def __init__(self, states_path: Path):
         """
         Initialize the renderer.
@@ -37,47 +71,99 @@ class PybarsRenderer:
             states_path: Path to the states directory containing templates
         """
         self.states_path = states_path
-        self.compiler = Compiler()
+        self._compiler = None
+        # Guards the template/partial caches below (shared between worker threads)
+        self._cache_lock = threading.Lock()
         self._compiled_cache: Dict[int, Callable] = {}
+        # Source brute -> (source nettoyée, fonction de rendu, clés référencées)
+        self._templates: Dict[str, Tuple[str, Callable, Optional[FrozenSet[str]]]] = {}
+        self._partial_refs: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._outputs: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._outputs_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'uncacheable': 0}
+        # Templates précompilés du bundle: hash de la source -> chargeur
+        self._precompiled: Dict[int, Callable[[], Callable]] = {}
         self._partials: Dict[str, Callable] = {}
         self._partial_sources: Dict[str, str] = {}  # For debugging
 
-    def load_all_partials(self) -> int:
+    @property
+    def compiler(self):
+        """pybars Compiler (imported on first compilation: building its grammar takes ~1.5 s)."""
+        if self._compiler is None:
+            from pybars import Compiler
+            self._compiler = Compiler()
+        return self._compiler
+
+    @staticmethod
+    def partial_files(states_path: Path) -> List[Tuple[str, Path]]:
         """
-        Pre-load and compile all partials from the templates directory.
+        List the partial files of a states directory with their partial names.
+
+        Args:
+            states_path: Path to the states directory
 
         Returns:
-            Number of partials loaded successfully
+            List of (partial name, file path)
         """
-        count = 0
+        files = []
 
         # 1. HTML partials (new modular system) - under templates/partials/
-        partials_root = self.states_path / "templates" / "partials"
+        partials_root = states_path / "templates" / "partials"
         if partials_root.exists():
             for partial_file in partials_root.rglob("*.html"):
                 # Create partial name from relative path
                 # e.g., partials/intentions/statut_dossier.html -> partials/intentions/statut_dossier
-                relative = partial_file.relative_to(self.states_path / "templates")
+                relative = partial_file.relative_to(states_path / "templates")
                 partial_name = str(relative.with_suffix('')).replace('\\', '/')
-                if self._register_partial(partial_name, partial_file):
-                    count += 1
+                files.append((partial_name, partial_file))
 
         # 2. MD blocks (legacy system) - under blocks/
-        blocks_path = self.states_path / "blocks"
+        blocks_path = states_path / "blocks"
         if blocks_path.exists():
             for block_file in blocks_path.glob("*.md"):
                 # Block name is just the filename without extension
-                partial_name = block_file.stem
-                if self._register_partial(partial_name, block_file):
-                    count += 1
+                files.append((block_file.stem, block_file))
 
         # 3. HTML templates in base_legacy (for backwards compatibility)
-        base_legacy_path = self.states_path / "templates" / "base_legacy"
+        base_legacy_path = states_path / "templates" / "base_legacy"
         if base_legacy_path.exists():
             for template_file in base_legacy_path.glob("*.html"):
-                partial_name = f"base_legacy/{template_file.stem}"
-                if self._register_partial(partial_name, template_file):
-                    count += 1
+                files.append((f"base_legacy/{template_file.stem}", template_file))
+
+        return files
+
+    def load_all_partials(self) -> int:
+        """
+        Pre-load and compile all partials from the templates directory.
+
+        Partials (and the main templates) come precompiled from the state
+        engine bundle when it is enabled (see bundle.py); otherwise they are
+        compiled here.
+
+        Returns:
+            Number of partials loaded successfully
+        """
+        from .bundle import get_bundle
+
+        # Partials changed: references and outputs must be recomputed
+        with self._cache_lock:
+            self._templates.clear()
+            self._partial_refs.clear()
+        with self._outputs_lock:
+            self._outputs.clear()
+
+        bundle = get_bundle(self.states_path)
+        if bundle is not None:
+            self._partials, self._partial_sources = bundle.partials()
+            for source, loader in bundle.templates().values():
+                self._precompiled[hash(source)] = loader
+            logger.info(f"PybarsRenderer: Loaded {len(self._partials)} partials from bundle {bundle.content_hash[:12]}")
+            return len(self._partials)
+
+        count = 0
+        for partial_name, partial_file in self.partial_files(self.states_path):
+            if self._register_partial(partial_name, partial_file):
+                count += 1
 
         logger.info(f"PybarsRenderer: Loaded {count} partials")
         return count
@@ -101,14 +187,16 @@ class PybarsRenderer:
             self._partial_sources[name] = content
 
             # Compile the partial
-            self._partials[name] = self.compiler.compile(content)
+            with self._compile_lock:
+                self._partials[name] = self.compiler.compile(content)
             return True
 
         except Exception as e:
             logger.warning(f"Failed to compile partial '{name}' from {file_path}: {e}")
             return False
 
-    def _clean_content(self, content: str) -> str:
+    @staticmethod
+    def _clean_content(content: str) -> str:
         """
         Remove comments and normalize content for pybars3.
 
@@ -159,32 +247,150 @@ class PybarsRenderer:
                 result[key] = value
         return result
 
-    def render(self, template_content: str, context: Dict[str, Any]) -> str:
+    def template_refs(self, content: str) -> Optional[FrozenSet[str]]:
         """
-        Render a template with the given context.
+        Top-level context keys referenced by a cleaned template, including
+        through the partials it includes (recursively).
+
+        Over-approximation: names used inside {{#each}}/{{#with}} blocks
+        (item fields) are included too, which only adds unused keys.
 
         Args:
-            template_content: The Handlebars template string
-            context: Data to render into the template
+            content: Cleaned template source
 
         Returns:
-            Rendered template string
+            Set of keys, or None if the template needs the whole context
+            ({{this}} or {{.}}, directly or in a partial)
         """
-        # Clean the template content
-        cleaned = self._clean_content(template_content)
+        return self._collect_refs(content, frozenset())[0]
 
-        # Compile with caching (by content hash)
+    def _collect_refs(self, content: str, visiting: FrozenSet[str]) -> Tuple[Optional[FrozenSet[str]], FrozenSet[str]]:
+        """
+        template_refs, following partials not already being visited.
+
+        Returns:
+            (keys or None, partials of `visiting` that were skipped: the
+            keys are incomplete until those partials are added)
+        """
+        refs = set()
+        skipped = set()
+        for tag in _TAG_RE.findall(content):
+            tag = tag.strip()
+            if not tag or tag[0] == '!':
+                continue
+            partial = tag[0] == '>'
+            tokens = _STRING_RE.sub(' ', tag.lstrip('#^/>&').replace('(', ' ').replace(')', ' ')).split()
+            if partial:
+                if not tokens:
+                    continue
+                partial_refs, partial_skipped = self._refs_of_partial(tokens.pop(0), visiting)
+                if partial_refs is None:
+                    return None, frozenset()
+                refs.update(partial_refs)
+                skipped.update(partial_skipped)
+            for token in tokens:
+                token = token.split('=', 1)[-1]
+                if token in ('this', '.', './'):
+                    return None, frozenset()
+                while token.startswith('../'):
+                    token = token[3:]
+                for prefix in ('@root.', 'this.', './'):
+                    if token.startswith(prefix):
+                        token = token[len(prefix):]
+                if (not token or token in _LITERALS or token[0] == '@'
+                        or token.lstrip('-').replace('.', '', 1).isdigit()):
+                    continue
+                refs.add(re.split(r'[./]', token, 1)[0])
+        return frozenset(refs), frozenset(skipped)
+
+    def _refs_of_partial(self, name: str, visiting: FrozenSet[str]) -> Tuple[Optional[FrozenSet[str]], FrozenSet[str]]:
+        """
+        _collect_refs of a registered partial.
+
+        Only complete results are memoized: a partial reached again through
+        its own includes (recursion) is skipped locally, never published.
+        """
+        cached = self._partial_refs.get(name, _MISSING)
+        if cached is not _MISSING:
+            return cached, frozenset()
+        source = self._partial_sources.get(name)
+        if source is None:
+            # Unknown partial: rendering fails whatever the context
+            return frozenset(), frozenset()
+        if name in visiting:
+            return frozenset(), frozenset({name})
+
+        refs, skipped = self._collect_refs(source, visiting | {name})
+        skipped = skipped - {name}
+        if not skipped:
+            with self._cache_lock:
+                self._partial_refs.setdefault(name, refs)
+        return refs, skipped
+
+    def _template(self, template_content: str) -> Optional[Tuple[str, Callable, Optional[FrozenSet[str]]]]:
+        """Cleaned source, render function and referenced keys of a template (cached)."""
+        entry = self._templates.get(template_content)
+        if entry is not None:
+            return entry
+
+        cleaned = self._clean_content(template_content)
         template_hash = hash(cleaned)
-        if template_hash not in self._compiled_cache:
+        compiled = self._compiled_cache.get(template_hash)
+        if compiled is None:
+            loader = self._precompiled.get(template_hash)
             try:
-                self._compiled_cache[template_hash] = self.compiler.compile(cleaned)
+                if loader is not None:
+                    compiled = loader()
+                else:
+                    with self._compile_lock:
+                        compiled = self.compiler.compile(cleaned)
             except Exception as e:
                 logger.error(f"Failed to compile template: {e}")
                 logger.debug(f"Template content:\n{cleaned[:500]}...")
-                # Return template as-is if compilation fails
-                return template_content
+                return None
+            with self._cache_lock:
+                compiled = self._compiled_cache.setdefault(template_hash, compiled)
+
+        # Everything is computed before publication: readers never see a partial entry
+        entry = (cleaned, compiled, self.template_refs(cleaned))
+        with self._cache_lock:
+            return self._templates.setdefault(template_content, entry)
+
+    def render(self, template_content: str, context: Dict[str, Any]) -> str:
+        """
+        Render a template with the given context.
 
-        template = self._compiled_cache[template_hash]
+        Args:
+            template_content: The Handlebars template string
+            context: Data to render into the template
+
+        Returns:
+            Rendered template string
+        """
+        entry = self._template(template_content)
+        if entry is None:
+            # Return template as-is if compilation fails
+            return template_content
+        cleaned, template, refs = entry
+
+        # Only the referenced part of the context is keyed and prepared
+        if refs is not None and context:
+            context = {key: value for key, value in context.items() if key in refs}
+
+        cache_key = None
+        if PYBARS_RENDER_CACHE_SIZE > 0:
+            try:
+                cache_key = (template, _context_key(context))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                self._stats['uncacheable'] += 1
+            else:
+                with self._outputs_lock:
+                    result = self._outputs.get(cache_key)
+                    if result is not None:
+                        self._outputs.move_to_end(cache_key)
+                        self._stats['hits'] += 1
+                        return result
+                self._stats['misses'] += 1
 
         # Prepare context (handle None values)
         prepared_context = self._prepare_context(context)
@@ -192,13 +398,27 @@ class PybarsRenderer:
         # Render with partials
         try:
             result = template(prepared_context, partials=self._partials)
-            return result
         except Exception as e:
             logger.error(f"Failed to render template: {e}")
             logger.debug(f"Context keys: {list(prepared_context.keys())}")
             # Return cleaned template as fallback
             return cleaned
 
+        if cache_key is not None:
+            with self._outputs_lock:
+                self._outputs[cache_key] = result
+                while len(self._outputs) > PYBARS_RENDER_CACHE_SIZE:
+                    self._outputs.popitem(last=False)
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """Template and output cache statistics."""
+        return {
+            'templates': len(self._templates),
+            'outputs': len(self._outputs),
+            **self._stats,
+        }
+
     def get_partial(self, name: str) -> Optional[str]:
         """
         Get the source of a registered partial (for debugging).
@@ -0,0 +1,309 @@
+"""
+Cas enregistrés du State Engine, rejoués hors ligne.
+
+Un cas contient toutes les entrées nécessaires pour rejouer un ticket sans
+Zoho ni Anthropic:
+- detector_inputs: arguments de StateDetector.detect_all_states
+- detected_states: DetectedStates tels que passés à generate_response_multi
+  (après l'enrichissement du workflow: dates, sessions, cross-département)
+- triage_result
+
+Le rejeu re-détecte les états depuis detector_inputs (replay_detection:
+contrôle des règles) et régénère la réponse depuis detected_states
+(replay_response: contrôle des templates). Les sections IA ne sont pas générées (ai_generator=None): la
+comparaison porte sur la partie déterministe de la réponse.
+
+Les identifiants (mot_de_passe ExamT3P, MDP_EVALBOX du CRM, tokens...) sont
+masqués à la création du cas (redact_credentials): aucun secret en clair
+dans les fichiers enregistrés.
+
+Format: JSON Lines, un cas par ligne. Les contextes partagés entre états
+(le même dict pour tous les états d'un ticket) ne sont écrits qu'une fois.
+
+Enregistrement depuis le workflow:
+- STATE_ENGINE_RECORD_DIR=chemin: chaque ticket traité est ajouté à
+  <chemin>/cases_AAAAMMJJ.jsonl (désactivé par défaut)
+
+Rejeu, comparaison aux sorties de référence et benchmark:
+    python tests/replay_state_engine.py --help
+"""
+import copy
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .state_detector import DetectedState, DetectedStates
+
+logger = logging.getLogger(__name__)
+
+STATE_ENGINE_RECORD_DIR = os.getenv('STATE_ENGINE_RECORD_DIR')
+
+# Incrémenter à chaque changement de structure des cas
+CASE_FORMAT = 1
+
+_STATE_FIELDS = [f.name for f in fields(DetectedState) if f.name not in ('context_data', 'alerts')]
+_record_lock = threading.Lock()
+
+# Clés dont la valeur est un secret (mot_de_passe, MDP_EVALBOX, refresh_token...)
+_CREDENTIAL_KEY = re.compile(
+    r'(?:^|_)(?:mot_de_passe|password|mdp|secret|token|api_key)(?:_evalbox)?$', re.IGNORECASE
+)
+REDACTED = '***'
+
+
+# ----------------------------------------------------------------------
+# Sérialisation
+# ----------------------------------------------------------------------
+
+def _json_default(value: Any) -> Any:
+    """Types non JSON des contextes (dates: restaurées au chargement)."""
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _json_object_hook(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def dump_detected_states(detected_states: DetectedStates) -> Dict[str, Any]:
+    """
+    DetectedStates → dict JSON.
+
+    Les états sont listés une fois (all_states + états hors all_states);
+    blocking/warning/info/primary les référencent par index, les contextes
+    et alertes partagés sont dédupliqués.
+    """
+    states: List[DetectedState] = []
+    contexts: List[Dict[str, Any]] = []
+    alerts: List[List[Dict[str, Any]]] = []
+
+    def index(items: list, item: Any) -> int:
+        for i, existing in enumerate(items):
+            if existing is item:
+                return i
+        items.append(item)
+        return len(items) - 1
+
+    def ref(state: Optional[DetectedState]) -> Optional[int]:
+        return None if state is None else index(states, state)
+
+    refs = {
+        'all_states': [ref(s) for s in detected_states.all_states],
+        'blocking_state': ref(detected_states.blocking_state),
+        'warning_states': [ref(s) for s in detected_states.warning_states],
+        'info_states': [ref(s) for s in detected_states.info_states],
+        'primary_state': ref(detected_states.primary_state),
+    }
+    dumped = []
+    for state in states:
+        entry = {name: getattr(state, name) for name in _STATE_FIELDS}
+        entry['context_data'] = index(contexts, state.context_data)
+        entry['alerts'] = index(alerts, state.alerts)
+        dumped.append(entry)
+
+    return {'states': dumped, 'contexts': contexts, 'alerts': alerts, **refs}
+
+
+def load_detected_states(data: Dict[str, Any]) -> DetectedStates:
+    """
+    dict de dump_detected_states → DetectedStates (contextes partagés comme à l'origine).
+
+    Les données sont copiées: chaque appel retourne des états indépendants
+    (generate_response_multi modifie les contextes).
+    """
+    data = copy.deepcopy(data)
+    states = []
+    for entry in data['states']:
+        entry = dict(entry)
+        entry['context_data'] = data['contexts'][entry['context_data']]
+        entry['alerts'] = data['alerts'][entry['alerts']]
+        states.append(DetectedState(**entry))
+
+    def state(i: Optional[int]) -> Optional[DetectedState]:
+        return None if i is None else states[i]
+
+    return DetectedStates(
+        blocking_state=state(data['blocking_state']),
+        warning_states=[states[i] for i in data['warning_states']],
+        info_states=[states[i] for i in data['info_states']],
+        primary_state=state(data['primary_state']),
+        all_states=[states[i] for i in data['all_states']],
+    )
+
+
+def state_names(detected_states: DetectedStates) -> Dict[str, Any]:
+    """Noms des états par sévérité (comparaison des détections)."""
+    return {
+        'primary': detected_states.primary_state.name if detected_states.primary_state else None,
+        'blocking': detected_states.blocking_state.name if detected_states.blocking_state else None,
+        'warning': [s.name for s in detected_states.warning_states],
+        'info': [s.name for s in detected_states.info_states],
+    }
+
+
+def redact_credentials(value: Any) -> Any:
+    """
+    Copie de value avec les secrets masqués (REDACTED), à toute profondeur.
+
+    Les valeurs vides sont conservées: les règles qui testent la présence
+    d'un identifiant se rejouent à l'identique.
+    """
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if item and isinstance(key, str) and _CREDENTIAL_KEY.search(key)
+            else redact_credentials(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact_credentials(item) for item in value]
+    return value
+
+
+def make_case(
+    ticket_id: str,
+    detector_inputs: Dict[str, Any],
+    detected_states: DetectedStates,
+    triage_result: Dict[str, Any],
+    source: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Cas de rejeu d'un ticket.
+
+    Args:
+        ticket_id: ID du ticket (identifiant du cas, avec source)
+        detector_inputs: kwargs de detect_all_states
+        detected_states: Entrée de generate_response_multi
+        triage_result: Résultat du triage
+        source: Origine du cas (workflow, fichier d'analyse, variante)
+
+    Returns:
+        Cas sérialisable en JSON (json_dumps), identifiants masqués
+    """
+    return redact_credentials({
+        'format': CASE_FORMAT,
+        'case_id': f"{ticket_id}:{source}" if source else str(ticket_id),
+        'ticket_id': ticket_id,
+        'source': source,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'detector_inputs': detector_inputs,
+        'detected_states': dump_detected_states(detected_states),
+        'triage_result': triage_result,
+    })
+
+
+def json_dumps(case: Dict[str, Any]) -> str:
+    return json.dumps(case, ensure_ascii=False, default=_json_default)
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_cases(path: Path, cases: List[Dict[str, Any]]) -> None:
+    """Écrit des cas (JSON Lines, gzip si le chemin finit par .gz)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _open(path, 'w') as f:
+        for case in cases:
+            f.write(json_dumps(case) + '\n')
+
+
+def iter_cases(path: Path) -> Iterator[Dict[str, Any]]:
+    """Cas d'un fichier JSON Lines (lignes illisibles ou d'un autre format ignorées)."""
+    with _open(Path(path), 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                case = json.loads(line, object_hook=_json_object_hook)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Cas illisible {path}:{line_number}: {e}")
+                continue
+            if case.get('format') != CASE_FORMAT:
+                logger.warning(f"Cas d'un autre format ignoré {path}:{line_number}")
+                continue
+            yield case
+
+
+def record_case(
+    ticket_id: str,
+    detector_inputs: Dict[str, Any],
+    detected_states: DetectedStates,
+    triage_result: Dict[str, Any]
+) -> Optional[Path]:
+    """
+    Ajoute le cas du ticket au fichier du jour si STATE_ENGINE_RECORD_DIR est défini.
+
+    À appeler juste avant generate_response_multi (qui modifie le contexte
+    de l'état principal). Une erreur d'enregistrement n'interrompt jamais le
+    workflow.
+
+    Returns:
+        Fichier complété, ou None (désactivé / erreur)
+    """
+    if not STATE_ENGINE_RECORD_DIR:
+        return None
+    path = Path(STATE_ENGINE_RECORD_DIR) / f"cases_{datetime.now():%Y%m%d}.jsonl"
+    try:
+        line = json_dumps(make_case(ticket_id, detector_inputs, detected_states, triage_result, source='workflow'))
+        with _record_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        return path
+    except Exception as e:
+        logger.warning(f"Cas State Engine non enregistré ({ticket_id}): {e}")
+        return None
+
+
+# ----------------------------------------------------------------------
+# Rejeu
+# ----------------------------------------------------------------------
+
+def replay_detection(detector, case: Dict[str, Any]) -> DetectedStates:
+    """Re-détecte les états du cas avec les règles actuelles."""
+    return detector.detect_all_states(**case['detector_inputs'])
+
+
+def replay_response(engine, case: Dict[str, Any], detected_states: Optional[DetectedStates] = None) -> Dict[str, Any]:
+    """
+    Régénère la réponse du cas avec les templates actuels.
+
+    Args:
+        engine: TemplateEngine
+        case: Cas enregistré
+        detected_states: États déjà chargés (load_detected_states); chargés
+            depuis le cas sinon. generate_response_multi les modifie: ne pas
+            les réutiliser pour un second rendu
+
+    Returns:
+        Sortie comparable (texte, template, états et intentions utilisés)
+    """
+    if detected_states is None:
+        detected_states = load_detected_states(case['detected_states'])
+    result = engine.generate_response_multi(detected_states, case['triage_result'], ai_generator=None)
+    return {
+        'response_text': result.get('response_text', ''),
+        'template_used': result.get('template_used'),
+        'states_used': result.get('states_used', []),
+        'intents_handled': result.get('intents_handled', []),
+    }
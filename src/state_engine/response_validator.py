@@ -7,17 +7,34 @@ Ce module valide que les réponses générées respectent:
 3. L'absence de termes interdits (BFS, Evalbox, 20€, etc.)
 4. La cohérence des données (dates proposées = dates réelles, pas inventées)
 5. L'absence d'hallucinations (montants, identifiants, etc.)
+
+Les règles sont compilées une fois par validateur: une seule expression
+pour tous les termes interdits, une seule pour les dates et montants
+(scan()). Chaque réponse est parcourue une fois par ces deux expressions,
+qui retournent tous les éléments trouvés avec leur position. La validation
+tourne sur chaque brouillon et à chaque relance d'humanisation.
 """
 
+import functools
 import logging
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Pattern, Tuple
 from datetime import datetime, date
 
 from .state_detector import DetectedState
 
 logger = logging.getLogger(__name__)
 
+_DIGITS_RE = re.compile(r'\d+')
+_WORD_CHAR_RE = re.compile(r'\w')
+_DATE_DMY_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+_DATE_ISO_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_GREETING_RE = re.compile(r'^(bonjour|cher|chère|madame|monsieur)', re.IGNORECASE)
+_CLOSING_RE = re.compile(r'(cordialement|bien à vous|salutations)', re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r'\{\{[^}]+\}\}')
+
 
 class ValidationError:
     """Représente une erreur de validation."""
@@ -27,12 +44,15 @@ class ValidationError:
         error_type: str,
         message: str,
         severity: str = 'error',  # 'error', 'warning', 'info'
-        location: Optional[str] = None
+        location: Optional[str] = None,
+        position: Optional[int] = None
     ):
         self.error_type = error_type
         self.message = message
         self.severity = severity
         self.location = location
+        # Position (caractère) de l'élément en cause dans la réponse
+        self.position = position
 
     def __repr__(self):
         return f"ValidationError({self.severity}: {self.error_type} - {self.message})"
@@ -60,14 +80,93 @@ class ValidationResult:
     def to_dict(self) -> Dict[str, Any]:
         return {
             'valid': self.valid,
-            'errors': [{'type': e.error_type, 'message': e.message, 'location': e.location}
+            'errors': [{'type': e.error_type, 'message': e.message, 'location': e.location,
+                        'position': e.position}
                        for e in self.errors],
-            'warnings': [{'type': w.error_type, 'message': w.message, 'location': w.location}
+            'warnings': [{'type': w.error_type, 'message': w.message, 'location': w.location,
+                          'position': w.position}
                          for w in self.warnings],
             'checks_passed': self.checks_passed
         }
 
 
+@dataclass
+class Finding:
+    """Élément relevé par ResponseValidator.scan()."""
+    # 'forbidden_term', 'date' ou 'amount'
+    kind: str
+    # Texte trouvé (terme interdit: le terme tel que configuré)
+    text: str
+    # Position dans la réponse
+    start: int
+    # Index du terme (forbidden_terms) ou du pattern (DATE_PATTERNS / AMOUNT_PATTERNS)
+    index: int
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_terms(terms: Tuple[str, ...]) -> Tuple[Optional[Pattern], Dict[str, List[int]], List[Tuple[int, Pattern]]]:
+    """
+    Compile les termes interdits (mot entier, insensible à la casse).
+
+    Une alternative unique dans une assertion avant: toutes les occurrences
+    sont trouvées en une passe, même si elles se chevauchent. Un terme qui
+    commence un autre terme et s'y termine sur une limite de mot ('cours du'
+    / 'cours du soir') serait masqué par celui-ci à la même position: il est
+    cherché séparément ('deal' / 'deal_id' ne se masquent pas: pas de limite
+    de mot entre 'l' et '_').
+
+    Returns:
+        (expression combinée, {terme en minuscules: index}, [(index, expression)] des termes contenus)
+    """
+    lowered = [term.lower() for term in terms]
+    indexes: Dict[str, List[int]] = {}
+    nested = []
+    def masked(term: str, other: str) -> bool:
+        if other == term or not other.startswith(term):
+            return False
+        return (_WORD_CHAR_RE.match(term[-1]) is None) != (_WORD_CHAR_RE.match(other[len(term)]) is None)
+
+    for i, term in enumerate(lowered):
+        if not term or any(masked(term, other) for other in lowered):
+            nested.append((i, re.compile(r'\b' + re.escape(term) + r'\b')))
+        else:
+            indexes.setdefault(term, []).append(i)
+    combined = None
+    if indexes:
+        # Préfiltre sur la première lettre: évite d'essayer l'alternative à chaque position
+        first_chars = ''.join(sorted({re.escape(term[0]) for term in indexes}))
+        alternatives = '|'.join(re.escape(term) for term in sorted(indexes, key=len, reverse=True))
+        combined = re.compile(r'(?=[' + first_chars + r'])(?=\b(' + alternatives + r')\b)')
+    return combined, indexes, nested
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_tokens(patterns: Tuple[str, ...], token_start: str) -> Tuple[Pattern, List[Pattern]]:
+    """
+    Compile les patterns de dates et montants en un seul tokenizer.
+
+    Chaque pattern est un groupe nommé d'une alternative placée dans une
+    assertion avant: un seul parcours trouve les débuts de tous les
+    éléments, y compris ceux qui se chevauchent (date suivie de '€').
+
+    Args:
+        patterns: DATE_PATTERNS + AMOUNT_PATTERNS
+        token_start: Classe des caractères par lesquels ils commencent (préfiltre)
+
+    Returns:
+        (tokenizer, patterns compilés séparément)
+    """
+    alternatives = '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(patterns))
+    tokenizer = re.compile(r'(?=' + token_start + r')(?=' + alternatives + r')', re.IGNORECASE)
+    return tokenizer, [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+
+@functools.lru_cache(maxsize=256)
+def _block_regex(patterns: Tuple[str, ...]) -> Pattern:
+    """Une expression pour "au moins un des patterns" (détection d'un bloc)."""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
 class ResponseValidator:
     """
     Valide les réponses générées pour éviter les hallucinations et erreurs.
@@ -114,6 +213,55 @@ class ResponseValidator:
         r'€\s*\d+',
     ]
 
+    # Premier caractère possible d'une date ou d'un montant (préfiltre du scan)
+    TOKEN_START = r'[\d€]'
+
+    # Mapping bloc obligatoire → patterns de détection (un seul suffit)
+    REQUIRED_BLOCK_PATTERNS = {
+        'salutation': [r'bonjour', r'cher', r'chère', r'madame', r'monsieur'],
+        'signature': [r'cordialement', r'l\'équipe', r'cab formations', r'bien à vous'],
+        'identifiants_examt3p': [r'identifiant', r'mot de passe', r'intras\.fr'],
+        'warning_spam': [r'spam', r'indésirable', r'courrier'],
+        'dates_proposees': [r'\d{2}/\d{2}/\d{4}', r'date.*examen', r'📅'],
+        'call_to_action': [r'merci de', r'veuillez', r'n\'hésitez pas', r'contactez'],
+        'lien_plateforme': [r'intras\.fr', r'https://'],
+        'confirmation_choix': [r'enregistré', r'confirmé', r'validé'],
+        # Blocs pour credentials_invalid
+        'explication_probleme_identifiants': [
+            r'identifiants de connexion',
+            r'plateforme examt3p',
+            r'avons besoin de vos identifiants',
+        ],
+        'instructions_recuperation': [
+            r'retrouver vos identifiants',
+            r'recherchez dans votre bo[îi]te mail',
+            r'noreply@intras\.fr',
+        ],
+        # Blocs pour credentials_refused_security
+        'comprendre_besoin_identifiants': [
+            r'pourquoi.*besoin.*identifiants',
+            r'chambre des m[ée]tiers',
+            r'cma',
+            r'paiement des frais',
+            r'en votre nom',
+        ],
+        'alternative_autonomie': [
+            r'vous pr[ée]f[ée]rez.*vous-m[êe]me',
+            r'c\'est tout [àa] fait possible',
+            r'voici la proc[ée]dure',
+            r'241.*€',
+        ],
+    }
+
+    # Mapping bloc interdit → patterns de détection
+    FORBIDDEN_BLOCK_PATTERNS = {
+        'dates_examen': [r'date.*examen', r'examen.*\d{2}/\d{2}', r'📅.*\d{2}/\d{2}'],
+        'sessions_formation': [r'cours du jour', r'cours du soir', r'session.*formation'],
+        'identifiants': [r'identifiant.*:', r'mot de passe.*:'],
+        'confirmation_inscription': [r'inscription.*confirmée', r'bien inscrit'],
+        'dates_proposees': [r'prochaines dates', r'dates disponibles'],
+    }
+
     def __init__(self, forbidden_terms: Optional[List[str]] = None):
         """
         Initialise le validateur.
@@ -124,6 +272,9 @@ class ResponseValidator:
         self.forbidden_terms = self.FORBIDDEN_TERMS.copy()
         if forbidden_terms:
             self.forbidden_terms.extend(forbidden_terms)
+        # Compilation des règles (partagée entre validateurs de mêmes règles)
+        _compile_terms(tuple(self.forbidden_terms))
+        _compile_tokens(tuple(self.DATE_PATTERNS) + tuple(self.AMOUNT_PATTERNS), self.TOKEN_START)
 
     def validate(
         self,
@@ -147,9 +298,13 @@ class ResponseValidator:
             ValidationResult avec erreurs et warnings
         """
         result = ValidationResult()
+        response_lower = response_text.lower()
+
+        # Termes interdits, dates et montants relevés en un seul parcours
+        findings = self._scan(response_text, response_lower)
 
         # 1. Vérifier les termes interdits
-        self._check_forbidden_terms(response_text, result)
+        self._check_forbidden_terms(response_text, response_lower, findings, result)
 
         # 2. Vérifier les blocs obligatoires
         # IMPORTANT: Si le template utilisé est différent du template par défaut de l'état,
@@ -160,16 +315,16 @@ class ResponseValidator:
             self._check_required_blocks(response_text, state, result)
 
         # 3. Vérifier les blocs interdits
-        self._check_forbidden_blocks(response_text, state, result)
+        self._check_forbidden_blocks(response_text, response_lower, state, result)
 
         # 4. Vérifier les dates (pas d'hallucination)
-        self._check_dates(response_text, proposed_dates, state, result)
+        self._check_dates(response_text, response_lower, findings, proposed_dates, state, result)
 
         # 5. Vérifier les identifiants
-        self._check_identifiants(response_text, state, result)
+        self._check_identifiants(response_text, response_lower, state, result)
 
         # 6. Vérifier les montants
-        self._check_amounts(response_text, allowed_amounts, result)
+        self._check_amounts(response_text, response_lower, findings, allowed_amounts, result)
 
         # 7. Vérifier le format et la structure
         self._check_format(response_text, result)
@@ -179,20 +334,80 @@ class ResponseValidator:
 
         return result
 
-    def _check_forbidden_terms(self, response: str, result: ValidationResult):
-        """Vérifie l'absence de termes interdits."""
-        response_lower = response.lower()
+    def scan(self, response_text: str) -> List[Finding]:
+        """
+        Relève les termes interdits, dates et montants d'une réponse.
 
-        for term in self.forbidden_terms:
-            # Recherche insensible à la casse mais mot entier
-            pattern = r'\b' + re.escape(term.lower()) + r'\b'
-            if re.search(pattern, response_lower):
-                result.add_error(ValidationError(
-                    'forbidden_term',
-                    f"Terme interdit trouvé: '{term}'",
-                    severity='error',
-                    location=self._find_location(response, term)
-                ))
+        Args:
+            response_text: Texte à analyser
+
+        Returns:
+            Éléments trouvés, par position (un terme interdit: première occurrence)
+        """
+        return sorted(self._scan(response_text, response_text.lower()), key=lambda f: f.start)
+
+    def _scan(self, response: str, response_lower: str) -> List[Finding]:
+        """Un parcours par expression compilée: termes interdits, puis dates et montants."""
+        findings = []
+
+        combined, term_indexes, nested_terms = _compile_terms(tuple(self.forbidden_terms))
+        if combined is not None:
+            first_seen: Dict[str, int] = {}
+            for match in combined.finditer(response_lower):
+                first_seen.setdefault(match.group(1), match.start())
+            for term, start in first_seen.items():
+                for i in term_indexes[term]:
+                    findings.append(Finding('forbidden_term', self.forbidden_terms[i], start, i))
+        for i, regex in nested_terms:
+            match = regex.search(response_lower)
+            if match:
+                findings.append(Finding('forbidden_term', self.forbidden_terms[i], match.start(), i))
+
+        patterns = tuple(self.DATE_PATTERNS) + tuple(self.AMOUNT_PATTERNS)
+        tokenizer, compiled = _compile_tokens(patterns, self.TOKEN_START)
+        date_count = len(self.DATE_PATTERNS)
+        # Comme un re.findall par pattern: un élément d'un pattern ne commence
+        # pas avant la fin de l'élément précédent du même pattern
+        next_start = [0] * len(patterns)
+        for match in tokenizer.finditer(response):
+            position = match.start()
+            first = int(match.lastgroup[1:])
+            for i in range(first, len(patterns)):
+                if position < next_start[i]:
+                    continue
+                if i == first:
+                    end = match.end(match.lastgroup)
+                else:
+                    # Un autre pattern peut commencer au même endroit
+                    other = compiled[i].match(response, position)
+                    if other is None:
+                        continue
+                    end = other.end()
+                next_start[i] = end
+                if i < date_count:
+                    findings.append(Finding('date', response[position:end], position, i))
+                else:
+                    findings.append(Finding('amount', response[position:end], position, i - date_count))
+
+        return findings
+
+    def _check_forbidden_terms(
+        self,
+        response: str,
+        response_lower: str,
+        findings: List[Finding],
+        result: ValidationResult
+    ):
+        """Vérifie l'absence de termes interdits (mot entier, insensible à la casse)."""
+        terms = sorted((f for f in findings if f.kind == 'forbidden_term'), key=lambda f: f.index)
+        for finding in terms:
+            result.add_error(ValidationError(
+                'forbidden_term',
+                f"Terme interdit trouvé: '{finding.text}'",
+                severity='error',
+                location=self._find_location(response, finding.text, response_lower),
+                position=finding.start
+            ))
 
         if not any(e.error_type == 'forbidden_term' for e in result.errors):
             result.add_passed('forbidden_terms')
@@ -207,49 +422,9 @@ class ResponseValidator:
         response_config = state.response_config
         required_blocks = response_config.get('blocks_required', [])
 
-        # Mapping bloc → patterns de détection
-        block_patterns = {
-            'salutation': [r'bonjour', r'cher', r'chère', r'madame', r'monsieur'],
-            'signature': [r'cordialement', r'l\'équipe', r'cab formations', r'bien à vous'],
-            'identifiants_examt3p': [r'identifiant', r'mot de passe', r'intras\.fr'],
-            'warning_spam': [r'spam', r'indésirable', r'courrier'],
-            'dates_proposees': [r'\d{2}/\d{2}/\d{4}', r'date.*examen', r'📅'],
-            'call_to_action': [r'merci de', r'veuillez', r'n\'hésitez pas', r'contactez'],
-            'lien_plateforme': [r'intras\.fr', r'https://'],
-            'confirmation_choix': [r'enregistré', r'confirmé', r'validé'],
-            # Blocs pour credentials_invalid
-            'explication_probleme_identifiants': [
-                r'identifiants de connexion',
-                r'plateforme examt3p',
-                r'avons besoin de vos identifiants',
-            ],
-            'instructions_recuperation': [
-                r'retrouver vos identifiants',
-                r'recherchez dans votre bo[îi]te mail',
-                r'noreply@intras\.fr',
-            ],
-            # Blocs pour credentials_refused_security
-            'comprendre_besoin_identifiants': [
-                r'pourquoi.*besoin.*identifiants',
-                r'chambre des m[ée]tiers',
-                r'cma',
-                r'paiement des frais',
-                r'en votre nom',
-            ],
-            'alternative_autonomie': [
-                r'vous pr[ée]f[ée]rez.*vous-m[êe]me',
-                r'c\'est tout [àa] fait possible',
-                r'voici la proc[ée]dure',
-                r'241.*€',
-            ],
-        }
-
         for block in required_blocks:
-            patterns = block_patterns.get(block, [block.lower()])
-            found = any(
-                re.search(pattern, response, re.IGNORECASE)
-                for pattern in patterns
-            )
+            patterns = self.REQUIRED_BLOCK_PATTERNS.get(block, [block.lower()])
+            found = _block_regex(tuple(patterns)).search(response)
 
             if not found:
                 result.add_error(ValidationError(
@@ -264,6 +439,7 @@ class ResponseValidator:
     def _check_forbidden_blocks(
         self,
         response: str,
+        response_lower: str,
         state: DetectedState,
         result: ValidationResult
     ):
@@ -271,24 +447,17 @@ class ResponseValidator:
         response_config = state.response_config
         forbidden_blocks = response_config.get('blocks_forbidden', [])
 
-        # Mapping bloc → patterns de détection
-        block_patterns = {
-            'dates_examen': [r'date.*examen', r'examen.*\d{2}/\d{2}', r'📅.*\d{2}/\d{2}'],
-            'sessions_formation': [r'cours du jour', r'cours du soir', r'session.*formation'],
-            'identifiants': [r'identifiant.*:', r'mot de passe.*:'],
-            'confirmation_inscription': [r'inscription.*confirmée', r'bien inscrit'],
-            'dates_proposees': [r'prochaines dates', r'dates disponibles'],
-        }
-
         for block in forbidden_blocks:
-            patterns = block_patterns.get(block, [block.lower()])
+            patterns = self.FORBIDDEN_BLOCK_PATTERNS.get(block, [block.lower()])
             for pattern in patterns:
-                if re.search(pattern, response, re.IGNORECASE):
+                match = _block_regex((pattern,)).search(response)
+                if match:
                     result.add_error(ValidationError(
                         'forbidden_block',
                         f"Bloc interdit présent: '{block}'",
                         severity='error',
-                        location=self._find_location(response, pattern)
+                        location=self._find_location(response, pattern, response_lower),
+                        position=match.start()
                     ))
                     break
 
@@ -298,15 +467,18 @@ class ResponseValidator:
     def _check_dates(
         self,
         response: str,
+        response_lower: str,
+        findings: List[Finding],
         proposed_dates: Optional[List[Dict]],
         state: DetectedState,
         result: ValidationResult
     ):
         """Vérifie que les dates mentionnées sont réelles (pas inventées)."""
-        # Extraire toutes les dates de la réponse
-        dates_found = []
-        for pattern in self.DATE_PATTERNS:
-            dates_found.extend(re.findall(pattern, response, re.IGNORECASE))
+        # Dates de la réponse, pattern par pattern (ordre des DATE_PATTERNS)
+        dates_found = [
+            (finding, *self._date_token(finding.text))
+            for finding in sorted((f for f in findings if f.kind == 'date'), key=lambda f: (f.index, f.start))
+        ]
 
         if not dates_found:
             result.add_passed('dates_coherence')
@@ -329,53 +501,58 @@ class ResponseValidator:
                         pass
 
             # Vérifier chaque date trouvée
-            for date_found in dates_found:
-                normalized = self._normalize_date(date_found)
+            context_dates = None
+            for finding, normalized, _ in dates_found:
                 if normalized and normalized not in valid_dates:
                     # Vérifier si c'est une date du contexte (date examen assignée, etc.)
-                    context = state.context_data
-                    context_dates = {
-                        context.get('date_examen'),
-                        context.get('date_cloture'),
-                    }
-                    context_dates = {d for d in context_dates if d}
-                    # Ajouter les formats alternatifs
-                    for d in list(context_dates):
-                        try:
-                            dt = datetime.strptime(d[:10], '%Y-%m-%d')
-                            context_dates.add(dt.strftime('%d/%m/%Y'))
-                        except Exception as e:
-                            pass
+                    if context_dates is None:
+                        context_dates = self._context_dates(state)
 
                     if normalized not in context_dates:
                         result.add_error(ValidationError(
                             'invented_date',
-                            f"Date potentiellement inventée: '{date_found}'",
+                            f"Date potentiellement inventée: '{finding.text}'",
                             severity='warning',  # Warning car peut être une date valide non listée
-                            location=self._find_location(response, date_found)
+                            location=self._find_location(response, finding.text, response_lower),
+                            position=finding.start
                         ))
 
         # Vérifier que les dates ne sont pas dans le passé (sauf contexte spécifique)
         today = date.today()
-        for date_found in dates_found:
-            try:
-                dt = self._parse_date(date_found)
-                if dt and dt < today:
-                    # C'est peut-être une date passée mentionnée volontairement
-                    result.add_error(ValidationError(
-                        'past_date',
-                        f"Date passée mentionnée: '{date_found}'",
-                        severity='warning'
-                    ))
-            except Exception as e:
-                pass
+        for finding, _, dt in dates_found:
+            if dt and dt < today:
+                # C'est peut-être une date passée mentionnée volontairement
+                result.add_error(ValidationError(
+                    'past_date',
+                    f"Date passée mentionnée: '{finding.text}'",
+                    severity='warning',
+                    position=finding.start
+                ))
 
         if not any(e.error_type in ['invented_date', 'past_date'] for e in result.errors):
             result.add_passed('dates_coherence')
 
+    def _context_dates(self, state: DetectedState) -> set:
+        """Dates du contexte de l'état (date examen, clôture), aux formats YYYY-MM-DD et DD/MM/YYYY."""
+        context = state.context_data
+        context_dates = {
+            context.get('date_examen'),
+            context.get('date_cloture'),
+        }
+        context_dates = {d for d in context_dates if d}
+        # Ajouter les formats alternatifs
+        for d in list(context_dates):
+            try:
+                dt = datetime.strptime(d[:10], '%Y-%m-%d')
+                context_dates.add(dt.strftime('%d/%m/%Y'))
+            except Exception as e:
+                pass
+        return context_dates
+
     def _check_identifiants(
         self,
         response: str,
+        response_lower: str,
         state: DetectedState,
         result: ValidationResult
     ):
@@ -383,18 +560,15 @@ class ResponseValidator:
         examt3p_data = state.context_data.get('examt3p_data', {})
 
         # Si la réponse contient des identifiants, ils doivent correspondre au CRM
-        if 'identifiant' in response.lower() and ':' in response:
+        if 'identifiant' in response_lower and ':' in response:
             real_identifiant = examt3p_data.get('identifiant', '')
 
             if real_identifiant:
                 # Vérifier que l'identifiant réel est présent
-                if real_identifiant.lower() not in response.lower():
+                if real_identifiant.lower() not in response_lower:
                     # Chercher des emails qui ne correspondent pas
-                    emails_found = re.findall(
-                        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-                        response
-                    )
-                    for email in emails_found:
+                    for match in _EMAIL_RE.finditer(response):
+                        email = match.group()
                         if email.lower() != real_identifiant.lower():
                             # Vérifier si c'est l'email du candidat (peut être différent)
                             candidate_email = state.context_data.get('deal_data', {}).get('Email') or ''
@@ -402,7 +576,8 @@ class ResponseValidator:
                                 result.add_error(ValidationError(
                                     'wrong_identifiant',
                                     f"Identifiant possiblement incorrect: '{email}'",
-                                    severity='warning'
+                                    severity='warning',
+                                    position=match.start()
                                 ))
 
         result.add_passed('identifiants_check')
@@ -410,6 +585,8 @@ class ResponseValidator:
     def _check_amounts(
         self,
         response: str,
+        response_lower: str,
+        findings: List[Finding],
         allowed_amounts: Optional[List[int]],
         result: ValidationResult
     ):
@@ -419,28 +596,28 @@ class ResponseValidator:
         if allowed_amounts:
             default_allowed.extend(allowed_amounts)
 
-        # Extraire les montants de la réponse
-        for pattern in self.AMOUNT_PATTERNS:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            for match in matches:
-                # Extraire le nombre
-                amount = int(re.search(r'\d+', match).group())
+        # Montants de la réponse, pattern par pattern (ordre des AMOUNT_PATTERNS)
+        for finding in sorted((f for f in findings if f.kind == 'amount'), key=lambda f: (f.index, f.start)):
+            # Extraire le nombre
+            amount = int(_DIGITS_RE.search(finding.text).group())
 
-                # 20€ est interdit sauf si explicitement autorisé (ex: DEMANDE_ANNULATION)
-                if amount == 20 and 20 not in default_allowed:
-                    result.add_error(ValidationError(
-                        'forbidden_amount',
-                        "Montant 20€ interdit (ne pas mentionner le prix de l'offre)",
-                        severity='error',
-                        location=self._find_location(response, match)
-                    ))
-                elif amount not in default_allowed and amount > 10:
-                    # Montants inhabituels = warning
-                    result.add_error(ValidationError(
-                        'unusual_amount',
-                        f"Montant inhabituel: {amount}€",
-                        severity='warning'
-                    ))
+            # 20€ est interdit sauf si explicitement autorisé (ex: DEMANDE_ANNULATION)
+            if amount == 20 and 20 not in default_allowed:
+                result.add_error(ValidationError(
+                    'forbidden_amount',
+                    "Montant 20€ interdit (ne pas mentionner le prix de l'offre)",
+                    severity='error',
+                    location=self._find_location(response, finding.text, response_lower),
+                    position=finding.start
+                ))
+            elif amount not in default_allowed and amount > 10:
+                # Montants inhabituels = warning
+                result.add_error(ValidationError(
+                    'unusual_amount',
+                    f"Montant inhabituel: {amount}€",
+                    severity='warning',
+                    position=finding.start
+                ))
 
         if not any(e.error_type in ['forbidden_amount', 'unusual_amount'] for e in result.errors):
             result.add_passed('amounts_check')
@@ -463,7 +640,7 @@ class ResponseValidator:
             ))
 
         # Commence par une salutation
-        if not re.match(r'^(bonjour|cher|chère|madame|monsieur)', response, re.IGNORECASE):
+        if not _GREETING_RE.match(response):
             result.add_error(ValidationError(
                 'missing_greeting',
                 "La réponse ne commence pas par une salutation",
@@ -471,7 +648,7 @@ class ResponseValidator:
             ))
 
         # Se termine par une formule de politesse
-        if not re.search(r'(cordialement|bien à vous|salutations)', response[-200:], re.IGNORECASE):
+        if not _CLOSING_RE.search(response[-200:]):
             result.add_error(ValidationError(
                 'missing_closing',
                 "La réponse ne se termine pas par une formule de politesse",
@@ -479,7 +656,7 @@ class ResponseValidator:
             ))
 
         # Pas de placeholders non résolus
-        unresolved = re.findall(r'\{\{[^}]+\}\}', response)
+        unresolved = _PLACEHOLDER_RE.findall(response)
         if unresolved:
             result.add_error(ValidationError(
                 'unresolved_placeholder',
@@ -544,9 +721,11 @@ class ResponseValidator:
 
         return False
 
-    def _find_location(self, text: str, search: str) -> str:
-        """Trouve la position approximative d'un texte."""
-        idx = text.lower().find(search.lower())
+    def _find_location(self, text: str, search: str, text_lower: Optional[str] = None) -> str:
+        """Trouve la position approximative d'un texte (text_lower: text.lower() déjà calculé)."""
+        if text_lower is None:
+            text_lower = text.lower()
+        idx = text_lower.find(search.lower())
         if idx == -1:
             return ""
 
@@ -581,3 +760,34 @@ class ResponseValidator:
         if normalized:
             return datetime.strptime(normalized, '%Y-%m-%d').date()
         return None
+
+    def _date_token(self, date_str: str) -> Tuple[Optional[str], Optional[date]]:
+        """
+        (date normalisée YYYY-MM-DD, date) d'une date trouvée par scan().
+
+        Le format est connu par la forme du texte: pas d'essais successifs de
+        strptime. Mêmes résultats que _normalize_date / _parse_date, utilisées
+        pour les cas limites (chiffres non ASCII, années < 1000).
+        """
+        if date_str.isascii():
+            match = _DATE_DMY_RE.fullmatch(date_str)
+            if match:
+                day, month, year = match.groups()
+            else:
+                match = _DATE_ISO_RE.fullmatch(date_str)
+                if not match:
+                    return None, None  # Date en toutes lettres: non comparée
+                year, month, day = match.groups()
+            if year >= '1000':
+                try:
+                    dt = date(int(year), int(month), int(day))
+                except ValueError:
+                    return None, None
+                return dt.strftime('%Y-%m-%d'), dt
+
+        normalized = self._normalize_date(date_str)
+        try:
+            dt = self._parse_date(date_str)
+        except Exception:
+            dt = None
+        return normalized, dt
@@ -0,0 +1,89 @@
+"""
+Composants partagés du State Engine (un exemplaire par process).
+
+StateDetector, TemplateEngine et ResponseValidator ne portent aucun état
+propre à un ticket: uniquement la configuration YAML parsée
+(candidate_states.yaml, state_intention_matrix.yaml), les partials pybars
+compilés et des caches de templates. Les reconstruire pour chaque
+DOCTicketWorkflow reparse les YAML et recompile tous les partials.
+
+Ces accesseurs construisent chaque composant une seule fois (thread-safe)
+et le partagent entre tous les workflows du process.
+
+Rechargement à chaud: au plus toutes les STATE_ENGINE_RELOAD_SECONDS, les
+sources de states/ sont comparées au bundle chargé (bundle.py); si un
+YAML ou un template a changé, les composants sont reconstruits depuis le
+nouveau bundle au prochain accès (sans redémarrer le process). Les
+utilisateurs de longue durée (DOCTicketWorkflow réutilisé par le pool ou le
+mode continu) doivent donc rappeler get_*() à chaque usage plutôt que de
+garder le composant.
+
+Usage:
+    from src.state_engine.shared import get_state_detector, get_template_engine
+
+    detector = get_state_detector()
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from . import bundle as state_bundle
+from .state_detector import StateDetector
+from .template_engine import STATES_PATH, TemplateEngine
+from .response_validator import ResponseValidator
+
+logger = logging.getLogger(__name__)
+
+_components: Dict[str, Any] = {}
+_components_lock = threading.Lock()
+_last_reload_check = 0.0
+
+
+def _reload_if_changed() -> None:
+    """Oublie les composants si les sources du State Engine ont changé (appelé sous verrou)."""
+    global _last_reload_check
+    if not _components or not state_bundle.STATE_ENGINE_BUNDLE or state_bundle.STATE_ENGINE_RELOAD_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    if now - _last_reload_check < state_bundle.STATE_ENGINE_RELOAD_SECONDS:
+        return
+    _last_reload_check = now
+
+    current = state_bundle.get_bundle(STATES_PATH)
+    built_from = _components.get("_bundle")
+    if current is not None and built_from is not None and current is not built_from:
+        logger.info(f"State Engine: sources modifiées → rechargement (bundle {current.content_hash[:12]})")
+        _components.clear()
+
+
+def _get_component(name: str, factory: Callable[[], Any]) -> Any:
+    with _components_lock:
+        _reload_if_changed()
+        if not _components and state_bundle.STATE_ENGINE_BUNDLE:
+            _components["_bundle"] = state_bundle.get_bundle(STATES_PATH)
+        if name not in _components:
+            _components[name] = factory()
+            logger.debug(f"State Engine: composant partagé {name} construit")
+        return _components[name]
+
+
+def get_state_detector() -> StateDetector:
+    """StateDetector partagé (candidate_states.yaml parsé une fois)."""
+    return _get_component("state_detector", StateDetector)
+
+
+def get_template_engine() -> TemplateEngine:
+    """TemplateEngine partagé (matrice parsée et partials compilés une fois)."""
+    return _get_component("template_engine", TemplateEngine)
+
+
+def get_response_validator() -> ResponseValidator:
+    """ResponseValidator partagé."""
+    return _get_component("response_validator", ResponseValidator)
+
+
+def reset_shared_components() -> None:
+    """Oublie les composants construits (rechargement de la config, tests)."""
+    with _components_lock:
+        _components.clear()
@@ -21,6 +21,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 
 from src.utils.training_exam_consistency_helper import detect_session_assignment_error
+from .state_rules import StateRules, compile_condition
 
 logger = logging.getLogger(__name__)
 
@@ -98,11 +99,19 @@ class StateDetector:
             self.states.items(),
             key=lambda x: x[1].get('priority', 999)
         )
+        # Conditions compilées une fois + table de décision (voir state_rules.py)
+        self.rules = StateRules(self, self._sorted_states)
 
         logger.info(f"StateDetector initialisé avec {len(self.states)} états")
 
     def _load_config(self) -> Dict[str, Any]:
-        """Charge la configuration YAML."""
+        """Charge la configuration YAML (déjà parsée dans le bundle si disponible)."""
+        from .bundle import STATES_CONFIG_FILE, get_bundle
+
+        if self.config_path.name == STATES_CONFIG_FILE:
+            bundle = get_bundle(self.config_path.parent)
+            if bundle is not None:
+                return bundle.states_config
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 return yaml.safe_load(f)
@@ -189,25 +198,25 @@ class StateDetector:
         info_states = []
         all_states = []
 
-        for state_name, state_config in self._sorted_states:
-            if self._matches_state(state_name, state_config, context):
-                state = self._create_detected_state(
-                    state_name, state_config, context, alerts
-                )
-                severity = state_config.get('severity', 'INFO')
-                all_states.append(state)
-
-                if severity == 'BLOCKING':
-                    if not blocking_state:  # Premier BLOCKING uniquement
-                        blocking_state = state
-                        logger.info(f"🚫 État BLOCKING détecté: {state_name} (priorité {state_config.get('priority')})")
-                        break  # Les BLOCKING stoppent la collecte
-                elif severity == 'WARNING':
-                    warning_states.append(state)
-                    logger.info(f"⚠️ État WARNING détecté: {state_name}")
-                else:  # INFO
-                    info_states.append(state)
-                    logger.info(f"ℹ️ État INFO détecté: {state_name}")
+        for rule in self.rules.matching(context):
+            state_name, state_config = rule.name, rule.config
+            state = self._create_detected_state(
+                state_name, state_config, context, alerts
+            )
+            severity = state_config.get('severity', 'INFO')
+            all_states.append(state)
+
+            if severity == 'BLOCKING':
+                if not blocking_state:  # Premier BLOCKING uniquement
+                    blocking_state = state
+                    logger.info(f"🚫 État BLOCKING détecté: {state_name} (priorité {state_config.get('priority')})")
+                    break  # Les BLOCKING stoppent la collecte
+            elif severity == 'WARNING':
+                warning_states.append(state)
+                logger.info(f"⚠️ État WARNING détecté: {state_name}")
+            else:  # INFO
+                info_states.append(state)
+                logger.info(f"ℹ️ État INFO détecté: {state_name}")
 
         # Si aucun état, utiliser GENERAL
         if not blocking_state and not info_states:
@@ -1025,37 +1034,8 @@ class StateDetector:
         return len(all_of) > 0
 
     def _evaluate_condition(self, condition: str, context: Dict) -> bool:
-        """Évalue une condition simple."""
-        # Parser la condition (format: "field == value" ou "field NOT IN [...]")
-        if '==' in condition:
-            parts = condition.split('==')
-            field = parts[0].strip()
-            value = parts[1].strip()
-
-            # Évaluer
-            actual = context.get(field)
-
-            if value == 'null' or value == 'None':
-                return actual is None
-            elif value == 'true' or value == 'True':
-                return actual == True
-            elif value == 'false' or value == 'False':
-                return actual == False
-            elif value.isdigit():
-                return actual == int(value)
-            else:
-                return str(actual) == value.strip("'\"")
-
-        if 'NOT IN' in condition:
-            parts = condition.split('NOT IN')
-            field = parts[0].strip()
-            values_str = parts[1].strip()
-            # Parser la liste
-            values = [v.strip().strip("'\"") for v in values_str.strip('[]').split(',')]
-            actual = context.get(field)
-            return actual not in values
-
-        return False
+        """Évalue une condition simple ("field == value" ou "field NOT IN [...]")."""
+        return compile_condition(condition)(context)
 
     def _create_detected_state(
         self,
@@ -0,0 +1,261 @@
+"""
+Règles de détection d'état compilées (candidate_states.yaml).
+
+StateDetector.detect_all_states parcourait les 41 états à chaque ticket:
+chaque _match_*_state re-découpait sa condition ("detected_intent == 'X'",
+"case == 3", "field NOT IN [...]"), et les cas Uber / date examen étaient
+recalculés pour chacun des 16 états qui les testent.
+
+Ici les conditions sont compilées une fois au chargement:
+- Table de décision indexée par valeur du contexte: triage_action,
+  intention (primaire + secondaires), cas Uber, cas date examen. Seuls les
+  états de la clé du ticket sont candidats (au plus quelques-uns)
+- États gardés par un champ du contexte (has_duplicate_uber_offer,
+  duplicate_payment_alert, ...): évalués seulement si le champ est vrai
+- Conditions "workflow" (all_of) compilées en prédicats
+- États spécifiques (CREDENTIALS_INVALID, cohérence, session, ...):
+  méthode _match_*_state liée une fois, évaluée seulement si le champ
+  dont elle dépend est renseigné
+
+Les candidats sont parcourus dans l'ordre de priorité d'origine: le
+résultat est identique à l'évaluation état par état (vérifié par
+tests/test_state_rules.py et tests/benchmark_state_detection.py).
+"""
+import functools
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _always(context: Dict[str, Any]) -> bool:
+    return True
+
+
+def _literal(value: str) -> str:
+    return value.strip().strip("'\"")
+
+
+@functools.lru_cache(maxsize=512)
+def compile_condition(condition: str) -> Predicate:
+    """
+    Compile une condition simple en prédicat.
+
+    Formats (mêmes règles que StateDetector._evaluate_condition):
+    "field == value" (null/None, true/True, false/False, entier, chaîne)
+    et "field NOT IN [a, b, ...]". Toute autre forme est toujours fausse.
+    """
+    if '==' in condition:
+        parts = condition.split('==')
+        field = parts[0].strip()
+        value = parts[1].strip()
+
+        if value == 'null' or value == 'None':
+            return lambda context: context.get(field) is None
+        if value == 'true' or value == 'True':
+            return lambda context: context.get(field) == True  # noqa: E712
+        if value == 'false' or value == 'False':
+            return lambda context: context.get(field) == False  # noqa: E712
+        if value.isdigit():
+            number = int(value)
+            return lambda context: context.get(field) == number
+        expected = value.strip("'\"")
+        return lambda context: str(context.get(field)) == expected
+
+    if 'NOT IN' in condition:
+        parts = condition.split('NOT IN')
+        field = parts[0].strip()
+        values = [v.strip().strip("'\"") for v in parts[1].strip().strip('[]').split(',')]
+        return lambda context: context.get(field) not in values
+
+    return lambda context: False
+
+
+# États reconnus par les méthodes _match_*_state spécifiques, avec le champ
+# du contexte sans lequel la méthode retourne toujours False (None: aucun)
+_MATCHER_GUARDS: Dict[str, Dict[str, Optional[str]]] = {
+    'credentials_helper': {'CREDENTIALS_INVALID': None},
+    'examt3p_agent': {'EXAMT3P_DOWN': 'examt3p_data'},
+    'training_exam_consistency_helper': {
+        'TRAINING_MISSED_EXAM_IMMINENT': 'training_exam_consistency_data',
+        'DOSSIER_NOT_RECEIVED': 'training_exam_consistency_data',
+        'SESSION_ASSIGNMENT_ERROR': 'session_assignment_error',
+    },
+    'session_helper': {'REFRESH_SESSION_AVAILABLE': 'session_data'},
+    'crm_update_agent': {'DATE_MODIFICATION_BLOCKED': None},
+    'combined': {'MISSED_TRAINING_FORCE_MAJEURE': 'has_consistency_issue'},
+}
+
+
+@dataclass
+class CompiledState:
+    """Un état de candidate_states.yaml avec son prédicat compilé."""
+    order: int
+    name: str
+    config: Dict[str, Any]
+    predicate: Predicate
+    # Clé de la table de décision ('intent', 'REPORT_DATE'), ('uber_case', 'A')...
+    key: Optional[Tuple[str, Any]] = None
+    # Champ du contexte qui doit être vrai pour que l'état puisse matcher
+    guard: Optional[str] = None
+
+
+class StateRules:
+    """
+    Table de décision des états, construite une fois par StateDetector.
+
+    Les méthodes _match_*_state et _determine_*_case du détecteur restent la
+    référence: elles servent aux états non indexables et au calcul des cas.
+    """
+
+    def __init__(self, detector, sorted_states: List[Tuple[str, Dict[str, Any]]]):
+        self._detector = detector
+        self.states: List[CompiledState] = []
+        self._by_key: Dict[Tuple[str, Any], List[CompiledState]] = {}
+        self._by_guard: Dict[str, List[CompiledState]] = {}
+        self._unindexed: List[CompiledState] = []
+        self.skipped: List[str] = []
+
+        for order, (state_name, state_config) in enumerate(sorted_states):
+            try:
+                compiled = self._compile_state(order, state_name, state_config)
+            except (IndexError, ValueError):
+                logger.error(f"StateRules: condition invalide pour {state_name}: {state_config.get('detection')}")
+                compiled = None
+            if compiled is None:
+                self.skipped.append(state_name)
+                continue
+            self.states.append(compiled)
+            if compiled.key is not None:
+                self._by_key.setdefault(compiled.key, []).append(compiled)
+            elif compiled.guard is not None:
+                self._by_guard.setdefault(compiled.guard, []).append(compiled)
+            else:
+                self._unindexed.append(compiled)
+
+        self._key_kinds = {key[0] for key in self._by_key}
+        logger.debug(
+            f"StateRules: {len(self.states)} états compilés ({len(self._by_key)} clés, "
+            f"{len(self._by_guard)} gardes, {len(self._unindexed)} toujours évalués, "
+            f"{len(self.skipped)} jamais applicables)"
+        )
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _compile_state(self, order: int, state_name: str, state_config: Dict[str, Any]) -> Optional[CompiledState]:
+        """Compile un état; None s'il ne peut jamais matcher."""
+        detection = state_config.get('detection', {})
+        method = detection.get('method', '')
+        condition = detection.get('condition', '')
+
+        def state(predicate: Predicate = _always, key=None, guard=None) -> CompiledState:
+            return CompiledState(order, state_name, state_config, predicate, key, guard)
+
+        if method == 'fallback':
+            return state()
+
+        if method == 'triage_agent' and detection.get('triage_action'):
+            return state(key=('triage_action', detection['triage_action']))
+
+        if method in ('intent', 'triage_agent'):
+            if 'detected_intent' not in condition:
+                return None
+            return state(key=('intent', _literal(condition.split('==')[1])))
+
+        if method == 'uber_eligibility_helper':
+            if 'case ==' not in condition:
+                return None
+            return state(key=('uber_case', _literal(condition.split('==')[1])))
+
+        if method == 'date_examen_helper':
+            if 'case ==' not in condition:
+                return None
+            return state(key=('date_case', int(condition.split('==')[1].strip())))
+
+        if method == 'deal_linking_agent':
+            if 'has_duplicate_uber_offer' in condition:
+                field = 'has_duplicate_uber_offer'
+            elif 'needs_clarification' in condition or 'deal_id == null' in condition:
+                field = 'needs_clarification'
+            else:
+                return None
+            return state(lambda context: bool(context.get(field, False)), guard=field)
+
+        if method == 'credentials_helper' and state_name != 'CREDENTIALS_INVALID':
+            if 'duplicate_payment_alert' in condition:
+                return state(lambda context: bool(context.get('duplicate_payment_alert', False)),
+                             guard='duplicate_payment_alert')
+            for field in ('personal_account_warning', 'session_assignment_error'):
+                if field in condition:
+                    return state(lambda context, field=field: context.get(field) is True, guard=field)
+            return None
+
+        if method == 'workflow':
+            all_of = [compile_condition(c) for c in detection.get('conditions', {}).get('all_of', [])]
+            if not all_of:
+                return None
+            return state(lambda context: all(check(context) for check in all_of))
+
+        matchers = {
+            'credentials_helper': self._detector._match_credentials_state,
+            'examt3p_agent': self._detector._match_examt3p_state,
+            'training_exam_consistency_helper': self._detector._match_consistency_state,
+            'session_helper': self._detector._match_session_state,
+            'crm_update_agent': self._detector._match_blocking_state,
+            'combined': self._detector._match_force_majeure_consistency_state,
+        }
+        # Ces méthodes ne reconnaissent que certains noms d'état
+        if method in matchers and state_name in _MATCHER_GUARDS[method]:
+            return state(functools.partial(matchers[method], state_name, detection),
+                         guard=_MATCHER_GUARDS[method][state_name])
+
+        return None
+
+    # ------------------------------------------------------------------
+    # Évaluation
+    # ------------------------------------------------------------------
+
+    def _keys(self, context: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """Clés de la table de décision pour ce contexte."""
+        yield ('triage_action', context.get('triage_action'))
+
+        primary_intent = context.get('primary_intent') or context.get('detected_intent')
+        yield ('intent', primary_intent)
+        for intent in context.get('secondary_intents') or []:
+            yield ('intent', intent)
+
+        if 'uber_case' in self._key_kinds:
+            yield ('uber_case', self._detector._determine_uber_case(context))
+        if 'date_case' in self._key_kinds:
+            yield ('date_case', self._detector._determine_date_examen_case(context))
+
+    def candidates(self, context: Dict[str, Any]) -> List[CompiledState]:
+        """États susceptibles de matcher, dans l'ordre de priorité."""
+        candidates = list(self._unindexed)
+        for key in self._keys(context):
+            try:
+                candidates.extend(self._by_key.get(key, ()))
+            except TypeError:
+                continue  # valeur non hashable dans le contexte: aucun état indexé dessus
+        for field, states in self._by_guard.items():
+            if context.get(field):
+                candidates.extend(states)
+
+        seen = set()
+        unique = []
+        for state in sorted(candidates, key=lambda s: s.order):
+            if state.order not in seen:
+                seen.add(state.order)
+                unique.append(state)
+        return unique
+
+    def matching(self, context: Dict[str, Any]) -> Iterator[CompiledState]:
+        """États qui matchent le contexte, dans l'ordre de priorité."""
+        for state in self.candidates(context):
+            if state.predicate(context):
+                yield state
@@ -27,6 +27,7 @@ from datetime import datetime
 import gender_guesser.detector as gender_detector
 
 from .state_detector import DetectedState, DetectedStates
+from .bundle import get_bundle
 
 # Détecteur de genre par prénom (singleton)
 _gender_detector = gender_detector.Detector()
@@ -72,6 +73,9 @@ class TemplateEngine:
         self.templates_cache: Dict[str, str] = {}
         self.blocks_cache: Dict[str, str] = {}
 
+        # Bundle précompilé (matrice parsée, templates nettoyés et compilés)
+        self.bundle = get_bundle(self.states_path)
+
         # Charger la matrice état×intention
         self.matrix = self._load_matrix()
         self.blocks_registry = self.matrix.get('blocks_registry', {})
@@ -90,7 +94,9 @@ class TemplateEngine:
         logger.info(f"TemplateEngine initialisé: {len(self.blocks_registry)} blocs, {len(self.base_templates)} templates")
 
     def _load_matrix(self) -> Dict[str, Any]:
-        """Charge state_intention_matrix.yaml."""
+        """Charge state_intention_matrix.yaml (déjà parsée dans le bundle si disponible)."""
+        if self.bundle is not None:
+            return self.bundle.matrix
         try:
             if self.matrix_path.exists():
                 with open(self.matrix_path, 'r', encoding='utf-8') as f:
@@ -501,6 +507,16 @@ class TemplateEngine:
                     logger.warning(f"Template non trouvé: {template_path}")
                     return None
 
+        # Contenu déjà nettoyé dans le bundle
+        if self.bundle is not None:
+            try:
+                content = self.bundle.template_content(full_path.relative_to(self.states_path).as_posix())
+            except ValueError:
+                content = None
+            if content is not None:
+                self.templates_cache[template_path] = content
+                return content
+
         try:
             content = full_path.read_text(encoding='utf-8')
             # Nettoyer le contenu: supprimer commentaires HTML et espaces inutiles
@@ -540,7 +556,8 @@ class TemplateEngine:
             logger.error(f"Erreur lecture bloc {block_name}: {e}")
             return None
 
-    def _clean_block_content(self, content: str) -> str:
+    @staticmethod
+    def _clean_block_content(content: str) -> str:
         """Nettoie le contenu d'un bloc en supprimant commentaires et espaces inutiles."""
         import re
         # Supprimer les commentaires HTML (<!-- ... -->)
@@ -0,0 +1,232 @@
+"""
+Pool de composants "chauds" (DOCTicketWorkflow, ZohoAutomationOrchestrator).
+
+Chaque requête webhook et chaque run_single_ticket construisait un workflow
+neuf: clients Zoho (sessions HTTP, client async), agents et leurs clients
+Anthropic, composants du State Engine. Le pool construit ces objets une
+seule fois par process et les réutilise d'une requête à l'autre:
+
+- acquire() prête une instance inactive, ou en construit une tant que
+  max_size n'est pas atteint, sinon attend qu'une instance soit rendue
+- Au retour, reset_request_state() efface l'état propre au ticket
+  (historiques des agents); une instance qui échoue au reset est fermée
+- La configuration immuable (YAML, partials pybars) est partagée par
+  process via src.state_engine.shared, quel que soit le nombre d'instances
+- LIFO: l'instance rendue en dernier (connexions les plus chaudes) est
+  prêtée en premier
+
+Usage:
+    from src.utils.component_pool import get_workflow_pool
+
+    with get_workflow_pool().acquire() as workflow:
+        result = workflow.process_ticket(ticket_id)
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentPool:
+    """
+    Pool borné d'instances réutilisables.
+
+    Thread-safe (Condition); factory() construit une instance, qui peut
+    exposer reset_request_state() et close().
+    """
+
+    # Taille max par défaut (instances construites)
+    MAX_SIZE = 4
+
+    def __init__(self, name: str, factory: Callable[[], Any], max_size: Optional[int] = None):
+        self.name = name
+        self.factory = factory
+        self.max_size = max(1, max_size or self.MAX_SIZE)
+        self._idle: List[Any] = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Monitoring
+        self._acquisitions = 0
+        self._reused = 0
+        self._discarded = 0
+        self._build_seconds = 0.0
+
+    def _build(self) -> Any:
+        start = time.perf_counter()
+        try:
+            instance = self.factory()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._build_seconds += elapsed
+        logger.info(f"Pool {self.name}: instance construite en {elapsed:.2f}s ({self._size}/{self.max_size})")
+        return instance
+
+    def _take(self, timeout: Optional[float]) -> Any:
+        """Instance inactive, ou None si une nouvelle doit être construite."""
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._idle and self._size >= self.max_size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Pool {self.name}: aucune instance disponible après {timeout}s")
+                self._cond.wait(remaining)
+            self._acquisitions += 1
+            if self._idle:
+                self._reused += 1
+                return self._idle.pop()
+            self._size += 1
+            return None
+
+    def _discard(self, instance: Any) -> None:
+        with self._cond:
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+        try:
+            if hasattr(instance, 'close'):
+                instance.close()
+        except Exception as e:
+            logger.warning(f"Pool {self.name}: erreur fermeture instance: {e}")
+
+    def release(self, instance: Any) -> None:
+        """Rend une instance au pool (après reset de son état par requête)."""
+        try:
+            if hasattr(instance, 'reset_request_state'):
+                instance.reset_request_state()
+        except Exception as e:
+            logger.warning(f"Pool {self.name}: reset impossible, instance fermée: {e}")
+            self._discard(instance)
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append(instance)
+                self._cond.notify()
+                return
+        self._discard(instance)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Prête une instance pour la durée du bloc.
+
+        Args:
+            timeout: Attente max si le pool est plein (None = illimitée)
+
+        Raises:
+            TimeoutError: Aucune instance disponible dans le délai
+        """
+        instance = self._take(timeout)
+        if instance is None:
+            instance = self._build()
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Construit d'avance des instances (démarrage du process).
+
+        Returns:
+            Nombre d'instances construites
+        """
+        built = 0
+        for _ in range(min(count or self.max_size, self.max_size)):
+            with self._cond:
+                if self._size >= self.max_size:
+                    break
+                self._size += 1
+            instance = self._build()
+            with self._cond:
+                self._idle.append(instance)
+                self._cond.notify()
+            built += 1
+        return built
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics for monitoring.
+
+        Returns:
+            Dict with size, idle, in_use, acquisitions, reuse_rate, build time
+        """
+        with self._cond:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "acquisitions": self._acquisitions,
+                "reused": self._reused,
+                "reuse_rate": round(self._reused / self._acquisitions, 3) if self._acquisitions else 0.0,
+                "discarded": self._discarded,
+                "build_seconds_total": round(self._build_seconds, 3),
+            }
+
+    def close_all(self) -> None:
+        """Ferme les instances inactives (les instances prêtées sont fermées à leur retour)."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for instance in idle:
+            self._discard(instance)
+
+
+def _build_workflow() -> Any:
+    from src.workflows.doc_ticket_workflow import DOCTicketWorkflow
+    return DOCTicketWorkflow()
+
+
+def _build_orchestrator() -> Any:
+    from src.orchestrator import ZohoAutomationOrchestrator
+    return ZohoAutomationOrchestrator()
+
+
+_pools: Dict[str, ComponentPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name: str, factory: Callable[[], Any], max_size: Optional[int]) -> ComponentPool:
+    with _pools_lock:
+        if name not in _pools:
+            size = max_size or int(os.getenv("COMPONENT_POOL_SIZE", str(ComponentPool.MAX_SIZE)))
+            _pools[name] = ComponentPool(name, factory, max_size=size)
+        return _pools[name]
+
+
+def get_workflow_pool(max_size: Optional[int] = None) -> ComponentPool:
+    """
+    Get the process-wide pool of DOCTicketWorkflow instances.
+
+    Args:
+        max_size: Taille max à la création du pool (défaut: COMPONENT_POOL_SIZE ou 4)
+
+    Returns:
+        ComponentPool instance
+    """
+    return _get_pool("workflow", _build_workflow, max_size)
+
+
+def get_orchestrator_pool(max_size: Optional[int] = None) -> ComponentPool:
+    """
+    Get the process-wide pool of ZohoAutomationOrchestrator instances.
+
+    Args:
+        max_size: Taille max à la création du pool (défaut: COMPONENT_POOL_SIZE ou 4)
+
+    Returns:
+        ComponentPool instance
+    """
+    return _get_pool("orchestrator", _build_orchestrator, max_size)
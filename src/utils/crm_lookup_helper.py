@@ -11,7 +11,7 @@ MODULES DE RÉFÉRENCE:
 - Session -> module "Sessions1"
   Champs: Name, session_type, Date_d_but, Date_de_fin
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -120,8 +120,15 @@ def enrich_deal_lookups(
         'session_date_fin': None,
     }
 
-    # Enrichir Date_examen_VTC
-    date_examen_record = enrich_lookup_field(crm_client, deal_data, 'Date_examen_VTC', cache)
+    # Enrichir Date_examen_VTC et Session (GETs indépendants → en parallèle si possible)
+    if hasattr(crm_client, 'async_client'):
+        date_examen_record, session_record = _fetch_lookups_concurrently(
+            crm_client, deal_data, ['Date_examen_VTC', 'Session'], cache
+        )
+    else:
+        date_examen_record = enrich_lookup_field(crm_client, deal_data, 'Date_examen_VTC', cache)
+        session_record = enrich_lookup_field(crm_client, deal_data, 'Session', cache)
+
     if date_examen_record:
         result['date_examen_record'] = date_examen_record
         result['date_examen'] = date_examen_record.get('Date_Examen')
@@ -129,8 +136,6 @@ def enrich_deal_lookups(
         result['departement'] = date_examen_record.get('Departement')
         logger.info(f"  📅 Date_Examen: {result['date_examen']}, Clôture: {result['date_cloture']}, Dept: {result['departement']}")
 
-    # Enrichir Session
-    session_record = enrich_lookup_field(crm_client, deal_data, 'Session', cache)
     if session_record:
         result['session_record'] = session_record
         result['session_name'] = session_record.get('Name')
@@ -150,6 +155,59 @@ def enrich_deal_lookups(
     return result
 
 
+def _fetch_lookups_concurrently(
+    crm_client,
+    deal_data: Dict[str, Any],
+    field_names: List[str],
+    cache: Dict[str, Any]
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Récupère plusieurs champs lookup en parallèle via le client async (aiohttp).
+
+    Même sémantique que enrich_lookup_field (cache partagé, None si erreur).
+    """
+    import asyncio
+    from src.zoho_async_client import run_sync
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(field_names)
+    to_fetch: List[Tuple[int, str, str, str]] = []  # (index, field, module, id)
+
+    for index, field_name in enumerate(field_names):
+        lookup_value = deal_data.get(field_name)
+        if not isinstance(lookup_value, dict) or 'id' not in lookup_value:
+            continue
+        module_name = LOOKUP_MODULE_MAP.get(field_name)
+        if not module_name:
+            continue
+        cache_key = f"{module_name}_{lookup_value['id']}"
+        if cache_key in cache:
+            results[index] = cache[cache_key]
+        else:
+            to_fetch.append((index, field_name, module_name, lookup_value['id']))
+
+    if not to_fetch:
+        return results
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(crm_client.async_client.get_record(module, lookup_id) for _, _, module, lookup_id in to_fetch),
+            return_exceptions=True
+        )
+
+    records = run_sync(fetch_all())
+    for (index, field_name, module_name, lookup_id), record in zip(to_fetch, records):
+        if isinstance(record, BaseException):
+            logger.warning(f"  Erreur récupération {field_name} depuis {module_name}: {record}")
+        elif record:
+            logger.debug(f"  ✅ {field_name} enrichi depuis {module_name}")
+            cache[f"{module_name}_{lookup_id}"] = record
+            results[index] = record
+        else:
+            logger.warning(f"  Record non trouvé: {module_name}/{lookup_id}")
+
+    return results
+
+
 # ============================================================================
 # HELPER FUNCTIONS - Accès simplifié aux données enrichies
 # ============================================================================
@@ -51,45 +51,16 @@ def get_next_exam_dates(
     Returns:
         Liste des sessions d'examen avec leurs infos
     """
-    from config import settings
+    from src.utils.exam_date_catalogue import get_exam_date_catalogue
 
     logger.info(f"🔍 Recherche des prochaines dates d'examen pour le département {departement}")
 
     try:
-        # Construire la requête de recherche
-        # On cherche les sessions actives pour ce département
-        # Note: L'API search ne supporte pas sort_by/sort_order sur les modules custom
-        url = f"{settings.zoho_crm_api_url}/Dates_Examens_VTC_TAXI/search"
-
-        # Critère: (Statut = Actif OU Statut = vide) AND Departement = X
-        criteria = f"(((Statut:equals:Actif)or(Statut:equals:null))and(Departement:equals:{departement}))"
-
-        # Pagination: récupérer toutes les pages
-        all_sessions = []
-        page = 1
-        max_pages = 10  # Sécurité pour éviter boucle infinie
-
-        while page <= max_pages:
-            params = {
-                "criteria": criteria,
-                "page": page,
-                "per_page": 200  # Max autorisé par Zoho
-            }
-
-            response = crm_client._make_request("GET", url, params=params)
-            sessions = response.get("data", [])
-
-            if not sessions:
-                break
-
-            all_sessions.extend(sessions)
-            logger.info(f"  Page {page}: {len(sessions)} session(s) récupérée(s)")
-
-            # Si moins de 200 résultats, c'est la dernière page
-            if len(sessions) < 200:
-                break
-
-            page += 1
+        # Sessions actives (Statut = Actif ou vide) du département,
+        # servies depuis le catalogue local (pas d'appel API si déjà chargé)
+        all_sessions = get_exam_date_catalogue().get_active_sessions(
+            crm_client, departement=departement
+        )
 
         if not all_sessions:
             logger.warning(f"Aucune session trouvée pour le département {departement}")
@@ -168,7 +139,7 @@ def get_earlier_dates_other_departments(
         Liste des sessions d'examen plus tôt dans d'autres départements,
         triées par date, avec info département incluse
     """
-    from config import settings
+    from src.utils.exam_date_catalogue import get_exam_date_catalogue
 
     logger.info(f"🔍 Recherche de dates plus tôt dans d'autres départements (référence: {reference_date})")
 
@@ -184,34 +155,8 @@ def get_earlier_dates_other_departments(
             logger.warning(f"Format de date de référence invalide: {reference_date}")
             return []
 
-        url = f"{settings.zoho_crm_api_url}/Dates_Examens_VTC_TAXI/search"
-        # Critère: Statut = Actif OU Statut = vide
-        criteria = "((Statut:equals:Actif)or(Statut:equals:null))"
-
-        # Pagination: récupérer toutes les pages
-        all_sessions = []
-        page = 1
-        max_pages = 10
-
-        while page <= max_pages:
-            params = {
-                "criteria": criteria,
-                "page": page,
-                "per_page": 200
-            }
-
-            response = crm_client._make_request("GET", url, params=params)
-            sessions = response.get("data", [])
-
-            if not sessions:
-                break
-
-            all_sessions.extend(sessions)
-
-            if len(sessions) < 200:
-                break
-
-            page += 1
+        # Toutes les sessions actives, depuis le catalogue local
+        all_sessions = get_exam_date_catalogue().get_active_sessions(crm_client)
 
         if not all_sessions:
             logger.warning("Aucune session trouvée")
@@ -279,44 +224,15 @@ def get_next_exam_dates_any_department(
 ) -> List[Dict[str, Any]]:
     """
     Récupère les prochaines dates d'examen sans filtre département (fallback).
-    Avec pagination pour récupérer toutes les sessions.
+    Les sessions sont servies par le catalogue local (exam_date_catalogue).
     """
-    from config import settings
+    from src.utils.exam_date_catalogue import get_exam_date_catalogue
 
     logger.info("🔍 Recherche des prochaines dates d'examen (tous départements)")
 
     try:
-        url = f"{settings.zoho_crm_api_url}/Dates_Examens_VTC_TAXI/search"
-        # Note: L'API search ne supporte pas sort_by/sort_order sur les modules custom
-        # Critère: Statut = Actif OU Statut = vide
-        criteria = "((Statut:equals:Actif)or(Statut:equals:null))"
-
-        # Pagination: récupérer toutes les pages
-        all_sessions = []
-        page = 1
-        max_pages = 10  # Sécurité pour éviter boucle infinie
-
-        while page <= max_pages:
-            params = {
-                "criteria": criteria,
-                "page": page,
-                "per_page": 200  # Max autorisé par Zoho
-            }
-
-            response = crm_client._make_request("GET", url, params=params)
-            sessions = response.get("data", [])
-
-            if not sessions:
-                break
-
-            all_sessions.extend(sessions)
-            logger.info(f"  Page {page}: {len(sessions)} session(s) récupérée(s)")
-
-            # Si moins de 200 résultats, c'est la dernière page
-            if len(sessions) < 200:
-                break
-
-            page += 1
+        # Toutes les sessions actives, depuis le catalogue local
+        all_sessions = get_exam_date_catalogue().get_active_sessions(crm_client)
 
         if not all_sessions:
             logger.warning("Aucune session active trouvée")
@@ -0,0 +1,340 @@
+"""
+Catalogue local des dates d'examen (module CRM Dates_Examens_VTC_TAXI).
+
+Les helpers de dates (get_next_exam_dates, get_earlier_dates_other_departments,
+get_next_exam_dates_any_department, find_exam_session_by_date_and_dept)
+re-paginaient le endpoint Dates_Examens_VTC_TAXI/search à chaque appel,
+parfois plusieurs fois par ticket. Ce module charge le catalogue UNE fois
+par process et le sert depuis la mémoire.
+
+Fonctionnement:
+- Chargement initial: toutes les sessions actives (Statut = Actif ou vide)
+- Index: par id, par département, par région (DEPT_TO_REGION) et par date
+- Refresh incrémental: toutes les REFRESH_INTERVAL secondes, on ne récupère
+  que les enregistrements dont Modified_Time > dernier Modified_Time connu
+  (les changements de statut sont donc pris en compte)
+- Rechargement complet: toutes les FULL_RELOAD_INTERVAL secondes
+  (pour prendre en compte les suppressions)
+
+Usage:
+    from src.utils.exam_date_catalogue import get_exam_date_catalogue
+
+    catalogue = get_exam_date_catalogue()
+    sessions = catalogue.get_active_sessions(crm_client, departement="75")
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+from src.utils.date_examen_vtc_helper import DEPT_TO_REGION
+
+logger = logging.getLogger(__name__)
+
+MODULE_NAME = "Dates_Examens_VTC_TAXI"
+
+# Critère de chargement initial (identique aux anciennes recherches)
+ACTIVE_CRITERIA = "((Statut:equals:Actif)or(Statut:equals:null))"
+
+# Valeurs de Statut considérées comme actives
+ACTIVE_STATUSES = ("Actif", None, "")
+
+
+def _is_active(session: Dict[str, Any]) -> bool:
+    """Session active = Statut 'Actif' ou vide."""
+    return session.get('Statut') in ACTIVE_STATUSES
+
+
+def _date_key(value: Any) -> str:
+    """Normalise une date CRM (YYYY-MM-DD ou ISO datetime) en YYYY-MM-DD."""
+    return str(value)[:10] if value else ''
+
+
+class ExamDateCatalogue:
+    """
+    Catalogue process-wide des sessions d'examen, indexé en mémoire.
+
+    Thread-safe (RLock): partagé entre tous les workflows d'un même process.
+    """
+
+    _instance: Optional["ExamDateCatalogue"] = None
+    _lock = threading.RLock()
+
+    # Refresh incrémental (Modified_Time) toutes les 5 minutes
+    REFRESH_INTERVAL = 300
+    # Rechargement complet toutes les heures (suppressions)
+    FULL_RELOAD_INTERVAL = 3600
+
+    PER_PAGE = 200  # Max autorisé par Zoho
+    MAX_PAGES = 10  # Sécurité pour éviter boucle infinie
+
+    def __new__(cls) -> "ExamDateCatalogue":
+        """Ensure only one instance exists (singleton pattern)."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self):
+        """Initialize the catalogue (only runs once due to singleton)."""
+        if self._initialized:
+            return
+
+        self._sessions: Dict[str, Dict[str, Any]] = {}  # {id: session}
+        self._by_dept: Dict[str, List[str]] = {}
+        self._by_region: Dict[str, List[str]] = {}
+        self._by_date: Dict[str, List[str]] = {}
+        self._ordered_ids: List[str] = []  # Tous les ids, triés par Date_Examen
+
+        self._loaded_at: float = 0  # Dernier chargement complet
+        self._refreshed_at: float = 0  # Dernier refresh (complet ou incrémental)
+        self._max_modified_time: Optional[str] = None
+
+        # Monitoring
+        self._full_loads = 0
+        self._incremental_refreshes = 0
+        self._api_calls = 0
+        self._lookups = 0
+
+        self._initialized = True
+
+    # ------------------------------------------------------------------
+    # Chargement
+    # ------------------------------------------------------------------
+
+    def _fetch_all_pages(self, crm_client, criteria: str) -> List[Dict[str, Any]]:
+        """Pagine Dates_Examens_VTC_TAXI/search pour un critère donné."""
+        from config import settings
+
+        url = f"{settings.zoho_crm_api_url}/{MODULE_NAME}/search"
+        all_sessions = []
+        page = 1
+
+        while page <= self.MAX_PAGES:
+            params = {
+                "criteria": criteria,
+                "page": page,
+                "per_page": self.PER_PAGE
+            }
+            response = crm_client._make_request("GET", url, params=params)
+            self._api_calls += 1
+            sessions = response.get("data", [])
+
+            if not sessions:
+                break
+
+            all_sessions.extend(sessions)
+
+            # Si moins de 200 résultats, c'est la dernière page
+            if len(sessions) < self.PER_PAGE:
+                break
+
+            page += 1
+
+        return all_sessions
+
+    def _upsert(self, session: Dict[str, Any]) -> None:
+        """Ajoute ou remplace une session et met à jour Modified_Time max."""
+        session_id = session.get('id')
+        if not session_id:
+            return
+        self._sessions[str(session_id)] = session
+
+        modified = session.get('Modified_Time')
+        if modified and (self._max_modified_time is None or str(modified) > self._max_modified_time):
+            self._max_modified_time = str(modified)
+
+    def _rebuild_indexes(self) -> None:
+        """Reconstruit les index département / région / date (triés par Date_Examen)."""
+        by_dept: Dict[str, List[str]] = {}
+        by_region: Dict[str, List[str]] = {}
+        by_date: Dict[str, List[str]] = {}
+
+        ordered = sorted(
+            self._sessions.items(),
+            key=lambda item: item[1].get('Date_Examen') or '9999-99-99'
+        )
+        for session_id, session in ordered:
+            dept = str(session.get('Departement') or '')
+            by_dept.setdefault(dept, []).append(session_id)
+
+            region = DEPT_TO_REGION.get(dept)
+            if region:
+                by_region.setdefault(region, []).append(session_id)
+
+            date_key = _date_key(session.get('Date_Examen'))
+            if date_key:
+                by_date.setdefault(date_key, []).append(session_id)
+
+        self._by_dept = by_dept
+        self._by_region = by_region
+        self._by_date = by_date
+        self._ordered_ids = [session_id for session_id, _ in ordered]
+
+    def _full_load(self, crm_client) -> None:
+        """Charge toutes les sessions actives et reconstruit les index."""
+        sessions = self._fetch_all_pages(crm_client, ACTIVE_CRITERIA)
+
+        self._sessions = {}
+        self._max_modified_time = None
+        for session in sessions:
+            self._upsert(session)
+        self._rebuild_indexes()
+
+        now = time.time()
+        self._loaded_at = now
+        self._refreshed_at = now
+        self._full_loads += 1
+        logger.info(f"📚 Catalogue dates d'examen chargé: {len(self._sessions)} session(s)")
+
+    def _incremental_refresh(self, crm_client) -> None:
+        """Récupère uniquement les sessions modifiées depuis le dernier Modified_Time."""
+        if not self._max_modified_time:
+            self._full_load(crm_client)
+            return
+
+        criteria = f"(Modified_Time:greater_than:{self._max_modified_time})"
+        changed = self._fetch_all_pages(crm_client, criteria)
+
+        for session in changed:
+            self._upsert(session)
+        if changed:
+            self._rebuild_indexes()
+
+        self._refreshed_at = time.time()
+        self._incremental_refreshes += 1
+        logger.info(f"📚 Catalogue dates d'examen: {len(changed)} session(s) modifiée(s)")
+
+    def ensure_fresh(self, crm_client, force: bool = False) -> None:
+        """
+        Charge ou rafraîchit le catalogue si nécessaire.
+
+        Args:
+            crm_client: Client Zoho CRM (utilisé uniquement si un appel est requis)
+            force: Forcer un rechargement complet
+        """
+        with self._lock:
+            now = time.time()
+            if force or not self._loaded_at or now - self._loaded_at >= self.FULL_RELOAD_INTERVAL:
+                self._full_load(crm_client)
+            elif now - self._refreshed_at >= self.REFRESH_INTERVAL:
+                try:
+                    self._incremental_refresh(crm_client)
+                except Exception as e:
+                    # Données en mémoire toujours utilisables: on réessaiera au prochain appel
+                    logger.warning(f"Refresh incrémental du catalogue échoué: {e}")
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def _resolve(self, ids: List[str], active_only: bool) -> List[Dict[str, Any]]:
+        """Retourne des copies des sessions (les appelants enrichissent les dicts)."""
+        result = []
+        for session_id in ids:
+            session = self._sessions.get(session_id)
+            if session is None or (active_only and not _is_active(session)):
+                continue
+            result.append(dict(session))
+        return result
+
+    def get_active_sessions(
+        self,
+        crm_client,
+        departement: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sessions actives, triées par Date_Examen.
+
+        Args:
+            crm_client: Client Zoho CRM
+            departement: Filtrer sur un département (ex: "75")
+            region: Filtrer sur une région (ex: "Île-de-France")
+
+        Returns:
+            Liste des sessions (copies)
+        """
+        self.ensure_fresh(crm_client)
+        with self._lock:
+            self._lookups += 1
+            if departement is not None:
+                ids = self._by_dept.get(str(departement), [])
+            elif region is not None:
+                ids = self._by_region.get(region, [])
+            else:
+                ids = self._ordered_ids
+            return self._resolve(ids, active_only=True)
+
+    def find_session(
+        self,
+        crm_client,
+        date_iso: str,
+        departement: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Trouve une session par date d'examen (YYYY-MM-DD) et département.
+
+        Toutes les sessions connues sont considérées, quel que soit leur statut.
+        Retourne None si la session n'est pas dans le catalogue.
+        """
+        self.ensure_fresh(crm_client)
+        with self._lock:
+            self._lookups += 1
+            for session in self._resolve(self._by_date.get(date_iso, []), active_only=False):
+                if str(session.get('Departement') or '') == str(departement):
+                    return session
+            return None
+
+    def get_session(self, crm_client, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne une session par son id, ou None si absente du catalogue."""
+        self.ensure_fresh(crm_client)
+        with self._lock:
+            self._lookups += 1
+            session = self._sessions.get(str(session_id))
+            return dict(session) if session is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get catalogue statistics for monitoring.
+
+        Returns:
+            Dict with session counts, loads, refreshes, api_calls, lookups
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "departments": len(self._by_dept),
+                "full_loads": self._full_loads,
+                "incremental_refreshes": self._incremental_refreshes,
+                "api_calls": self._api_calls,
+                "lookups": self._lookups,
+                "max_modified_time": self._max_modified_time,
+            }
+
+    def clear(self) -> None:
+        """Vide le catalogue (force un rechargement complet au prochain appel)."""
+        with self._lock:
+            self._sessions = {}
+            self._by_dept = {}
+            self._by_region = {}
+            self._by_date = {}
+            self._ordered_ids = []
+            self._loaded_at = 0
+            self._refreshed_at = 0
+            self._max_modified_time = None
+            self._full_loads = 0
+            self._incremental_refreshes = 0
+            self._api_calls = 0
+            self._lookups = 0
+
+
+def get_exam_date_catalogue() -> ExamDateCatalogue:
+    """
+    Get the singleton ExamDateCatalogue instance.
+
+    Returns:
+        ExamDateCatalogue singleton instance
+    """
+    return ExamDateCatalogue()
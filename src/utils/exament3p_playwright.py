@@ -16,19 +16,38 @@ Features v4.0:
 - Gestion d'erreurs robuste avec fallbacks
 - Timeouts configurables
 - Logs détaillés pour debugging
+- Navigateur persistant partagé (examt3p_browser_pool): un contexte isolé par
+  candidat, et reprise de la session ouverte par le test de connexion
+- Attentes adaptatives (EXAMT3P_ADAPTIVE_WAITS, activé par défaut): au lieu
+  des délais fixes ACTION_DELAY, attente du contenu (changement puis
+  stabilité) ou du résultat du login; images, polices et analytics bloqués;
+  durée de chaque étape dans data['step_timings']
+- Cache des résultats (examt3p_result_cache, EXAMT3P_CACHE_ENABLED): TTL par
+  groupe de champs, sonde du tableau de bord avant toute extraction complète
 
 Usage:
-    from exament3p_playwright import extract_exament3p_sync
+    from exament3p_playwright import extract_exament3p_sync, extract_many
 
     data = extract_exament3p_sync(identifiant, password)
+
+    # Lot de candidats en parallèle (résultats au fil de l'eau)
+    for index, data in extract_many([(id1, pw1), (id2, pw2)], concurrency=3):
+        ...
 """
 
 import asyncio
+import concurrent.futures
+import hashlib
+import os
 import re
-from typing import Dict, List, Optional
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 import traceback
 
+from src.utils.examt3p_browser_pool import get_browser_pool
+from src.utils.examt3p_result_cache import get_examt3p_result_cache
+
 
 # Configuration des retries et timeouts
 MAX_RETRIES = 3
@@ -36,6 +55,35 @@ RETRY_DELAY = 2  # secondes entre chaque retry
 PAGE_LOAD_TIMEOUT = 30000  # 30 secondes
 ELEMENT_TIMEOUT = 10000  # 10 secondes
 ACTION_DELAY = 1  # délai entre actions (secondes)
+DEFAULT_CONCURRENCY = 3  # extractions simultanées (extract_many)
+
+# Attentes adaptatives (remplacent les délais fixes ACTION_DELAY)
+ADAPTIVE_WAITS = os.getenv('EXAMT3P_ADAPTIVE_WAITS', 'true').lower() == 'true'
+SETTLE_POLL_INTERVAL = 0.1  # secondes entre deux lectures du contenu
+SETTLE_STABLE_POLLS = 4  # lectures identiques consécutives exigées après le changement
+SETTLE_MAX_WAIT = ACTION_DELAY * 2  # borne = ancien délai fixe après un clic d'onglet
+LOGIN_OUTCOME_MAX_WAIT = ACTION_DELAY * 5  # borne d'attente du résultat du login
+
+# Cache des résultats d'extraction (examt3p_result_cache)
+RESULT_CACHE_ENABLED = os.getenv('EXAMT3P_CACHE_ENABLED', 'true').lower() == 'true'
+
+# Indicateurs de connexion réussie / échouée (contenu de la page)
+LOGIN_SUCCESS_INDICATORS = [
+    "Vue d'ensemble",
+    "Mon Espace Candidat",
+    "Déconnexion",
+    "Bienvenue",
+    "monEspaceContainer"
+]
+LOGIN_ERROR_INDICATORS = [
+    "Identifiant ou mot de passe incorrect",
+]
+
+
+def dashboard_fingerprint(text_content: str) -> str:
+    """Empreinte du texte de la Vue d'ensemble (espaces normalisés)."""
+    normalized = re.sub(r'\s+', ' ', text_content or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
 
 class RetryError(Exception):
@@ -80,7 +128,13 @@ class ExamenT3PPlaywright:
     URL_BASE = "https://www.exament3p.fr"
     URL_LOGIN = "https://www.exament3p.fr/id/14"
 
-    def __init__(self, identifiant: str, password: str, max_retries: int = MAX_RETRIES):
+    def __init__(
+        self,
+        identifiant: str,
+        password: str,
+        max_retries: int = MAX_RETRIES,
+        adaptive_waits: Optional[bool] = None
+    ):
         """
         Initialise l'extracteur.
 
@@ -88,74 +142,91 @@ class ExamenT3PPlaywright:
             identifiant: Email du candidat (login ExamenT3P)
             password: Mot de passe ExamenT3P
             max_retries: Nombre maximum de tentatives pour chaque opération
+            adaptive_waits: Attentes adaptatives (défaut: ADAPTIVE_WAITS);
+                False = délais fixes ACTION_DELAY
         """
         self.identifiant = identifiant
         self.password = password
         self.max_retries = max_retries
+        self.adaptive_waits = ADAPTIVE_WAITS if adaptive_waits is None else adaptive_waits
         self.data = {
             'identifiant': identifiant,
             'extraction_requise': True,
-            'errors': []
+            'errors': [],
+            'pages_en_erreur': [],
+            'step_timings': {}
         }
-        self.browser = None
+        self.context = None
         self.page = None
 
-    async def extract_all(self) -> Dict:
+    async def _open_page(self, context) -> None:
+        self.context = context
+        self.page = context.pages[0] if context.pages else await context.new_page()
+
+    async def extract_all(self, stop_if_unchanged: Optional[str] = None) -> Dict:
         """
         Extraction complète de TOUTES les données ExamenT3P avec retry global.
 
+        S'exécute sur la boucle du pool navigateur (quelle que soit la boucle
+        appelante).
+
+        Args:
+            stop_if_unchanged: Empreinte connue de la Vue d'ensemble; si elle
+                n'a pas changé, l'extraction s'arrête après cette page
+                (data['dashboard_unchanged'] = True)
+
         Returns:
             Dictionnaire avec toutes les données extraites
         """
-        from playwright.async_api import async_playwright
+        pool = get_browser_pool()
+        return await pool.run(self._extract_all(pool, stop_if_unchanged))
 
+    async def _extract_all(self, pool, stop_if_unchanged: Optional[str] = None) -> Dict:
         for global_attempt in range(1, self.max_retries + 1):
             try:
-                async with async_playwright() as p:
-                    # Lancer le navigateur en mode headless
-                    # NOTE: Ne PAS spécifier executable_path pour laisser Playwright utiliser son navigateur bundlé
-                    # Installer les navigateurs avec: playwright install chromium
-                    self.browser = await p.chromium.launch(
-                        headless=True,
-                        args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
-                    )
-
-                    # Créer un contexte avec timeout configuré
-                    context = await self.browser.new_context(
-                        viewport={'width': 1280, 'height': 720}
-                    )
-                    context.set_default_timeout(PAGE_LOAD_TIMEOUT)
-
-                    self.page = await context.new_page()
-
-                    try:
-                        # 1. Connexion avec retry
+                # Session ouverte par le test de connexion: pas de second login
+                context = await pool.take_session(self.identifiant, self.password) if global_attempt == 1 else None
+                reused_session = context is not None
+                if context is None:
+                    context = await pool.new_context(block_resources=self.adaptive_waits)
+
+                try:
+                    await self._open_page(context)
+
+                    # 1. Connexion avec retry (sauf session reprise toujours connectée)
+                    started = time.perf_counter()
+                    if reused_session and await self._is_logged_in():
+                        print("   ♻️ Session du test de connexion reprise")
+                    else:
                         print("   🔐 Connexion en cours...")
                         connected = await self._login_with_retry()
                         if not connected:
                             raise Exception("Échec de connexion après retries")
 
                         print("   ✅ Connexion réussie")
+                    self._record_timing('login', started)
 
-                        # 2. Extraction de chaque page avec gestion d'erreurs individuelle
-                        await self._extract_all_pages()
+                    # 2. Extraction de chaque page avec gestion d'erreurs individuelle
+                    await self._extract_all_pages(stop_if_unchanged)
 
-                        # 3. Déconnexion (non bloquante)
-                        await self._safe_logout()
+                    # 3. Déconnexion (non bloquante)
+                    await self._safe_logout()
 
-                        # Marquer l'extraction comme réussie
-                        self.data['extraction_requise'] = False
-                        self.data['extraction_date'] = datetime.now().isoformat()
-                        self.data['extraction_attempt'] = global_attempt
+                    # Marquer l'extraction comme réussie
+                    self.data['extraction_requise'] = False
+                    self.data['extraction_date'] = datetime.now().isoformat()
+                    self.data['extraction_attempt'] = global_attempt
 
-                        print("   ✅ Extraction complète terminée")
-                        return self.data
+                    timings = self.data['step_timings']
+                    print(f"   ✅ Extraction complète terminée ({sum(timings.values()):.1f}s: "
+                          + ", ".join(f"{step} {seconds:.1f}s" for step, seconds in timings.items()) + ")")
+                    return self.data
 
-                    except Exception as e:
-                        self.data['errors'].append(f"Tentative {global_attempt}: {str(e)}")
-                        raise
-                    finally:
-                        await self.browser.close()
+                except Exception as e:
+                    self.data['errors'].append(f"Tentative {global_attempt}: {str(e)}")
+                    raise
+                finally:
+                    await context.close()
 
             except Exception as e:
                 if global_attempt < self.max_retries:
@@ -183,8 +254,10 @@ class ExamenT3PPlaywright:
         """Connexion au portail ExamenT3P."""
         try:
             # Accéder à la page de connexion
-            await self.page.goto(self.URL_LOGIN, wait_until='networkidle', timeout=PAGE_LOAD_TIMEOUT)
-            await asyncio.sleep(ACTION_DELAY * 2)
+            # networkidle attend la fin des scripts tiers: inutile, le bouton est attendu ci-dessous
+            wait_until = 'domcontentloaded' if self.adaptive_waits else 'networkidle'
+            await self.page.goto(self.URL_LOGIN, wait_until=wait_until, timeout=PAGE_LOAD_TIMEOUT)
+            await self._pause(ACTION_DELAY * 2)
 
             # Méthode 1: Cliquer sur "Me connecter" pour ouvrir la modal
             try:
@@ -194,7 +267,7 @@ class ExamenT3PPlaywright:
                 )
                 if me_connecter_btn:
                     await me_connecter_btn.click()
-                    await asyncio.sleep(ACTION_DELAY)
+                    await self._pause(ACTION_DELAY)
             except Exception as e:
                 # Méthode 2: La modal est peut-être déjà ouverte
                 pass
@@ -231,7 +304,7 @@ class ExamenT3PPlaywright:
             if not email_filled:
                 raise Exception("Champ email non trouvé")
 
-            await asyncio.sleep(ACTION_DELAY / 2)
+            await self._pause(ACTION_DELAY / 2)
 
             password_filled = False
             for selector in password_selectors:
@@ -245,7 +318,7 @@ class ExamenT3PPlaywright:
             if not password_filled:
                 raise Exception("Champ mot de passe non trouvé")
 
-            await asyncio.sleep(ACTION_DELAY / 2)
+            await self._pause(ACTION_DELAY / 2)
 
             # Cliquer sur le bouton de connexion - essayer plusieurs sélecteurs
             submit_selectors = [
@@ -271,35 +344,104 @@ class ExamenT3PPlaywright:
                 await self.page.keyboard.press('Enter')
 
             # Attendre la navigation avec plusieurs indicateurs de succès
-            await asyncio.sleep(ACTION_DELAY * 3)
-
-            # Vérifier si connecté avec plusieurs indicateurs
-            success_indicators = [
-                "Vue d'ensemble",
-                "Mon Espace Candidat",
-                "Déconnexion",
-                "Bienvenue",
-                "monEspaceContainer"
-            ]
+            if self.adaptive_waits:
+                await self._wait_for_login_outcome()
+            else:
+                await asyncio.sleep(ACTION_DELAY * 3)
 
-            content = await self.page.content()
-            for indicator in success_indicators:
-                if indicator in content:
-                    return True
+            return await self._is_logged_in()
 
-            # Vérifier l'URL
-            current_url = self.page.url
-            if "mon-espace" in current_url or "dashboard" in current_url:
-                return True
+        except Exception as e:
+            raise Exception(f"Erreur login: {e}")
 
+    async def _is_logged_in(self) -> bool:
+        """Vérifie (contenu, URL) que la page courante est celle d'un candidat connecté."""
+        # Vérifier si connecté avec plusieurs indicateurs
+        try:
+            content = await self.page.content()
+        except Exception:
             return False
+        for indicator in LOGIN_SUCCESS_INDICATORS:
+            if indicator in content:
+                return True
+
+        # Vérifier l'URL
+        current_url = self.page.url
+        if "mon-espace" in current_url or "dashboard" in current_url:
+            return True
+
+        return False
+
+    async def test_connection(self, keep_session: bool = True) -> Tuple[bool, Optional[str]]:
+        """
+        Teste les identifiants (un seul login, sans extraction).
 
+        Args:
+            keep_session: Déposer le contexte connecté dans le pool pour que
+                l'extraction suivante de ces identifiants le reprenne
+
+        Returns:
+            Tuple (success: bool, error_message: str or None)
+        """
+        pool = get_browser_pool()
+        return await pool.run(self._test_connection(pool, keep_session))
+
+    async def _test_connection(self, pool, keep_session: bool) -> Tuple[bool, Optional[str]]:
+        try:
+            context = await pool.new_context(block_resources=self.adaptive_waits)
         except Exception as e:
-            raise Exception(f"Erreur login: {e}")
+            return False, f"Erreur lors du test de connexion: {str(e)}"
 
-    async def _extract_all_pages(self):
-        """Extrait toutes les pages avec gestion d'erreurs individuelle."""
+        success, error = False, None
+        try:
+            await self._open_page(context)
+            success, error = await self._check_connection()
+            return success, error
+        except Exception as e:
+            return False, f"Erreur lors du test de connexion: {str(e)}"
+        finally:
+            if success and keep_session:
+                await pool.store_session(self.identifiant, self.password, context)
+            else:
+                await context.close()
+
+    async def _check_connection(self) -> Tuple[bool, Optional[str]]:
+        """Login + diagnostic de l'échec (identifiants invalides, page inconnue)."""
+        if await self._login():
+            return True, None
+
+        content = await self.page.content()
+        if "espace-candidat" in self.page.url:
+            return True, None
+
+        # Vérifier si erreur de connexion visible
+        error_indicators = [
+            "Identifiant ou mot de passe incorrect",
+            "invalid",
+            "erreur",
+            "échec",
+            "Mot de passe oublié"  # Si on voit encore ce bouton, on n'est pas connecté
+        ]
+        content_lower = content.lower()
+        for error in error_indicators:
+            if error.lower() in content_lower and "Me connecter" in content:
+                return False, "Identifiants invalides"
+
+        # Si on ne trouve pas les indicateurs mais qu'on n'est plus sur la page de login
+        if "Me connecter" not in content:
+            # Probablement connecté mais page différente
+            return True, None
+
+        return False, "Connexion échouée - page d'accueil non détectée"
+
+    async def _extract_all_pages(self, stop_if_unchanged: Optional[str] = None):
+        """
+        Extrait toutes les pages avec gestion d'erreurs individuelle.
 
+        Les pages en échec de cette tentative sont listées dans
+        data['pages_en_erreur'] (extraction partielle, non mise en cache).
+        """
+        self.data['pages_en_erreur'] = []
         # Liste des extractions à effectuer
         extractions = [
             ("📋 Vue d'ensemble", self._extract_overview),
@@ -312,19 +454,80 @@ class ExamenT3PPlaywright:
 
         for name, extract_func in extractions:
             print(f"   {name}...")
+            started = time.perf_counter()
             try:
                 await extract_func()
             except Exception as e:
                 error_msg = f"Erreur {name}: {str(e)[:50]}"
                 print(f"      ⚠️ {error_msg}")
                 self.data['errors'].append(error_msg)
+                self.data['pages_en_erreur'].append(extract_func.__name__.replace('_extract_', ''))
                 # Continuer avec les autres extractions
+            finally:
+                self._record_timing(extract_func.__name__.replace('_extract_', ''), started)
+
+            # Sonde: Vue d'ensemble identique à l'extraction en cache → inutile d'aller plus loin
+            if (stop_if_unchanged and extract_func == self._extract_overview
+                    and self.data.get('dashboard_fingerprint') == stop_if_unchanged):
+                print("   ♻️ Vue d'ensemble inchangée, données en cache conservées")
+                self.data['dashboard_unchanged'] = True
+                return
+
+    def _record_timing(self, step: str, started: float) -> None:
+        """Durée d'une étape (secondes) dans data['step_timings']."""
+        self.data['step_timings'][step] = round(time.perf_counter() - started, 2)
+
+    async def _pause(self, seconds: float) -> None:
+        """Délai fixe entre deux actions (mode délais fixes uniquement)."""
+        if not self.adaptive_waits:
+            await asyncio.sleep(seconds)
+
+    async def _wait_for_settle(self, previous: Optional[str], max_wait: float = SETTLE_MAX_WAIT) -> None:
+        """
+        Attend que le contenu de la page change puis se stabilise.
 
-    async def _safe_click(self, selector: str, timeout: int = ELEMENT_TIMEOUT) -> bool:
-        """Clic sécurisé avec gestion d'erreurs."""
+        Rend la main dès que le texte a changé puis n'a plus bougé pendant
+        SETTLE_STABLE_POLLS lectures consécutives (un rendu partiel de
+        l'onglet, suivi du chargement XHR, relance la fenêtre); au plus
+        max_wait secondes (contenu inchangé ou instable).
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        last, changed, stable_polls = previous, False, 0
+        while loop.time() < deadline:
+            await asyncio.sleep(SETTLE_POLL_INTERVAL)
+            text = await self._safe_get_text()
+            if text != last:
+                changed, last, stable_polls = True, text, 0
+            elif changed:
+                stable_polls += 1
+                if stable_polls >= SETTLE_STABLE_POLLS:
+                    return
+
+    async def _wait_for_login_outcome(self, max_wait: float = LOGIN_OUTCOME_MAX_WAIT) -> None:
+        """Attend l'espace candidat ou un message d'erreur de login (au plus max_wait secondes)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while loop.time() < deadline:
+            await asyncio.sleep(SETTLE_POLL_INTERVAL)
+            if await self._is_logged_in():
+                return
+            try:
+                content = await self.page.content()
+            except Exception:
+                continue  # navigation en cours
+            if any(error in content for error in LOGIN_ERROR_INDICATORS):
+                return
+
+    async def _safe_click(self, selector: str, timeout: int = ELEMENT_TIMEOUT, settle: bool = True) -> bool:
+        """Clic sécurisé avec gestion d'erreurs (puis attente du nouveau contenu si settle)."""
         try:
+            previous = await self._safe_get_text() if self.adaptive_waits and settle else None
             await self.page.click(selector, timeout=timeout)
-            await asyncio.sleep(ACTION_DELAY)
+            if not self.adaptive_waits:
+                await self._pause(ACTION_DELAY)
+            elif settle:
+                await self._wait_for_settle(previous)
             return True
         except Exception as e:
             return False
@@ -441,9 +644,10 @@ class ExamenT3PPlaywright:
         if not clicked:
             # Peut-être déjà sur la page
             pass
-        await asyncio.sleep(ACTION_DELAY)
+        await self._pause(ACTION_DELAY)
 
         text_content = await self._safe_get_text()
+        self.data['dashboard_fingerprint'] = dashboard_fingerprint(text_content)
 
         # === INFORMATIONS CANDIDAT ===
         match = re.search(r'Bienvenue\s+([A-Za-zÀ-ÿ\s]+)\s+-', text_content)
@@ -676,7 +880,7 @@ class ExamenT3PPlaywright:
     async def _extract_examens(self):
         """Extraction des données de Mes Examens."""
         await self._safe_click('a:has-text("Mes Examens")')
-        await asyncio.sleep(ACTION_DELAY)
+        await self._pause(ACTION_DELAY)
 
         text_content = await self._safe_get_text()
 
@@ -708,7 +912,7 @@ class ExamenT3PPlaywright:
     async def _extract_documents(self):
         """Extraction du statut des documents."""
         await self._safe_click('a:has-text("Mes Documents")')
-        await asyncio.sleep(ACTION_DELAY)
+        await self._pause(ACTION_DELAY)
 
         text_content = await self._safe_get_text()
 
@@ -843,7 +1047,7 @@ class ExamenT3PPlaywright:
     async def _extract_compte(self):
         """Extraction des informations du compte."""
         await self._safe_click('a:has-text("Mon Compte")')
-        await asyncio.sleep(ACTION_DELAY)
+        await self._pause(ACTION_DELAY)
 
         text_content = await self._safe_get_text()
 
@@ -902,7 +1106,7 @@ class ExamenT3PPlaywright:
     async def _extract_paiements(self):
         """Extraction de l'historique des paiements."""
         await self._safe_click('a:has-text("Mes Paiements")')
-        await asyncio.sleep(ACTION_DELAY)
+        await self._pause(ACTION_DELAY)
 
         text_content = await self._safe_get_text()
 
@@ -968,7 +1172,7 @@ class ExamenT3PPlaywright:
     async def _extract_messages(self):
         """Extraction des messages avec la CMA."""
         await self._safe_click('a:has-text("Messages")')
-        await asyncio.sleep(ACTION_DELAY)
+        await self._pause(ACTION_DELAY)
 
         text_content = await self._safe_get_text()
 
@@ -996,7 +1200,7 @@ class ExamenT3PPlaywright:
     async def _safe_logout(self):
         """Déconnexion sécurisée (non bloquante)."""
         try:
-            await self._safe_click('a:has-text("Déconnexion")', timeout=5000)
+            await self._safe_click('a:has-text("Déconnexion")', timeout=5000, settle=False)
         except Exception as e:
             pass
 
@@ -1014,4 +1218,145 @@ def extract_exament3p_sync(identifiant: str, password: str, max_retries: int = M
         Dictionnaire avec les données extraites
     """
     extractor = ExamenT3PPlaywright(identifiant, password, max_retries)
-    return asyncio.run(extractor.extract_all())
+    return get_browser_pool().run_sync(extractor.extract_all())
+
+
+def extract_exament3p_cached(
+    identifiant: str,
+    password: str,
+    max_retries: int = MAX_RETRIES,
+    force_refresh: bool = False
+) -> Dict:
+    """
+    Extraction ExamenT3P via le cache des résultats.
+
+    - Tous les groupes de champs frais → données en cache, sans navigateur
+    - Seuls des groupes du tableau de bord périmés → sonde (login + Vue
+      d'ensemble); inchangée → cache revalidé, sinon extraction complète
+      dans la même session
+    - Sinon (ou force_refresh) → extraction complète, mise en cache sauf
+      si une page a échoué (données partielles)
+
+    Args:
+        identifiant: Email du candidat
+        password: Mot de passe ExamenT3P
+        max_retries: Nombre maximum de tentatives
+        force_refresh: Ignorer le cache (l'intention exige des données fraîches)
+
+    Returns:
+        Dictionnaire avec les données extraites + 'cache_status'
+        ('hit' | 'revalidated' | 'refreshed' | 'miss')
+    """
+    if not RESULT_CACHE_ENABLED:
+        return extract_exament3p_sync(identifiant, password, max_retries)
+
+    cache = get_examt3p_result_cache()
+    entry = None if force_refresh else cache.get(identifiant, password)
+    status = 'miss'
+    probe_fingerprint = None
+
+    if entry is not None:
+        stale = cache.stale_groups(entry)
+        if not stale:
+            cache.record('hit')
+            print("   ♻️ Données ExamenT3P en cache (fraîches)")
+            return dict(entry['data'], cache_status='hit')
+        status = 'refreshed'
+        if set(stale) <= set(cache.DASHBOARD_GROUPS):
+            probe_fingerprint = entry['fingerprint']
+
+    extractor = ExamenT3PPlaywright(identifiant, password, max_retries)
+    data = get_browser_pool().run_sync(extractor.extract_all(stop_if_unchanged=probe_fingerprint))
+
+    if data.get('dashboard_unchanged'):
+        cache.touch(identifiant, password, cache.stale_groups(entry))
+        cache.record('revalidated')
+        return dict(entry['data'], cache_status='revalidated')
+
+    if data.get('pages_en_erreur'):
+        print(f"   ⚠️ Extraction partielle ({', '.join(data['pages_en_erreur'])}), non mise en cache")
+    elif not data.get('extraction_requise'):
+        cache.put(identifiant, password, data, fingerprint=data.get('dashboard_fingerprint'))
+    cache.record(status)
+    data['cache_status'] = status
+    return data
+
+
+def _normalize_credentials(credentials: Any) -> Tuple[str, str]:
+    """(identifiant, password) depuis un tuple ou un dict (identifiant/username, password/mot_de_passe)."""
+    if isinstance(credentials, dict):
+        identifiant = credentials.get('identifiant') or credentials.get('username')
+        password = credentials.get('password') or credentials.get('mot_de_passe')
+        return identifiant, password
+    identifiant, password = credentials
+    return identifiant, password
+
+
+def extract_many(
+    credentials_list: Iterable[Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = MAX_RETRIES
+) -> Iterator[Tuple[int, Dict]]:
+    """
+    Extrait les données ExamenT3P de plusieurs candidats en parallèle.
+
+    Les extractions partagent le navigateur du pool (un contexte par
+    candidat); au plus `concurrency` tournent en même temps. Une erreur
+    n'affecte que le candidat concerné.
+
+    Args:
+        credentials_list: (identifiant, password) ou dicts identifiant/password
+        concurrency: Nombre max d'extractions simultanées
+        max_retries: Nombre maximum de tentatives par candidat
+
+    Yields:
+        (index dans credentials_list, données extraites) dans l'ordre de fin
+    """
+    items = [_normalize_credentials(credentials) for credentials in credentials_list]
+    if not items:
+        return
+
+    pool = get_browser_pool()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def extract_one(identifiant: str, password: str) -> Dict:
+        async with semaphore:
+            return await ExamenT3PPlaywright(identifiant, password, max_retries).extract_all()
+
+    futures = {
+        asyncio.run_coroutine_threadsafe(extract_one(identifiant, password), pool.loop): index
+        for index, (identifiant, password) in enumerate(items)
+    }
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                data = {
+                    'identifiant': items[index][0],
+                    'extraction_requise': True,
+                    'errors': [str(e)],
+                    'error': str(e)
+                }
+            yield index, data
+    finally:
+        # Générateur abandonné: annuler les extractions restantes
+        for future in futures:
+            future.cancel()
+
+
+def test_connection_sync(identifiant: str, password: str, keep_session: bool = True) -> Tuple[bool, Optional[str]]:
+    """
+    Fonction synchrone pour tester une connexion ExamenT3P.
+
+    Args:
+        identifiant: Email du candidat
+        password: Mot de passe ExamenT3P
+        keep_session: Garder la session connectée pour l'extraction suivante
+
+    Returns:
+        Tuple (success: bool, error_message: str or None)
+    """
+    extractor = ExamenT3PPlaywright(identifiant, password, max_retries=1)
+    return get_browser_pool().run_sync(extractor.test_connection(keep_session=keep_session))
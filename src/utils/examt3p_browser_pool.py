@@ -0,0 +1,276 @@
+"""
+Pool navigateur ExamT3P: un Chromium persistant par process.
+
+test_examt3p_connection lançait un Chromium complet pour tester un login,
+puis ExamenT3PPlaywright.extract_all en relançait un autre (et se
+reconnectait), et chaque retry global relançait encore le navigateur.
+
+Ce pool garde un seul navigateur vivant par process (worker):
+- Playwright et le navigateur vivent sur une boucle asyncio dédiée
+  (thread daemon); le code sync y accède via run_sync(), le code async
+  d'une autre boucle via run()
+- Chaque candidat obtient un BrowserContext neuf et isolé (cookies,
+  stockage), fermé après usage
+- Navigateur relancé automatiquement s'il est déconnecté (crash)
+- Un test de connexion réussi dépose son contexte connecté (session)
+  que l'extraction reprend directement: un seul login par candidat
+- Sessions non reprises fermées après SESSION_TTL_SECONDS (max MAX_SESSIONS)
+- Contextes allégés (block_resources): images, polices, médias et
+  analytics interceptés et abandonnés
+
+Usage:
+    from src.utils.examt3p_browser_pool import get_browser_pool
+
+    pool = get_browser_pool()
+    context = await pool.new_context()
+"""
+import asyncio
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExamT3PBrowserPool:
+    """
+    Navigateur Chromium partagé + contextes isolés par candidat.
+
+    Thread-safe: toutes les opérations Playwright s'exécutent sur la boucle
+    du pool.
+    """
+
+    # Arguments de lancement (identiques aux anciens launch())
+    LAUNCH_ARGS = ['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
+    VIEWPORT = {'width': 1280, 'height': 720}
+    DEFAULT_TIMEOUT_MS = 30000
+    # Requêtes abandonnées dans les contextes allégés
+    BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media'})
+    BLOCKED_URL_PATTERNS = (
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+        'facebook.net', 'hotjar.com', 'clarity.ms',
+    )
+    # Durée de vie d'une session connectée non reprise (secondes)
+    SESSION_TTL_SECONDS = 300
+    # Sessions connectées conservées au maximum
+    MAX_SESSIONS = 8
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browser = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        # {(identifiant, hash mot de passe): (context, stored_at)}
+        self._sessions: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+
+        # Monitoring
+        self._launches = 0
+        self._contexts = 0
+        self._sessions_stored = 0
+        self._sessions_reused = 0
+        self._sessions_expired = 0
+        self._blocked_requests = 0
+
+    # ------------------------------------------------------------------
+    # Boucle dédiée
+    # ------------------------------------------------------------------
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="examt3p-browser-loop",
+                    daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run_sync(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Exécute une coroutine sur la boucle du pool et attend son résultat (code sync)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    async def run(self, coro: Awaitable[T]) -> T:
+        """Exécute une coroutine sur la boucle du pool depuis n'importe quelle boucle."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    # ------------------------------------------------------------------
+    # Navigateur et contextes (boucle du pool)
+    # ------------------------------------------------------------------
+
+    async def _get_browser(self):
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            from playwright.async_api import async_playwright
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            # NOTE: Ne PAS spécifier executable_path pour laisser Playwright utiliser son navigateur bundlé
+            # Installer les navigateurs avec: playwright install chromium
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=self.LAUNCH_ARGS
+            )
+            self._launches += 1
+            # Les sessions de l'ancien navigateur sont mortes
+            self._sessions.clear()
+            logger.info(f"ExamT3P: navigateur lancé (lancement #{self._launches})")
+            return self._browser
+
+    async def new_context(self, block_resources: bool = False):
+        """
+        Nouveau BrowserContext isolé (viewport et timeout par défaut configurés).
+
+        Args:
+            block_resources: Abandonner images, polices, médias et analytics
+        """
+        browser = await self._get_browser()
+        context = await browser.new_context(viewport=self.VIEWPORT)
+        context.set_default_timeout(self.DEFAULT_TIMEOUT_MS)
+        if block_resources:
+            await context.route("**/*", self._route_lightweight)
+        self._contexts += 1
+        return context
+
+    def is_blocked(self, resource_type: str, url: str) -> bool:
+        """Requête inutile à l'extraction (ressource lourde ou analytics)?"""
+        return resource_type in self.BLOCKED_RESOURCE_TYPES or any(
+            pattern in url for pattern in self.BLOCKED_URL_PATTERNS
+        )
+
+    async def _route_lightweight(self, route) -> None:
+        request = route.request
+        if self.is_blocked(request.resource_type, request.url):
+            self._blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @staticmethod
+    def _session_key(identifiant: str, password: str) -> Tuple[str, str]:
+        return (
+            (identifiant or "").strip().lower(),
+            hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+        )
+
+    async def _expire_sessions(self) -> None:
+        now = time.time()
+        expired = [key for key, (_, stored_at) in self._sessions.items()
+                   if now - stored_at > self.SESSION_TTL_SECONDS]
+        while len(self._sessions) - len(expired) > self.MAX_SESSIONS:
+            key = next(k for k in self._sessions if k not in expired)
+            expired.append(key)
+        for key in expired:
+            context, _ = self._sessions.pop(key)
+            self._sessions_expired += 1
+            await self._close_context(context)
+
+    @staticmethod
+    async def _close_context(context) -> None:
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"ExamT3P: fermeture contexte: {e}")
+
+    async def store_session(self, identifiant: str, password: str, context) -> None:
+        """Dépose un contexte connecté pour la prochaine extraction de ces identifiants."""
+        key = self._session_key(identifiant, password)
+        previous = self._sessions.pop(key, None)
+        if previous is not None:
+            await self._close_context(previous[0])
+        self._sessions[key] = (context, time.time())
+        self._sessions_stored += 1
+        await self._expire_sessions()
+
+    async def take_session(self, identifiant: str, password: str):
+        """Reprend le contexte connecté déposé par un test de connexion (ou None)."""
+        await self._expire_sessions()
+        entry = self._sessions.pop(self._session_key(identifiant, password), None)
+        if entry is None:
+            return None
+        self._sessions_reused += 1
+        return entry[0]
+
+    async def _close(self) -> None:
+        for context, _ in list(self._sessions.values()):
+            await self._close_context(context)
+        self._sessions.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.debug(f"ExamT3P: fermeture navigateur: {e}")
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"ExamT3P: arrêt playwright: {e}")
+            self._playwright = None
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Ferme les sessions, le navigateur et Playwright."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            self.run_sync(self._close(), timeout)
+        except Exception as e:
+            logger.warning(f"ExamT3P: erreur fermeture du pool navigateur: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics for monitoring.
+
+        Returns:
+            Dict with browser launches, contexts created and session handoffs
+        """
+        return {
+            "browser_connected": bool(self._browser is not None and self._browser.is_connected()),
+            "launches": self._launches,
+            "contexts": self._contexts,
+            "sessions_open": len(self._sessions),
+            "sessions_stored": self._sessions_stored,
+            "sessions_reused": self._sessions_reused,
+            "sessions_expired": self._sessions_expired,
+            "blocked_requests": self._blocked_requests,
+        }
+
+
+_pool: Optional[ExamT3PBrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> ExamT3PBrowserPool:
+    """
+    Get the process-wide ExamT3PBrowserPool (closed at interpreter exit).
+
+    Returns:
+        ExamT3PBrowserPool instance
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExamT3PBrowserPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -58,9 +58,7 @@ def extract_credentials_from_threads(threads: List[Dict]) -> Optional[Dict[str,
 
     # Appeler Claude pour extraire les identifiants
     try:
-        from anthropic import Anthropic
-
-        client = Anthropic()
+        from src.llm_client import create_message
 
         prompt = f"""Analyse ces messages d'un candidat et extrait ses identifiants de connexion ExamT3P s'il les a communiqués.
 
@@ -82,10 +80,11 @@ Réponds UNIQUEMENT en JSON valide (sans texte avant/après):
 Si tu ne trouves pas d'identifiants, réponds:
 {{"identifiant": null, "mot_de_passe": null, "confidence": 0}}"""
 
-        response = client.messages.create(
-            model="claude-3-5-haiku-20241022",  # Modèle rapide pour extraction
+        response = create_message(
+            stage="examt3p_credentials",
+            model="fast",  # Modèle rapide pour extraction
             max_tokens=200,
-            messages=[{"role": "user", "content": prompt}]
+            content=prompt
         )
 
         response_text = response.content[0].text.strip()
@@ -147,6 +146,10 @@ def test_examt3p_connection(identifiant: str, mot_de_passe: str) -> Tuple[bool,
     """
     Test la connexion ExamT3P avec les identifiants fournis.
 
+    Utilise le navigateur partagé (examt3p_browser_pool). En cas de succès, la
+    session connectée est conservée: l'extraction qui suit pour ces
+    identifiants la reprend sans nouveau login.
+
     Args:
         identifiant: IDENTIFIANT_EVALBOX
         mot_de_passe: MDP_EVALBOX
@@ -154,145 +157,24 @@ def test_examt3p_connection(identifiant: str, mot_de_passe: str) -> Tuple[bool,
     Returns:
         Tuple (success: bool, error_message: str or None)
     """
-    import asyncio
-
     try:
-        from playwright.async_api import async_playwright
+        import playwright.async_api  # noqa: F401
     except ImportError:
         logger.error("Module playwright non installé")
         return False, "Module playwright non installé - impossible de tester la connexion"
 
-    logger.info(f"Test de connexion ExamT3P pour {identifiant}...")
-
-    async def test_login():
-        """Test de login asynchrone."""
-        try:
-            async with async_playwright() as p:
-                # Lancer le navigateur en mode headless
-                # Note: Playwright trouvera automatiquement le navigateur installé (cross-platform)
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
-                )
-
-                context = await browser.new_context(viewport={'width': 1280, 'height': 720})
-                context.set_default_timeout(30000)  # 30 secondes
-                page = await context.new_page()
-
-                try:
-                    # Accéder à la page de connexion
-                    await page.goto("https://www.exament3p.fr/id/14", wait_until='networkidle', timeout=30000)
-                    await asyncio.sleep(3)  # Augmenté pour s'assurer que la page est chargée
-
-                    # Cliquer sur "Me connecter" pour ouvrir la modal
-                    try:
-                        me_connecter_btn = await page.wait_for_selector('button:has-text("Me connecter")', timeout=10000)
-                        if me_connecter_btn:
-                            await me_connecter_btn.click()
-                            await asyncio.sleep(1)
-                    except Exception as e:
-                        pass
-
-                    # Remplir le formulaire
-                    email_selectors = ['#loginEmail', 'input[type="email"]', 'input[name="email"]']
-                    email_filled = False
-                    for selector in email_selectors:
-                        try:
-                            await page.wait_for_selector(selector, state='visible', timeout=5000)
-                            await page.fill(selector, identifiant)
-                            email_filled = True
-                            break
-                        except Exception as e:
-                            continue
-
-                    if not email_filled:
-                        return False, "Champ email non trouvé"
-
-                    password_selectors = ['#loginPassword', 'input[type="password"]', 'input[name="password"]']
-                    password_filled = False
-                    for selector in password_selectors:
-                        try:
-                            await page.fill(selector, mot_de_passe)
-                            password_filled = True
-                            break
-                        except Exception as e:
-                            continue
-
-                    if not password_filled:
-                        return False, "Champ mot de passe non trouvé"
+    from src.utils.exament3p_playwright import test_connection_sync, RESULT_CACHE_ENABLED
+    from src.utils.examt3p_result_cache import get_examt3p_result_cache
 
-                    # Cliquer sur le bouton de connexion
-                    submit_selectors = [
-                        '#loginModal button:has-text("Se connecter")',
-                        'button:has-text("Se connecter")',
-                        'button[type="submit"]'
-                    ]
+    # Login réussi très récemment avec ces identifiants (relance rapprochée): pas de navigateur
+    if RESULT_CACHE_ENABLED and get_examt3p_result_cache().recently_validated(identifiant, mot_de_passe):
+        logger.info("✅ Connexion ExamT3P validée récemment (cache des extractions)")
+        return True, None
 
-                    submitted = False
-                    for selector in submit_selectors:
-                        try:
-                            btn = await page.query_selector(selector)
-                            if btn:
-                                await btn.click()
-                                submitted = True
-                                break
-                        except Exception as e:
-                            continue
-
-                    if not submitted:
-                        await page.keyboard.press('Enter')
-
-                    # Attendre la navigation (augmenté pour laisser la page charger)
-                    await asyncio.sleep(5)
-
-                    # Vérifier si connecté - mêmes indicateurs que exament3p_playwright.py
-                    success_indicators = [
-                        "Vue d'ensemble",
-                        "Mon Espace Candidat",
-                        "Déconnexion",
-                        "Bienvenue",
-                        "monEspaceContainer"  # ID/class présent sur la page après login
-                    ]
-
-                    content = await page.content()
-                    for indicator in success_indicators:
-                        if indicator in content:
-                            return True, None
-
-                    # Vérifier l'URL
-                    current_url = page.url
-                    if "mon-espace" in current_url or "dashboard" in current_url or "espace-candidat" in current_url:
-                        return True, None
-
-                    # Vérifier si erreur de connexion visible
-                    error_indicators = [
-                        "Identifiant ou mot de passe incorrect",
-                        "invalid",
-                        "erreur",
-                        "échec",
-                        "Mot de passe oublié"  # Si on voit encore ce bouton, on n'est pas connecté
-                    ]
-                    content_lower = content.lower()
-                    for error in error_indicators:
-                        if error.lower() in content_lower and "Me connecter" in content:
-                            return False, "Identifiants invalides"
-
-                    # Si on ne trouve pas les indicateurs mais qu'on n'est plus sur la page de login
-                    if "Me connecter" not in content:
-                        # Probablement connecté mais page différente
-                        return True, None
-
-                    return False, "Connexion échouée - page d'accueil non détectée"
-
-                finally:
-                    await browser.close()
-
-        except Exception as e:
-            return False, f"Erreur lors du test de connexion: {str(e)}"
+    logger.info(f"Test de connexion ExamT3P pour {identifiant}...")
 
     try:
-        # Exécuter le test de login
-        success, error = asyncio.run(test_login())
+        success, error = test_connection_sync(identifiant, mot_de_passe)
 
         if success:
             logger.info("✅ Test de connexion ExamT3P réussi")
@@ -592,14 +474,17 @@ def get_credentials_with_validation(
 
             # Importer l'extracteur ExamT3P
             try:
-                from exament3p_playwright import extract_exament3p_sync
-
-                # Extraire les données des deux comptes
-                logger.info(f"  📊 Extraction compte CRM: {identifiant_crm}")
-                data_crm = extract_exament3p_sync(identifiant_crm, mdp_crm, max_retries=1)
-
-                logger.info(f"  📊 Extraction compte Thread: {identifiant_threads}")
-                data_threads = extract_exament3p_sync(identifiant_threads, mdp_threads, max_retries=1)
+                from exament3p_playwright import extract_many
+
+                # Extraire les données des deux comptes (en parallèle)
+                logger.info(f"  📊 Extraction comptes CRM ({identifiant_crm}) et Thread ({identifiant_threads})")
+                extracted = dict(extract_many(
+                    [(identifiant_crm, mdp_crm), (identifiant_threads, mdp_threads)],
+                    concurrency=2,
+                    max_retries=1
+                ))
+                data_crm = extracted[0]
+                data_threads = extracted[1]
 
                 # Analyser les statuts de paiement
                 crm_paid = _is_account_paid(data_crm, "CRM")
@@ -461,6 +461,17 @@ def find_exam_session_by_date_and_dept(
 
     logger.info(f"  🔍 Recherche session: date={date_formatted}, département={departement}")
 
+    # 1. Catalogue local (pas d'appel API si déjà chargé)
+    try:
+        from src.utils.exam_date_catalogue import get_exam_date_catalogue
+        session = get_exam_date_catalogue().find_session(crm_client, date_iso, departement)
+        if session:
+            logger.info(f"  ✅ Session trouvée: {session.get('Name')} (ID: {session.get('id')})")
+            return session
+    except Exception as e:
+        logger.warning(f"  ⚠️ Catalogue dates indisponible, recherche CRM directe: {e}")
+
+    # 2. Recherche CRM (sessions inactives, absentes du catalogue)
     try:
         url = f"{settings.zoho_crm_api_url}/Dates_Examens_VTC_TAXI/search"
 
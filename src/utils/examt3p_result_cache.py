@@ -0,0 +1,287 @@
+"""
+Cache persistant (SQLite) des extractions ExamT3P, par compte.
+
+_run_analysis scrapait ExamT3P à chaque passage, même pour une relance
+arrivée quelques minutes après le ticket précédent du même candidat.
+
+- Clé: HMAC-SHA256 de l'identifiant (le mot de passe n'est stocké que sous
+  forme de HMAC, pour détecter un changement d'identifiants). Le secret
+  vient de EXAMT3P_CACHE_SECRET, sinon d'un fichier <base>.key (0600) généré
+  au premier lancement: sans lui, la base ne permet pas de tester des mots
+  de passe
+- TTL par groupe de champs (FIELD_GROUP_TTL_SECONDS): statut/documents
+  courts, examens et paiements plus longs, compte encore plus long
+- Les groupes couverts par le tableau de bord (DASHBOARD_GROUPS) peuvent
+  être revalidés par une sonde: login + Vue d'ensemble seule, comparée à
+  l'empreinte (fingerprint) de l'extraction en cache
+- Seules les extractions réussies sont mises en cache (aucune page en
+  erreur: une extraction partielle n'est pas servie comme fraîche)
+
+La décision (cache / sonde / extraction complète) est prise par
+extract_exament3p_cached (exament3p_playwright.py).
+
+Usage:
+    from src.utils.examt3p_result_cache import get_examt3p_result_cache
+
+    cache = get_examt3p_result_cache()
+    entry = cache.get(identifiant, password)
+    if entry and not cache.stale_groups(entry):
+        data = entry['data']
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "examt3p_cache.db"
+
+# Version du schéma (PRAGMA user_version). 1: clés HMAC (avant: SHA-256 sans
+# secret, entrées supprimées à l'ouverture)
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS examt3p_results (
+    account_key TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    fingerprint TEXT,
+    data TEXT NOT NULL,
+    group_fetched_at TEXT NOT NULL,
+    extracted_at REAL NOT NULL
+);
+"""
+
+
+class ExamT3PResultCache:
+    """
+    Cache des résultats d'extraction ExamT3P.
+
+    Thread-safe (RLock sur une connexion SQLite en mode WAL).
+    """
+
+    # Durée de validité par groupe de champs (secondes)
+    FIELD_GROUP_TTL_SECONDS = {
+        'status': 30 * 60,         # statut dossier, progression, actions, documents
+        'messages': 2 * 3600,      # échanges avec la CMA
+        'examens': 6 * 3600,       # dates d'examen, convocation
+        'paiements': 6 * 3600,     # paiement CMA, historique
+        'compte': 24 * 3600,       # informations personnelles
+    }
+    # Groupes reflétés par la Vue d'ensemble (revalidables par la sonde)
+    DASHBOARD_GROUPS = ('status',)
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        secret: Optional[str] = None
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = dict(self.FIELD_GROUP_TTL_SECONDS)
+        self.ttl_seconds.update(ttl_seconds or {})
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS examt3p_results")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._secret = (secret or os.getenv("EXAMT3P_CACHE_SECRET") or self._load_secret()).encode("utf-8")
+
+        # Monitoring (process courant)
+        self._hits = 0
+        self._revalidated = 0
+        self._refreshed = 0
+        self._misses = 0
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _load_secret(self) -> str:
+        """Secret HMAC du fichier <base>.key, créé (0600) s'il n'existe pas."""
+        key_path = f"{os.path.abspath(self.db_path)}.key"
+        try:
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(key_path, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        secret = secrets.token_hex(32)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(secret)
+        logger.info(f"ExamT3P cache: secret HMAC généré ({key_path})")
+        return secret
+
+    def _hash(self, value: str) -> str:
+        return hmac.new(self._secret, (value or "").encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _account_key(self, identifiant: str) -> str:
+        return self._hash((identifiant or "").strip().lower())
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def get(self, identifiant: str, password: str) -> Optional[Dict[str, Any]]:
+        """
+        Entrée en cache pour ces identifiants.
+
+        Returns:
+            {'data', 'fingerprint', 'group_fetched_at', 'extracted_at'} ou None
+            (absente, ou mot de passe différent)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM examt3p_results WHERE account_key = ?", (self._account_key(identifiant),)
+            ).fetchone()
+        if row is None or row["password_hash"] != self._hash(password):
+            return None
+        return {
+            'data': json.loads(row["data"]),
+            'fingerprint': row["fingerprint"],
+            'group_fetched_at': json.loads(row["group_fetched_at"]),
+            'extracted_at': row["extracted_at"],
+        }
+
+    def stale_groups(self, entry: Dict[str, Any], now: Optional[float] = None) -> List[str]:
+        """Groupes de champs dont le TTL est dépassé."""
+        now = now or time.time()
+        fetched = entry.get('group_fetched_at', {})
+        return [
+            group for group, ttl in self.ttl_seconds.items()
+            if now - fetched.get(group, 0) > ttl
+        ]
+
+    def recently_validated(self, identifiant: str, password: str, max_age: Optional[float] = None) -> bool:
+        """Login réussi (extraction ou sonde) avec ces identifiants depuis moins de max_age secondes."""
+        entry = self.get(identifiant, password)
+        if entry is None:
+            return False
+        max_age = max_age if max_age is not None else min(self.ttl_seconds.values())
+        last_login = max(entry['group_fetched_at'].values(), default=0)
+        return time.time() - last_login <= max_age
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def put(self, identifiant: str, password: str, data: Dict[str, Any], fingerprint: Optional[str] = None) -> None:
+        """Enregistre une extraction complète (tous les groupes frais)."""
+        now = time.time()
+        groups = {group: now for group in self.ttl_seconds}
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO examt3p_results
+                    (account_key, password_hash, fingerprint, data, group_fetched_at, extracted_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (self._account_key(identifiant), self._hash(password), fingerprint,
+                 json.dumps(data, ensure_ascii=False, default=str), json.dumps(groups), now)
+            )
+
+    def touch(self, identifiant: str, password: str, groups: Iterable[str]) -> None:
+        """Marque des groupes comme frais (sonde: tableau de bord inchangé)."""
+        entry = self.get(identifiant, password)
+        if entry is None:
+            return
+        now = time.time()
+        fetched = entry['group_fetched_at']
+        for group in groups:
+            fetched[group] = now
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE examt3p_results SET group_fetched_at = ? WHERE account_key = ?",
+                (json.dumps(fetched), self._account_key(identifiant))
+            )
+
+    def invalidate(self, identifiant: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM examt3p_results WHERE account_key = ?", (self._account_key(identifiant),))
+
+    # ------------------------------------------------------------------
+    # Monitoring
+    # ------------------------------------------------------------------
+
+    def record(self, status: str) -> None:
+        """Compte l'issue d'une lecture (hit, revalidated, refreshed, miss)."""
+        with self._lock:
+            if status == 'hit':
+                self._hits += 1
+            elif status == 'revalidated':
+                self._revalidated += 1
+            elif status == 'refreshed':
+                self._refreshed += 1
+            else:
+                self._misses += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for monitoring.
+
+        Returns:
+            Dict with accounts cached and hits / revalidations / refreshes / misses
+        """
+        with self._lock:
+            accounts = self._conn.execute("SELECT COUNT(*) FROM examt3p_results").fetchone()[0]
+            lookups = self._hits + self._revalidated + self._refreshed + self._misses
+            return {
+                "accounts": accounts,
+                "hits": self._hits,
+                "revalidated": self._revalidated,
+                "refreshed": self._refreshed,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._revalidated) / lookups, 3) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, ExamT3PResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _ttl_from_env() -> Dict[str, float]:
+    """TTL surchargés par EXAMT3P_CACHE_TTL_<GROUPE> (secondes)."""
+    ttl = {}
+    for group in ExamT3PResultCache.FIELD_GROUP_TTL_SECONDS:
+        value = os.getenv(f"EXAMT3P_CACHE_TTL_{group.upper()}")
+        if value:
+            ttl[group] = float(value)
+    return ttl
+
+
+def get_examt3p_result_cache(db_path: Optional[str] = None) -> ExamT3PResultCache:
+    """
+    Get the ExamT3PResultCache for a database path (one instance per path and process).
+
+    Args:
+        db_path: Chemin de la base (défaut: EXAMT3P_CACHE_PATH ou examt3p_cache.db)
+
+    Returns:
+        ExamT3PResultCache instance
+    """
+    path = os.path.abspath(db_path or os.getenv("EXAMT3P_CACHE_PATH", DEFAULT_DB_PATH))
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ExamT3PResultCache(path, ttl_seconds=_ttl_from_env())
+        return _caches[path]
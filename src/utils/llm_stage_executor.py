@@ -0,0 +1,104 @@
+"""
+Étage LLM parallèle: exécute les appels LLM indépendants d'un même ticket
+en même temps.
+
+Après le rendu du template, _run_state_driven_response enchaînait
+humanisation (Sonnet, jusqu'à 2 tentatives), extraction CRM (Haiku) et,
+plus tard, la note CRM (Sonnet). Les mises à jour CRM ne dépendent que du
+template et de l'état détecté; la note résume le texte final envoyé au
+candidat, donc part après la validation:
+
+    template ──┬── humanisation ── validation ── note CRM ── (jointe au STEP 6)
+               └── mises à jour CRM (extraction LLM éventuelle)
+
+Chaque étape est soumise ici et retourne un Future; l'appelant joint les
+résultats là où ils sont nécessaires. La latence tend vers l'appel le plus
+long au lieu de la somme. Le nombre total d'appels simultanés reste borné
+par le LLMGateway.
+
+- Pool de threads partagé par le process (LLM_STAGE_WORKERS)
+- PARALLEL_LLM_STAGES=false: exécution immédiate et séquentielle, même
+  interface (Future déjà résolu)
+
+Usage:
+    from src.utils.llm_stage_executor import submit_llm_stage
+
+    note_future = submit_llm_stage(generate_note, analysis_result, response_result)
+    ...
+    note = note_future.result()
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_LLM_STAGES = os.getenv('PARALLEL_LLM_STAGES', 'true').lower() == 'true'
+LLM_STAGE_WORKERS = int(os.getenv('LLM_STAGE_WORKERS', '4'))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Monitoring
+_submitted = 0
+_inline = 0
+_stats_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(LLM_STAGE_WORKERS, 1),
+                thread_name_prefix="llm-stage"
+            )
+        return _executor
+
+
+def submit_llm_stage(fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """
+    Lance une étape indépendante de l'étage LLM.
+
+    Returns:
+        Future du résultat (exception de l'étape relevée par .result())
+    """
+    global _submitted, _inline
+    if not PARALLEL_LLM_STAGES:
+        with _stats_lock:
+            _inline += 1
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    with _stats_lock:
+        _submitted += 1
+    return _get_executor().submit(fn, *args, **kwargs)
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Get stage executor statistics for monitoring.
+
+    Returns:
+        Dict with mode, workers and stages submitted / run inline
+    """
+    return {
+        "parallel": PARALLEL_LLM_STAGES,
+        "workers": LLM_STAGE_WORKERS,
+        "submitted": _submitted,
+        "inline": _inline,
+    }
+
+
+def shutdown(wait: bool = True) -> None:
+    """Arrête le pool (recréé à la prochaine soumission)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
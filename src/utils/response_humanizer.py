@@ -10,7 +10,7 @@ import logging
 import re
 from typing import Dict, Any, Optional
 
-import anthropic
+from src.llm_client import create_message
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +136,10 @@ EXEMPLES D'ERREURS À ÉVITER :
 
 FORMAT : Retourne UNIQUEMENT l'email reformulé en HTML."""
 
+# Consigne statique du message utilisateur (préfixe cacheable, avant les données du ticket)
+HUMANIZE_INSTRUCTIONS = """Reformule cet email pour le rendre naturel et fluide.
+Fusionne les sections, ajoute des transitions naturelles, garde toutes les informations factuelles."""
+
 
 def humanize_response(
     template_response: str,
@@ -169,8 +173,6 @@ def humanize_response(
         }
 
     try:
-        client = anthropic.Anthropic()
-
         # Construire le contexte du message précédent si disponible
         previous_context = ""
         if previous_response:
@@ -189,16 +191,13 @@ NOTRE PRÉCÉDENT MESSAGE AU CANDIDAT (éviter de répéter ces infos) :
         for attempt in range(max_attempts):
             is_retry = attempt > 0
 
-            # Prompt de base
-            base_prompt = f"""Reformule cet email pour le rendre naturel et fluide.
-{previous_context}
+            # Prompt de base (la consigne statique HUMANIZE_INSTRUCTIONS est envoyée avant)
+            base_prompt = f"""{previous_context}
 MESSAGE DU CANDIDAT (contexte) :
 {candidate_message[:800]}
 
 EMAIL À REFORMULER :
 {template_response}
-
-Fusionne les sections, ajoute des transitions naturelles, garde toutes les informations factuelles.
 {"IMPORTANT : Évite de répéter les informations déjà communiquées dans notre précédent message." if previous_response else ""}"""
 
             # Prompt renforcé pour le retry
@@ -213,11 +212,13 @@ Tu DOIS conserver les horaires EXACTS de formation : 8h30-17h30 pour les cours d
 NE JAMAIS modifier ces horaires (pas de "8h30 à 16h", pas de "9h-17h", etc.)."""
                 logger.info(f"🔄 Retry humanization (attempt {attempt + 1}/{max_attempts}) - dates requises: {dates_str}")
 
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = create_message(
+                stage="humanize",
+                model="precise",
                 max_tokens=2000,
                 system=HUMANIZE_SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": base_prompt}]
+                instructions=HUMANIZE_INSTRUCTIONS,
+                content=base_prompt
             )
 
             humanized = response.content[0].text.strip()
@@ -0,0 +1,305 @@
+"""
+Catalogue local des sessions de formation (module CRM Sessions1).
+
+get_sessions_for_exam_date et match_sessions_by_date_range interrogeaient
+Sessions1/search à chaque appel (jusqu'à 20 pages), puis filtraient
+Lieu_de_formation en Python. Ce module charge les sessions planifiées UNE
+fois par process (rechargement toutes les REFRESH_INTERVAL secondes) et les
+range dans un index d'intervalles (Date_d_but, Date_fin):
+
+- Partition par type (jour = cdj-*, soir = cds-*, autre) et par lieu
+- Dans chaque partition: sessions triées par Date_fin + bisect
+- "Sessions se terminant entre X et Y" = O(log n + k), sans appel API
+- "Sessions chevauchant [X, Y]" = bisect sur Date_fin ∈ [X, Y + durée max]
+
+Usage:
+    from src.utils.session_catalogue import get_session_catalogue
+
+    catalogue = get_session_catalogue()
+    sessions = catalogue.sessions_ending_between(
+        crm_client, "2026-03-01", "2026-03-28", start_from="2026-02-10"
+    )
+"""
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODULE_NAME = "Sessions1"
+
+
+def get_lieu_name(session: Dict[str, Any]) -> str:
+    """Nom du lieu de formation (lookup {name, id} ou chaîne)."""
+    lieu = session.get('Lieu_de_formation')
+    if isinstance(lieu, dict):
+        return lieu.get('name', '') or ''
+    return str(lieu) if lieu else ''
+
+
+def get_session_kind(session: Dict[str, Any]) -> str:
+    """Type de session d'après la convention de nommage: 'jour' (cdj-*), 'soir' (cds-*) ou 'autre'."""
+    name = (session.get('Name') or '').lower()
+    if name.startswith('cdj'):
+        return 'jour'
+    if name.startswith('cds'):
+        return 'soir'
+    return 'autre'
+
+
+def normalize_session_type(session_type: Optional[str]) -> Optional[str]:
+    """'cdj'/'jour' → 'jour', 'cds'/'soir' → 'soir', sinon None (tous types)."""
+    if session_type in ('cdj', 'jour'):
+        return 'jour'
+    if session_type in ('cds', 'soir'):
+        return 'soir'
+    return None
+
+
+class _IntervalPartition:
+    """Sessions d'une partition (type, lieu), triées par Date_fin."""
+
+    def __init__(self, sessions: List[Dict[str, Any]]):
+        self.sessions = sorted(sessions, key=lambda s: s['Date_fin'])
+        self.end_keys = [s['Date_fin'] for s in self.sessions]
+        # Durée max (jours) pour borner la recherche de chevauchement
+        self.max_duration = 0
+        for s in self.sessions:
+            try:
+                start = datetime.strptime(s['Date_d_but'], "%Y-%m-%d")
+                end = datetime.strptime(s['Date_fin'], "%Y-%m-%d")
+                self.max_duration = max(self.max_duration, (end - start).days)
+            except ValueError:
+                continue
+
+    def ending_between(self, end_from: str, end_to: str) -> List[Dict[str, Any]]:
+        lo = bisect.bisect_left(self.end_keys, end_from)
+        hi = bisect.bisect_right(self.end_keys, end_to)
+        return self.sessions[lo:hi]
+
+    def overlapping(self, start: str, end: str) -> List[Dict[str, Any]]:
+        # Date_d_but <= end ⇒ Date_fin <= end + durée max
+        upper = (datetime.strptime(end, "%Y-%m-%d") + timedelta(days=self.max_duration)).strftime("%Y-%m-%d")
+        return [s for s in self.ending_between(start, upper) if s['Date_d_but'] <= end]
+
+
+class SessionCatalogue:
+    """
+    Catalogue process-wide des sessions de formation planifiées.
+
+    Thread-safe (RLock): partagé entre tous les workflows d'un même process.
+    """
+
+    _instance: Optional["SessionCatalogue"] = None
+    _lock = threading.RLock()
+
+    # Rechargement complet toutes les 15 minutes
+    REFRESH_INTERVAL = 900
+
+    PER_PAGE = 200  # Max autorisé par Zoho
+    MAX_PAGES = 20  # 20 pages × 200 = 4000 sessions max
+
+    def __new__(cls) -> "SessionCatalogue":
+        """Ensure only one instance exists (singleton pattern)."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self):
+        """Initialize the catalogue (only runs once due to singleton)."""
+        if self._initialized:
+            return
+
+        self._partitions: Dict[Tuple[str, str], _IntervalPartition] = {}  # {(type, lieu): partition}
+        self._session_count = 0
+        self._loaded_at: float = 0
+
+        # Monitoring
+        self._loads = 0
+        self._api_calls = 0
+        self._lookups = 0
+
+        self._initialized = True
+
+    def _load(self, crm_client) -> None:
+        """Charge les sessions planifiées non commencées et reconstruit l'index."""
+        from config import settings
+
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        url = f"{settings.zoho_crm_api_url}/{MODULE_NAME}/search"
+        criteria = (
+            f"(((Statut:equals:PLANIFIÉ)or(Statut:equals:null))"
+            f"and(Date_d_but:greater_equal:{today_str}))"
+        )
+
+        all_sessions = []
+        page = 1
+        while page <= self.MAX_PAGES:
+            params = {
+                "criteria": criteria,
+                "page": page,
+                "per_page": self.PER_PAGE
+            }
+            response = crm_client._make_request("GET", url, params=params)
+            self._api_calls += 1
+            sessions = response.get("data", [])
+
+            if not sessions:
+                break
+
+            all_sessions.extend(sessions)
+
+            if len(sessions) < self.PER_PAGE:
+                break
+
+            page += 1
+
+        grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        count = 0
+        for session in all_sessions:
+            if not session.get('Date_d_but') or not session.get('Date_fin'):
+                continue
+            key = (get_session_kind(session), get_lieu_name(session))
+            grouped.setdefault(key, []).append(session)
+            count += 1
+
+        self._partitions = {key: _IntervalPartition(sessions) for key, sessions in grouped.items()}
+        self._session_count = count
+        self._loaded_at = time.time()
+        self._loads += 1
+        logger.info(f"📚 Catalogue sessions chargé: {count} session(s), {len(self._partitions)} partition(s)")
+
+    def ensure_fresh(self, crm_client, force: bool = False) -> None:
+        """Charge ou recharge le catalogue si nécessaire."""
+        with self._lock:
+            if force or not self._loaded_at or time.time() - self._loaded_at >= self.REFRESH_INTERVAL:
+                self._load(crm_client)
+
+    def _select_partitions(
+        self,
+        session_type: Optional[str],
+        lieu_filter: Optional[Callable[[str], bool]]
+    ) -> List[_IntervalPartition]:
+        kind = normalize_session_type(session_type)
+        return [
+            partition
+            for (p_kind, lieu), partition in self._partitions.items()
+            if (kind is None or p_kind == kind) and (lieu_filter is None or lieu_filter(lieu))
+        ]
+
+    def _query(
+        self,
+        crm_client,
+        lookup: Callable[[_IntervalPartition], List[Dict[str, Any]]],
+        session_type: Optional[str],
+        lieu_filter: Optional[Callable[[str], bool]],
+        start_from: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        self.ensure_fresh(crm_client)
+        with self._lock:
+            self._lookups += 1
+            today_str = datetime.now().strftime('%Y-%m-%d')
+            start_min = max(start_from or today_str, today_str)
+            result = []
+            for partition in self._select_partitions(session_type, lieu_filter):
+                for session in lookup(partition):
+                    # Sessions déjà commencées exclues (le catalogue vit plusieurs jours)
+                    if session['Date_d_but'] >= start_min:
+                        result.append(dict(session))
+            result.sort(key=lambda s: s['Date_fin'])
+            return result
+
+    def sessions_ending_between(
+        self,
+        crm_client,
+        end_from: str,
+        end_to: str,
+        session_type: Optional[str] = None,
+        lieu_filter: Optional[Callable[[str], bool]] = None,
+        start_from: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sessions dont Date_fin ∈ [end_from, end_to] (YYYY-MM-DD), triées par Date_fin.
+
+        Args:
+            crm_client: Client Zoho CRM (utilisé uniquement pour (re)charger)
+            end_from: Borne basse de Date_fin
+            end_to: Borne haute de Date_fin
+            session_type: 'jour'/'cdj', 'soir'/'cds' ou None (tous types)
+            lieu_filter: Prédicat sur le nom du lieu de formation
+            start_from: Date_d_but minimum (défaut: aujourd'hui)
+
+        Returns:
+            Liste des sessions (copies)
+        """
+        return self._query(
+            crm_client,
+            lambda partition: partition.ending_between(end_from, end_to),
+            session_type, lieu_filter, start_from
+        )
+
+    def sessions_overlapping(
+        self,
+        crm_client,
+        start: str,
+        end: str,
+        session_type: Optional[str] = None,
+        lieu_filter: Optional[Callable[[str], bool]] = None,
+        start_from: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sessions dont l'intervalle (Date_d_but, Date_fin) chevauche [start, end].
+
+        Mêmes arguments que sessions_ending_between.
+        """
+        return self._query(
+            crm_client,
+            lambda partition: partition.overlapping(start, end),
+            session_type, lieu_filter, start_from
+        )
+
+    def list_locations(self) -> List[str]:
+        """Lieux de formation présents dans le catalogue (debug)."""
+        with self._lock:
+            return sorted({lieu for _, lieu in self._partitions})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get catalogue statistics for monitoring.
+
+        Returns:
+            Dict with sessions, partitions, loads, api_calls, lookups
+        """
+        with self._lock:
+            return {
+                "sessions": self._session_count,
+                "partitions": len(self._partitions),
+                "loads": self._loads,
+                "api_calls": self._api_calls,
+                "lookups": self._lookups,
+            }
+
+    def clear(self) -> None:
+        """Vide le catalogue (force un rechargement au prochain appel)."""
+        with self._lock:
+            self._partitions = {}
+            self._session_count = 0
+            self._loaded_at = 0
+            self._loads = 0
+            self._api_calls = 0
+            self._lookups = 0
+
+
+def get_session_catalogue() -> SessionCatalogue:
+    """
+    Get the singleton SessionCatalogue instance.
+
+    Returns:
+        SessionCatalogue singleton instance
+    """
+    return SessionCatalogue()
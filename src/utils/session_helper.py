@@ -23,6 +23,16 @@ MIN_DAYS_BEFORE_EXAM = 3
 MAX_DAYS_BEFORE_EXAM = 60
 
 
+def _is_uber_visio_lieu(lieu_name: str) -> bool:
+    """Lieu des sessions Uber: VISIO Zoom VTC."""
+    return 'VISIO' in lieu_name.upper() and 'VTC' in lieu_name.upper()
+
+
+def _is_visio_lieu(lieu_name: str) -> bool:
+    """Lieu en visio (VISIO ou Zoom)."""
+    return 'visio' in lieu_name.lower() or 'zoom' in lieu_name.lower()
+
+
 def get_sessions_for_exam_date(
     crm_client,
     exam_date: str,
@@ -43,7 +53,7 @@ def get_sessions_for_exam_date(
     Returns:
         Liste des sessions avec leurs infos
     """
-    from config import settings
+    from src.utils.session_catalogue import get_session_catalogue
 
     logger.info(f"🔍 Recherche des sessions pour l'examen du {exam_date}")
 
@@ -62,81 +72,21 @@ def get_sessions_for_exam_date(
         logger.info(f"  Filtrage: Date_debut >= {today_str} (sessions non commencées)")
         logger.info(f"  Filtrage: Lieu_de_formation = VISIO Zoom VTC (sessions Uber uniquement)")
 
-        # Rechercher les sessions planifiées
-        url = f"{settings.zoho_crm_api_url}/Sessions1/search"
-
-        # Critère:
-        # - Statut = PLANIFIÉ (ou null)
-        # - Date_fin dans la plage (proche de l'examen)
-        # - Date_debut >= aujourd'hui (pas encore commencée)
-        # Note: Filtrage Lieu_de_formation = VISIO Zoom VTC fait en Python après récupération
-        criteria = (
-            f"(((Statut:equals:PLANIFIÉ)or(Statut:equals:null))"
-            f"and(Date_fin:greater_equal:{min_end_date.strftime('%Y-%m-%d')})"
-            f"and(Date_fin:less_equal:{max_end_date.strftime('%Y-%m-%d')})"
-            f"and(Date_d_but:greater_equal:{today_str}))"
+        # Sessions planifiées (Statut = PLANIFIÉ ou null), non commencées,
+        # Date_fin dans la plage, lieu VISIO Zoom VTC (sessions Uber uniquement)
+        # → lookup dans l'index d'intervalles du catalogue local (pas d'appel API)
+        catalogue = get_session_catalogue()
+        uber_sessions = catalogue.sessions_ending_between(
+            crm_client,
+            min_end_date.strftime('%Y-%m-%d'),
+            max_end_date.strftime('%Y-%m-%d'),
+            lieu_filter=_is_uber_visio_lieu,
+            start_from=today_str
         )
 
-        # Pagination - augmentée pour couvrir tous les cas
-        all_sessions = []
-        page = 1
-        max_pages = 20  # 20 pages × 200 = 4000 sessions max
-
-        while page <= max_pages:
-            params = {
-                "criteria": criteria,
-                "page": page,
-                "per_page": 200
-            }
-
-            response = crm_client._make_request("GET", url, params=params)
-            sessions = response.get("data", [])
-
-            if not sessions:
-                break
-
-            all_sessions.extend(sessions)
-            logger.info(f"  Page {page}: {len(sessions)} session(s) récupérée(s)")
-
-            if len(sessions) < 200:
-                break
-
-            page += 1
-
-        if not all_sessions:
-            logger.warning(f"Aucune session trouvée pour l'examen du {exam_date}")
-            return []
-
-        logger.info(f"  Total: {len(all_sessions)} session(s) trouvée(s) (avant filtrage Lieu)")
-
-        # Filtrer par Lieu_de_formation = VISIO Zoom VTC (sessions Uber uniquement)
-        uber_sessions = []
-        for session in all_sessions:
-            lieu = session.get('Lieu_de_formation')
-            lieu_name = ""
-            if isinstance(lieu, dict):
-                lieu_name = lieu.get('name', '')
-            elif lieu:
-                lieu_name = str(lieu)
-
-            # Garder uniquement les sessions VISIO Zoom VTC
-            if 'VISIO' in lieu_name.upper() and 'VTC' in lieu_name.upper():
-                uber_sessions.append(session)
-                logger.debug(f"  Session Uber: {session.get('Name')} - Lieu: {lieu_name}")
-            else:
-                logger.debug(f"  Session ignorée (lieu={lieu_name}): {session.get('Name')}")
-
         if not uber_sessions:
-            # Debug: lister les lieux trouvés
-            lieux_trouves = set()
-            for s in all_sessions[:10]:  # Limiter à 10 pour le log
-                lieu = s.get('Lieu_de_formation')
-                if isinstance(lieu, dict):
-                    lieux_trouves.add(lieu.get('name', 'N/A'))
-                elif lieu:
-                    lieux_trouves.add(str(lieu))
             logger.warning(f"Aucune session Uber (VISIO Zoom VTC) trouvée pour l'examen du {exam_date}")
-            logger.warning(f"  Lieux trouvés dans les {len(all_sessions)} sessions: {lieux_trouves}")
+            logger.warning(f"  Lieux présents dans le catalogue: {catalogue.list_locations()}")
             return []
 
         logger.info(f"  ✅ {len(uber_sessions)} session(s) Uber (VISIO Zoom VTC)")
@@ -203,6 +153,10 @@ def get_sessions_for_multiple_exam_dates(
     """
     Récupère les sessions de formation pour plusieurs dates d'examen.
 
+    Le catalogue de sessions est chargé (au plus) une fois, puis chaque date
+    est une simple recherche en mémoire. Les dates en double ne sont
+    calculées qu'une fois.
+
     Args:
         crm_client: Client Zoho CRM
         exam_dates: Liste des dates d'examen (retournées par get_next_exam_dates)
@@ -211,15 +165,25 @@ def get_sessions_for_multiple_exam_dates(
     Returns:
         Dict avec date_examen comme clé et liste de sessions comme valeur
     """
+    from src.utils.session_catalogue import get_session_catalogue
+
     result = {}
+    sessions_by_date = {}
+
+    try:
+        get_session_catalogue().ensure_fresh(crm_client)
+    except Exception as e:
+        logger.error(f"❌ Erreur chargement catalogue sessions: {e}")
+        return result
 
     for exam_info in exam_dates:
         exam_date = exam_info.get('Date_Examen')
         if exam_date:
-            sessions = get_sessions_for_exam_date(crm_client, exam_date, session_type)
+            if exam_date not in sessions_by_date:
+                sessions_by_date[exam_date] = get_sessions_for_exam_date(crm_client, exam_date, session_type)
             result[exam_date] = {
                 'exam_info': exam_info,
-                'sessions': sessions
+                'sessions': sessions_by_date[exam_date]
             }
 
     return result
@@ -745,7 +709,7 @@ def match_sessions_by_date_range(
             'sessions_proposees': [sessions formatées pour template]
         }
     """
-    from config import settings
+    from src.utils.session_catalogue import get_session_catalogue
 
     result = {
         'match_type': 'NO_MATCH',
@@ -791,44 +755,25 @@ def match_sessions_by_date_range(
     search_end = (end_date + timedelta(days=30)).strftime('%Y-%m-%d')
 
     try:
-        url = f"{settings.zoho_crm_api_url}/Sessions1/search"
-
-        # Critères: sessions planifiées, dans la période de recherche
-        criteria = (
-            f"(((Statut:equals:PLANIFIÉ)or(Statut:equals:null))"
-            f"and(Date_d_but:greater_equal:{today_str})"
-            f"and(Date_d_but:less_equal:{search_end})"
-            f"and(Date_fin:greater_equal:{search_start}))"
+        # Sessions planifiées, non commencées, qui chevauchent la période de recherche,
+        # en visio (VISIO/Zoom) → lookup dans le catalogue local (pas d'appel API)
+        visio_sessions = get_session_catalogue().sessions_overlapping(
+            crm_client,
+            search_start,
+            search_end,
+            lieu_filter=_is_visio_lieu,
+            start_from=today_str
         )
 
-        params = {
-            "criteria": criteria,
-            "page": 1,
-            "per_page": 200
-        }
-
-        response = crm_client._make_request("GET", url, params=params)
-        all_sessions = response.get("data", [])
-
-        logger.info(f"  {len(all_sessions)} session(s) trouvée(s) dans la période")
+        logger.info(f"  {len(visio_sessions)} session(s) VISIO trouvée(s) dans la période")
 
     except Exception as e:
         logger.error(f"Erreur API sessions: {e}")
         return result
 
-    if not all_sessions:
+    if not visio_sessions:
         return result
 
-    # Filtrer par lieu (VISIO uniquement pour Uber)
-    visio_sessions = []
-    for s in all_sessions:
-        lieu = s.get('Lieu_de_formation', {})
-        lieu_name = lieu.get('name', '') if isinstance(lieu, dict) else str(lieu)
-        if 'visio' in lieu_name.lower() or 'zoom' in lieu_name.lower():
-            visio_sessions.append(s)
-
-    logger.info(f"  {len(visio_sessions)} session(s) VISIO après filtrage lieu")
-
     # Filtrer par type si demandé
     if session_type:
         type_prefix = 'cdj' if session_type == 'jour' else 'cds'
@@ -0,0 +1,457 @@
+"""
+Job store SQLite des tickets DOC (pending / in_flight / done / failed).
+
+Remplace doc_tickets_pending.json et doc_tickets_processed.json, qui étaient
+relus et réécrits en entier après chaque ticket (I/O en O(n²) avec
+l'historique, et non sûr dès que plusieurs workers écrivent):
+
+- Table jobs: un ticket = une ligne, transitions d'état atomiques
+  (pending → in_flight → done | failed, retour en pending si retry)
+- Lease (lease_owner, lease_expires_at): un ticket n'est traité que par un
+  worker / process à la fois; un lease expiré (crash) est repris
+- attempts / MAX_ATTEMPTS: une exception remet le ticket en pending jusqu'à
+  MAX_ATTEMPTS tentatives, puis failed
+- Table history: un enregistrement par traitement (append-only), colonnes
+  indexées (ticket_id, processed_at, triage_action) + record JSON complet
+  (même format que l'ancien doc_tickets_processed.json)
+
+Partagé par run_workflow_continuous.py, batch_ticket_actions.py et les
+scripts d'analyse (enrich_route_tickets.py...). Mode WAL: les scripts
+peuvent lire pendant que le batch écrit.
+
+Usage:
+    from src.utils.ticket_job_store import get_ticket_job_store
+
+    store = get_ticket_job_store()
+    store.replace_pending(tickets_from_zoho)
+    if store.claim(ticket_id, owner="worker-1"):
+        ...
+        store.complete(ticket_id, record, success=True)
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "doc_tickets.db"
+
+# États d'un job
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+# Champs ticket conservés dans jobs (issus de la synchronisation Zoho)
+TICKET_FIELDS = ("ticketNumber", "subject", "email", "contactId", "createdTime", "status")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    ticket_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    ticket TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    enqueued_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, enqueued_at);
+
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id TEXT NOT NULL,
+    processed_at TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    workflow_stage TEXT,
+    triage_action TEXT,
+    deal_id TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_ticket ON history (ticket_id, processed_at);
+CREATE INDEX IF NOT EXISTS idx_history_processed_at ON history (processed_at);
+CREATE INDEX IF NOT EXISTS idx_history_triage ON history (triage_action);
+"""
+
+
+class TicketJobStore:
+    """
+    Store SQLite des jobs de traitement des tickets DOC.
+
+    Thread-safe (une connexion par store, sérialisée par un RLock) et
+    multi-process (transactions BEGIN IMMEDIATE pour les transitions).
+    """
+
+    # Lease par défaut d'un ticket en cours de traitement (secondes)
+    LEASE_SECONDS = 900
+    # Tentatives max avant passage en failed (exceptions)
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT/ROLLBACK (verrou d'écriture dès le début)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _job_to_ticket(row: sqlite3.Row) -> Dict[str, Any]:
+        ticket = json.loads(row["ticket"])
+        ticket["id"] = row["ticket_id"]
+        return ticket
+
+    # ------------------------------------------------------------------
+    # Pending
+    # ------------------------------------------------------------------
+
+    def replace_pending(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Remplace la liste des tickets en attente (résultat d'une synchronisation Zoho).
+
+        - Les tickets listés passent (ou restent) en pending, tentatives remises à zéro
+          (un ticket done/failed qui réapparaît = le client a répondu)
+        - Les pending absents de la liste sont retirés
+        - Les tickets in_flight avec un lease valide ne sont pas touchés
+
+        Returns:
+            Nombre de tickets en attente après synchronisation
+        """
+        now = self._now()
+        with self._transaction() as conn:
+            listed = []
+            for ticket in tickets:
+                ticket_id = str(ticket["id"])
+                listed.append(ticket_id)
+                payload = json.dumps({k: ticket.get(k) for k in TICKET_FIELDS}, ensure_ascii=False)
+                conn.execute(
+                    """
+                    INSERT INTO jobs (ticket_id, state, ticket, attempts, enqueued_at, updated_at)
+                    VALUES (?, ?, ?, 0, ?, ?)
+                    ON CONFLICT(ticket_id) DO UPDATE SET
+                        ticket = excluded.ticket,
+                        state = CASE WHEN jobs.state = ? AND jobs.lease_expires_at > ? THEN jobs.state ELSE ? END,
+                        attempts = CASE WHEN jobs.state IN (?, ?) THEN jobs.attempts ELSE 0 END,
+                        enqueued_at = CASE WHEN jobs.state IN (?, ?) THEN jobs.enqueued_at ELSE excluded.enqueued_at END,
+                        updated_at = excluded.updated_at
+                    """,
+                    (ticket_id, PENDING, payload, now, now, IN_FLIGHT, time.time(), PENDING,
+                     PENDING, IN_FLIGHT, PENDING, IN_FLIGHT)
+                )
+
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _listed (ticket_id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM _listed")
+            conn.executemany("INSERT OR IGNORE INTO _listed VALUES (?)", [(t,) for t in listed])
+            conn.execute(
+                "DELETE FROM jobs WHERE state = ? AND ticket_id NOT IN (SELECT ticket_id FROM _listed)",
+                (PENDING,)
+            )
+            count = conn.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (PENDING,)).fetchone()[0]
+        return count
+
+    def enqueue(self, ticket: Dict[str, Any]) -> None:
+        """Ajoute (ou remet) un ticket en pending sans toucher aux autres."""
+        now = self._now()
+        payload = json.dumps({k: ticket.get(k) for k in TICKET_FIELDS}, ensure_ascii=False)
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO jobs (ticket_id, state, ticket, attempts, enqueued_at, updated_at)
+                VALUES (?, ?, ?, 0, ?, ?)
+                ON CONFLICT(ticket_id) DO UPDATE SET
+                    ticket = excluded.ticket, state = excluded.state, attempts = 0,
+                    lease_owner = NULL, lease_expires_at = NULL, updated_at = excluded.updated_at
+                """,
+                (str(ticket["id"]), PENDING, payload, now, now)
+            )
+
+    def list_pending(self) -> List[Dict[str, Any]]:
+        """Tickets à traiter (pending + in_flight au lease expiré), ordre d'arrivée."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE state = ? OR (state = ? AND lease_expires_at <= ?)
+                ORDER BY enqueued_at, rowid
+                """,
+                (PENDING, IN_FLIGHT, time.time())
+            ).fetchall()
+        return [self._job_to_ticket(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Transitions
+    # ------------------------------------------------------------------
+
+    def claim(self, ticket_id: str, owner: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Prend le lease d'un ticket (pending → in_flight).
+
+        Returns:
+            True si le ticket est à ce worker, False s'il est déjà pris / terminé
+        """
+        lease = lease_seconds or self.LEASE_SECONDS
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET state = ?, lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE ticket_id = ? AND (state = ? OR (state = ? AND lease_expires_at <= ?))
+                """,
+                (IN_FLIGHT, owner, now + lease, self._now(), str(ticket_id), PENDING, IN_FLIGHT, now)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, ticket_id: str, record: Dict[str, Any], success: bool) -> None:
+        """
+        Termine un ticket (in_flight → done | failed) et ajoute l'enregistrement à l'historique.
+
+        Args:
+            ticket_id: ID du ticket
+            record: Enregistrement complet (format doc_tickets_processed.json)
+            success: Résultat du workflow
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    last_error = ?, updated_at = ?
+                WHERE ticket_id = ?
+                """,
+                (DONE if success else FAILED, record.get("error"), self._now(), str(ticket_id))
+            )
+            self._insert_history(conn, str(ticket_id), record, success)
+
+    def fail(self, ticket_id: str, error: str) -> str:
+        """
+        Échec technique (exception): retour en pending tant que attempts < MAX_ATTEMPTS.
+
+        Returns:
+            Nouvel état du job (pending ou failed)
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM jobs WHERE ticket_id = ?", (str(ticket_id),)).fetchone()
+            attempts = row["attempts"] if row else self.MAX_ATTEMPTS
+            state = PENDING if attempts < self.MAX_ATTEMPTS else FAILED
+            conn.execute(
+                """
+                UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    last_error = ?, updated_at = ?
+                WHERE ticket_id = ?
+                """,
+                (state, error, self._now(), str(ticket_id))
+            )
+        return state
+
+    def release(self, ticket_id: str) -> None:
+        """Rend un ticket non traité (in_flight → pending) sans compter de tentative."""
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    attempts = MAX(attempts - 1, 0), updated_at = ?
+                WHERE ticket_id = ? AND state = ?
+                """,
+                (PENDING, self._now(), str(ticket_id), IN_FLIGHT)
+            )
+
+    # ------------------------------------------------------------------
+    # Historique
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _insert_history(conn, ticket_id: str, record: Dict[str, Any], success: bool) -> None:
+        conn.execute(
+            """
+            INSERT INTO history (ticket_id, processed_at, success, workflow_stage, triage_action, deal_id, record)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                ticket_id,
+                record.get("processed_at") or datetime.now().isoformat(),
+                1 if success else 0,
+                record.get("workflow_stage"),
+                record.get("triage_action"),
+                record.get("deal_id"),
+                json.dumps(record, ensure_ascii=False, default=str),
+            )
+        )
+
+    def history(
+        self,
+        ticket_id: Optional[str] = None,
+        triage_action: Optional[str] = None,
+        since: Optional[str] = None,
+        latest_only: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Historique des traitements (ordre chronologique).
+
+        Args:
+            ticket_id: Filtre sur un ticket
+            triage_action: Filtre sur l'action de triage (GO, ROUTE, SPAM...)
+            since: processed_at minimum (ISO)
+            latest_only: Uniquement le dernier traitement de chaque ticket
+            limit: Nombre max d'enregistrements (les plus récents)
+
+        Returns:
+            Liste de records (format doc_tickets_processed.json) avec '_history_id'
+        """
+        clauses, params = [], []
+        if ticket_id:
+            clauses.append("ticket_id = ?")
+            params.append(str(ticket_id))
+        if triage_action:
+            clauses.append("triage_action = ?")
+            params.append(triage_action)
+        if since:
+            clauses.append("processed_at >= ?")
+            params.append(since)
+        if latest_only:
+            clauses.append("id IN (SELECT MAX(id) FROM history GROUP BY ticket_id)")
+
+        query = "SELECT id, record FROM history"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        records = []
+        for row in reversed(rows):
+            record = json.loads(row["record"])
+            record["_history_id"] = row["id"]
+            records.append(record)
+        return records
+
+    def update_history_record(self, history_id: int, updates: Dict[str, Any]) -> None:
+        """Complète un enregistrement d'historique (enrichissement a posteriori)."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT record FROM history WHERE id = ?", (history_id,)).fetchone()
+            if row is None:
+                return
+            record = json.loads(row["record"])
+            record.update({k: v for k, v in updates.items() if k != "_history_id"})
+            conn.execute(
+                "UPDATE history SET record = ?, triage_action = ?, workflow_stage = ? WHERE id = ?",
+                (json.dumps(record, ensure_ascii=False, default=str),
+                 record.get("triage_action"), record.get("workflow_stage"), history_id)
+            )
+
+    # ------------------------------------------------------------------
+    # Monitoring / migration
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics for monitoring.
+
+        Returns:
+            Dict with jobs per state and history size
+        """
+        with self._lock:
+            counts = {state: 0 for state in (PENDING, IN_FLIGHT, DONE, FAILED)}
+            for row in self._conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+                counts[row["state"]] = row["n"]
+            history_count = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        return {**counts, "history": history_count}
+
+    def import_legacy_json(self, pending_file: str, processed_file: str) -> Dict[str, int]:
+        """
+        Importe doc_tickets_pending.json / doc_tickets_processed.json (une seule fois:
+        ignoré si le store contient déjà des jobs ou un historique).
+
+        Returns:
+            {'pending': n, 'history': n}
+        """
+        imported = {"pending": 0, "history": 0}
+        stats = self.get_stats()
+        if stats["history"] or any(stats[state] for state in (PENDING, IN_FLIGHT, DONE, FAILED)):
+            return imported
+
+        if os.path.exists(processed_file):
+            with open(processed_file, "r", encoding="utf-8") as f:
+                processed = json.load(f)
+            with self._transaction() as conn:
+                for record in processed:
+                    success = bool(record.get("success"))
+                    self._insert_history(conn, str(record.get("id")), record, success)
+                    conn.execute(
+                        """
+                        INSERT OR REPLACE INTO jobs (ticket_id, state, ticket, attempts, enqueued_at, updated_at)
+                        VALUES (?, ?, ?, 1, ?, ?)
+                        """,
+                        (str(record.get("id")), DONE if success else FAILED,
+                         json.dumps({k: record.get(k) for k in TICKET_FIELDS}, ensure_ascii=False),
+                         record.get("processed_at") or self._now(), record.get("processed_at") or self._now())
+                    )
+            imported["history"] = len(processed)
+
+        if os.path.exists(pending_file):
+            with open(pending_file, "r", encoding="utf-8") as f:
+                pending = json.load(f)
+            for ticket in pending:
+                self.enqueue(ticket)
+            imported["pending"] = len(pending)
+
+        if imported["pending"] or imported["history"]:
+            logger.info(f"Job store: import JSON legacy ({imported['pending']} pending, {imported['history']} historique)")
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, TicketJobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_ticket_job_store(db_path: Optional[str] = None) -> TicketJobStore:
+    """
+    Get the TicketJobStore for a database path (one instance per path and process).
+
+    Args:
+        db_path: Chemin de la base (défaut: DOC_JOB_STORE_PATH ou doc_tickets.db)
+
+    Returns:
+        TicketJobStore instance
+    """
+    path = os.path.abspath(db_path or os.getenv("DOC_JOB_STORE_PATH", DEFAULT_DB_PATH))
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = TicketJobStore(path)
+        return _stores[path]
@@ -0,0 +1,460 @@
+"""
+Triage rapide par règles: classe sans appel LLM les tickets dont
+l'intention est évidente.
+
+Une bonne partie des tickets DOC sont des messages courts et sans
+ambiguïté ("merci beaucoup", "voici mes identifiants: x@y.fr / mdp ...",
+"cours du soir svp", "où en est mon dossier ?"). Le TriageAgent les envoyait
+tous à Sonnet (~2-4 s et ~3k tokens par ticket).
+
+Ce classifieur passe avant le LLM:
+- Règles construites depuis knowledge_base/scenarios_mapping.py (triggers
+  des scénarios) et ticket_info_extractor.CONFIRMATION_PATTERNS
+- Ne regarde que le DERNIER message du candidat (historique cité retiré)
+- Retourne le même dict que TriageAgent.triage_ticket, avec un score de
+  confiance et method='rule_fast_path'
+- Le TriageAgent n'utilise le résultat qu'au-dessus du seuil
+  (TRIAGE_FAST_PATH_MIN_CONFIDENCE, défaut 0.85); sinon → LLM
+- Tout signal de complexité (plusieurs messages, plusieurs questions,
+  force majeure, message long, documents) → pas de fast path
+- Négation / contraste ("pas reçu", "mais", "toujours rien") → pas de
+  remerciement ni de confirmation par règle
+- SPAM (clôture du ticket sans réponse): jamais sur un seul déclencheur.
+  Il faut plusieurs déclencheurs SC-SPAM distincts (mots entiers) dans le
+  dernier message, sans deal CRM ni vocabulaire de candidat; sinon → LLM
+
+Désactivable avec TRIAGE_FAST_PATH=false.
+Mesure hors ligne: tests/benchmark_triage_fast_path.py (taux de
+couverture et accord avec le triage LLM historique).
+
+Usage:
+    from src.utils.triage_fast_path import get_triage_fast_path
+
+    fast_path = get_triage_fast_path()
+    result = fast_path.classify(subject, thread_content, deal_data)
+    if result and fast_path.accepts(result):
+        return result
+"""
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from knowledge_base.scenarios_mapping import SCENARIOS
+from src.utils.ticket_info_extractor import CONFIRMATION_PATTERNS, parse_date_from_match
+
+logger = logging.getLogger(__name__)
+
+TRIAGE_FAST_PATH = os.getenv('TRIAGE_FAST_PATH', 'true').lower() == 'true'
+TRIAGE_FAST_PATH_MIN_CONFIDENCE = float(os.getenv('TRIAGE_FAST_PATH_MIN_CONFIDENCE', '0.85'))
+
+# Début de l'historique cité / de la signature: tout ce qui suit est ignoré
+_QUOTE_MARKERS = re.compile(
+    r"(?:^|\n|\s)(?:"
+    r"Le\s[^\n]{5,120}?a\s+écrit\s*:"
+    r"|On\s[^\n]{5,120}?wrote\s*:"
+    r"|De\s*:\s"
+    r"|From\s*:\s"
+    r"|-{3,}\s*(?:Message|Original|Forwarded)"
+    r"|Envoyé\s+(?:à\s+partir\s+de|de\s+mon|depuis)"
+    r"|Sent\s+from"
+    r")",
+    re.IGNORECASE
+)
+# Séparateur des messages récents combinés par le workflow
+_MESSAGE_SEPARATOR = "\n---\n"
+
+_EMAIL = re.compile(r"[\w.+\-]+@[\w\-]+\.[\w.\-]+")
+
+# Signaux qui demandent une lecture contextuelle (→ LLM)
+_COMPLEX_SIGNALS = [
+    # Force majeure / urgence (REPORT_DATE prioritaire, contexte à extraire)
+    'malade', 'maladie', 'hospitalis', 'hôpital', 'hopital', 'médical', 'medical',
+    'décès', 'deces', 'accident', 'urgence', 'urgent', 'enceinte', 'certificat',
+    # Report / annulation / réclamation
+    'report', 'décaler', 'decaler', 'annul', 'rembours', 'réclamation', 'plainte', 'erreur',
+    # Documents (déjà couverts par les règles du TriageAgent et should_use_ai_triage)
+    'document', 'pièce', 'piece', 'justificatif', 'attestation', 'ci-joint', 'joint',
+]
+
+# Négation / contraste: le message n'est pas un simple accord (→ LLM)
+_NEGATION = re.compile(
+    r"\b(?:ne|pas|plus|rien|jamais|aucune?|mais|toujours|sauf|cependant|pourtant|toutefois|sinon)\b"
+    r"|\bn['’]"
+)
+
+# Vocabulaire d'un candidat: un message qui en contient n'est pas clos comme spam par règle
+_CANDIDATE_SIGNALS = re.compile(
+    r"\b(?:vtc|taxi|examen|inscri\w*|formation|permis|dossier|cma|evalbox|session|cours)\b"
+)
+# Déclencheurs SC-SPAM distincts requis pour un SPAM accepté sans LLM
+SPAM_MIN_TRIGGERS = 2
+
+_THANKS_WORDS = {
+    'merci', 'mercii', 'beaucoup', 'bien', 'reçu', 'recu', 'bonne', 'journée', 'journee',
+    'soirée', 'soiree', 'super', 'parfait', 'ok', 'daccord', "d'accord", 'top', 'génial',
+    'genial', 'encore', 'pour', 'tout', 'votre', 'vos', 'aide', 'retour', 'réponse',
+    'reponse', 'infos', 'information', 'informations', 'bonjour', 'bonsoir', 'cordialement',
+    'salutations', 'à', 'a', 'vous', 'de', 'la', 'le', 'c\'est', 'cest', 'noté', 'note',
+    'très', 'tres', 'mille', 'fois', 'madame', 'monsieur', 'bisous', 'et',
+}
+
+_IDENTIFIANTS_REQUEST = [
+    r"mot\s+de\s+passe\s+oubli",
+    r"(?:perdu|oublié|oublie)\s+(?:mon|mes)\s+(?:mot\s+de\s+passe|identifiants?|code)",
+    r"(?:quels?\s+sont|envoye[rz]?[\s-]moi|renvoye[rz]?[\s-]moi|recevoir|avoir)\s+(?:mes|les)\s+identifiants",
+]
+_ELEARNING_SIGNALS = ['e-learning', 'elearning', 'formation', 'cours', 'module', 'cab-formations']
+
+_EXAM_DATE_QUESTION = [
+    r"quand\s+(?:est|a\s+lieu|se\s+passe|aura\s+lieu)\s+(?:mon|l')\s*examen",
+    r"quelle\s+est\s+(?:ma|la)\s+date\s+(?:d'|de\s+l')?examen",
+    r"(?:c'est|ce\s+sera)\s+quand\s+(?:mon|l')\s*examen",
+    r"(?:connaître|connaitre|savoir)\s+(?:ma|la)\s+date\s+(?:d'|de\s+l')?examen",
+]
+_FUTURE_DATES_QUESTION = [
+    r"prochaines?\s+dates?\s+(?:d'|de\s+l')?examen",
+    r"dates?\s+(?:d'examen\s+)?disponibles?",
+    r"quelles?\s+sont\s+les\s+(?:prochaines\s+)?dates",
+]
+
+_SESSION_HOURS = {
+    'soir': re.compile(r"\b18\s*h(?:00)?\s*(?:à|a|-)\s*22\s*h", re.IGNORECASE),
+    'jour': re.compile(r"\b8\s*h\s*30\s*(?:à|a|-)\s*16\s*h\s*30", re.IGNORECASE),
+}
+
+
+def _triggers(*scenario_ids: str) -> List[str]:
+    """Triggers (minuscules) des scénarios de la knowledge base."""
+    triggers: List[str] = []
+    for scenario_id in scenario_ids:
+        triggers.extend(t.lower() for t in SCENARIOS.get(scenario_id, {}).get('triggers', []))
+    return triggers
+
+
+def _compile(patterns: List[str]) -> List["re.Pattern[str]"]:
+    return [re.compile(p, re.IGNORECASE) for p in patterns]
+
+
+class TriageFastPath:
+    """
+    Classifieur déterministe placé devant le triage LLM.
+
+    Thread-safe (patterns compilés une fois, compteurs sous verrou).
+    """
+
+    def __init__(self, min_confidence: Optional[float] = None):
+        self.min_confidence = TRIAGE_FAST_PATH_MIN_CONFIDENCE if min_confidence is None else min_confidence
+
+        self._spam_triggers = [
+            re.compile(r"\b" + re.escape(trigger) + r"\b", re.IGNORECASE)
+            for trigger in _triggers('SC-SPAM')
+        ]
+        self._identifiants_triggers = _triggers('SC-01_IDENTIFIANTS_EXAMENT3P')
+        self._statut_triggers = _triggers('SC-06_STATUT_DOSSIER') + [
+            'où en est mon inscription', 'ou en est mon dossier', 'ou en est mon inscription',
+            'mon dossier a bien été transmis', 'des nouvelles de mon dossier',
+        ]
+        self._date_confirmation = _compile(CONFIRMATION_PATTERNS['date_examen'])
+        self._session_preference = _compile(CONFIRMATION_PATTERNS['session_preference'])
+        self._report_request = _compile(CONFIRMATION_PATTERNS['report_request'])
+        self._identifiants_request = _compile(_IDENTIFIANTS_REQUEST)
+        self._exam_date_question = _compile(_EXAM_DATE_QUESTION)
+        self._future_dates_question = _compile(_FUTURE_DATES_QUESTION)
+
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._below_threshold = 0
+        self._no_match = 0
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def classify(
+        self,
+        ticket_subject: str,
+        thread_content: str,
+        deal_data: Optional[Dict[str, Any]] = None,
+        current_department: str = "DOC"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Classe un ticket par règles.
+
+        Args:
+            ticket_subject: Sujet du ticket
+            thread_content: Message(s) récent(s) du candidat (texte nettoyé)
+            deal_data: Données du deal CRM (optionnel)
+            current_department: Département actuel du ticket
+
+        Returns:
+            Dict de triage (même format que TriageAgent.triage_ticket) avec
+            'confidence', ou None si aucune règle ne s'applique
+        """
+        content = thread_content or ''
+        message = self.latest_message(content)
+        message_lower = message.lower()
+
+        result = self._classify_spam(message_lower, deal_data)
+        if result is None and self._is_simple(content, message_lower):
+            result = (
+                self._classify_remerciement(message_lower)
+                or self._classify_envoie_identifiants(message, message_lower)
+                or self._classify_confirmation_date(message_lower)
+                or self._classify_session_preference(message_lower, deal_data)
+                or self._classify_exam_dates(message_lower, deal_data)
+                or self._classify_demande_identifiants(message_lower)
+                or self._classify_statut_dossier(message_lower)
+            )
+
+        with self._lock:
+            if result is None:
+                self._no_match += 1
+                return None
+            if result['confidence'] < self.min_confidence:
+                self._below_threshold += 1
+            else:
+                rule = result['intent_context']['fast_path_rule']
+                self._hits[rule] = self._hits.get(rule, 0) + 1
+
+        if result['action'] == 'GO':
+            result['target_department'] = current_department
+        return result
+
+    def accepts(self, result: Optional[Dict[str, Any]]) -> bool:
+        """True si le résultat est assez sûr pour se passer du LLM."""
+        return bool(result) and result['confidence'] >= self.min_confidence
+
+    @staticmethod
+    def latest_message(thread_content: str) -> str:
+        """Dernier message du candidat, sans l'historique cité ni la signature mail."""
+        message = (thread_content or '').split(_MESSAGE_SEPARATOR)[0]
+        match = _QUOTE_MARKERS.search(message)
+        if match:
+            message = message[:match.start()]
+        return message.strip()
+
+    # ------------------------------------------------------------------
+    # Garde-fous
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_simple(content: str, message_lower: str) -> bool:
+        """Message unique, court, au plus une question, sans signal de complexité."""
+        if not message_lower or _MESSAGE_SEPARATOR in content:
+            return False
+        if len(message_lower) > 400 or message_lower.count('?') > 1:
+            return False
+        return not any(signal in message_lower for signal in _COMPLEX_SIGNALS)
+
+    # ------------------------------------------------------------------
+    # Règles
+    # ------------------------------------------------------------------
+
+    def _classify_spam(self, message_lower: str, deal_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        # Un candidat connu du CRM n'est jamais traité comme spam par règle
+        if deal_data:
+            return None
+        triggers = sum(1 for trigger in self._spam_triggers if trigger.search(message_lower))
+        if not triggers:
+            return None
+        # Le ticket est clos sans réponse: un seul mot ("je travaille chez
+        # Casino") ou un prospect sans deal lié ne suffit pas → LLM
+        if triggers < SPAM_MIN_TRIGGERS or _CANDIDATE_SIGNALS.search(message_lower):
+            return self._result('spam_trigger', None, 0.6, action='SPAM',
+                                reason="Déclencheur spam isolé (SC-SPAM), à confirmer")
+        return self._result('spam_trigger', None, 0.97, action='SPAM',
+                            reason=f"{triggers} déclencheurs spam (SC-SPAM) sans deal CRM")
+
+    def _classify_remerciement(self, message_lower: str) -> Optional[Dict[str, Any]]:
+        if 'merci' not in message_lower or '?' in message_lower:
+            return None
+        # "Merci, pas reçu" / "merci mais toujours rien" → problème, pas remerciement
+        if _NEGATION.search(message_lower):
+            return None
+        words = re.findall(r"[\w'’]+", message_lower.replace('’', "'"))
+        others = [w for w in words if w not in _THANKS_WORDS]
+        # Tolère la signature (prénom nom)
+        if len(others) > 2:
+            return None
+        return self._result('remerciement', 'REMERCIEMENT', 0.9,
+                            reason="Simple remerciement sans autre demande")
+
+    def _classify_envoie_identifiants(self, message: str, message_lower: str) -> Optional[Dict[str, Any]]:
+        if not _EMAIL.search(message):
+            return None
+        mentions_password = any(k in message_lower for k in ('mot de passe', 'mdp', 'password', 'mp :', 'mp:'))
+        mentions_identifiants = 'identifiant' in message_lower
+        if not (mentions_password or mentions_identifiants):
+            return None
+        # "je ne veux pas donner mon mot de passe" → REFUS_PARTAGE_CREDENTIALS (LLM)
+        if re.search(r"\b(?:ne|pas|jamais)\b.{0,30}(?:donner|partager|communiquer)", message_lower):
+            return None
+        confidence = 0.95 if mentions_password else 0.87
+        if '?' in message_lower:
+            confidence -= 0.1
+        return self._result('envoie_identifiants', 'ENVOIE_IDENTIFIANTS', confidence,
+                            reason="Le candidat transmet ses identifiants ExamT3P",
+                            has_credentials=True)
+
+    def _classify_confirmation_date(self, message_lower: str) -> Optional[Dict[str, Any]]:
+        if any(p.search(message_lower) for p in self._report_request):
+            return None
+        # "je confirme le 15/03 mais je ne pourrai pas venir" → LLM
+        if _NEGATION.search(message_lower):
+            return None
+        for pattern in self._date_confirmation:
+            match = pattern.search(message_lower)
+            if not match:
+                continue
+            confirmed = parse_date_from_match(match.group(1))
+            if not confirmed:
+                return None
+            confidence = 0.75 if '?' in message_lower else 0.9
+            return self._result('confirmation_date_examen', 'CONFIRMATION_DATE_EXAMEN', confidence,
+                                reason=f"Le candidat confirme la date d'examen du {confirmed}",
+                                confirmed_new_exam_date=confirmed)
+        return None
+
+    def _classify_session_preference(
+        self,
+        message_lower: str,
+        deal_data: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        # Candidat déjà positionné sur une session: changement de session possible → LLM
+        if deal_data and deal_data.get('Session'):
+            return None
+        preference = None
+        for pattern in self._session_preference:
+            match = pattern.search(message_lower)
+            if match:
+                matched = match.group(0)
+                preference = 'jour' if ('jour' in matched or 'journée' in matched) else 'soir'
+                break
+        if preference is None:
+            for name, pattern in _SESSION_HOURS.items():
+                if pattern.search(message_lower):
+                    preference = name
+                    break
+        if preference is None:
+            return None
+        confidence = 0.75 if '?' in message_lower else 0.88
+        return self._result('session_preference', 'CONFIRMATION_SESSION', confidence,
+                            reason=f"Le candidat choisit les cours du {preference}",
+                            session_preference=preference)
+
+    def _classify_exam_dates(
+        self,
+        message_lower: str,
+        deal_data: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        if 'convocation' in message_lower or 'session' in message_lower:
+            return None
+        has_exam_date = bool(deal_data and (deal_data.get('_real_exam_date') or deal_data.get('Date_examen_VTC')))
+        if any(p.search(message_lower) for p in self._exam_date_question):
+            if not has_exam_date:
+                return None
+            return self._result('demande_date_examen', 'DEMANDE_DATE_EXAMEN', 0.88,
+                                reason="Le candidat demande sa date d'examen (date assignée)")
+        if any(p.search(message_lower) for p in self._future_dates_question):
+            # Avec une date assignée, demander d'autres dates = souvent un report → LLM
+            if has_exam_date or deal_data is None:
+                return None
+            return self._result('demande_dates_futures', 'DEMANDE_DATES_FUTURES', 0.88,
+                                reason="Le candidat demande les prochaines dates d'examen (aucune date assignée)")
+        return None
+
+    def _classify_demande_identifiants(self, message_lower: str) -> Optional[Dict[str, Any]]:
+        if any(signal in message_lower for signal in _ELEARNING_SIGNALS):
+            return None
+        if "n'arrive pas" in message_lower or 'impossible' in message_lower:
+            return None  # PROBLEME_CONNEXION_EXAMT3P → LLM
+        if any(p.search(message_lower) for p in self._identifiants_request):
+            confidence = 0.9
+        elif any(trigger in message_lower for trigger in self._identifiants_triggers) and '?' in message_lower:
+            confidence = 0.8
+        else:
+            return None
+        return self._result('demande_identifiants', 'DEMANDE_IDENTIFIANTS', confidence,
+                            reason="Le candidat demande ses identifiants ExamT3P")
+
+    def _classify_statut_dossier(self, message_lower: str) -> Optional[Dict[str, Any]]:
+        if not any(trigger in message_lower for trigger in self._statut_triggers):
+            return None
+        # Question sur la convocation ou les dates en plus → multi-intentions (LLM)
+        if any(k in message_lower for k in ('convocation', 'date', 'session', 'paiement', 'payé')):
+            return None
+        confidence = 0.88 if len(message_lower) <= 250 else 0.8
+        return self._result('statut_dossier', 'STATUT_DOSSIER', confidence,
+                            reason="Le candidat demande l'avancement de son dossier")
+
+    @staticmethod
+    def _result(
+        rule: str,
+        intent: Optional[str],
+        confidence: float,
+        reason: str,
+        action: str = 'GO',
+        **context: Any
+    ) -> Dict[str, Any]:
+        """Dict de triage au format TriageAgent.triage_ticket."""
+        intent_context = {
+            'is_urgent': False,
+            'mentions_force_majeure': False,
+            'force_majeure_type': None,
+            'force_majeure_details': None,
+            'fast_path_rule': rule,
+        }
+        intent_context.update(context)
+        return {
+            'action': action,
+            'target_department': None,
+            'reason': f"{reason} (règle rapide)",
+            'confidence': round(confidence, 2),
+            'method': 'rule_fast_path',
+            'primary_intent': intent,
+            'secondary_intents': [],
+            'detected_intent': intent,
+            'intent_context': intent_context,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get fast path statistics for monitoring.
+
+        Returns:
+            Dict with threshold, hits per rule, below-threshold and no-match counts
+        """
+        with self._lock:
+            hits = sum(self._hits.values())
+            total = hits + self._below_threshold + self._no_match
+            return {
+                "enabled": TRIAGE_FAST_PATH,
+                "min_confidence": self.min_confidence,
+                "hits": hits,
+                "hits_by_rule": dict(self._hits),
+                "below_threshold": self._below_threshold,
+                "no_match": self._no_match,
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+            }
+
+
+_fast_path: Optional[TriageFastPath] = None
+_fast_path_lock = threading.Lock()
+
+
+def get_triage_fast_path() -> Optional[TriageFastPath]:
+    """
+    Get the process-wide TriageFastPath.
+
+    Returns:
+        TriageFastPath instance, or None if TRIAGE_FAST_PATH=false
+    """
+    global _fast_path
+    if not TRIAGE_FAST_PATH:
+        return None
+    with _fast_path_lock:
+        if _fast_path is None:
+            _fast_path = TriageFastPath()
+        return _fast_path
@@ -0,0 +1,452 @@
+"""
+File persistante (SQLite) des événements webhook Zoho Desk + pool de workers.
+
+handle_zoho_desk_webhook exécutait tout le workflow (plusieurs minutes) dans
+la requête Flask: Zoho dépasse son timeout, relivre l'événement, et le même
+ticket est traité plusieurs fois. Désormais l'endpoint valide puis enqueue
+en quelques millisecondes; un pool de workers consomme la file:
+
+- Une ligne par ticket (ticket_id = clé): les événements répétés sont
+  coalescés tant que le ticket est en attente, et le traitement est retardé
+  de COALESCE_SECONDS après le dernier événement (borné par MAX_DELAY_SECONDS)
+- Payload identique déjà en file (ou traité depuis moins de DEDUPE_SECONDS)
+  = relivraison Zoho → doublon ignoré
+- Événement reçu pendant le traitement du ticket → un seul re-traitement
+  planifié à la fin (rerun), pas de traitement concurrent du même ticket
+- Lease + tentatives (retry avec backoff), reprise après redémarrage
+- Profondeur de file et latences (attente, traitement) pour /webhook/stats
+
+Usage:
+    from src.utils.webhook_queue import get_webhook_queue, WebhookWorkerPool
+
+    queue = get_webhook_queue()
+    queue.enqueue(ticket_id, event_type, payload)
+    pool = WebhookWorkerPool(queue, handler=process_job, workers=2)
+    pool.start()
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "webhook_queue.db"
+
+# États d'un job
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_jobs (
+    ticket_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    event_type TEXT,
+    payload TEXT,
+    payload_hash TEXT,
+    events INTEGER NOT NULL DEFAULT 1,
+    first_event_at REAL NOT NULL,
+    last_event_at REAL NOT NULL,
+    not_before REAL NOT NULL,
+    rerun INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_jobs_ready ON webhook_jobs (state, not_before);
+"""
+
+
+class WebhookQueue:
+    """
+    File persistante des tickets à traiter suite à un webhook.
+
+    Thread-safe (RLock sur une connexion SQLite en mode WAL).
+    """
+
+    # Fenêtre de coalescence après le dernier événement (secondes)
+    COALESCE_SECONDS = 30
+    # Délai max entre le premier événement et le traitement
+    MAX_DELAY_SECONDS = 120
+    # Relivraison d'un payload déjà traité ignorée pendant ce délai
+    DEDUPE_SECONDS = 600
+    # Lease d'un job en cours de traitement
+    LEASE_SECONDS = 1800
+    # Tentatives max (exceptions) avant failed
+    MAX_ATTEMPTS = 3
+    # Nombre de mesures de latence conservées pour les stats
+    LATENCY_SAMPLES = 500
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, coalesce_seconds: Optional[float] = None):
+        self.db_path = db_path
+        if coalesce_seconds is not None:
+            self.COALESCE_SECONDS = coalesce_seconds
+        self._lock = threading.RLock()
+        self._ready = threading.Condition(self._lock)
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        # Monitoring (process courant)
+        self._received = 0
+        self._coalesced = 0
+        self._duplicates = 0
+        self._reruns = 0
+        self._processed = 0
+        self._failed = 0
+        self._wait_times = deque(maxlen=self.LATENCY_SAMPLES)
+        self._processing_times = deque(maxlen=self.LATENCY_SAMPLES)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _hash_payload(payload: Any) -> str:
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Producteur (requête HTTP)
+    # ------------------------------------------------------------------
+
+    def enqueue(self, ticket_id: str, event_type: Optional[str] = None, payload: Any = None) -> Dict[str, Any]:
+        """
+        Enregistre un événement webhook pour un ticket.
+
+        Returns:
+            {'status': 'queued' | 'coalesced' | 'duplicate' | 'rerun_scheduled', 'depth': int}
+        """
+        now = time.time()
+        payload_hash = self._hash_payload(payload)
+        payload_json = json.dumps(payload, ensure_ascii=False, default=str)
+
+        with self._transaction() as conn:
+            self._received += 1
+            row = conn.execute("SELECT * FROM webhook_jobs WHERE ticket_id = ?", (str(ticket_id),)).fetchone()
+
+            if row is not None and row["state"] == PENDING and row["payload_hash"] == payload_hash:
+                # Relivraison Zoho du même événement
+                self._duplicates += 1
+                status = "duplicate"
+                conn.execute("UPDATE webhook_jobs SET events = events + 1 WHERE ticket_id = ?", (str(ticket_id),))
+            elif row is not None and row["state"] == PENDING:
+                self._coalesced += 1
+                status = "coalesced"
+                not_before = min(now + self.COALESCE_SECONDS, row["first_event_at"] + self.MAX_DELAY_SECONDS)
+                conn.execute(
+                    """
+                    UPDATE webhook_jobs SET event_type = ?, payload = ?, payload_hash = ?,
+                        events = events + 1, last_event_at = ?, not_before = MAX(not_before, ?)
+                    WHERE ticket_id = ?
+                    """,
+                    (event_type, payload_json, payload_hash, now, not_before, str(ticket_id))
+                )
+            elif (row is not None and row["state"] == DONE and row["payload_hash"] == payload_hash
+                    and now - (row["finished_at"] or 0) < self.DEDUPE_SECONDS):
+                # Relivraison (timeout Zoho) d'un événement déjà traité
+                self._duplicates += 1
+                status = "duplicate"
+            elif row is not None and row["state"] == IN_FLIGHT and (row["lease_expires_at"] or 0) > now:
+                if row["payload_hash"] == payload_hash:
+                    self._duplicates += 1
+                    status = "duplicate"
+                else:
+                    # Nouvel événement pendant le traitement: un seul re-traitement à la fin
+                    self._coalesced += 1
+                    status = "rerun_scheduled"
+                    conn.execute(
+                        """
+                        UPDATE webhook_jobs SET rerun = 1, event_type = ?, payload = ?, payload_hash = ?,
+                            events = events + 1, last_event_at = ?
+                        WHERE ticket_id = ?
+                        """,
+                        (event_type, payload_json, payload_hash, now, str(ticket_id))
+                    )
+            else:
+                status = "queued"
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO webhook_jobs (ticket_id, state, event_type, payload, payload_hash,
+                        events, first_event_at, last_event_at, not_before, rerun, attempts)
+                    VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, 0, 0)
+                    """,
+                    (str(ticket_id), PENDING, event_type, payload_json, payload_hash,
+                     now, now, now + self.COALESCE_SECONDS)
+                )
+
+            depth = conn.execute("SELECT COUNT(*) FROM webhook_jobs WHERE state = ?", (PENDING,)).fetchone()[0]
+            self._ready.notify_all()
+
+        return {"status": status, "depth": depth}
+
+    # ------------------------------------------------------------------
+    # Consommateurs (workers)
+    # ------------------------------------------------------------------
+
+    def claim_next(self, owner: str) -> Optional[Dict[str, Any]]:
+        """Prend le prochain job prêt (not_before dépassé), ou None."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                """
+                SELECT * FROM webhook_jobs
+                WHERE (state = ? AND not_before <= ?) OR (state = ? AND lease_expires_at <= ?)
+                ORDER BY not_before LIMIT 1
+                """,
+                (PENDING, now, IN_FLIGHT, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                """
+                UPDATE webhook_jobs SET state = ?, lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, started_at = ?, rerun = 0
+                WHERE ticket_id = ?
+                """,
+                (IN_FLIGHT, owner, now + self.LEASE_SECONDS, now, row["ticket_id"])
+            )
+            self._wait_times.append(now - row["first_event_at"])
+
+        job = dict(row)
+        job["payload"] = json.loads(row["payload"]) if row["payload"] else None
+        return job
+
+    def wait_for_job(self, timeout: float) -> None:
+        """Attend un nouvel événement (ou le timeout)."""
+        with self._ready:
+            self._ready.wait(timeout)
+
+    def next_ready_in(self) -> Optional[float]:
+        """Secondes avant le prochain job prêt (None si file vide)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(not_before) FROM webhook_jobs WHERE state = ?", (PENDING,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def complete(self, ticket_id: str, success: bool = True, error: Optional[str] = None) -> str:
+        """
+        Termine un job. S'il a reçu des événements pendant le traitement
+        (rerun), il repasse en pending après la fenêtre de coalescence.
+
+        Returns:
+            Nouvel état du job
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM webhook_jobs WHERE ticket_id = ?", (str(ticket_id),)).fetchone()
+            if row is None:
+                return DONE
+            if row["started_at"]:
+                self._processing_times.append(now - row["started_at"])
+            if success:
+                self._processed += 1
+            else:
+                self._failed += 1
+
+            if row["rerun"]:
+                self._reruns += 1
+                state = PENDING
+                conn.execute(
+                    """
+                    UPDATE webhook_jobs SET state = ?, rerun = 0, attempts = 0, events = 1,
+                        first_event_at = ?, not_before = ?, lease_owner = NULL, lease_expires_at = NULL,
+                        finished_at = ?, last_error = ?
+                    WHERE ticket_id = ?
+                    """,
+                    (state, row["last_event_at"], now + self.COALESCE_SECONDS, now, error, str(ticket_id))
+                )
+            else:
+                state = DONE if success else FAILED
+                conn.execute(
+                    """
+                    UPDATE webhook_jobs SET state = ?, lease_owner = NULL, lease_expires_at = NULL,
+                        finished_at = ?, last_error = ?
+                    WHERE ticket_id = ?
+                    """,
+                    (state, now, error, str(ticket_id))
+                )
+            self._ready.notify_all()
+        return state
+
+    def fail(self, ticket_id: str, error: str) -> str:
+        """
+        Échec technique (exception): retry avec backoff tant que attempts < MAX_ATTEMPTS.
+
+        Returns:
+            Nouvel état du job (pending ou failed)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM webhook_jobs WHERE ticket_id = ?", (str(ticket_id),)).fetchone()
+            attempts = row["attempts"] if row else self.MAX_ATTEMPTS
+        if attempts >= self.MAX_ATTEMPTS:
+            return self.complete(ticket_id, success=False, error=error)
+
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE webhook_jobs SET state = ?, not_before = ?, lease_owner = NULL,
+                    lease_expires_at = NULL, last_error = ?
+                WHERE ticket_id = ?
+                """,
+                (PENDING, now + self.COALESCE_SECONDS * (2 ** attempts), error, str(ticket_id))
+            )
+        return PENDING
+
+    # ------------------------------------------------------------------
+    # Monitoring
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _summary(samples: List[float]) -> Dict[str, Any]:
+        if not samples:
+            return {"count": 0, "avg_seconds": 0.0, "p95_seconds": 0.0, "max_seconds": 0.0}
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "avg_seconds": round(sum(ordered) / len(ordered), 3),
+            "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max_seconds": round(ordered[-1], 3),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics for monitoring (/webhook/stats).
+
+        Returns:
+            Dict with depth per state, oldest pending age, event counters and latencies
+        """
+        now = time.time()
+        with self._lock:
+            states = {state: 0 for state in (PENDING, IN_FLIGHT, DONE, FAILED)}
+            for row in self._conn.execute("SELECT state, COUNT(*) AS n FROM webhook_jobs GROUP BY state"):
+                states[row["state"]] = row["n"]
+            oldest = self._conn.execute(
+                "SELECT MIN(first_event_at) FROM webhook_jobs WHERE state = ?", (PENDING,)
+            ).fetchone()[0]
+            return {
+                "depth": states[PENDING],
+                "states": states,
+                "oldest_pending_age_seconds": round(now - oldest, 1) if oldest else 0.0,
+                "received": self._received,
+                "coalesced": self._coalesced,
+                "duplicates": self._duplicates,
+                "reruns": self._reruns,
+                "processed": self._processed,
+                "failed": self._failed,
+                "queue_wait": self._summary(list(self._wait_times)),
+                "processing": self._summary(list(self._processing_times)),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class WebhookWorkerPool:
+    """
+    Threads consommant la WebhookQueue.
+
+    handler(job) est appelé dans le thread du worker et doit retourner un dict
+    avec 'success' (bool); une exception déclenche un retry (WebhookQueue.fail).
+    """
+
+    # Attente max entre deux vérifications de la file (secondes)
+    POLL_SECONDS = 5.0
+
+    def __init__(self, queue: WebhookQueue, handler: Callable[[Dict[str, Any]], Dict[str, Any]], workers: int = 2):
+        self.queue = queue
+        self.handler = handler
+        self.workers = max(1, workers)
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Démarre les workers (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"webhook-worker-{i + 1}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"Webhook worker pool started ({self.workers} worker(s))")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Arrête les workers (après le job en cours)."""
+        self._stop.set()
+        with self.queue._ready:
+            self.queue._ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _run(self) -> None:
+        owner = f"{os.getpid()}:{threading.current_thread().name}"
+        while not self._stop.is_set():
+            job = self.queue.claim_next(owner)
+            if job is None:
+                ready_in = self.queue.next_ready_in()
+                timeout = self.POLL_SECONDS if ready_in is None else min(ready_in, self.POLL_SECONDS)
+                self.queue.wait_for_job(max(timeout, 0.05))
+                continue
+
+            ticket_id = job["ticket_id"]
+            try:
+                result = self.handler(job) or {}
+                self.queue.complete(ticket_id, success=bool(result.get("success", True)), error=result.get("error"))
+            except Exception as e:
+                state = self.queue.fail(ticket_id, str(e))
+                logger.error(f"Webhook job {ticket_id} failed ({state}): {e}")
+
+
+_queues: Dict[str, WebhookQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_webhook_queue(db_path: Optional[str] = None) -> WebhookQueue:
+    """
+    Get the WebhookQueue for a database path (one instance per path and process).
+
+    Args:
+        db_path: Chemin de la base (défaut: WEBHOOK_QUEUE_PATH ou webhook_queue.db)
+
+    Returns:
+        WebhookQueue instance
+    """
+    path = os.path.abspath(db_path or os.getenv("WEBHOOK_QUEUE_PATH", DEFAULT_DB_PATH))
+    with _queues_lock:
+        if path not in _queues:
+            coalesce = os.getenv("WEBHOOK_COALESCE_SECONDS")
+            _queues[path] = WebhookQueue(path, coalesce_seconds=float(coalesce) if coalesce else None)
+        return _queues[path]
@@ -46,15 +46,26 @@ from knowledge_base.scenarios_mapping import (
 )
 
 # State Engine - Architecture State-Driven
-from src.state_engine import StateDetector, TemplateEngine, ResponseValidator, CRMUpdater
+from src.state_engine import (
+    CRMUpdater,
+    get_state_detector,
+    get_template_engine,
+    get_response_validator,
+)
+from src.state_engine.replay import record_case
+from src.agents.base_agent import BaseAgent
 from src.utils.crm_lookup_helper import enrich_deal_lookups
 from src.utils.response_humanizer import humanize_response
 from src.utils.intent_parser import IntentParser
 from src.utils.date_filter import DateFilter, apply_final_filter
-import anthropic
+from src.llm_client import create_message
+from src.utils.llm_stage_executor import submit_llm_stage
 
 logger = logging.getLogger(__name__)
 
+# Intentions pour lesquelles les données ExamT3P doivent être relues (pas de cache)
+EXAMT3P_FRESH_DATA_INTENTS = {'STATUT_DOSSIER', 'DEMANDE_CONVOCATION'}
+
 
 class DOCTicketWorkflow:
     """Complete workflow orchestrator for DOC tickets."""
@@ -81,16 +92,30 @@ class DOCTicketWorkflow:
         self.triage_agent = TriageAgent()  # Uses Anthropic API, not Zoho API
 
         # State Engine - Architecture State-Driven (seul mode supporté)
-        self.state_detector = StateDetector()
-        self.template_engine = TemplateEngine()
-        self.response_validator = ResponseValidator()
+        # state_detector / template_engine / response_validator: propriétés
+        # ci-dessous, résolues à chaque usage (rechargement à chaud)
         self.state_crm_updater = CRMUpdater(crm_client=self.crm_client)
-        # Anthropic client for AI personalization (using Sonnet for best quality)
-        self.anthropic_client = anthropic.Anthropic()
-        self.personalization_model = "claude-sonnet-4-5-20250929"
+        # AI personalization (Sonnet for best quality), via the shared LLM gateway
+        self.personalization_model = "agent"
 
         logger.info("✅ DOCTicketWorkflow initialized (State Engine, shared clients)")
 
+    # Composants sans état par ticket: partagés par process (YAML parsés et
+    # partials pybars compilés une seule fois). Résolus à chaque usage et non
+    # capturés dans __init__: un workflow réutilisé (ComponentPool, mode
+    # continu) voit les templates modifiés sans redémarrage (shared.py)
+    @property
+    def state_detector(self):
+        return get_state_detector()
+
+    @property
+    def template_engine(self):
+        return get_template_engine()
+
+    @property
+    def response_validator(self):
+        return get_response_validator()
+
     def _mark_brouillon_auto(self, ticket_id: str) -> None:
         """Mark ticket with BROUILLON AUTO = true after draft creation."""
         try:
@@ -292,6 +317,29 @@ class DOCTicketWorkflow:
                 'errors': List[str]
             }
         """
+        # Cache de lectures Desk/CRM limité au ticket (GETs identiques dédupliqués,
+        # invalidé par update_ticket / update_deal / create_ticket_reply_draft)
+        with self.desk_client.request_scope(ticket_id), self.crm_client.request_scope(ticket_id):
+            result = self._process_ticket(
+                ticket_id,
+                auto_create_draft=auto_create_draft,
+                auto_update_crm=auto_update_crm,
+                auto_update_ticket=auto_update_ticket
+            )
+            result['api_cache_stats'] = {
+                'desk': self.desk_client.get_request_cache_stats(),
+                'crm': self.crm_client.get_request_cache_stats(),
+            }
+        return result
+
+    def _process_ticket(
+        self,
+        ticket_id: str,
+        auto_create_draft: bool,
+        auto_update_crm: bool,
+        auto_update_ticket: bool
+    ) -> Dict:
+        """Corps de process_ticket (exécuté dans le scope de cache du ticket)."""
         logger.info(f"=" * 80)
         logger.info(f"Processing DOC ticket: {ticket_id}")
         logger.info(f"=" * 80)
@@ -1075,9 +1123,6 @@ Le candidat a un ancien dossier dont les frais CMA (241€) ont déjà été ré
                 # Générer un résumé des échanges via IA
                 threads_summary = "Non disponible"
                 try:
-                    import anthropic
-                    from config import settings
-
                     # Extraire le contenu des threads pour le résumé
                     threads_text = []
                     for t in threads_data[:10]:  # Max 10 derniers threads
@@ -1086,20 +1131,18 @@ Le candidat a un ancien dossier dont les frais CMA (241€) ont déjà été ré
                         threads_text.append(f"[{direction}]: {content}")
 
                     if threads_text:
-                        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-                        summary_response = client.messages.create(
-                            model="claude-3-5-haiku-20241022",
+                        summary_response = create_message(
+                            stage="threads_summary",
+                            model="fast",
+                            cache=True,
                             max_tokens=300,
-                            messages=[{
-                                "role": "user",
-                                "content": f"""Résume en 3-4 phrases les échanges suivants entre un candidat VTC et CAB Formations.
+                            content=f"""Résume en 3-4 phrases les échanges suivants entre un candidat VTC et CAB Formations.
 Focus sur: ce que demande le candidat, les problèmes mentionnés, les actions déjà faites.
 
 ÉCHANGES:
 {chr(10).join(threads_text)}
 
 RÉSUMÉ (3-4 phrases, en français):"""
-                            }]
                         )
                         threads_summary = summary_response.content[0].text.strip()
                 except Exception as e:
@@ -1213,8 +1256,10 @@ La date d'examen dans Zoho CRM est dans le passé. Le workflow a été stoppé p
             response_result = self._run_response_generation(
                 ticket_id=ticket_id,
                 triage_result=triage_result,
-                analysis_result=analysis_result
+                analysis_result=analysis_result,
+                prefetch_note=True
             )
+            note_content_future = response_result.pop('note_content_future', None)
             result['response_result'] = response_result
 
             # Check if workflow should stop based on scenario
@@ -1359,7 +1404,8 @@ La date d'examen dans Zoho CRM est dans le passé. Le workflow a été stoppé p
                 triage_result=triage_result,
                 analysis_result=analysis_result,
                 response_result=response_result,
-                crm_updates_applied=result.get('crm_updates_applied', {})
+                crm_updates_applied=result.get('crm_updates_applied', {}),
+                note_content_future=note_content_future
             )
             result['crm_note'] = crm_note
 
@@ -2096,9 +2142,6 @@ La date d'examen dans Zoho CRM est dans le passé. Le workflow a été stoppé p
         if len(threads) > 2:
             logger.info("📝 Génération du résumé de conversation...")
             try:
-                import anthropic
-                from config import settings
-
                 # Extraire le contenu des threads pour le résumé
                 threads_text = []
                 for t in threads[:10]:  # Max 10 derniers threads
@@ -2108,20 +2151,18 @@ La date d'examen dans Zoho CRM est dans le passé. Le workflow a été stoppé p
                         threads_text.append(f"[{direction}]: {content}")
 
                 if threads_text:
-                    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-                    summary_response = client.messages.create(
-                        model="claude-3-5-haiku-20241022",
+                    summary_response = create_message(
+                        stage="conversation_summary",
+                        model="fast",
+                        cache=True,
                         max_tokens=200,
-                        messages=[{
-                            "role": "user",
-                            "content": f"""Résume en 2-3 phrases l'historique de cette conversation entre un candidat VTC et CAB Formations.
+                        content=f"""Résume en 2-3 phrases l'historique de cette conversation entre un candidat VTC et CAB Formations.
 Focus sur: le problème principal, ce qui a été fait, ce qui reste à résoudre.
 
 CONVERSATION:
 {chr(10).join(threads_text)}
 
 RÉSUMÉ (2-3 phrases):"""
-                        }]
                     )
                     conversation_summary = summary_response.content[0].text.strip()
                     logger.info(f"  ✅ Résumé généré ({len(conversation_summary)} chars)")
@@ -2471,10 +2512,16 @@ Deux comptes ExamenT3P fonctionnels ont été détectés pour ce candidat, et le
             try:
                 # Extraction complète des données ExamenT3P
                 logger.info("  📥 Extraction des données ExamenT3P...")
+                # Données fraîches exigées par certaines intentions (sinon cache ExamT3P)
+                triage = triage_result or {}
+                intents = {triage.get('primary_intent')} | set(triage.get('secondary_intents') or [])
                 examt3p_result = self.examt3p_agent.process({
                     'username': credentials_result['identifiant'],
-                    'password': credentials_result['mot_de_passe']
+                    'password': credentials_result['mot_de_passe'],
+                    'force_refresh': bool(intents & EXAMT3P_FRESH_DATA_INTENTS)
                 })
+                if examt3p_result.get('cache_status'):
+                    logger.info(f"  ♻️ ExamenT3P cache: {examt3p_result['cache_status']}")
 
                 if examt3p_result.get('success'):
                     # Fusionner les données extraites avec examt3p_data
@@ -4296,13 +4343,18 @@ L'équipe CAB Formations"""
         self,
         ticket_id: str,
         triage_result: Dict,
-        analysis_result: Dict
+        analysis_result: Dict,
+        prefetch_note: bool = False
     ) -> Dict:
         """
         Run AGENT RÉDACTEUR - Generate response using State Engine.
 
         Uses deterministic state detection + templates + validation.
 
+        Args:
+            prefetch_note: Start the CRM note generation in parallel
+                (response_result['note_content_future'])
+
         Returns response_result dict.
         """
         # Get ticket info
@@ -4331,7 +4383,8 @@ L'équipe CAB Formations"""
             analysis_result=analysis_result,
             customer_message=customer_message,
             previous_response=previous_response,
-            ticket_subject=ticket_subject
+            ticket_subject=ticket_subject,
+            prefetch_note=prefetch_note
         )
 
     def _run_state_driven_response(
@@ -4341,7 +4394,8 @@ L'équipe CAB Formations"""
         analysis_result: Dict,
         customer_message: str,
         previous_response: str,
-        ticket_subject: str
+        ticket_subject: str,
+        prefetch_note: bool = False
     ) -> Dict:
         """
         Run State-Driven response generation (deterministic).
@@ -4359,6 +4413,8 @@ L'équipe CAB Formations"""
             customer_message: Candidate's message content
             previous_response: Our previous message to the candidate
             ticket_subject: Ticket subject
+            prefetch_note: Start the CRM note generation on the final text, in
+                parallel with the CRM updates
 
         Returns:
             response_result dict compatible with current workflow
@@ -4387,7 +4443,7 @@ L'équipe CAB Formations"""
         training_exam_consistency_data = analysis_result.get('training_exam_consistency_result', {})
         session_data = analysis_result.get('session_data', {})
 
-        detected_states = self.state_detector.detect_all_states(
+        detector_inputs = dict(
             deal_data=deal_data,
             examt3p_data=examt3p_data,
             triage_result=triage_result,
@@ -4397,6 +4453,7 @@ L'équipe CAB Formations"""
             training_exam_consistency_data=training_exam_consistency_data,
             enriched_lookups=enriched_lookups
         )
+        detected_states = self.state_detector.detect_all_states(**detector_inputs)
 
         # Pour rétrocompatibilité, on utilise primary_state comme référence principale
         detected_state = detected_states.primary_state
@@ -4874,6 +4931,9 @@ L'équipe CAB Formations"""
                     detected_state.context_data['no_dates_in_own_dept'] = True
                     logger.info(f"  ⚠️ Aucune date cross-département disponible non plus")
 
+        # Cas de rejeu hors ligne (STATE_ENGINE_RECORD_DIR, voir state_engine/replay.py)
+        record_case(ticket_id, detector_inputs, detected_states, triage_result)
+
         template_result = self.template_engine.generate_response_multi(
             detected_states=detected_states,
             triage_result=triage_result,
@@ -4889,6 +4949,61 @@ L'équipe CAB Formations"""
         if template_result.get('intents_handled'):
             logger.info(f"     Intentions traitées: {template_result['intents_handled']}")
 
+        # ================================================================
+        # ÉTAGE LLM PARALLÈLE
+        # ================================================================
+        # Dépendances après le template:
+        #   humanisation → validation → note CRM | mises à jour CRM (extraction Haiku)
+        # Les mises à jour CRM ne dépendent que du template et de l'état: lancées
+        # en même temps que l'humanisation. La note, qui résume le texte final,
+        # est lancée après la validation.
+        logger.info("  📊 STATE ENGINE: Détermination des mises à jour CRM (parallèle)...")
+
+        # Check for CRM updates defined in STATE:INTENTION matrix
+        # These have priority over state-level crm_updates
+        matrix_crm_updates = template_result.get('crm_updates_from_matrix')
+        if matrix_crm_updates:
+            # Matrix provides config in correct format: {'method': '...', 'fields': [...]}
+            # or list format: [{'field': '...', 'value': '...'}]
+            if isinstance(matrix_crm_updates, dict) and 'method' in matrix_crm_updates:
+                # New format with method: {'method': 'extract_date_choice', 'fields': [...]}
+                detected_state.crm_updates_config = matrix_crm_updates
+                method = matrix_crm_updates.get('method', 'unknown')
+                fields = [f.get('field') for f in matrix_crm_updates.get('fields', [])]
+            else:
+                # Legacy list format: [{'field': '...', 'value': '...'}]
+                fields_list = matrix_crm_updates if isinstance(matrix_crm_updates, list) else [matrix_crm_updates]
+                detected_state.crm_updates_config = {
+                    'method': 'direct',
+                    'fields': fields_list
+                }
+                method = 'direct'
+                fields = [f.get('field') for f in fields_list if isinstance(f, dict)]
+
+            logger.info(f"  📋 CRM updates depuis matrice STATE:INTENTION")
+            logger.info(f"     Méthode: {method}")
+            logger.info(f"     Champs: {fields}")
+
+        # Get proposed sessions/dates for CRM updates
+        proposed_sessions = []
+        session_data = analysis_result.get('session_data', {})
+        for option in session_data.get('proposed_options', []):
+            for sess in option.get('sessions', []):
+                proposed_sessions.append(sess)
+
+        proposed_dates = analysis_result.get('date_examen_vtc_result', {}).get('next_dates', [])
+
+        # Injecter proposed_sessions dans le contexte pour extraction LLM si nécessaire
+        detected_state.context_data['proposed_sessions'] = proposed_sessions
+
+        crm_update_future = submit_llm_stage(
+            self.state_crm_updater.determine_updates,
+            state=detected_state,
+            candidate_message=customer_message,
+            proposed_sessions=proposed_sessions,
+            proposed_dates=proposed_dates
+        )
+
         # ================================================================
         # STEP 3a: Humanize Response (Optional AI polish)
         # ================================================================
@@ -4959,54 +5074,21 @@ L'équipe CAB Formations"""
             for warning in validation_result.warnings:
                 logger.info(f"     ⚡ {warning.message}")
 
+        # Note CRM rédigée sur le texte final (humanisé et validé): celui que
+        # le candidat reçoit. Elle tourne en parallèle de la fin des mises à
+        # jour CRM (STEP 4 ici, STEP 4-5 de _process_ticket)
+        note_content_future = None
+        if prefetch_note and not detected_state.response_config.get('stop_workflow', False):
+            note_content_future = submit_llm_stage(
+                self._generate_note_content_with_ai,
+                analysis_result,
+                {'response_text': response_text}
+            )
+
         # ================================================================
-        # STEP 4: Determine CRM Updates (Deterministic)
+        # STEP 4: Determine CRM Updates (lancé en parallèle au STEP 3a)
         # ================================================================
-        logger.info("  📊 STATE ENGINE: Détermination des mises à jour CRM...")
-
-        # Check for CRM updates defined in STATE:INTENTION matrix
-        # These have priority over state-level crm_updates
-        matrix_crm_updates = template_result.get('crm_updates_from_matrix')
-        if matrix_crm_updates:
-            # Matrix provides config in correct format: {'method': '...', 'fields': [...]}
-            # or list format: [{'field': '...', 'value': '...'}]
-            if isinstance(matrix_crm_updates, dict) and 'method' in matrix_crm_updates:
-                # New format with method: {'method': 'extract_date_choice', 'fields': [...]}
-                detected_state.crm_updates_config = matrix_crm_updates
-                method = matrix_crm_updates.get('method', 'unknown')
-                fields = [f.get('field') for f in matrix_crm_updates.get('fields', [])]
-            else:
-                # Legacy list format: [{'field': '...', 'value': '...'}]
-                fields_list = matrix_crm_updates if isinstance(matrix_crm_updates, list) else [matrix_crm_updates]
-                detected_state.crm_updates_config = {
-                    'method': 'direct',
-                    'fields': fields_list
-                }
-                method = 'direct'
-                fields = [f.get('field') for f in fields_list if isinstance(f, dict)]
-
-            logger.info(f"  📋 CRM updates depuis matrice STATE:INTENTION")
-            logger.info(f"     Méthode: {method}")
-            logger.info(f"     Champs: {fields}")
-
-        # Get proposed sessions/dates for CRM updates
-        proposed_sessions = []
-        session_data = analysis_result.get('session_data', {})
-        for option in session_data.get('proposed_options', []):
-            for sess in option.get('sessions', []):
-                proposed_sessions.append(sess)
-
-        proposed_dates = analysis_result.get('date_examen_vtc_result', {}).get('next_dates', [])
-
-        # Injecter proposed_sessions dans le contexte pour extraction LLM si nécessaire
-        detected_state.context_data['proposed_sessions'] = proposed_sessions
-
-        crm_update_result = self.state_crm_updater.determine_updates(
-            state=detected_state,
-            candidate_message=customer_message,
-            proposed_sessions=proposed_sessions,
-            proposed_dates=proposed_dates
-        )
+        crm_update_result = crm_update_future.result()
 
         crm_updates = crm_update_result.updates_applied
 
@@ -5061,6 +5143,9 @@ L'équipe CAB Formations"""
             'primary_intent': template_result.get('primary_intent'),
             'secondary_intents': template_result.get('secondary_intents', []),
         }
+        if note_content_future is not None:
+            # Retiré par _process_ticket avant tout usage du résultat (non sérialisable)
+            response_result['note_content_future'] = note_content_future
 
         return response_result
 
@@ -5236,12 +5321,13 @@ FORMAT DE SORTIE:
 Génère maintenant la personnalisation (1-3 phrases):"""
 
         try:
-            response = self.anthropic_client.messages.create(
+            response = create_message(
+                stage="personalization",
                 model=self.personalization_model,
                 max_tokens=200,
                 temperature=0.3,  # Low temperature for consistency
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}]
+                system=system_prompt,  # static → cached prefix
+                content=user_prompt
             )
 
             personalization = response.content[0].text.strip()
@@ -5315,7 +5401,8 @@ Génère maintenant la personnalisation (1-3 phrases):"""
         triage_result: Dict,
         analysis_result: Dict,
         response_result: Dict,
-        crm_updates_applied: Dict = None
+        crm_updates_applied: Dict = None,
+        note_content_future=None
     ) -> str:
         """
         Crée une note CRM unique et consolidée avec toutes les infos du traitement.
@@ -5330,7 +5417,6 @@ Génère maintenant la personnalisation (1-3 phrases):"""
         """
         if crm_updates_applied is None:
             crm_updates_applied = {}
-        import anthropic
 
         lines = []
 
@@ -5381,7 +5467,11 @@ Génère maintenant la personnalisation (1-3 phrases):"""
         lines.append("")
 
         # === GÉNÉRER RÉSUMÉ + NEXT STEPS avec Claude ===
-        note_content = self._generate_note_content_with_ai(analysis_result, response_result)
+        # (déjà lancé en parallèle des mises à jour CRM si note_content_future)
+        if note_content_future is not None:
+            note_content = note_content_future.result()
+        else:
+            note_content = self._generate_note_content_with_ai(analysis_result, response_result)
         if note_content:
             lines.append(note_content)
             lines.append("")
@@ -5550,8 +5640,6 @@ Génère maintenant la personnalisation (1-3 phrases):"""
         1. Résumé de ce qui a été répondu au candidat
         2. Next steps candidat et CAB
         """
-        import anthropic
-
         # Récupérer la réponse envoyée
         response_text = response_result.get('response_text', '')
 
@@ -5609,11 +5697,12 @@ RÈGLES:
 Réponds UNIQUEMENT avec le format demandé, rien d'autre."""
 
         try:
-            client = anthropic.Anthropic()
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = create_message(
+                stage="crm_note",
+                model="precise",
                 max_tokens=400,
-                messages=[{"role": "user", "content": prompt}]
+                content=prompt,
+                cache=True
             )
             return response.content[0].text.strip()
         except Exception as e:
@@ -5767,6 +5856,15 @@ Réponds UNIQUEMENT avec le format demandé, rien d'autre."""
 
         return crm_updates
 
+    def reset_request_state(self):
+        """
+        Efface l'état propre au ticket précédent avant de réutiliser le workflow
+        (pool de workflows): historiques de conversation des agents.
+        """
+        for component in vars(self).values():
+            if isinstance(component, BaseAgent):
+                component.conversation_history = []
+
     def close(self):
         """Clean up resources."""
         if hasattr(self, 'desk_client'):
@@ -0,0 +1,408 @@
+"""
+Async Zoho API client (aiohttp) with connection pooling and concurrent fan-out.
+
+Async twin of ZohoAPIClient._make_request with the same semantics:
+- Rate limiting through the shared ZohoRateLimiter buckets
+- Auto-retry on 401 with token invalidation (shared TokenManager)
+- Retry on 429 (bucket paused for Retry-After) and on timeouts / HTTP errors
+  with exponential backoff
+
+On top of that:
+- One pooled aiohttp.ClientSession per client (keep-alive connections)
+- A semaphore bounding the number of in-flight requests per client
+- Fan-out helpers (asyncio.gather) for independent GETs
+
+Sync code (the workflow, agents, helpers) reaches these coroutines through
+run_sync(), which executes them on a single background event loop. The
+aiohttp sessions therefore live as long as the process and keep their
+connections warm across tickets.
+
+Usage:
+    from src.zoho_async_client import AsyncZohoDeskClient, run_sync
+
+    client = AsyncZohoDeskClient()
+    context = run_sync(client.get_ticket_complete_context(ticket_id))
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Awaitable, TypeVar
+
+import aiohttp
+
+from config import settings
+from src.zoho_token_manager import get_token_manager
+from src.zoho_rate_limiter import get_rate_limiter, classify_endpoint
+from src.zoho_thread_store import get_thread_store
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# =============================================================================
+# BACKGROUND EVENT LOOP (sync → async bridge)
+# =============================================================================
+
+class _BackgroundLoop:
+    """A single event loop running in a daemon thread, shared by the process."""
+
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                cls._loop = asyncio.new_event_loop()
+                cls._thread = threading.Thread(
+                    target=cls._loop.run_forever,
+                    name="zoho-async-loop",
+                    daemon=True
+                )
+                cls._thread.start()
+            return cls._loop
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the shared background loop and wait for its result.
+
+    Safe to call from any thread that is not the background loop itself
+    (Flask handlers, worker threads, scripts).
+    """
+    loop = _BackgroundLoop.get_loop()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
+
+
+# =============================================================================
+# ASYNC CLIENTS
+# =============================================================================
+
+class AsyncZohoAPIClient:
+    """Base async client for Zoho API interactions with OAuth2 authentication."""
+
+    API_FAMILY = "desk"
+
+    MAX_RETRIES = 3
+    REQUEST_TIMEOUT = 30  # seconds
+    # Max in-flight requests per client (the rate limiter still applies on top)
+    MAX_CONCURRENCY = 8
+    # Pooled keep-alive connections
+    CONNECTION_LIMIT = 20
+    KEEPALIVE_TIMEOUT = 60
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.access_token: Optional[str] = None
+        self._max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._token_manager = get_token_manager()
+        self._rate_limiter = get_rate_limiter()
+
+    def _get_credentials(self) -> tuple:
+        """
+        Get OAuth credentials for this client.
+
+        Override in subclasses to use different credentials.
+
+        Returns:
+            Tuple of (client_id, client_secret, refresh_token, accounts_url)
+        """
+        return (
+            settings.zoho_client_id,
+            settings.zoho_client_secret,
+            settings.zoho_refresh_token,
+            settings.zoho_accounts_url
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the pooled session (must run inside the event loop)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.CONNECTION_LIMIT,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT
+            )
+            # trust_env=False: no proxy for Zoho API calls (same as the sync client)
+            self._session = aiohttp.ClientSession(connector=connector, trust_env=False)
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def _ensure_valid_token(self) -> None:
+        """Get a valid token from the TokenManager singleton (may refresh, so off-loop)."""
+        client_id, client_secret, refresh_token, accounts_url = self._get_credentials()
+        self.access_token = await asyncio.to_thread(
+            self._token_manager.get_token,
+            client_id=client_id,
+            client_secret=client_secret,
+            refresh_token=refresh_token,
+            accounts_url=accounts_url
+        )
+
+    async def _make_request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        _retry_count: int = 0,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Make an authenticated API request to Zoho (async).
+
+        Same retry semantics as ZohoAPIClient._make_request.
+        """
+        session = self._get_session()
+        endpoint_class = classify_endpoint(method, url)
+
+        # Apply rate limiting before the call (shared buckets, non-blocking wait)
+        wait = self._rate_limiter.reserve(self.API_FAMILY, endpoint_class)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        await self._ensure_valid_token()
+
+        headers = dict(headers or {})
+        headers["Authorization"] = f"Zoho-oauthtoken {self.access_token}"
+        headers["Content-Type"] = "application/json"
+
+        retry_reason = None
+        try:
+            async with self._semaphore:
+                async with session.request(
+                    method, url, headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT),
+                    **kwargs
+                ) as response:
+                    self._rate_limiter.observe_response(
+                        self.API_FAMILY, endpoint_class, response.status, response.headers
+                    )
+                    text = await response.text()
+
+            # Handle 401 Unauthorized - token may be revoked
+            if response.status == 401 and _retry_count < self.MAX_RETRIES:
+                logger.warning("401 Unauthorized - invalidating token and retrying...")
+                client_id, _, refresh_token, _ = self._get_credentials()
+                self._token_manager.invalidate(client_id, refresh_token)
+                return await self._make_request(
+                    method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
+                )
+
+            # Handle 429 Too Many Requests - the limiter paused the bucket
+            if response.status == 429 and _retry_count < self.MAX_RETRIES:
+                logger.warning(f"429 Rate Limited - retrying after {response.headers.get('Retry-After', 60)}s...")
+                return await self._make_request(
+                    method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
+                )
+
+            if response.status >= 400:
+                logger.error(f"API Error {response.status}: {method} {url}")
+                logger.error(f"Response body: {text[:1000]}")
+                if 'json' in kwargs:
+                    logger.error(f"Request payload size: {len(str(kwargs['json']))} chars")
+                response.raise_for_status()
+
+            # Handle empty responses (204 No Content or empty body)
+            if response.status == 204 or not text.strip():
+                return {}
+
+            return json.loads(text)
+
+        except asyncio.TimeoutError:
+            logger.error(f"API request timeout: {method} {url}")
+            retry_reason = "timeout"
+            if _retry_count >= self.MAX_RETRIES:
+                raise
+
+        except aiohttp.ClientError as e:
+            logger.error(f"API request failed: {method} {url} - {e}")
+            retry_reason = "error"
+            if _retry_count >= self.MAX_RETRIES:
+                raise
+
+        # Exponential backoff (timeout / request error)
+        wait_time = 2 ** _retry_count
+        logger.info(f"Retrying after {wait_time}s ({retry_reason})...")
+        await asyncio.sleep(wait_time)
+        return await self._make_request(
+            method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
+        )
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncZohoDeskClient(AsyncZohoAPIClient):
+    """Async client for Zoho Desk read operations with concurrent fan-out."""
+
+    async def get_ticket(self, ticket_id: str) -> Dict[str, Any]:
+        """Get a specific ticket by ID."""
+        url = f"{settings.zoho_desk_api_url}/tickets/{ticket_id}"
+        params = {"orgId": settings.zoho_desk_org_id}
+        return await self._make_request("GET", url, params=params)
+
+    async def get_ticket_threads(self, ticket_id: str) -> Dict[str, Any]:
+        """Get all threads (summaries) for a ticket."""
+        url = f"{settings.zoho_desk_api_url}/tickets/{ticket_id}/threads"
+        params = {"orgId": settings.zoho_desk_org_id}
+        return await self._make_request("GET", url, params=params)
+
+    async def get_thread_details(self, ticket_id: str, thread_id: str) -> Dict[str, Any]:
+        """Get the complete details of a specific thread including full content."""
+        url = f"{settings.zoho_desk_api_url}/tickets/{ticket_id}/threads/{thread_id}"
+        params = {"orgId": settings.zoho_desk_org_id}
+        return await self._make_request("GET", url, params=params)
+
+    async def get_ticket_conversations(self, ticket_id: str) -> Dict[str, Any]:
+        """Get all conversations for a ticket."""
+        url = f"{settings.zoho_desk_api_url}/tickets/{ticket_id}/conversations"
+        params = {"orgId": settings.zoho_desk_org_id}
+        return await self._make_request("GET", url, params=params)
+
+    async def get_ticket_history(self, ticket_id: str) -> Dict[str, Any]:
+        """Get the complete history of a ticket."""
+        url = f"{settings.zoho_desk_api_url}/tickets/{ticket_id}/history"
+        params = {"orgId": settings.zoho_desk_org_id}
+        return await self._make_request("GET", url, params=params)
+
+    async def _fetch_thread_details(self, ticket_id: str, thread: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Full details of one thread, or None if they cannot be fetched."""
+        thread_id = thread.get("id")
+        if not thread_id:
+            logger.warning("Thread without ID found, using as-is")
+            return None
+        try:
+            return await self.get_thread_details(ticket_id, thread_id)
+        except Exception as e:
+            logger.warning(f"Could not fetch full details for thread {thread_id}: {e}")
+            logger.warning(f"Using summary data for thread {thread_id} (may be incomplete)")
+            return None
+
+    async def get_threads_details(
+        self,
+        ticket_id: str,
+        threads: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch full content for a list of thread summaries concurrently.
+
+        Order is preserved. A thread whose details cannot be fetched falls back
+        to its summary data (same behavior as the sync client).
+        """
+        details = await asyncio.gather(*(self._fetch_thread_details(ticket_id, t) for t in threads))
+        return [full if full is not None else thread for thread, full in zip(threads, details)]
+
+    async def get_all_threads_with_full_content(self, ticket_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all threads for a ticket with FULL content.
+
+        Threads already in the thread store with the same version are not
+        fetched again; new or modified threads are fetched concurrently.
+        """
+        logger.info(f"Fetching all threads with full content for ticket {ticket_id} (async)")
+
+        threads_response = await self.get_ticket_threads(ticket_id)
+        threads_list = threads_response.get("data", [])
+
+        if not threads_list:
+            logger.info(f"No threads found for ticket {ticket_id}")
+            return []
+
+        store = get_thread_store()
+        full_threads = store.lookup(ticket_id, threads_list)
+        missing = [i for i, full in enumerate(full_threads) if full is None]
+
+        if missing:
+            details = await asyncio.gather(
+                *(self._fetch_thread_details(ticket_id, threads_list[i]) for i in missing)
+            )
+            for i, full in zip(missing, details):
+                if full is None:
+                    full_threads[i] = threads_list[i]
+                else:
+                    store.put(ticket_id, threads_list[i], full)
+                    full_threads[i] = full
+
+        logger.info(
+            f"Fetched {len(full_threads)} threads with full content for ticket {ticket_id} "
+            f"({len(threads_list) - len(missing)} from store, {len(missing)} fetched)"
+        )
+        return full_threads
+
+    async def get_ticket_complete_context(self, ticket_id: str) -> Dict[str, Any]:
+        """
+        Get ticket, full threads, conversations and history concurrently.
+
+        Same structure and error tolerance as ZohoDeskClient.get_ticket_complete_context.
+        """
+        logger.info(f"Fetching complete context for ticket {ticket_id} (async)")
+
+        ticket, threads, conversations, history = await asyncio.gather(
+            self.get_ticket(ticket_id),
+            self.get_all_threads_with_full_content(ticket_id),
+            self.get_ticket_conversations(ticket_id),
+            self.get_ticket_history(ticket_id),
+            return_exceptions=True
+        )
+
+        # Ticket is mandatory (the sync client raises too)
+        if isinstance(ticket, BaseException):
+            raise ticket
+
+        if isinstance(threads, BaseException):
+            logger.warning(f"Could not fetch threads for ticket {ticket_id}: {threads}")
+            threads = []
+        if isinstance(conversations, BaseException):
+            logger.warning(f"Could not fetch conversations for ticket {ticket_id}: {conversations}")
+            conversations = {}
+        if isinstance(history, BaseException):
+            logger.warning(f"Could not fetch history for ticket {ticket_id}: {history}")
+            history = {}
+
+        return {
+            "ticket": ticket,
+            "threads": threads,
+            "conversations": conversations.get("data", []),
+            "history": history.get("data", [])
+        }
+
+
+class AsyncZohoCRMClient(AsyncZohoAPIClient):
+    """Async client for Zoho CRM read operations."""
+
+    API_FAMILY = "crm"
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        super().__init__(max_concurrency)
+        self._crm_client_id = settings.zoho_crm_client_id or settings.zoho_client_id
+        self._crm_client_secret = settings.zoho_crm_client_secret or settings.zoho_client_secret
+        self._crm_refresh_token = settings.zoho_crm_refresh_token or settings.zoho_refresh_token
+
+    def _get_credentials(self) -> tuple:
+        """Get CRM-specific OAuth credentials (falls back to Desk credentials)."""
+        return (
+            self._crm_client_id,
+            self._crm_client_secret,
+            self._crm_refresh_token,
+            settings.zoho_accounts_url
+        )
+
+    async def get_record(self, module: str, record_id: str) -> Dict[str, Any]:
+        """Get a specific record by module name and ID."""
+        url = f"{settings.zoho_crm_api_url}/{module}/{record_id}"
+        response = await self._make_request("GET", url)
+        return response.get("data", [{}])[0] if response.get("data") else {}
+
+    async def get_deal(self, deal_id: str) -> Dict[str, Any]:
+        """Get a specific deal/opportunity by ID."""
+        return await self.get_record("Deals", deal_id)
+
+    async def get_contact(self, contact_id: str) -> Dict[str, Any]:
+        """Get a specific contact by ID."""
+        return await self.get_record("Contacts", contact_id)
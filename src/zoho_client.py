@@ -2,12 +2,16 @@
 import logging
 import threading
 import time
-from typing import Dict, Any, Optional, List
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Iterator
 import requests
 from datetime import datetime
 # Note: tenacity removed - using custom retry logic for better rate limit handling
 from config import settings
 from src.zoho_token_manager import get_token_manager, ZohoRateLimitError
+from src.zoho_rate_limiter import get_rate_limiter, classify_endpoint
+from src.zoho_async_client import AsyncZohoDeskClient, AsyncZohoCRMClient, run_sync
+from src.zoho_request_cache import RequestScope
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +19,10 @@ logger = logging.getLogger(__name__)
 class ZohoAPIClient:
     """Base client for Zoho API interactions with OAuth2 authentication."""
 
-    # Class-level rate limiting for API calls (shared across all instances)
-    _api_lock = threading.Lock()
-    _last_api_call_time: float = 0
-    MIN_API_INTERVAL = 0.3  # 300ms minimum between API calls
+    # API family used to pick the rate-limit budget (see ZohoRateLimiter)
+    API_FAMILY = "desk"
+    # Async twin used for concurrent fan-out (see zoho_async_client)
+    ASYNC_CLIENT_CLASS = AsyncZohoDeskClient
 
     def __init__(self):
         self.access_token: Optional[str] = None
@@ -27,19 +31,77 @@ class ZohoAPIClient:
         self._session.proxies = {"http": None, "https": None}
         # Token management is now delegated to TokenManager singleton
         self._token_manager = get_token_manager()
+        # Rate limiting is delegated to the ZohoRateLimiter singleton (shared buckets)
+        self._rate_limiter = get_rate_limiter()
+        self._async_client = None
+        # Request-scoped read cache (one scope per thread, see request_scope)
+        self._scope_local = threading.local()
+        self._last_scope_stats: Optional[Dict[str, Any]] = None
 
-    def _apply_api_rate_limit(self) -> None:
+    @property
+    def async_client(self):
         """
-        Apply rate limiting between API calls to prevent hitting Zoho limits.
+        Async twin of this client (aiohttp, pooled connections), created lazily.
 
-        Uses a class-level lock to ensure rate limiting across all client instances.
+        Its coroutines are run from sync code with run_sync().
         """
-        with self._api_lock:
-            elapsed = time.time() - self._last_api_call_time
-            if elapsed < self.MIN_API_INTERVAL:
-                sleep_time = self.MIN_API_INTERVAL - elapsed
-                time.sleep(sleep_time)
-            ZohoAPIClient._last_api_call_time = time.time()
+        if self._async_client is None:
+            self._async_client = self.ASYNC_CLIENT_CLASS()
+        return self._async_client
+
+    def _api_base_url(self) -> str:
+        """Base URL of this API family (used to identify records in the request cache)."""
+        return settings.zoho_desk_api_url
+
+    @contextmanager
+    def request_scope(self, label: str) -> Iterator[RequestScope]:
+        """
+        Open a read-through cache for one unit of work (typically one ticket).
+
+        Identical GETs inside the scope hit the API once; writes invalidate the
+        cached reads of the record they touch. Nested scopes reuse the outer one.
+
+        Args:
+            label: Name of the unit of work (ticket ID), used in logs/stats
+        """
+        current = getattr(self._scope_local, "scope", None)
+        if current is not None:
+            yield current
+            return
+
+        scope = RequestScope(self.API_FAMILY, label, self._api_base_url())
+        self._scope_local.scope = scope
+        try:
+            yield scope
+        finally:
+            self._scope_local.scope = None
+            self._last_scope_stats = scope.get_stats()
+            logger.info(
+                f"📦 Cache requêtes {self.API_FAMILY} [{label}]: "
+                f"{scope.hits} hit(s) / {scope.misses} miss(es), {scope.invalidations} invalidation(s)"
+            )
+
+    def get_request_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Hit/miss counts of the current request scope (or of the last closed one).
+
+        Returns:
+            Dict with label, hits, misses, hit_rate, invalidations, cached; None if no scope yet
+        """
+        scope = getattr(self._scope_local, "scope", None)
+        if scope is not None:
+            return scope.get_stats()
+        return self._last_scope_stats
+
+    def _apply_api_rate_limit(self, method: str = "GET", url: str = "") -> None:
+        """
+        Apply rate limiting before an API call to prevent hitting Zoho limits.
+
+        Takes a token from the family bucket (desk/crm) and, for stricter
+        endpoints such as search, from the endpoint-class bucket. Buckets are
+        shared across all client instances; the wait happens outside any lock.
+        """
+        self._rate_limiter.acquire(self.API_FAMILY, classify_endpoint(method, url))
 
     def _get_credentials(self) -> tuple:
         """
@@ -72,6 +134,39 @@ class ZohoAPIClient:
         )
 
     def _make_request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Make an authenticated API request to Zoho, through the request scope if open.
+
+        GETs are served from the current request scope when possible; writes
+        invalidate the cached reads of the record they touch.
+        """
+        scope: Optional[RequestScope] = getattr(self._scope_local, "scope", None)
+        if scope is None:
+            return self._send_request(method, url, headers=headers, **kwargs)
+
+        if method.upper() != "GET":
+            try:
+                return self._send_request(method, url, headers=headers, **kwargs)
+            finally:
+                scope.invalidate_for_write(url)
+
+        key = scope.make_key(method, url, kwargs.get("params"))
+        cached = scope.get(key)
+        if cached is not None:
+            logger.debug(f"Request cache hit: {method} {url}")
+            return cached
+
+        response = self._send_request(method, url, headers=headers, **kwargs)
+        scope.put(key, response)
+        return response
+
+    def _send_request(
         self,
         method: str,
         url: str,
@@ -80,17 +175,17 @@ class ZohoAPIClient:
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Make an authenticated API request to Zoho.
+        Send an authenticated API request to Zoho.
 
         Features:
-        - Rate limiting (300ms between calls)
+        - Rate limiting (token buckets per API family / endpoint class)
         - Auto-retry on 401 with token invalidation
         - Exponential backoff on 429 rate limit
         """
         MAX_RETRIES = 3
 
         # Apply rate limiting before the call
-        self._apply_api_rate_limit()
+        self._apply_api_rate_limit(method, url)
 
         # Ensure valid token
         self._ensure_valid_token()
@@ -106,6 +201,12 @@ class ZohoAPIClient:
                 method, url, headers=headers, timeout=30, **kwargs
             )
 
+            # Let the rate limiter adapt to Zoho's quota headers / 429
+            self._rate_limiter.observe_response(
+                self.API_FAMILY, classify_endpoint(method, url),
+                response.status_code, response.headers
+            )
+
             # Handle 401 Unauthorized - token may be revoked
             if response.status_code == 401:
                 if _retry_count < MAX_RETRIES:
@@ -114,7 +215,7 @@ class ZohoAPIClient:
                     client_id, _, refresh_token, _ = self._get_credentials()
                     self._token_manager.invalidate(client_id, refresh_token)
                     # Retry with fresh token
-                    return self._make_request(
+                    return self._send_request(
                         method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
                     )
 
@@ -123,8 +224,9 @@ class ZohoAPIClient:
                 if _retry_count < MAX_RETRIES:
                     retry_after = int(response.headers.get("Retry-After", 60))
                     logger.warning(f"429 Rate Limited - waiting {retry_after}s before retry...")
-                    time.sleep(retry_after)
-                    return self._make_request(
+                    # The rate limiter paused the bucket for Retry-After seconds:
+                    # the retry (and every other worker) waits in _apply_api_rate_limit
+                    return self._send_request(
                         method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
                     )
 
@@ -149,7 +251,7 @@ class ZohoAPIClient:
                 wait_time = 2 ** _retry_count  # Exponential backoff
                 logger.info(f"Retrying after {wait_time}s...")
                 time.sleep(wait_time)
-                return self._make_request(
+                return self._send_request(
                     method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
                 )
             raise
@@ -160,14 +262,20 @@ class ZohoAPIClient:
                 wait_time = 2 ** _retry_count  # Exponential backoff
                 logger.info(f"Retrying after {wait_time}s...")
                 time.sleep(wait_time)
-                return self._make_request(
+                return self._send_request(
                     method, url, headers=None, _retry_count=_retry_count + 1, **kwargs
                 )
             raise
 
     def close(self) -> None:
-        """Close the session."""
+        """Close the session (and the async twin's pooled session, if any)."""
         self._session.close()
+        if self._async_client is not None:
+            try:
+                run_sync(self._async_client.close(), timeout=10)
+            except Exception as e:
+                logger.debug(f"Error closing async client: {e}")
+            self._async_client = None
 
 
 class ZohoDeskClient(ZohoAPIClient):
@@ -521,7 +629,8 @@ class ZohoDeskClient(ZohoAPIClient):
 
         This method ensures you get complete email bodies, not summaries:
         1. Gets the list of threads
-        2. Fetches full details for each thread individually
+        2. Fetches full details for each new or modified thread (concurrently);
+           threads already fetched for this ticket come from the thread store
         3. Returns complete thread data with full email content
 
         This is the recommended method to use when you need the complete
@@ -533,37 +642,10 @@ class ZohoDeskClient(ZohoAPIClient):
         Returns:
             List of threads with full content
         """
-        logger.info(f"Fetching all threads with full content for ticket {ticket_id}")
-
-        # Get list of threads
-        threads_response = self.get_ticket_threads(ticket_id)
-        threads_list = threads_response.get("data", [])
-
-        if not threads_list:
-            logger.info(f"No threads found for ticket {ticket_id}")
-            return []
-
-        # Fetch full details for each thread
-        full_threads = []
-        for idx, thread in enumerate(threads_list, 1):
-            thread_id = thread.get("id")
-            if thread_id:
-                try:
-                    # Get full thread details with complete content
-                    full_thread = self.get_thread_details(ticket_id, thread_id)
-                    full_threads.append(full_thread)
-                    logger.debug(f"Fetched full content for thread {thread_id} ({idx}/{len(threads_list)})")
-                except Exception as e:
-                    logger.warning(f"Could not fetch full details for thread {thread_id}: {e}")
-                    # Fallback to the summary data from the list
-                    logger.warning(f"Using summary data for thread {thread_id} (may be incomplete)")
-                    full_threads.append(thread)
-            else:
-                logger.warning(f"Thread without ID found, using as-is")
-                full_threads.append(thread)
-
-        logger.info(f"Fetched {len(full_threads)} threads with full content for ticket {ticket_id}")
-        return full_threads
+        # Thread list + only new/modified thread details, fetched concurrently
+        # (bounded by the async client's semaphore and the rate limiter);
+        # unchanged threads come from the process-wide thread store
+        return run_sync(self.async_client.get_all_threads_with_full_content(ticket_id))
 
     def get_ticket_conversations(self, ticket_id: str) -> Dict[str, Any]:
         """
@@ -595,46 +677,21 @@ class ZohoDeskClient(ZohoAPIClient):
 
         IMPORTANT: This method fetches each thread individually to ensure
         we get the full email body content, not just summaries.
+        All independent GETs run concurrently (AsyncZohoDeskClient).
         """
         logger.info(f"Fetching complete context for ticket {ticket_id}")
 
-        # Get basic ticket info
-        ticket = self.get_ticket(ticket_id)
-
-        # Get all threads with FULL content (fetches each thread individually)
-        try:
-            threads = self.get_all_threads_with_full_content(ticket_id)
-        except Exception as e:
-            logger.warning(f"Could not fetch threads for ticket {ticket_id}: {e}")
-            threads = []
-
-        # Get conversations
-        try:
-            conversations_response = self.get_ticket_conversations(ticket_id)
-            conversations = conversations_response.get("data", [])
-        except Exception as e:
-            logger.warning(f"Could not fetch conversations for ticket {ticket_id}: {e}")
-            conversations = []
-
-        # Get history
-        try:
-            history_response = self.get_ticket_history(ticket_id)
-            history = history_response.get("data", [])
-        except Exception as e:
-            logger.warning(f"Could not fetch history for ticket {ticket_id}: {e}")
-            history = []
-
-        return {
-            "ticket": ticket,
-            "threads": threads,  # Now contains full content for each thread
-            "conversations": conversations,
-            "history": history
-        }
+        # Ticket, threads, conversations and history are independent:
+        # fetch them concurrently through the async client
+        return run_sync(self.async_client.get_ticket_complete_context(ticket_id))
 
 
 class ZohoCRMClient(ZohoAPIClient):
     """Client for Zoho CRM API operations."""
 
+    API_FAMILY = "crm"
+    ASYNC_CLIENT_CLASS = AsyncZohoCRMClient
+
     def __init__(self):
         super().__init__()
         # Store CRM-specific credentials for _get_credentials override
@@ -658,6 +715,10 @@ class ZohoCRMClient(ZohoAPIClient):
             settings.zoho_accounts_url
         )
 
+    def _api_base_url(self) -> str:
+        """Base URL of the CRM API."""
+        return settings.zoho_crm_api_url
+
     def get_record(self, module: str, record_id: str) -> Dict[str, Any]:
         """Get a specific record by module name and ID."""
         url = f"{settings.zoho_crm_api_url}/{module}/{record_id}"
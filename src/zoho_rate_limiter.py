@@ -0,0 +1,282 @@
+"""
+Zoho Rate Limiter - Token buckets per API family and endpoint class.
+
+Replaces the single class-level lock of ZohoAPIClient (300ms between ANY
+two calls, Desk and CRM together) with independent token buckets:
+- One bucket per API family (desk, crm)
+- One extra bucket per endpoint class where Zoho is stricter (search)
+- Bursts allowed up to the bucket capacity
+- Callers reserve a token under the lock and sleep OUTSIDE the lock,
+  so concurrent workers share the real quota instead of queuing
+- Adapts to Zoho's rate-limit response headers and Retry-After
+- Wait-time metrics per bucket (get_stats)
+
+Usage:
+    from src.zoho_rate_limiter import get_rate_limiter
+
+    limiter = get_rate_limiter()
+    limiter.acquire("crm", "search")        # blocks until a token is available
+    ...
+    limiter.observe_response("crm", "search", response.status_code, response.headers)
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional, Any, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Default budgets: (requests per second, burst capacity)
+# Family buckets apply to every call; endpoint-class buckets apply on top.
+DEFAULT_BUDGETS: Dict[Tuple[str, Optional[str]], Tuple[float, float]] = {
+    ("desk", None): (5.0, 10),
+    ("crm", None): (5.0, 10),
+    ("desk", "search"): (2.0, 4),
+    ("crm", "search"): (2.0, 4),
+}
+
+# Rate-limit headers returned by Zoho APIs (case-insensitive lookup)
+REMAINING_HEADERS = ("X-RATELIMIT-REMAINING", "X-Rate-Limit-Remaining-v3", "X-Rate-Limit-Remaining")
+# Below this many remaining calls, drain the local bucket to slow down
+LOW_REMAINING_THRESHOLD = 5
+
+
+def classify_endpoint(method: str, url: str) -> str:
+    """
+    Classify a Zoho API call into an endpoint class.
+
+    Returns:
+        "search" for /search endpoints, "get" for other reads, "write" otherwise
+    """
+    if "/search" in url:
+        return "search"
+    if method.upper() == "GET":
+        return "get"
+    return "write"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with reservation semantics.
+
+    reserve() never sleeps: it takes a token (possibly going negative) and
+    returns how long the caller must wait before using it.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Monitoring
+        self._acquired = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._throttled = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return the wait time (seconds) before it is usable."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = 0.0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            wait = max(wait, self._paused_until - now)
+
+            self._acquired += 1
+            if wait > 0:
+                self._waited += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Block the bucket for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._throttled += 1
+
+    def drain_to(self, remaining: float) -> None:
+        """Cap local tokens to the server-reported remaining quota."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, float(remaining))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "total_wait_seconds": round(self._total_wait, 3),
+                "max_wait_seconds": round(self._max_wait, 3),
+                "avg_wait_seconds": round(self._total_wait / self._acquired, 4) if self._acquired else 0.0,
+                "throttled": self._throttled,
+            }
+
+
+class ZohoRateLimiter:
+    """
+    Singleton holding the token buckets shared by all Zoho clients.
+
+    Budgets come from DEFAULT_BUDGETS, overridable via config.settings
+    (zoho_desk_requests_per_second, zoho_crm_search_burst, ...).
+    """
+
+    _instance: Optional["ZohoRateLimiter"] = None
+    _lock = threading.RLock()
+
+    def __new__(cls) -> "ZohoRateLimiter":
+        """Ensure only one instance exists (singleton pattern)."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self):
+        """Initialize the limiter (only runs once due to singleton)."""
+        if self._initialized:
+            return
+
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        for key, (rate, capacity) in DEFAULT_BUDGETS.items():
+            rate, capacity = self._configured_budget(key, rate, capacity)
+            self._buckets[key] = TokenBucket(self._bucket_name(key), rate, capacity)
+
+        self._initialized = True
+        logger.info("ZohoRateLimiter initialized (singleton)")
+
+    @staticmethod
+    def _bucket_name(key: Tuple[str, Optional[str]]) -> str:
+        family, endpoint_class = key
+        return f"{family}:{endpoint_class}" if endpoint_class else family
+
+    @staticmethod
+    def _configured_budget(key: Tuple[str, Optional[str]], rate: float, capacity: float) -> Tuple[float, float]:
+        """Read overrides from settings, e.g. zoho_crm_search_requests_per_second."""
+        try:
+            from config import settings
+        except Exception:
+            return rate, capacity
+
+        family, endpoint_class = key
+        prefix = f"zoho_{family}_{endpoint_class}" if endpoint_class else f"zoho_{family}"
+        rate = getattr(settings, f"{prefix}_requests_per_second", None) or rate
+        capacity = getattr(settings, f"{prefix}_burst", None) or capacity
+        return float(rate), float(capacity)
+
+    def configure(self, family: str, endpoint_class: Optional[str], rate: float, capacity: float) -> None:
+        """Set (or add) the budget of a bucket at runtime."""
+        with self._lock:
+            key = (family, endpoint_class)
+            self._buckets[key] = TokenBucket(self._bucket_name(key), rate, capacity)
+
+    def _buckets_for(self, family: str, endpoint_class: Optional[str]):
+        buckets = []
+        family_bucket = self._buckets.get((family, None))
+        if family_bucket:
+            buckets.append(family_bucket)
+        class_bucket = self._buckets.get((family, endpoint_class))
+        if class_bucket and endpoint_class:
+            buckets.append(class_bucket)
+        return buckets
+
+    def reserve(self, family: str, endpoint_class: Optional[str] = None) -> float:
+        """Reserve a token in every applicable bucket; return the wait time."""
+        return max([bucket.reserve() for bucket in self._buckets_for(family, endpoint_class)] or [0.0])
+
+    def acquire(self, family: str, endpoint_class: Optional[str] = None) -> float:
+        """
+        Block until a call is allowed for this family / endpoint class.
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(family, endpoint_class)
+        if wait > 0:
+            logger.debug(f"Rate limiter: waiting {wait:.3f}s for {family}:{endpoint_class}")
+            time.sleep(wait)
+        return wait
+
+    def observe_response(
+        self,
+        family: str,
+        endpoint_class: Optional[str],
+        status_code: int,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """
+        Adapt the buckets to Zoho's answer.
+
+        - 429: pause the buckets for Retry-After seconds
+        - Low X-RATELIMIT-REMAINING: drain local tokens to match the server
+        """
+        buckets = self._buckets_for(family, endpoint_class)
+        headers = headers or {}
+
+        if status_code == 429:
+            try:
+                retry_after = float(headers.get("Retry-After", 60))
+            except (TypeError, ValueError):
+                retry_after = 60.0
+            for bucket in buckets:
+                bucket.pause(retry_after)
+            return
+
+        for header in REMAINING_HEADERS:
+            value = headers.get(header)
+            if value is None:
+                continue
+            try:
+                remaining = float(value)
+            except (TypeError, ValueError):
+                break
+            if remaining <= LOW_REMAINING_THRESHOLD:
+                logger.info(f"Zoho quota low for {family} ({remaining:.0f} remaining) - slowing down")
+                for bucket in buckets:
+                    bucket.drain_to(remaining - LOW_REMAINING_THRESHOLD)
+            break
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-bucket statistics (wait times, throttling) for monitoring.
+
+        Returns:
+            Dict {bucket_name: stats}
+        """
+        with self._lock:
+            return {bucket.name: bucket.get_stats() for bucket in self._buckets.values()}
+
+    def reset(self) -> None:
+        """Rebuild all buckets with their configured budgets (useful for testing)."""
+        with self._lock:
+            self._initialized = False
+            self.__init__()
+
+
+def get_rate_limiter() -> ZohoRateLimiter:
+    """
+    Get the singleton ZohoRateLimiter instance.
+
+    Returns:
+        ZohoRateLimiter singleton instance
+    """
+    return ZohoRateLimiter()
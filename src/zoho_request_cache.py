@@ -0,0 +1,106 @@
+"""
+Zoho Request Cache - Request-scoped read-through cache for Zoho clients.
+
+While DOCTicketWorkflow.process_ticket runs, the same GETs are issued many
+times for one ticket (get_ticket from a dozen branches, get_ticket_threads
+from has_existing_draft and the duplicate-clarification check, get_deal
+again after updates...). A RequestScope, opened per ticket on a client,
+deduplicates identical GETs:
+- Key: method + URL + sorted query params
+- Responses are deep-copied in and out (callers may mutate them)
+- Any write (POST/PUT/PATCH/DELETE) invalidates the cached reads of the
+  same record (e.g. PATCH tickets/123 → GET tickets/123, tickets/123/threads)
+  and the listings/searches of the same module
+- Hit/miss counts per scope, logged when the scope closes
+
+Scopes are thread-local: a client shared between worker threads keeps one
+scope per thread. Outside a scope the client behaves exactly as before.
+
+Usage:
+    with desk_client.request_scope(ticket_id), crm_client.request_scope(ticket_id):
+        ...
+"""
+import copy
+import logging
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+def _resource_of(url: str, base_url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split a Zoho URL into (module, record) relative to the API base URL.
+
+    tickets/123/threads → ("tickets", "123"); Deals/search → ("Deals", "search")
+    """
+    path = urlsplit(url).path
+    base_path = urlsplit(base_url).path.rstrip("/") if base_url else ""
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    parts = [p for p in path.split("/") if p]
+    module = parts[0] if parts else None
+    record = parts[1] if len(parts) > 1 else None
+    return module, record
+
+
+class RequestScope:
+    """Read-through cache of GET responses for one unit of work (a ticket)."""
+
+    def __init__(self, name: str, label: str, base_url: str = ""):
+        self.name = name
+        self.label = label
+        self.base_url = base_url
+        self._responses: Dict[Tuple[str, str, Tuple], Dict[str, Any]] = {}
+
+        # Monitoring
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str, Tuple]:
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return method.upper(), url, items
+
+    def get(self, key: Tuple[str, str, Tuple]) -> Optional[Dict[str, Any]]:
+        """Cached response (copy) or None."""
+        response = self._responses.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(response)
+
+    def put(self, key: Tuple[str, str, Tuple], response: Dict[str, Any]) -> None:
+        self._responses[key] = copy.deepcopy(response)
+
+    def invalidate_for_write(self, url: str) -> None:
+        """Drop the cached reads a write to `url` may have made stale."""
+        module, record = _resource_of(url, self.base_url)
+        stale = []
+        for key in self._responses:
+            key_module, key_record = _resource_of(key[1], self.base_url)
+            if key_module != module:
+                continue
+            # Same record, or a listing/search of the same module
+            if key_record == record or key_record in (None, "search"):
+                stale.append(key)
+        for key in stale:
+            del self._responses[key]
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._responses)
+        self._responses.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "label": self.label,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "cached": len(self._responses),
+        }
@@ -0,0 +1,153 @@
+"""
+Zoho Thread Store - Full thread content cached per ticket.
+
+get_all_threads_with_full_content lists the threads of a ticket, then fetches
+each thread's full content (GET /threads/{id}). The workflow calls it several
+times for the same ticket (triage, analysis, deal linking...), so a 15-thread
+conversation used to cost 16 calls, 2-3 times per ticket.
+
+This singleton keeps the full content of every thread already fetched:
+- Keyed by ticket id, then thread id + version (modifiedTime, else createdTime)
+- A thread is fetched again only if it is new or its version changed
+- Only successful detail fetches are stored (summary fallbacks are not)
+- LRU on tickets (MAX_TICKETS) to bound memory in long-running processes
+- Shared by all ZohoDeskClient instances of the process (thread-safe)
+
+Usage:
+    from src.zoho_thread_store import get_thread_store
+
+    store = get_thread_store()
+    cached = store.lookup(ticket_id, summaries)   # full thread or None, per summary
+    store.put(ticket_id, summary, full_thread)
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def thread_version(thread: Dict[str, Any]) -> Optional[str]:
+    """Version of a thread as seen in the thread list (modifiedTime, else createdTime)."""
+    return thread.get("modifiedTime") or thread.get("createdTime")
+
+
+class ZohoThreadStore:
+    """
+    Singleton cache of full thread content, per ticket.
+
+    Thread-safe with RLock; returned threads are copies.
+    """
+
+    _instance: Optional["ZohoThreadStore"] = None
+    _lock = threading.RLock()
+
+    # Max tickets kept in memory (least recently used evicted first)
+    MAX_TICKETS = 500
+
+    def __new__(cls) -> "ZohoThreadStore":
+        """Ensure only one instance exists (singleton pattern)."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self):
+        """Initialize the store (only runs once due to singleton)."""
+        if self._initialized:
+            return
+
+        # {ticket_id: {thread_id: (version, full_thread)}}
+        self._tickets: "OrderedDict[str, Dict[str, Tuple[Optional[str], Dict[str, Any]]]]" = OrderedDict()
+
+        # Monitoring
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._initialized = True
+
+    def lookup(self, ticket_id: str, summaries: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Return the stored full content for each thread summary.
+
+        Args:
+            ticket_id: The ticket ID
+            summaries: Thread summaries from GET /tickets/{id}/threads
+
+        Returns:
+            List aligned with summaries: full thread (copy) if stored with the
+            same version, None if it must be fetched
+        """
+        with self._lock:
+            threads = self._tickets.get(ticket_id)
+            if threads is not None:
+                self._tickets.move_to_end(ticket_id)
+
+            result: List[Optional[Dict[str, Any]]] = []
+            for summary in summaries:
+                entry = threads.get(summary.get("id")) if threads else None
+                if entry is not None and entry[0] == thread_version(summary):
+                    self._hits += 1
+                    result.append(dict(entry[1]))
+                else:
+                    self._misses += 1
+                    result.append(None)
+            return result
+
+    def put(self, ticket_id: str, summary: Dict[str, Any], full_thread: Dict[str, Any]) -> None:
+        """Store the full content of a thread under the version of its summary."""
+        thread_id = summary.get("id")
+        if not thread_id:
+            return
+        with self._lock:
+            threads = self._tickets.setdefault(ticket_id, {})
+            self._tickets.move_to_end(ticket_id)
+            threads[thread_id] = (thread_version(summary), dict(full_thread))
+
+            while len(self._tickets) > self.MAX_TICKETS:
+                self._tickets.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, ticket_id: str) -> None:
+        """Forget all threads of a ticket."""
+        with self._lock:
+            self._tickets.pop(ticket_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics for monitoring.
+
+        Returns:
+            Dict with tickets, threads, hits, misses, hit_rate, evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "tickets": len(self._tickets),
+                "threads": sum(len(threads) for threads in self._tickets.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def clear(self) -> None:
+        """Clear all stored threads (useful for testing)."""
+        with self._lock:
+            self._tickets.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+def get_thread_store() -> ZohoThreadStore:
+    """
+    Get the singleton ZohoThreadStore instance.
+
+    Returns:
+        ZohoThreadStore singleton instance
+    """
+    return ZohoThreadStore()
@@ -16,6 +16,7 @@ Usage:
     python test_lot_analysis.py --lot 2                    # Analyse lot 2 (tickets 11-20)
     python test_lot_analysis.py --start 11 --end 20        # Même chose
     python test_lot_analysis.py --ticket 198709000448029779 # Un seul ticket
+    python test_lot_analysis.py --start 1 --end 300 --batch # Triage en lot (Message Batches)
 """
 
 import json
@@ -151,6 +152,22 @@ class LotAnalyzer:
 
     def analyze_ticket(self, ticket_id: str) -> TicketAnalysis:
         """Analyse complète d'un ticket."""
+        result, ctx = self._load_ticket(ticket_id)
+        if ctx is not None:
+            try:
+                triage_result = self.triage_agent.triage_ticket(**self._triage_inputs(result, ctx))
+                self._complete_ticket(result, ctx, triage_result)
+            except Exception as e:
+                result.errors.append(f"ANALYSIS_ERROR: {str(e)[:100]}")
+        return result
+
+    def _load_ticket(self, ticket_id: str):
+        """
+        Étapes 1-4: ticket, threads, deal CRM (appels Zoho, pas de LLM).
+
+        Returns:
+            (TicketAnalysis, contexte pour la suite) - contexte None si l'analyse s'arrête
+        """
         result = TicketAnalysis(ticket_id=ticket_id)
 
         try:
@@ -158,7 +175,7 @@ class LotAnalyzer:
             ticket = self.desk.get_ticket(ticket_id)
             if not ticket:
                 result.errors.append("TICKET_NOT_FOUND")
-                return result
+                return result, None
 
             result.ticket_number = ticket.get("ticketNumber", "")
             result.subject = ticket.get("subject", "")[:100]
@@ -186,27 +203,46 @@ class LotAnalyzer:
             # 3. LIAISON DEAL CRM
             deal_result = self.deal_agent.process({"ticket_id": ticket_id})
             result.deal_id = deal_result.get("deal_id")
+            ctx = {"ticket": ticket, "threads": threads, "deal_result": deal_result, "deal_data": None}
 
             if not result.deal_id:
-                # Pas de deal - vérifier si SPAM ou PROSPECT
-                self._analyze_no_deal_ticket(result, ticket)
-                return result
+                # Pas de deal - le triage dira si SPAM ou PROSPECT
+                return result, ctx
 
             # 4. EXTRACTION DONNÉES CRM
             deal_data = self.crm.get_deal(result.deal_id)
             if not deal_data:
                 result.errors.append("DEAL_NOT_FETCHED")
-                return result
+                return result, None
 
             result.deal_data = deal_data
+            ctx["deal_data"] = deal_data
+            return result, ctx
+
+        except Exception as e:
+            result.errors.append(f"ANALYSIS_ERROR: {str(e)[:100]}")
+            return result, None
+
+    def _triage_inputs(self, result: TicketAnalysis, ctx: Dict) -> Dict[str, Any]:
+        """Arguments de TriageAgent.triage_ticket pour ce ticket."""
+        return {
+            "ticket_subject": ctx["ticket"].get("subject", ""),
+            "thread_content": result.customer_message,
+            "deal_data": ctx["deal_data"],
+            "current_department": "DOC",
+        }
+
+    def _complete_ticket(self, result: TicketAnalysis, ctx: Dict, triage_result: Dict):
+        """Étapes 5-9 à partir du triage (direct ou en lot)."""
+        try:
+            if ctx["deal_data"] is None:
+                self._analyze_no_deal_ticket(result, triage_result)
+                return
+
+            deal_data = ctx["deal_data"]
+            threads = ctx["threads"]
 
             # 5. TRIAGE + INTENTION
-            triage_result = self.triage_agent.triage_ticket(
-                ticket_subject=ticket.get("subject", ""),
-                thread_content=result.customer_message,
-                deal_data=deal_data,
-                current_department="DOC"
-            )
             result.triage_action = triage_result.get("action", "")
             result.triage_intention = triage_result.get("detected_intent")
             result.triage_confidence = triage_result.get("confidence", 0.0)
@@ -227,7 +263,7 @@ class LotAnalyzer:
             self._apply_legacy_rules(result, threads)
 
             # 8. STATE ENGINE
-            self._apply_state_engine(result, triage_result, deal_result, threads)
+            self._apply_state_engine(result, triage_result, ctx["deal_result"], threads)
 
             # 9. ANALYSE COHÉRENCE
             self._analyze_coherence(result)
@@ -235,16 +271,8 @@ class LotAnalyzer:
         except Exception as e:
             result.errors.append(f"ANALYSIS_ERROR: {str(e)[:100]}")
 
-        return result
-
-    def _analyze_no_deal_ticket(self, result: TicketAnalysis, ticket: Dict):
+    def _analyze_no_deal_ticket(self, result: TicketAnalysis, spam_check: Dict):
         """Analyse un ticket sans deal CRM."""
-        spam_check = self.triage_agent.triage_ticket(
-            ticket_subject=ticket.get("subject", ""),
-            thread_content=result.customer_message,
-            deal_data=None,
-            current_department="DOC"
-        )
         result.triage_action = spam_check.get("action", "")
         result.triage_intention = spam_check.get("detected_intent")
         result.triage_confidence = spam_check.get("confidence", 0.0)
@@ -643,8 +671,13 @@ class LotAnalyzer:
 
         return comparison
 
-    def analyze_lot(self, start: int, end: int) -> Dict[str, Any]:
-        """Analyse un lot complet de tickets."""
+    def analyze_lot(self, start: int, end: int, batch: bool = False) -> Dict[str, Any]:
+        """
+        Analyse un lot complet de tickets.
+
+        batch=True: triage de tout le lot en un seul passage LLM
+        (TriageAgent.triage_many) au lieu d'un appel par ticket.
+        """
         ticket_ids = self.load_ticket_ids(start, end)
         lot_num = (start - 1) // 10 + 1
 
@@ -653,10 +686,13 @@ class LotAnalyzer:
         print("=" * 80)
         print(f"Tickets a analyser: {len(ticket_ids)}\n")
 
+        if batch:
+            analyses = self._analyze_batch(ticket_ids)
+
         results = []
         for i, ticket_id in enumerate(ticket_ids):
             print(f"[{i+1}/{len(ticket_ids)}] Ticket {ticket_id}...")
-            analysis = self.analyze_ticket(ticket_id)
+            analysis = analyses[ticket_id] if batch else self.analyze_ticket(ticket_id)
             results.append(analysis)
 
             # Afficher résumé
@@ -681,6 +717,27 @@ class LotAnalyzer:
 
         return report
 
+    def _analyze_batch(self, ticket_ids: List[str]) -> Dict[str, TicketAnalysis]:
+        """Chargement de tous les tickets, triage en lot, puis fin d'analyse ticket par ticket."""
+        loaded = {}
+        analyses = {}
+        for i, ticket_id in enumerate(ticket_ids):
+            print(f"[{i+1}/{len(ticket_ids)}] Chargement {ticket_id}...")
+            result, ctx = self._load_ticket(ticket_id)
+            analyses[ticket_id] = result
+            if ctx is not None:
+                loaded[ticket_id] = ctx
+
+        print(f"\nTriage en lot de {len(loaded)} tickets...")
+        triage_results = self.triage_agent.triage_many(
+            {ticket_id: self._triage_inputs(analyses[ticket_id], ctx) for ticket_id, ctx in loaded.items()}
+        )
+        print("OK\n")
+
+        for ticket_id, ctx in loaded.items():
+            self._complete_ticket(analyses[ticket_id], ctx, triage_results[ticket_id])
+        return analyses
+
     def _generate_report(self, results: List[TicketAnalysis], start: int, end: int, lot_num: int) -> Dict:
         """Génère un rapport détaillé."""
         # Statistiques
@@ -759,6 +816,8 @@ def main():
     parser.add_argument("--start", type=int, help="Ticket de debut")
     parser.add_argument("--end", type=int, help="Ticket de fin")
     parser.add_argument("--ticket", help="Analyser un seul ticket par ID")
+    parser.add_argument("--batch", action="store_true",
+                        help="Triage de tout le lot en un seul passage LLM (voir LLM_BATCH_MODE)")
     args = parser.parse_args()
 
     analyzer = LotAnalyzer()
@@ -780,9 +839,9 @@ def main():
     elif args.lot:
         start = (args.lot - 1) * 10 + 1
         end = args.lot * 10
-        analyzer.analyze_lot(start, end)
+        analyzer.analyze_lot(start, end, batch=args.batch)
     elif args.start and args.end:
-        analyzer.analyze_lot(args.start, args.end)
+        analyzer.analyze_lot(args.start, args.end, batch=args.batch)
     else:
         print("Usage:")
         print("  python test_lot_analysis.py --lot 2")
@@ -156,7 +156,8 @@ def test_webhook_with_signature(base_url: str, ticket_id: str, secret: str, even
         )
         print(f"\nStatus: {response.status_code}")
         print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
+        # 202: event queued, processed asynchronously by the worker pool
+        return response.status_code == 202
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         return False
@@ -44,22 +44,16 @@ REGRESSION_TICKETS = [
 
 def run_single_ticket(ticket_id: str, dry_run: bool = True) -> dict:
     """Run workflow for a single ticket and return results."""
-    from src.workflows.doc_ticket_workflow import DOCTicketWorkflow
+    from src.utils.component_pool import get_workflow_pool
 
-    workflow = DOCTicketWorkflow()
-    try:
-        result = workflow.process_ticket(
+    # Warm workflow reused across tickets (clients, agents, State Engine)
+    with get_workflow_pool().acquire() as workflow:
+        return workflow.process_ticket(
             ticket_id=ticket_id,
             auto_create_draft=False,
             auto_update_crm=False,
             auto_update_ticket=False
         )
-        return result
-    finally:
-        try:
-            workflow.close()
-        except Exception:
-            pass
 
 
 def capture_baseline(output_file: str = None):
@@ -139,6 +133,9 @@ def capture_baseline(output_file: str = None):
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
 
+    from src.utils.component_pool import get_workflow_pool
+    get_workflow_pool().close_all()
+
     print("\n" + "=" * 60)
     print(f"Captured {len(results)} baselines")
     print(f"  Successful: {len(REGRESSION_TICKETS) - len(errors)}")
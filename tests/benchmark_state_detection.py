@@ -0,0 +1,170 @@
+"""
+Benchmark state detection: compiled rules vs state-by-state evaluation.
+
+Builds the detection contexts of the recorded bulk analysis tickets
+(data/lot*_full_analysis_*.json: deal_data, examt3p_data, triage) with
+StateDetector._build_context, then times matching over that corpus:
+- before: every state of candidate_states.yaml through _matches_state
+  (conditions re-parsed, Uber / date cases recomputed per state)
+- after:  StateRules.matching (compiled conditions, decision table)
+
+Both paths must return the same states for every context; any difference
+is reported and makes the script exit 1. No API call is made.
+
+Usage:
+    python tests/benchmark_state_detection.py
+    python tests/benchmark_state_detection.py --repeat 2000
+"""
+import sys
+import io
+import ast
+import glob
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Fix Windows encoding issues
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from src.state_engine.state_detector import StateDetector
+
+DEFAULT_GLOB = str(PROJECT_ROOT / 'data' / 'lot*_full_analysis_*.json')
+
+# Intent / action variations replayed on each recorded ticket, so every
+# branch of the decision table is exercised
+TRIAGE_VARIANTS = [
+    {},
+    {'action': 'SPAM'},
+    {'action': 'ROUTE'},
+    {'primary_intent': 'REPORT_DATE', 'secondary_intents': ['STATUT_DOSSIER']},
+    {'primary_intent': 'CONFIRMATION_SESSION', 'secondary_intents': ['DEMANDE_IDENTIFIANTS']},
+]
+
+
+def parse_field(value):
+    """Fields are stored either as dicts or as Python reprs in the analysis files."""
+    if not isinstance(value, str):
+        return value if isinstance(value, dict) else {}
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def load_contexts(paths, detector):
+    contexts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for ticket in data.get('tickets', []):
+            deal_data = parse_field(ticket.get('deal_data'))
+            if not deal_data:
+                continue
+            examt3p_data = parse_field(ticket.get('examt3p_data'))
+            for variant in TRIAGE_VARIANTS:
+                triage_result = {
+                    'action': ticket.get('triage_action') or 'GO',
+                    'detected_intent': ticket.get('triage_intention'),
+                    'intent_context': parse_field(ticket.get('intent_context')),
+                    **variant,
+                }
+                contexts.append(detector._build_context(
+                    deal_data, examt3p_data, triage_result,
+                    {'deal_id': ticket.get('deal_id')}, None
+                ))
+    return contexts
+
+
+def match_legacy(detector, context):
+    """State-by-state evaluation (behaviour before the compiled rules)."""
+    matched = []
+    for state_name, state_config in detector._sorted_states:
+        if detector._matches_state(state_name, state_config, context):
+            matched.append(state_name)
+            if state_config.get('severity', 'INFO') == 'BLOCKING':
+                break
+    return matched
+
+
+def match_compiled(detector, context):
+    matched = []
+    for rule in detector.rules.matching(context):
+        matched.append(rule.name)
+        if rule.config.get('severity', 'INFO') == 'BLOCKING':
+            break
+    return matched
+
+
+def time_matching(match, detector, contexts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for context in contexts:
+            match(detector, context)
+    return (time.perf_counter() - started) / (repeat * len(contexts))
+
+
+def run_benchmark(paths, repeat) -> int:
+    logging.disable(logging.INFO)
+    detector = StateDetector()
+    contexts = load_contexts(paths, detector)
+    if not contexts:
+        print("ERROR: no recorded contexts found")
+        return 2
+
+    differences = [
+        (i, legacy, compiled) for i, context in enumerate(contexts)
+        for legacy, compiled in [(match_legacy(detector, context), match_compiled(detector, context))]
+        if legacy != compiled
+    ]
+
+    before = time_matching(match_legacy, detector, contexts, repeat)
+    after = time_matching(match_compiled, detector, contexts, repeat)
+
+    print(f"State detection benchmark ({len(contexts)} contexts from {len(paths)} file(s), x{repeat})")
+    print("=" * 70)
+    print(f"  States:                 {len(detector._sorted_states)} "
+          f"({len(detector.rules.states)} compiled, {len(detector.rules.skipped)} never applicable)")
+    print(f"  Avg candidates/context: "
+          f"{sum(len(detector.rules.candidates(c)) for c in contexts) / len(contexts):.1f}")
+    print(f"  Before (per context):   {before * 1e6:.1f} µs")
+    print(f"  After  (per context):   {after * 1e6:.1f} µs")
+    print(f"  Speed-up:               x{before / after:.1f}")
+    print(f"  Identical results:      {len(contexts) - len(differences)}/{len(contexts)}")
+
+    for i, legacy, compiled in differences[:10]:
+        print(f"  [context {i}] before={legacy} after={compiled}")
+    return 1 if differences else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark compiled state detection rules against state-by-state evaluation'
+    )
+    parser.add_argument(
+        'files',
+        nargs='*',
+        help=f'Bulk analysis files (default: {DEFAULT_GLOB})'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=500,
+        help='Passes over the corpus for each timing (default: 500)'
+    )
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(DEFAULT_GLOB))
+    sys.exit(run_benchmark(paths, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
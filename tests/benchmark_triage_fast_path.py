@@ -0,0 +1,183 @@
+"""
+Benchmark the rule-based triage fast path against historical LLM triage.
+
+Replays the tickets of the bulk analysis files (data/lot*_full_analysis_*.json,
+each ticket carrying the triage_action / triage_intention produced by the
+LLM at the time) through TriageFastPath and reports:
+- hit rate: share of tickets answered without the LLM (confidence >= threshold)
+- agreement: on those hits, same action / same intent as the LLM triage
+- false accepts: hand-labelled tricky messages (negations, spam words in a
+  candidate message...) that must never be answered without the LLM
+
+Agreement on a handful of hits does not validate the threshold: below
+MIN_HITS hits the report says so.
+
+No API call is made.
+
+Usage:
+    python tests/benchmark_triage_fast_path.py
+    python tests/benchmark_triage_fast_path.py data/lot3_full_analysis_21_30.json --verbose
+    python tests/benchmark_triage_fast_path.py --min-confidence 0.8
+"""
+import sys
+import io
+import ast
+import json
+import glob
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Fix Windows encoding issues
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from src.utils.text_utils import clean_html_content
+from src.utils.triage_fast_path import TriageFastPath
+
+DEFAULT_GLOB = str(PROJECT_ROOT / 'data' / 'lot*_full_analysis_*.json')
+
+# Intent names renamed since the historical runs (historical -> current)
+INTENT_ALIASES = {
+    # Credentials sent by the candidate were labelled DEMANDE_IDENTIFIANTS
+    # before ENVOIE_IDENTIFIANTS existed
+    ('DEMANDE_IDENTIFIANTS', 'ENVOIE_IDENTIFIANTS'),
+}
+
+
+# Hits needed before the agreement rates say anything about the threshold
+MIN_HITS = 50
+
+# (subject, message, deal_data): must fall through to the LLM
+MUST_FALL_THROUGH = [
+    ("Inscription", "Bonjour, je travaille chez Casino à Lyon et je voudrais m'inscrire à la formation VTC", None),
+    ("Newsletter", "Bonjour, je souhaite des informations.\nClick here to unsubscribe from our newsletter", None),
+    ("Re: Inscription", "Merci pas reçu", {"Deal_Name": "X"}),
+    ("Re: Inscription", "Merci mais toujours rien", {"Deal_Name": "X"}),
+    ("Re: Dates d'examen", "je confirme le 15/03/2026 mais je ne pourrai pas venir", {"Deal_Name": "X"}),
+    ("Re: Dates d'examen", "ok pour le 15/03/2026, toujours pas de convocation", {"Deal_Name": "X"}),
+    ("Re: Examen VTC", "Merci. Je serai hospitalisé le jour de l'examen, pouvez-vous reporter ?", {"Deal_Name": "X"}),
+]
+
+
+def parse_field(value):
+    """Fields are stored as Python reprs in the analysis files ("{'Evalbox': ...}")."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def load_tickets(paths):
+    tickets = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for ticket in data.get('tickets', []):
+            ticket['_source'] = Path(path).name
+            tickets.append(ticket)
+    return tickets
+
+
+def intents_agree(expected, actual) -> bool:
+    return expected == actual or (expected, actual) in INTENT_ALIASES
+
+
+def run_benchmark(paths, min_confidence=None, verbose=False) -> int:
+    tickets = load_tickets(paths)
+    if not tickets:
+        print("ERROR: no tickets found")
+        return 2
+
+    fast_path = TriageFastPath(min_confidence=min_confidence)
+    hits = []
+    below_threshold = 0
+
+    for ticket in tickets:
+        message = clean_html_content(ticket.get('last_customer_message') or ticket.get('customer_message') or '')
+        deal_data = parse_field(ticket.get('deal_data'))
+        result = fast_path.classify(ticket.get('subject', ''), message, deal_data if isinstance(deal_data, dict) else None)
+        if result is None:
+            continue
+        if not fast_path.accepts(result):
+            below_threshold += 1
+            continue
+        hits.append((ticket, result))
+
+    action_ok = sum(1 for t, r in hits if r['action'] == t.get('triage_action'))
+    intent_ok = sum(1 for t, r in hits if intents_agree(t.get('triage_intention'), r['primary_intent']))
+
+    print(f"Triage fast path benchmark ({len(paths)} file(s), threshold {fast_path.min_confidence})")
+    print("=" * 70)
+    print(f"  Tickets:            {len(tickets)}")
+    print(f"  Fast path hits:     {len(hits)} ({len(hits) / len(tickets):.0%} of LLM calls avoided)")
+    print(f"  Below threshold:    {below_threshold}")
+    if hits:
+        print(f"  Action agreement:   {action_ok}/{len(hits)} ({action_ok / len(hits):.0%})")
+        print(f"  Intent agreement:   {intent_ok}/{len(hits)} ({intent_ok / len(hits):.0%})")
+        rules = Counter(r['intent_context']['fast_path_rule'] for _, r in hits)
+        print("  Hits by rule:       " + ", ".join(f"{rule}={count}" for rule, count in rules.most_common()))
+
+    false_accepts = [
+        (subject, message) for subject, message, deal_data in MUST_FALL_THROUGH
+        if fast_path.accepts(fast_path.classify(subject, message, deal_data))
+    ]
+    print(f"  False accepts:      {len(false_accepts)}/{len(MUST_FALL_THROUGH)} tricky messages")
+    for subject, message in false_accepts:
+        print(f"    {subject!r}: {message[:60]!r}")
+    if len(hits) < MIN_HITS:
+        print(f"  WARNING: {len(hits)} hits (< {MIN_HITS}): too few to validate the threshold")
+
+    disagreements = [
+        (t, r) for t, r in hits
+        if r['action'] != t.get('triage_action') or not intents_agree(t.get('triage_intention'), r['primary_intent'])
+    ]
+    if disagreements:
+        print("\nDisagreements (LLM -> fast path):")
+        for ticket, result in disagreements:
+            print(f"  [{ticket.get('ticket_id')}] {ticket.get('triage_action')}/{ticket.get('triage_intention')}"
+                  f" -> {result['action']}/{result['primary_intent']} ({result['intent_context']['fast_path_rule']})")
+    if verbose:
+        print("\nHits:")
+        for ticket, result in hits:
+            print(f"  [{ticket.get('ticket_id')}] {ticket.get('subject', '')[:50]!r} -> "
+                  f"{result['primary_intent'] or result['action']} ({result['confidence']})")
+
+    return 1 if disagreements or false_accepts else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the triage fast path against historical LLM triage'
+    )
+    parser.add_argument(
+        'files',
+        nargs='*',
+        help=f'Bulk analysis files (default: {DEFAULT_GLOB})'
+    )
+    parser.add_argument(
+        '--min-confidence',
+        type=float,
+        default=None,
+        help='Confidence threshold (default: TRIAGE_FAST_PATH_MIN_CONFIDENCE)'
+    )
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='List every fast path hit'
+    )
+    args = parser.parse_args()
+
+    paths = args.files or sorted(glob.glob(DEFAULT_GLOB))
+    sys.exit(run_benchmark(paths, args.min_confidence, args.verbose))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def test_credentials(monkeypatch):
+    """Placeholder Zoho/Anthropic credentials: settings load without a .env, no test reaches the real APIs."""
+    for var in ("ZOHO_CLIENT_ID", "ZOHO_CLIENT_SECRET", "ZOHO_REFRESH_TOKEN", "ZOHO_DESK_ORG_ID"):
+        monkeypatch.setenv(var, "test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
@@ -0,0 +1,191 @@
+"""
+Local stub of the Anthropic messages API (messages + Message Batches).
+
+Lets the LLM layer (LLMGateway, LLMBatch) and the bulk analysis scripts run
+end to end without the real API: point the SDK at it with ANTHROPIC_BASE_URL.
+
+Endpoints:
+    POST /v1/messages
+    POST /v1/messages/batches
+    GET  /v1/messages/batches/{id}          (ends after `polls_before_end` polls)
+    GET  /v1/messages/batches/{id}/results  (JSONL)
+    POST /v1/messages/batches/{id}/cancel
+
+Replies are "ok" by default; pass `reply(params) -> str` to script them.
+
+Usage:
+    python tests/llm_stub_server.py --port 8765
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 python test_lot_analysis.py --start 1 --end 50 --batch
+
+    with StubLLMServer() as stub:
+        client = anthropic.Anthropic(api_key="x", base_url=stub.url)
+"""
+import sys
+import io
+import json
+import argparse
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+# Fix Windows encoding issues
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+
+def _message(params: Dict[str, Any], text: str) -> Dict[str, Any]:
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:12]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "stub"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 2},
+    }
+
+
+class StubLLMServer:
+    """Threaded HTTP stub; records every request received."""
+
+    def __init__(
+        self,
+        reply: Optional[Callable[[Dict[str, Any]], str]] = None,
+        polls_before_end: int = 1,
+        fail_custom_ids: Optional[List[str]] = None,
+        port: int = 0
+    ):
+        self.reply = reply or (lambda params: "ok")
+        self.polls_before_end = polls_before_end
+        self.fail_custom_ids = set(fail_custom_ids or [])
+        self.requests: List[Dict[str, Any]] = []
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _batch_object(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        ended = batch["status"] == "ended"
+        count = len(batch["requests"])
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": batch["status"],
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0, "canceled": 0, "expired": 0,
+            },
+            "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": "2026-01-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, body: str, content_type: str = "application/json"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", content_type)
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("content-length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?")[0]
+                with stub._lock:
+                    stub.requests.append({"method": "POST", "path": path, "body": body})
+
+                if path == "/v1/messages":
+                    return self._send(200, json.dumps(_message(body, stub.reply(body))))
+                if path == "/v1/messages/batches":
+                    batch = {"id": f"msgbatch_{uuid.uuid4().hex[:12]}", "status": "in_progress",
+                             "polls": 0, "requests": body.get("requests", [])}
+                    with stub._lock:
+                        stub.batches[batch["id"]] = batch
+                    return self._send(200, json.dumps(stub._batch_object(batch)))
+                if path.endswith("/cancel"):
+                    batch = stub.batches[path.split("/")[-2]]
+                    batch["status"] = "canceling"
+                    return self._send(200, json.dumps(stub._batch_object(batch)))
+                self._send(404, json.dumps({"type": "error", "error": {"type": "not_found_error", "message": path}}))
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                with stub._lock:
+                    stub.requests.append({"method": "GET", "path": path})
+                parts = path.strip("/").split("/")
+                batch = stub.batches.get(parts[3]) if len(parts) >= 4 else None
+                if batch is None:
+                    return self._send(404, json.dumps({"type": "error", "error": {"type": "not_found_error", "message": path}}))
+
+                if len(parts) == 5 and parts[4] == "results":
+                    lines = []
+                    for request in batch["requests"]:
+                        if request["custom_id"] in stub.fail_custom_ids:
+                            result = {"type": "errored", "error": {"type": "error", "error": {
+                                "type": "overloaded_error", "message": "stub failure"}}}
+                        else:
+                            params = request["params"]
+                            result = {"type": "succeeded", "message": _message(params, stub.reply(params))}
+                        lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}))
+                    return self._send(200, "\n".join(lines) + "\n", "application/x-jsonl")
+
+                if batch["status"] == "in_progress":
+                    batch["polls"] += 1
+                    if batch["polls"] >= stub.polls_before_end:
+                        batch["status"] = "ended"
+                return self._send(200, json.dumps(stub._batch_object(batch)))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Local stub of the Anthropic messages / Message Batches API'
+    )
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    args = parser.parse_args()
+
+    server = StubLLMServer(port=args.port).start()
+    print(f"Stub LLM API on {server.url} (ANTHROPIC_BASE_URL={server.url}), Ctrl+C to stop")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+Offline golden-output regression and benchmark for the State Engine.
+
+Replays recorded cases (src/state_engine/replay.py: detect_all_states
+inputs + the DetectedStates / triage_result given to
+generate_response_multi) through StateDetector and TemplateEngine, without
+Zoho or Anthropic:
+- detection: states re-detected with the current rules vs recorded states
+- rendering: responses regenerated with the current templates vs the
+  golden outputs (AI sections are not generated)
+- speed: throughput, p50/p95 latency and memory per ticket
+
+Cases come from the workflow (STATE_ENGINE_RECORD_DIR) or are built from
+the recorded bulk analysis files (data/lot*_full_analysis_*.json,
+data/ticket_analysis_*.json), replayed with several triage intents.
+
+Typical use around a template / rules change:
+    python tests/replay_state_engine.py --build             # cases from data/ (once)
+    python tests/replay_state_engine.py --update            # golden outputs, before the change
+    python tests/replay_state_engine.py                     # after the change: diff + benchmark
+    python tests/replay_state_engine.py --cases recordings/cases_*.jsonl --verbose
+
+Some outputs depend on the current date (exam deadlines): refresh the
+golden outputs the same day as the comparison.
+
+Exit code: 1 if any detection or output differs from the golden file.
+"""
+import sys
+import io
+import glob
+import json
+import time
+import logging
+import argparse
+import statistics
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+from difflib import unified_diff
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Fix Windows encoding issues
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from benchmark_state_detection import parse_field, TRIAGE_VARIANTS
+from src.state_engine.replay import (
+    iter_cases, load_detected_states, make_case, replay_detection, replay_response,
+    state_names, write_cases,
+)
+from src.state_engine import pybars_renderer
+from src.state_engine.state_detector import StateDetector
+from src.state_engine.template_engine import TemplateEngine
+
+DEFAULT_SOURCES = [
+    str(PROJECT_ROOT / 'data' / 'lot*_full_analysis_*.json'),
+    str(PROJECT_ROOT / 'data' / 'ticket_analysis_*.json'),
+]
+DEFAULT_CASES = PROJECT_ROOT / 'baselines' / 'state_engine_cases.jsonl.gz'
+DEFAULT_GOLDEN = PROJECT_ROOT / 'baselines' / 'state_engine_golden.json'
+
+
+# ----------------------------------------------------------------------
+# Building cases from the bulk analysis files
+# ----------------------------------------------------------------------
+
+def cases_from_analysis(paths, detector):
+    """One case per (recorded ticket, triage variant)."""
+    cases = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for ticket in data.get('tickets', [data]):
+            deal_data = parse_field(ticket.get('deal_data'))
+            if not deal_data:
+                continue
+            for variant_index, variant in enumerate(TRIAGE_VARIANTS):
+                triage_result = {
+                    'action': ticket.get('triage_action') or 'GO',
+                    'detected_intent': ticket.get('triage_intention'),
+                    'primary_intent': ticket.get('triage_intention'),
+                    'secondary_intents': [],
+                    'intent_context': parse_field(ticket.get('intent_context')),
+                    **variant,
+                }
+                detector_inputs = {
+                    'deal_data': deal_data,
+                    'examt3p_data': parse_field(ticket.get('examt3p_data')),
+                    'triage_result': triage_result,
+                    'linking_result': {'deal_id': ticket.get('deal_id')},
+                    'threads_data': None,
+                    'session_data': parse_field(ticket.get('legacy_session_data')),
+                }
+                cases.append(make_case(
+                    ticket.get('ticket_id'), detector_inputs,
+                    detector.detect_all_states(**detector_inputs), triage_result,
+                    source=f"{Path(path).stem}#{variant_index}",
+                ))
+    return cases
+
+
+# ----------------------------------------------------------------------
+# Replay
+# ----------------------------------------------------------------------
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def replay_all(cases, detector, engine, repeat):
+    """Replay every case `repeat` times; returns (outputs by case_id, timings)."""
+    outputs = {}
+    detect_times, render_times = [], []
+    for run in range(repeat):
+        for case in cases:
+            started = time.perf_counter()
+            detected = replay_detection(detector, case)
+            detect_times.append(time.perf_counter() - started)
+
+            # Loading (deep copy of the recorded states) is not part of rendering
+            recorded_states = load_detected_states(case['detected_states'])
+            started = time.perf_counter()
+            output = replay_response(engine, case, recorded_states)
+            render_times.append(time.perf_counter() - started)
+
+            if run == 0:
+                outputs[case['case_id']] = {'states': state_names(detected), **output}
+    return outputs, {'detect': detect_times, 'render': render_times}
+
+
+def memory_per_ticket(cases, detector, engine):
+    """Peak memory allocated by the detection + rendering of each case (bytes)."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for case in cases:
+            recorded_states = load_detected_states(case['detected_states'])
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            replay_detection(detector, case)
+            replay_response(engine, case, recorded_states)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def compare(golden, outputs, verbose):
+    """Differences between the golden outputs and the current outputs."""
+    differences = []
+    for case_id, current in outputs.items():
+        expected = golden.get(case_id)
+        if expected is None:
+            differences.append((case_id, 'new case (not in golden file)'))
+            continue
+        if expected['states'] != current['states']:
+            differences.append((case_id, f"states: {expected['states']} -> {current['states']}"))
+        for key in ('template_used', 'states_used', 'intents_handled'):
+            if expected.get(key) != current.get(key):
+                differences.append((case_id, f"{key}: {expected.get(key)} -> {current.get(key)}"))
+        if expected['response_text'] != current['response_text']:
+            detail = (f"response_text: {len(expected['response_text'])} -> "
+                      f"{len(current['response_text'])} chars")
+            if verbose:
+                diff = unified_diff(
+                    expected['response_text'].splitlines(), current['response_text'].splitlines(),
+                    fromfile='golden', tofile='current', lineterm='', n=1
+                )
+                detail += '\n' + '\n'.join(f"      {line}" for line in list(diff)[:40])
+            differences.append((case_id, detail))
+    for case_id in golden.keys() - outputs.keys():
+        differences.append((case_id, 'missing case (in golden file only)'))
+    return differences
+
+
+def report(cases, timings, peaks):
+    detect, render = timings['detect'], timings['render']
+    total = sum(detect) + sum(render)
+    print(f"  Throughput:             {len(detect) / total:.0f} tickets/s (detection + rendering)")
+    for label, values in (('Detection', detect), ('Rendering', render)):
+        print(f"  {label + ' latency:':<24}p50 {percentile(values, 0.5) * 1e3:.2f} ms, "
+              f"p95 {percentile(values, 0.95) * 1e3:.2f} ms, max {max(values) * 1e3:.2f} ms")
+    print(f"  Memory per ticket:      avg {statistics.mean(peaks) / 1024:.0f} KiB, "
+          f"p95 {percentile(peaks, 0.95) / 1024:.0f} KiB, max {max(peaks) / 1024:.0f} KiB")
+
+
+def run(args) -> int:
+    logging.disable(logging.WARNING)
+    if not args.render_cache:
+        # Every pass measures real rendering, not output cache hits
+        pybars_renderer.PYBARS_RENDER_CACHE_SIZE = 0
+    detector = StateDetector()
+
+    if args.build:
+        sources = sorted(p for pattern in (args.build_from or DEFAULT_SOURCES) for p in glob.glob(pattern))
+        cases = cases_from_analysis(sources, detector)
+        output = Path(args.cases[0]) if args.cases else DEFAULT_CASES
+        write_cases(output, cases)
+        print(f"{len(cases)} cases built from {len(sources)} file(s): {output}")
+        return 0
+
+    case_paths = sorted(p for pattern in (args.cases or [str(DEFAULT_CASES)]) for p in glob.glob(pattern))
+    cases = [case for path in case_paths for case in iter_cases(path)]
+    if not cases:
+        print(f"ERROR: no cases found ({', '.join(args.cases or [str(DEFAULT_CASES)])}); run with --build first")
+        return 2
+
+    started = time.perf_counter()
+    engine = TemplateEngine()
+    startup = time.perf_counter() - started
+
+    # First render: imports pybars and loads the render functions it uses
+    started = time.perf_counter()
+    replay_response(engine, cases[0])
+    warmup = time.perf_counter() - started
+
+    outputs, timings = replay_all(cases, detector, engine, args.repeat)
+    peaks = memory_per_ticket(cases, detector, engine)
+
+    print(f"State Engine replay ({len(cases)} cases from {len(case_paths)} file(s), x{args.repeat})")
+    print("=" * 70)
+    print(f"  TemplateEngine startup: {startup * 1e3:.0f} ms (first render: {warmup * 1e3:.0f} ms)")
+    report(cases, timings, peaks)
+
+    golden_path = Path(args.golden)
+    if args.update:
+        golden_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(golden_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'outputs': outputs,
+            }, f, indent=1, ensure_ascii=False)
+        print(f"  Golden outputs written: {golden_path}")
+        return 0
+
+    if not golden_path.exists():
+        print(f"  No golden file ({golden_path}): run with --update to create it")
+        return 0
+
+    with open(golden_path, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    generated_at = golden.get('generated_at', '')
+    if generated_at[:10] != datetime.now().date().isoformat():
+        print(f"  WARNING: golden outputs from {generated_at}: date-dependent outputs may differ")
+
+    differences = compare(golden['outputs'], outputs, args.verbose)
+    changed = sorted({case_id for case_id, _ in differences})
+    print(f"  Identical outputs:      {len(outputs) - len(changed)}/{len(outputs)}")
+    for case_id, detail in differences[:args.max_diffs]:
+        print(f"  [{case_id}] {detail}")
+    if len(differences) > args.max_diffs:
+        print(f"  ... {len(differences) - args.max_diffs} more difference(s)")
+    return 1 if differences else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay recorded State Engine cases offline: golden-output diff and benchmark'
+    )
+    parser.add_argument(
+        '--cases',
+        nargs='+',
+        default=None,
+        help=f'Case files (JSON Lines, .gz allowed, globs expanded; default: {DEFAULT_CASES})'
+    )
+    parser.add_argument(
+        '--golden',
+        default=str(DEFAULT_GOLDEN),
+        help=f'Golden outputs file (default: {DEFAULT_GOLDEN})'
+    )
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        help='Write the current outputs as the golden outputs'
+    )
+    parser.add_argument(
+        '--build',
+        action='store_true',
+        help='Build cases from bulk analysis files (written to the first --cases path)'
+    )
+    parser.add_argument(
+        '--build-from',
+        nargs='+',
+        default=None,
+        help='Analysis files for --build (default: data/lot*_full_analysis_*.json, data/ticket_analysis_*.json)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Passes over the cases for the timings (default: 3)'
+    )
+    parser.add_argument(
+        '--render-cache',
+        action='store_true',
+        help='Keep the PybarsRenderer output cache during the timings (disabled by default)'
+    )
+    parser.add_argument(
+        '--max-diffs',
+        type=int,
+        default=20,
+        help='Differences printed (default: 20)'
+    )
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Show a diff of the changed responses'
+    )
+    args = parser.parse_args()
+    sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
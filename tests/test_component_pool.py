@@ -0,0 +1,139 @@
+"""Tests for the warm component pool and the shared State Engine components."""
+
+import threading
+
+import pytest
+
+from src.utils.component_pool import ComponentPool
+
+
+class FakeComponent:
+    def __init__(self):
+        self.history = []
+        self.resets = 0
+        self.closed = False
+
+    def reset_request_state(self):
+        self.resets += 1
+        self.history = []
+
+    def close(self):
+        self.closed = True
+
+
+class TestComponentPool:
+    def test_instances_are_reused_and_reset(self):
+        built = []
+
+        def factory():
+            built.append(FakeComponent())
+            return built[-1]
+
+        pool = ComponentPool("test", factory, max_size=2)
+        with pool.acquire() as first:
+            first.history.append("ticket 1")
+        with pool.acquire() as second:
+            assert second is first
+            assert second.history == []
+
+        assert len(built) == 1
+        assert first.resets == 2
+        stats = pool.get_stats()
+        assert stats["acquisitions"] == 2
+        assert stats["reused"] == 1
+        assert stats["idle"] == 1
+
+    def test_bounded_size_blocks_until_release(self):
+        pool = ComponentPool("test", FakeComponent, max_size=1)
+        with pool.acquire():
+            with pytest.raises(TimeoutError):
+                with pool.acquire(timeout=0.05):
+                    pass
+
+        released = threading.Event()
+
+        def hold():
+            with pool.acquire():
+                released.wait(1)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        released.set()
+        with pool.acquire(timeout=2) as instance:
+            assert isinstance(instance, FakeComponent)
+        thread.join()
+        assert pool.get_stats()["size"] == 1
+
+    def test_failed_reset_discards_instance(self):
+        class Broken(FakeComponent):
+            def reset_request_state(self):
+                raise RuntimeError("boom")
+
+        pool = ComponentPool("test", Broken, max_size=1)
+        with pool.acquire() as instance:
+            pass
+        assert instance.closed
+        assert pool.get_stats()["size"] == 0
+        assert pool.get_stats()["discarded"] == 1
+
+    def test_factory_error_frees_slot(self):
+        def factory():
+            raise RuntimeError("no credentials")
+
+        pool = ComponentPool("test", factory, max_size=1)
+        with pytest.raises(RuntimeError):
+            with pool.acquire(timeout=0.05):
+                pass
+        assert pool.get_stats()["size"] == 0
+
+    def test_warm_and_close_all(self):
+        pool = ComponentPool("test", FakeComponent, max_size=3)
+        assert pool.warm(2) == 2
+        assert pool.get_stats()["idle"] == 2
+
+        with pool.acquire() as in_use:
+            pool.close_all()
+        assert in_use.closed
+        assert pool.get_stats()["size"] == 0
+
+
+class TestSharedStateEngine:
+    def test_components_built_once_per_process(self):
+        from src.state_engine import get_state_detector, get_template_engine, reset_shared_components
+
+        reset_shared_components()
+        assert get_state_detector() is get_state_detector()
+        assert get_template_engine() is get_template_engine()
+        reset_shared_components()
+
+    def test_pooled_workflow_sees_edited_template(self, monkeypatch, tmp_path):
+        from src.state_engine import bundle as state_bundle
+        from src.state_engine import shared, template_engine
+        from src.workflows.doc_ticket_workflow import DOCTicketWorkflow
+
+        states = tmp_path / "states"
+        (states / "templates" / "partials" / "common").mkdir(parents=True)
+        (states / "state_intention_matrix.yaml").write_text("matrix: {}\nblocks_registry: {}\n", encoding="utf-8")
+        salutation = states / "templates" / "partials" / "common" / "salutation.html"
+        salutation.write_text("Bonjour {{prenom}},", encoding="utf-8")
+
+        monkeypatch.setattr(template_engine, "STATES_PATH", states)
+        monkeypatch.setattr(shared, "STATES_PATH", states)
+        monkeypatch.setattr(state_bundle, "STATE_ENGINE_BUNDLE", True)
+        monkeypatch.setattr(state_bundle, "STATE_ENGINE_BUNDLE_PATH", str(tmp_path / "state_engine.bundle"))
+        monkeypatch.setattr(state_bundle, "STATE_ENGINE_RELOAD_SECONDS", 1e-6)
+        shared.reset_shared_components()
+
+        pool = ComponentPool("workflow", DOCTicketWorkflow, max_size=1)
+        template = "{{> partials/common/salutation}}"
+        try:
+            with pool.acquire() as workflow:
+                assert workflow.template_engine.pybars_renderer.render(template, {"prenom": "Karim"}) == "Bonjour Karim,"
+
+            salutation.write_text("Salut {{prenom}} !", encoding="utf-8")
+            with pool.acquire() as reused:
+                assert reused is workflow
+                assert reused.template_engine.pybars_renderer.render(template, {"prenom": "Karim"}) == "Salut Karim !"
+        finally:
+            pool.close_all()
+            shared.reset_shared_components()
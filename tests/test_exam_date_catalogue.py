@@ -0,0 +1,111 @@
+"""Tests for the exam-date catalogue (Dates_Examens_VTC_TAXI cache)."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from src.utils.exam_date_catalogue import get_exam_date_catalogue, ExamDateCatalogue
+
+
+def _future(days: int) -> str:
+    return (datetime.now().date() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class FakeCRMClient:
+    """Minimal stand-in for ZohoCRMClient: answers /search from a list of records."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    def _make_request(self, method, url, params=None, **kwargs):
+        self.calls.append(params["criteria"])
+        if "Modified_Time:greater_than:" in params["criteria"]:
+            since = params["criteria"].split("greater_than:", 1)[1].rstrip(")")
+            data = [r for r in self.records if r["Modified_Time"] > since]
+        else:
+            data = [r for r in self.records if r.get("Statut") in ("Actif", None)]
+        return {"data": data} if data else {}
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalogue():
+    get_exam_date_catalogue().clear()
+    yield
+    get_exam_date_catalogue().clear()
+
+
+@pytest.fixture
+def records():
+    return [
+        {"id": "1", "Departement": "75", "Date_Examen": _future(30), "Date_Cloture_Inscription": _future(10),
+         "Statut": "Actif", "Modified_Time": "2026-01-01T10:00:00+01:00"},
+        {"id": "2", "Departement": "75", "Date_Examen": _future(20), "Date_Cloture_Inscription": _future(5),
+         "Statut": "Actif", "Modified_Time": "2026-01-02T10:00:00+01:00"},
+        {"id": "3", "Departement": "34", "Date_Examen": _future(15), "Date_Cloture_Inscription": _future(3),
+         "Statut": None, "Modified_Time": "2026-01-03T10:00:00+01:00"},
+    ]
+
+
+class TestExamDateCatalogue:
+    def test_singleton(self):
+        assert get_exam_date_catalogue() is ExamDateCatalogue()
+
+    def test_loads_once_and_serves_from_memory(self, records):
+        client = FakeCRMClient(records)
+        catalogue = get_exam_date_catalogue()
+        catalogue.get_active_sessions(client, departement="75")
+        catalogue.get_active_sessions(client, departement="34")
+        catalogue.get_active_sessions(client)
+        assert len(client.calls) == 1
+        assert catalogue.get_stats()["lookups"] == 3
+
+    def test_department_index_sorted_by_exam_date(self, records):
+        sessions = get_exam_date_catalogue().get_active_sessions(FakeCRMClient(records), departement="75")
+        assert [s["id"] for s in sessions] == ["2", "1"]
+
+    def test_region_index(self, records):
+        sessions = get_exam_date_catalogue().get_active_sessions(FakeCRMClient(records), region="Occitanie")
+        assert [s["id"] for s in sessions] == ["3"]
+
+    def test_returns_copies(self, records):
+        client = FakeCRMClient(records)
+        catalogue = get_exam_date_catalogue()
+        catalogue.get_active_sessions(client, departement="34")[0]["region"] = "mutated"
+        assert "region" not in catalogue.get_active_sessions(client, departement="34")[0]
+
+    def test_find_session_by_date_and_dept(self, records):
+        client = FakeCRMClient(records)
+        session = get_exam_date_catalogue().find_session(client, _future(30), "75")
+        assert session["id"] == "1"
+        assert get_exam_date_catalogue().find_session(client, _future(30), "34") is None
+
+    def test_incremental_refresh_applies_status_change(self, records):
+        client = FakeCRMClient(records)
+        catalogue = get_exam_date_catalogue()
+        assert len(catalogue.get_active_sessions(client, departement="75")) == 2
+
+        records[0]["Statut"] = "Inactif"
+        records[0]["Modified_Time"] = "2026-01-05T10:00:00+01:00"
+        catalogue._refreshed_at = 0  # Force l'échéance du refresh incrémental
+
+        sessions = catalogue.get_active_sessions(client, departement="75")
+        assert [s["id"] for s in sessions] == ["2"]
+        assert client.calls[-1] == "(Modified_Time:greater_than:2026-01-03T10:00:00+01:00)"
+        assert catalogue.get_stats()["incremental_refreshes"] == 1
+
+
+class TestHelpersUseCatalogue:
+    def test_next_exam_dates_single_api_call(self, records):
+        from src.utils.date_examen_vtc_helper import (
+            get_next_exam_dates,
+            get_next_exam_dates_any_department,
+            get_earlier_dates_other_departments,
+        )
+
+        client = FakeCRMClient(records)
+        assert [s["id"] for s in get_next_exam_dates(client, "75", limit=20)] == ["2", "1"]
+        assert [s["id"] for s in get_next_exam_dates(client, "75", limit=1)] == ["2"]
+        assert [s["id"] for s in get_next_exam_dates_any_department(client, limit=5)] == ["3", "2", "1"]
+        earlier = get_earlier_dates_other_departments(client, "75", _future(20), limit=3)
+        assert [s["id"] for s in earlier] == ["3"]
+        assert len(client.calls) == 1
@@ -0,0 +1,88 @@
+"""Tests for the event-driven waits of the ExamT3P scraper (fake page, no browser)."""
+
+import asyncio
+import time
+
+from src.utils import exament3p_playwright
+from src.utils.exament3p_playwright import ExamenT3PPlaywright
+from src.utils.examt3p_browser_pool import ExamT3PBrowserPool
+
+
+class FakePage:
+    """Page whose body text follows a scripted sequence, one entry per read."""
+
+    def __init__(self, texts, url="https://www.exament3p.fr/id/14"):
+        self.texts = list(texts)
+        self.url = url
+        self.clicks = []
+
+    async def inner_text(self, selector):
+        return self.texts.pop(0) if len(self.texts) > 1 else self.texts[0]
+
+    async def content(self):
+        return await self.inner_text("body")
+
+    async def click(self, selector, timeout=None):
+        self.clicks.append(selector)
+
+
+def make_extractor(page, adaptive=True):
+    extractor = ExamenT3PPlaywright("candidat@mail.fr", "pw", adaptive_waits=adaptive)
+    extractor.page = page
+    return extractor
+
+
+class TestAdaptiveWaits:
+    def test_click_returns_once_content_changed_and_stable(self, monkeypatch):
+        monkeypatch.setattr(exament3p_playwright, "SETTLE_POLL_INTERVAL", 0.01)
+        page = FakePage(["Vue d'ensemble", "Vue d'ensemble", "Mes Examens", "Mes Examens"])
+        extractor = make_extractor(page)
+
+        started = time.perf_counter()
+        assert asyncio.run(extractor._safe_click('a:has-text("Mes Examens")'))
+        assert time.perf_counter() - started < exament3p_playwright.SETTLE_MAX_WAIT / 2
+        assert page.clicks == ['a:has-text("Mes Examens")']
+
+    def test_partial_render_does_not_end_the_wait(self, monkeypatch):
+        monkeypatch.setattr(exament3p_playwright, "SETTLE_POLL_INTERVAL", 0.01)
+        # Squelette de l'onglet stable une lecture, puis contenu chargé par XHR
+        loaded = "Mes Examens\nDate : 12/03/2026"
+        page = FakePage(["Vue d'ensemble", "Mes Examens", "Mes Examens", loaded, loaded])
+        extractor = make_extractor(page)
+
+        asyncio.run(extractor._wait_for_settle("Vue d'ensemble", max_wait=1))
+        assert page.texts == [loaded]  # contenu complet lu avant de rendre la main
+
+    def test_unchanged_content_waits_at_most_the_bound(self, monkeypatch):
+        monkeypatch.setattr(exament3p_playwright, "SETTLE_POLL_INTERVAL", 0.01)
+        extractor = make_extractor(FakePage(["same"]))
+
+        started = time.perf_counter()
+        asyncio.run(extractor._wait_for_settle("same", max_wait=0.1))
+        assert 0.1 <= time.perf_counter() - started < 0.5
+
+    def test_login_outcome_stops_on_success_indicator(self, monkeypatch):
+        monkeypatch.setattr(exament3p_playwright, "SETTLE_POLL_INTERVAL", 0.01)
+        extractor = make_extractor(FakePage(["Me connecter", "Me connecter", "Bienvenue Jean -"]))
+
+        started = time.perf_counter()
+        asyncio.run(extractor._wait_for_login_outcome(max_wait=2))
+        assert time.perf_counter() - started < 1
+
+    def test_fixed_delay_mode_keeps_sleeping(self, monkeypatch):
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        extractor = make_extractor(FakePage(["x"]), adaptive=False)
+        monkeypatch.setattr(exament3p_playwright.asyncio, "sleep", fake_sleep)
+        asyncio.run(extractor._pause(1))
+        assert slept == [1]
+
+    def test_heavy_and_analytics_requests_are_blocked(self):
+        pool = ExamT3PBrowserPool()
+        assert pool.is_blocked("image", "https://www.exament3p.fr/logo.png")
+        assert pool.is_blocked("script", "https://www.googletagmanager.com/gtm.js")
+        assert not pool.is_blocked("document", "https://www.exament3p.fr/id/14")
+        assert not pool.is_blocked("stylesheet", "https://www.exament3p.fr/app.css")
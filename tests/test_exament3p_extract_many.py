@@ -0,0 +1,43 @@
+"""Tests for concurrent ExamT3P batch extraction (extractor stubbed, no browser)."""
+
+import asyncio
+
+from src.utils import exament3p_playwright
+from src.utils.exament3p_playwright import ExamenT3PPlaywright, extract_many
+
+
+class TestExtractMany:
+    def test_bounded_concurrency_streaming_and_isolated_errors(self, monkeypatch):
+        running = {"now": 0, "max": 0}
+        delays = {"slow@mail.fr": 0.2, "fast@mail.fr": 0.01, "broken@mail.fr": 0.05}
+
+        async def fake_extract_all(self):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            try:
+                await asyncio.sleep(delays[self.identifiant])
+                if self.identifiant == "broken@mail.fr":
+                    raise RuntimeError("site down")
+                return {"identifiant": self.identifiant, "extraction_requise": False}
+            finally:
+                running["now"] -= 1
+
+        monkeypatch.setattr(ExamenT3PPlaywright, "extract_all", fake_extract_all)
+
+        credentials = [
+            ("slow@mail.fr", "pw"),
+            {"identifiant": "fast@mail.fr", "password": "pw"},
+            {"username": "broken@mail.fr", "mot_de_passe": "pw"},
+        ]
+        results = list(extract_many(credentials, concurrency=2))
+
+        assert [index for index, _ in results] == [1, 2, 0]
+        assert running["max"] == 2
+        by_index = dict(results)
+        assert by_index[0]["extraction_requise"] is False
+        assert by_index[2]["extraction_requise"] is True
+        assert "site down" in by_index[2]["error"]
+
+    def test_empty_batch(self):
+        assert list(extract_many([])) == []
+        assert exament3p_playwright.DEFAULT_CONCURRENCY >= 1
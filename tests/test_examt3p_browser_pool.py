@@ -0,0 +1,81 @@
+"""Tests for the shared ExamT3P browser pool (fake browser, no Chromium needed)."""
+
+import asyncio
+
+import pytest
+
+from src.utils.examt3p_browser_pool import ExamT3PBrowserPool
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.pages = []
+        self.timeout = None
+
+    def set_default_timeout(self, timeout):
+        self.timeout = timeout
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, viewport=None):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+@pytest.fixture
+def pool():
+    pool = ExamT3PBrowserPool()
+    pool._browser = FakeBrowser()
+    yield pool
+    pool._browser = None
+    pool.loop.call_soon_threadsafe(pool.loop.stop)
+
+
+class TestBrowserPool:
+    def test_contexts_are_isolated_and_share_one_browser(self, pool):
+        first = pool.run_sync(pool.new_context())
+        second = pool.run_sync(pool.new_context())
+        assert first is not second
+        assert first.timeout == pool.DEFAULT_TIMEOUT_MS
+        assert pool.get_stats()["contexts"] == 2
+        assert pool.get_stats()["launches"] == 0
+
+    def test_session_handoff_is_single_use(self, pool):
+        context = pool.run_sync(pool.new_context())
+        pool.run_sync(pool.store_session("Candidat@Mail.fr", "secret", context))
+
+        assert pool.run_sync(pool.take_session("candidat@mail.fr", "other")) is None
+        assert pool.run_sync(pool.take_session("candidat@mail.fr", "secret")) is context
+        assert pool.run_sync(pool.take_session("candidat@mail.fr", "secret")) is None
+        assert pool.get_stats()["sessions_reused"] == 1
+
+    def test_expired_and_excess_sessions_are_closed(self, pool):
+        pool.SESSION_TTL_SECONDS = 0
+        old = pool.run_sync(pool.new_context())
+        pool.run_sync(pool.store_session("a@mail.fr", "pw", old))
+        assert old.closed
+        assert pool.run_sync(pool.take_session("a@mail.fr", "pw")) is None
+
+        pool.SESSION_TTL_SECONDS = 300
+        pool.MAX_SESSIONS = 1
+        first = pool.run_sync(pool.new_context())
+        second = pool.run_sync(pool.new_context())
+        pool.run_sync(pool.store_session("b@mail.fr", "pw", first))
+        pool.run_sync(pool.store_session("c@mail.fr", "pw", second))
+        assert first.closed and not second.closed
+
+    def test_run_from_another_event_loop(self, pool):
+        async def caller():
+            return await pool.run(pool.new_context())
+
+        assert isinstance(asyncio.run(caller()), FakeContext)
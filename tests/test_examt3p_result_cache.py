@@ -0,0 +1,143 @@
+"""Tests for the ExamT3P result cache and the cached extraction flow (no browser)."""
+
+import time
+
+import pytest
+
+from src.utils import exament3p_playwright, examt3p_result_cache
+from src.utils.exament3p_playwright import ExamenT3PPlaywright, extract_exament3p_cached
+from src.utils.examt3p_result_cache import ExamT3PResultCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ExamT3PResultCache(str(tmp_path / "examt3p.db"))
+    monkeypatch.setattr(exament3p_playwright, "get_examt3p_result_cache", lambda: cache)
+    monkeypatch.setattr(exament3p_playwright, "RESULT_CACHE_ENABLED", True)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def crawls(monkeypatch):
+    """Stub extract_all: records the probe fingerprint and returns a scripted dashboard."""
+    calls = []
+    state = {"dashboard": "v1", "failed_pages": []}
+
+    async def fake_extract_all(self, stop_if_unchanged=None):
+        calls.append(stop_if_unchanged)
+        fingerprint = f"fp-{state['dashboard']}"
+        data = {"identifiant": self.identifiant, "extraction_requise": False,
+                "statut_dossier": state["dashboard"], "dashboard_fingerprint": fingerprint,
+                "pages_en_erreur": list(state["failed_pages"])}
+        if stop_if_unchanged == fingerprint:
+            data["dashboard_unchanged"] = True
+        return data
+
+    monkeypatch.setattr(ExamenT3PPlaywright, "extract_all", fake_extract_all)
+    return calls, state
+
+
+def expire(cache, groups):
+    entry = cache.get("a@mail.fr", "pw")
+    for group in groups:
+        entry["group_fetched_at"][group] = time.time() - 10 * 24 * 3600
+    with cache._transaction() as conn:
+        conn.execute("UPDATE examt3p_results SET group_fetched_at = ?",
+                     (examt3p_result_cache.json.dumps(entry["group_fetched_at"]),))
+
+
+class TestResultCache:
+    def test_password_change_is_a_miss(self, cache):
+        cache.put("A@mail.fr", "pw", {"statut_dossier": "Valide"}, fingerprint="fp")
+        assert cache.get("a@mail.fr", "pw")["data"] == {"statut_dossier": "Valide"}
+        assert cache.get("a@mail.fr", "other") is None
+        assert cache.recently_validated("a@mail.fr", "pw")
+
+    def test_keys_are_hmac_with_a_persistent_secret(self, cache, tmp_path):
+        cache.put("a@mail.fr", "pw", {"statut_dossier": "Valide"})
+        row = cache._conn.execute("SELECT account_key, password_hash FROM examt3p_results").fetchone()
+        plain = examt3p_result_cache.hashlib.sha256(b"pw").hexdigest()
+        assert row["password_hash"] != plain
+        assert (tmp_path / "examt3p.db.key").exists()
+
+        # Même secret à la réouverture; un autre secret ne retrouve rien
+        reopened = ExamT3PResultCache(str(tmp_path / "examt3p.db"))
+        other = ExamT3PResultCache(str(tmp_path / "examt3p.db"), secret="autre")
+        assert reopened.get("a@mail.fr", "pw")["data"] == {"statut_dossier": "Valide"}
+        assert other.get("a@mail.fr", "pw") is None
+        reopened.close()
+        other.close()
+
+    def test_unversioned_database_is_purged(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = examt3p_result_cache.sqlite3.connect(path)
+        conn.executescript(examt3p_result_cache._SCHEMA)
+        conn.execute("INSERT INTO examt3p_results VALUES ('k', 'h', NULL, '{}', '{}', 0)")
+        conn.commit()
+        conn.close()
+
+        cache = ExamT3PResultCache(path)
+        assert cache.get_stats()["accounts"] == 0
+        cache.close()
+
+    def test_fresh_entry_is_served_without_browser(self, cache, crawls):
+        calls, _ = crawls
+        assert extract_exament3p_cached("a@mail.fr", "pw")["cache_status"] == "miss"
+        assert extract_exament3p_cached("a@mail.fr", "pw")["cache_status"] == "hit"
+        assert len(calls) == 1
+
+    def test_stale_status_is_revalidated_by_dashboard_probe(self, cache, crawls):
+        calls, state = crawls
+        extract_exament3p_cached("a@mail.fr", "pw")
+        expire(cache, ["status"])
+
+        assert extract_exament3p_cached("a@mail.fr", "pw")["cache_status"] == "revalidated"
+        assert calls[-1] == "fp-v1"
+        assert cache.stale_groups(cache.get("a@mail.fr", "pw")) == []
+
+        expire(cache, ["status"])
+        state["dashboard"] = "v2"
+        result = extract_exament3p_cached("a@mail.fr", "pw")
+        assert result["cache_status"] == "refreshed"
+        assert result["statut_dossier"] == "v2"
+
+    def test_stale_long_group_and_forced_refresh_crawl_fully(self, cache, crawls):
+        calls, _ = crawls
+        extract_exament3p_cached("a@mail.fr", "pw")
+        expire(cache, ["paiements"])
+        extract_exament3p_cached("a@mail.fr", "pw")
+        assert calls[-1] is None
+
+        extract_exament3p_cached("a@mail.fr", "pw", force_refresh=True)
+        assert len(calls) == 3
+        assert cache.get_stats()["misses"] == 2
+
+    def test_partial_extraction_is_not_cached(self, cache, crawls):
+        calls, state = crawls
+        state["failed_pages"] = ["paiements"]
+        assert extract_exament3p_cached("a@mail.fr", "pw")["cache_status"] == "miss"
+        assert cache.get("a@mail.fr", "pw") is None
+
+        state["failed_pages"] = []
+        extract_exament3p_cached("a@mail.fr", "pw")
+        assert extract_exament3p_cached("a@mail.fr", "pw")["cache_status"] == "hit"
+        assert len(calls) == 2
+
+    def test_failed_page_is_listed_for_the_final_attempt_only(self, monkeypatch):
+        extractor = ExamenT3PPlaywright("a@mail.fr", "pw")
+        extractor.data["pages_en_erreur"] = ["overview"]
+
+        async def ok():
+            pass
+
+        async def boom():
+            raise RuntimeError("timeout")
+
+        for name in ("overview", "examens", "documents", "compte", "messages"):
+            monkeypatch.setattr(extractor, f"_extract_{name}", ok)
+        boom.__name__ = "_extract_paiements"
+        monkeypatch.setattr(extractor, "_extract_paiements", boom)
+
+        exament3p_playwright.asyncio.run(extractor._extract_all_pages())
+        assert extractor.data["pages_en_erreur"] == ["paiements"]
@@ -0,0 +1,118 @@
+"""Tests for the LLM batch mode (Message Batches job / fan-out) against the local stub server."""
+
+import anthropic
+import pytest
+
+from src.llm_batch import LLMBatch
+from src.llm_client import LLMGateway
+from src.llm_response_cache import LLMResponseCache
+from tests.llm_stub_server import StubLLMServer
+
+
+def echo(params):
+    """Replies with the user content so results can be matched to requests."""
+    return f"echo:{params['messages'][-1]['content'][-1]['text']}"
+
+
+def make_batch(stub, mode, response_cache=None):
+    client = anthropic.Anthropic(api_key="x", base_url=stub.url, max_retries=0)
+    gateway = LLMGateway(client=client, aliases={}, response_cache=response_cache, max_retries=0)
+    batch = LLMBatch(gateway, mode=mode, min_batch_requests=2, poll_seconds=0.01, timeout_seconds=5)
+    for ticket_id in ("198709000001", "198709000002", "198709000003"):
+        batch.add(ticket_id, stage="triage", model="stub-model", max_tokens=50,
+                  system="SYSTEM", content=ticket_id, cache=True)
+    return batch
+
+
+def paths(stub, method):
+    return [r["path"] for r in stub.requests if r["method"] == method]
+
+
+class TestLLMBatch:
+    def test_batch_job_results_joined_by_custom_id(self):
+        with StubLLMServer(reply=echo, polls_before_end=2) as stub:
+            batch = make_batch(stub, "auto")
+            results = batch.run()
+
+        assert {cid: r.text for cid, r in results.items()} == {
+            "198709000001": "echo:198709000001",
+            "198709000002": "echo:198709000002",
+            "198709000003": "echo:198709000003",
+        }
+        assert paths(stub, "POST") == ["/v1/messages/batches"]
+        assert batch.get_stats()["batched"] == 3 and batch.get_stats()["jobs"] == 1
+        assert batch.gateway.get_stats()["stages"]["triage"]["calls"] == 3
+
+    def test_fanout_mode_calls_messages_api(self):
+        with StubLLMServer(reply=echo) as stub:
+            batch = make_batch(stub, "fanout")
+            results = batch.run()
+
+        assert results["198709000002"].text == "echo:198709000002"
+        assert paths(stub, "POST") == ["/v1/messages"] * 3
+        assert batch.get_stats()["fanout"] == 3
+
+    def test_errored_batch_entries_are_retried_by_fanout(self):
+        # custom_ids are positional in the job: r1 = second ticket
+        with StubLLMServer(reply=echo, fail_custom_ids=["r1"]) as stub:
+            batch = make_batch(stub, "batch")
+            results = batch.run()
+
+        assert all(r.ok for r in results.values())
+        assert paths(stub, "POST") == ["/v1/messages/batches", "/v1/messages"]
+        assert stub.requests[-1]["body"]["messages"][-1]["content"][-1]["text"] == "198709000002"
+        assert batch.get_stats()["batched"] == 2 and batch.get_stats()["fanout"] == 1
+
+    def test_cached_responses_skip_the_api(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.db"))
+        with StubLLMServer(reply=echo) as stub:
+            make_batch(stub, "batch", cache).run()
+            batch = make_batch(stub, "batch", cache)
+            results = batch.run()
+        cache.close()
+
+        assert results["198709000003"].text == "echo:198709000003"
+        assert len(stub.batches) == 1
+        assert batch.get_stats()["cached"] == 3
+
+    def test_fanout_queries_the_response_cache_once(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.db"))
+        with StubLLMServer(reply=echo) as stub:
+            make_batch(stub, "fanout", cache).run()
+            assert cache.get_stats()["misses"] == 3
+            results = make_batch(stub, "fanout", cache).run()
+        stats = cache.get_stats()
+        cache.close()
+
+        assert results["198709000001"].text == "echo:198709000001"
+        assert paths(stub, "POST") == ["/v1/messages"] * 3
+        assert stats["misses"] == 3 and stats["hits"] == 3
+
+    def test_triage_many_falls_back_per_ticket(self, monkeypatch):
+        from src import llm_client
+        from src.agents.triage_agent import TriageAgent
+
+        replies = {
+            "ok": '{"action": "GO", "confidence": 0.9}',
+            "list": "[1]",
+            "confidence": '{"action": "GO", "confidence": "haute"}',
+        }
+        agent = TriageAgent()
+        monkeypatch.setattr(agent, "_prepare_triage", lambda ticket_subject, **kwargs: (None, {
+            "stage": "triage", "model": "stub-model", "max_tokens": 50, "content": ticket_subject
+        }))
+        with StubLLMServer(reply=lambda params: replies[params["messages"][-1]["content"][-1]["text"]]) as stub:
+            client = anthropic.Anthropic(api_key="x", base_url=stub.url, max_retries=0)
+            monkeypatch.setattr(llm_client, "_gateway", LLMGateway(client=client, aliases={}, max_retries=0))
+            results = agent.triage_many(
+                {subject: {"ticket_subject": subject, "thread_content": ""} for subject in replies},
+                mode="fanout"
+            )
+
+        assert results["ok"]["confidence"] == 0.9
+        assert results["list"]["method"] == results["confidence"]["method"] == "fallback"
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            LLMBatch(LLMGateway(client=object(), aliases={}), mode="async", min_batch_requests=1,
+                     poll_seconds=1, timeout_seconds=1)
@@ -0,0 +1,125 @@
+"""Tests for the LLM gateway (prompt caching, backoff, aliases, metrics)."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import anthropic
+import pytest
+
+from src.llm_client import CACHE_CONTROL, LLMGateway
+
+
+class FakeClient:
+    """Records messages.create requests; raises the scripted errors first."""
+
+    def __init__(self, errors=(), delay=0.0, **usage):
+        self.requests = []
+        self.errors = list(errors)
+        self.delay = delay
+        self.messages = self
+        self.usage = SimpleNamespace(input_tokens=20, output_tokens=5, **usage)
+
+    def create(self, **request):
+        self.requests.append(request)
+        if self.errors:
+            raise self.errors.pop(0)
+        time.sleep(self.delay)
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=self.usage)
+
+
+def status_error(status_code, headers=None):
+    """APIStatusError with a status code and response headers (no HTTP round trip)."""
+    error = anthropic.APIStatusError.__new__(anthropic.APIStatusError)
+    error.status_code = status_code
+    error.response = SimpleNamespace(headers=headers or {})
+    return error
+
+
+def make_gateway(client, **kwargs):
+    kwargs.setdefault("backoff_seconds", 0.01)
+    return LLMGateway(client=client, aliases={"fast": "haiku-x", "precise": "sonnet-x"}, **kwargs)
+
+
+class TestCreateMessage:
+    def test_static_prefix_cached_and_dynamic_data_last(self):
+        client = FakeClient()
+        make_gateway(client).create_message(stage="triage", model="precise", max_tokens=10,
+                                            system="SYSTEM", instructions="Analyse ce ticket:", content="ticket 123")
+
+        request = client.requests[0]
+        assert request["model"] == "sonnet-x"
+        assert request["system"] == [{"type": "text", "text": "SYSTEM", "cache_control": CACHE_CONTROL}]
+        blocks = request["messages"][-1]["content"]
+        assert blocks[0]["cache_control"] == CACHE_CONTROL
+        assert blocks[-1] == {"type": "text", "text": "ticket 123"}
+
+    def test_history_kept_and_no_system_when_empty(self):
+        client = FakeClient()
+        history = [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+        make_gateway(client).create_message(stage="agent", model="claude-custom", max_tokens=10,
+                                            messages=history, content="c", temperature=0.3)
+
+        request = client.requests[0]
+        assert "system" not in request
+        assert request["model"] == "claude-custom"
+        assert request["messages"][:2] == history
+        assert request["temperature"] == 0.3
+
+    def test_cache_tokens_and_latency_recorded_per_stage(self):
+        gateway = make_gateway(FakeClient(cache_read_input_tokens=900, cache_creation_input_tokens=0))
+        gateway.create_message(stage="triage", model="fast", max_tokens=10, system="S", content="x")
+        gateway._client = FakeClient()
+        gateway.create_message(stage="triage", model="fast", max_tokens=10, system="S", content="x")
+
+        stats = gateway.get_stats()
+        triage = stats["stages"]["triage"]
+        assert triage["calls"] == 2
+        assert triage["cache_read_input_tokens"] == 900
+        assert triage["cache_creation_input_tokens"] == 0
+        assert stats["cache_read_ratio"] == round(900 / 940, 3)
+        assert gateway.stats.recent_calls()[-1]["model"] == "haiku-x"
+
+
+class TestResilience:
+    def test_rate_limit_and_overload_are_retried(self):
+        client = FakeClient(errors=[status_error(429, {"retry-after": "0"}), status_error(529)])
+        gateway = make_gateway(client)
+        assert gateway.create_message(stage="s", model="fast", max_tokens=1, content="x").content[0].text == "ok"
+        assert len(client.requests) == 3
+        assert gateway.get_stats()["stages"]["s"]["retries"] == 2
+
+    def test_client_errors_are_not_retried(self):
+        client = FakeClient(errors=[status_error(400)])
+        gateway = make_gateway(client)
+        with pytest.raises(anthropic.APIStatusError):
+            gateway.create_message(stage="s", model="fast", max_tokens=1, content="x")
+        assert len(client.requests) == 1
+        assert gateway.get_stats()["stages"]["s"]["errors"] == 1
+
+    def test_concurrency_is_bounded(self):
+        client = FakeClient(delay=0.05)
+        gateway = make_gateway(client, max_concurrency=2)
+        running = {"now": 0, "max": 0}
+        lock = threading.Lock()
+        original = client.create
+
+        def tracking_create(**request):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            try:
+                return original(**request)
+            finally:
+                with lock:
+                    running["now"] -= 1
+
+        client.create = tracking_create
+        threads = [threading.Thread(target=gateway.create_message,
+                                    kwargs=dict(stage="s", model="fast", max_tokens=1, content="x"))
+                   for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert running["max"] == 2
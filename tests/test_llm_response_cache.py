@@ -0,0 +1,90 @@
+"""Tests for the on-disk LLM response cache and its use by the gateway."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm_client import LLMGateway
+from src.llm_response_cache import LLMResponseCache, make_key
+
+
+class FakeClient:
+    """Counts messages.create requests and returns a canned response."""
+
+    def __init__(self, stop_reason="end_turn"):
+        self.requests = []
+        self.messages = self
+        self.stop_reason = stop_reason
+
+    def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], model=request["model"],
+                               stop_reason=self.stop_reason,
+                               usage=SimpleNamespace(input_tokens=20, output_tokens=5))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), max_bytes=200)
+    yield cache
+    cache.close()
+
+
+class TestLLMResponseCache:
+    def test_key_depends_on_every_parameter(self):
+        request = {"model": "m", "system": "S", "messages": [{"role": "user", "content": "x"}]}
+        assert make_key(request) == make_key(dict(reversed(list(request.items()))))
+        assert make_key(request) != make_key({**request, "model": "other"})
+        assert make_key(request) != make_key({**request, "temperature": 0.3})
+
+    def test_ttl_expires_entries(self, cache):
+        cache.put("k", {"text": "ok"})
+        assert cache.get("k") == {"text": "ok"}
+        cache.ttl_seconds = 0.01
+        time.sleep(0.02)
+        assert cache.get("k") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_size_eviction_drops_least_recently_used(self, cache):
+        payload = {"text": "x" * 60}
+        cache.put("a", payload)
+        cache.put("b", payload)
+        cache.get("a")  # b devient le moins récemment utilisé
+        cache.put("c", payload)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == payload and cache.get("c") == payload
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= 200
+
+
+class TestGatewayResponseCache:
+    def test_opted_in_calls_are_replayed_from_disk(self, tmp_path):
+        client = FakeClient()
+        gateway = LLMGateway(client=client, aliases={}, response_cache=LLMResponseCache(str(tmp_path / "llm.db")))
+        call = dict(stage="summary", model="m", max_tokens=10, content="threads")
+
+        first = gateway.create_message(cache=True, **call)
+        second = gateway.create_message(cache=True, **call)
+        gateway.create_message(**call)  # pas d'opt-in: appel API
+
+        assert first.content[0].text == second.content[0].text == "ok"
+        assert getattr(second, "from_cache", False)
+        assert len(client.requests) == 2
+        stage = gateway.get_stats()["stages"]["summary"]
+        assert stage["calls"] == 3 and stage["cached"] == 1
+        assert gateway.get_stats()["response_cache"]["hits"] == 1
+
+    def test_incomplete_responses_are_not_stored(self, tmp_path):
+        client = FakeClient(stop_reason="max_tokens")
+        gateway = LLMGateway(client=client, aliases={}, response_cache=LLMResponseCache(str(tmp_path / "llm.db")))
+        call = dict(stage="summary", model="m", max_tokens=10, content="threads")
+
+        gateway.create_message(cache=True, **call)
+        second = gateway.create_message(cache=True, **call)
+
+        assert not getattr(second, "from_cache", False)
+        assert len(client.requests) == 2
+        assert gateway.get_stats()["response_cache"]["entries"] == 0
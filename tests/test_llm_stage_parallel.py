@@ -0,0 +1,51 @@
+"""Tests for the parallel post-template LLM stage executor."""
+
+import threading
+
+import pytest
+
+from src.utils import llm_stage_executor
+from src.utils.llm_stage_executor import submit_llm_stage
+
+
+class TestLLMStageExecutor:
+    def test_stages_run_concurrently(self):
+        started = threading.Barrier(3, timeout=5)
+
+        def stage(name):
+            started.wait()  # bloquerait si les étapes étaient séquentielles
+            return name
+
+        futures = [submit_llm_stage(stage, name) for name in ("humanize", "crm", "note")]
+        assert [f.result(timeout=5) for f in futures] == ["humanize", "crm", "note"]
+
+    def test_stage_error_is_raised_on_join(self):
+        def boom():
+            raise ValueError("llm down")
+
+        future = submit_llm_stage(boom)
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+
+    def test_sequential_fallback_keeps_future_interface(self, monkeypatch):
+        monkeypatch.setattr(llm_stage_executor, "PARALLEL_LLM_STAGES", False)
+        calls = []
+
+        future = submit_llm_stage(lambda x: calls.append(threading.current_thread()) or x * 2, 21)
+        assert future.done() and future.result() == 42
+        assert calls == [threading.current_thread()]
+
+    def test_stats_counted_from_many_threads(self, monkeypatch):
+        monkeypatch.setattr(llm_stage_executor, "PARALLEL_LLM_STAGES", False)
+        before = llm_stage_executor.get_stats()["inline"]
+
+        def submit_many():
+            for _ in range(500):
+                submit_llm_stage(int)
+
+        threads = [threading.Thread(target=submit_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert llm_stage_executor.get_stats()["inline"] - before == 4000
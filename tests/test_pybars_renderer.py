@@ -283,6 +283,105 @@ Concernant l'avancement de votre dossier...
     print("PASS: Complex template structure")
 
 
+def test_template_refs_through_partials():
+    """Test that referenced context keys are collected through {{> partials}}."""
+    from src.state_engine.pybars_renderer import PybarsRenderer
+
+    states_path = project_root / "states"
+    renderer = PybarsRenderer(states_path)
+    renderer.load_all_partials()
+
+    template = """{{> salutation_personnalisee}}
+{{#if (eq this.type "jour")}}{{deal.Stage}}{{/if}}
+{{#each sessions}}{{this.date_debut}}{{@index}}{{/each}}"""
+
+    refs = renderer.template_refs(template)
+    assert {"prenom", "type", "deal", "sessions", "date_debut"} <= refs, f"Got: {refs}"
+    assert not refs & {"this", "jour", "index"}, f"Got: {refs}"
+
+    # {{this}} needs the whole context
+    assert renderer.template_refs("{{#each items}}{{this}}{{/each}}") is None
+
+    print("PASS: Template refs through partials")
+
+
+def test_render_output_cache():
+    """Test that identical (template, referenced context) renders are served from the cache."""
+    from src.state_engine.pybars_renderer import PybarsRenderer
+
+    states_path = project_root / "states"
+    renderer = PybarsRenderer(states_path)
+
+    template = "Bonjour {{prenom}}{{#if urgent}} (urgent){{/if}}"
+    first = renderer.render(template, {"prenom": "Jean", "urgent": True, "deal_data": {"Amount": 20}})
+    # Unreferenced keys do not change the cache key
+    second = renderer.render(template, {"prenom": "Jean", "urgent": True, "deal_data": {"Amount": 500}})
+    assert first == second == "Bonjour Jean (urgent)", f"Got: {first} / {second}"
+    assert renderer.get_stats()["hits"] == 1, f"Got: {renderer.get_stats()}"
+
+    # Values equal for Python but rendered differently are not confused
+    assert renderer.render(template, {"prenom": 1, "urgent": True}) == "Bonjour 1 (urgent)"
+    assert renderer.render(template, {"prenom": True, "urgent": 1}) == "Bonjour true (urgent)"
+    assert renderer.render(template, {"prenom": None, "urgent": False}) == "Bonjour "
+
+    print("PASS: Render output cache")
+
+
+def test_refs_cache_shared_between_threads():
+    """Test that a thread computing a partial's refs never exposes an incomplete entry to other threads."""
+    import threading
+    from src.state_engine.pybars_renderer import PybarsRenderer
+
+    states_path = project_root / "states"
+    renderer = PybarsRenderer(states_path)
+    renderer.load_all_partials()
+
+    partial_source = renderer.get_partial("salutation_personnalisee")
+    inside_partial = threading.Event()
+    release = threading.Event()
+    collect_refs = renderer._collect_refs
+
+    def slow_collect_refs(content, visiting):
+        # Thread A stalls while computing the partial's refs
+        if content == partial_source and threading.current_thread().name == "A":
+            inside_partial.set()
+            release.wait(5)
+        return collect_refs(content, visiting)
+
+    renderer._collect_refs = slow_collect_refs
+    thread_a = threading.Thread(
+        target=renderer.template_refs, args=("{{> salutation_personnalisee}}{{a}}",), name="A"
+    )
+    thread_a.start()
+    try:
+        assert inside_partial.wait(5)
+        _, _, refs = renderer._template("{{> salutation_personnalisee}}")
+        assert refs == {"prenom"}, f"Got: {refs}"
+    finally:
+        release.set()
+        thread_a.join(5)
+
+    assert renderer.render("{{> salutation_personnalisee}}", {"prenom": "Jean"}).startswith("Bonjour Jean")
+
+    # Concurrent first renders all see the candidate name
+    renderer = PybarsRenderer(states_path)
+    renderer.load_all_partials()
+    template = "{{> salutation_personnalisee}}{{#if urgent}}!{{/if}}"
+    results = []
+
+    def render(i):
+        results.append(renderer.render(template, {"prenom": f"P{i}", "urgent": True}))
+
+    threads = [threading.Thread(target=render, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(results) == sorted(f"Bonjour P{i},<br>\n!" for i in range(16)), f"Got: {results}"
+
+    print("PASS: Refs cache shared between threads")
+
+
 def run_all_tests():
     """Run all tests."""
     print("=" * 60)
@@ -301,6 +400,9 @@ def run_all_tests():
         test_nested_path_access,
         test_handlebars_comments_stripped,
         test_complex_template_structure,
+        test_template_refs_through_partials,
+        test_render_output_cache,
+        test_refs_cache_shared_between_threads,
     ]
 
     passed = 0
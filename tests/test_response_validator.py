@@ -0,0 +1,95 @@
+"""Tests for the precompiled, single-scan ResponseValidator."""
+
+import pytest
+
+from src.state_engine.response_validator import Finding, ResponseValidator
+from src.state_engine.state_detector import DetectedState
+
+
+def make_state(blocks_required=(), blocks_forbidden=(), context=None):
+    return DetectedState(
+        id="I1", name="STATUT_DOSSIER", priority=100, category="intention", description="",
+        workflow_action="RESPOND",
+        response_config={"blocks_required": list(blocks_required), "blocks_forbidden": list(blocks_forbidden)},
+        crm_updates_config=None, detection_reason="test",
+        context_data=context if context is not None else {"date_examen": "2026-03-31"},
+    )
+
+
+@pytest.fixture
+def validator():
+    return ResponseValidator()
+
+
+class TestResponseValidatorScan:
+    def test_scan_returns_all_findings_with_positions(self, validator):
+        text = "Bonjour, votre dossier CRM: examen le 31/03/2026 (2026-03-31), frais 241 €."
+
+        findings = validator.scan(text)
+
+        assert findings == [
+            Finding("forbidden_term", "CRM", text.index("CRM"), validator.forbidden_terms.index("CRM")),
+            Finding("date", "31/03/2026", text.index("31/03"), 0),
+            Finding("date", "2026-03-31", text.index("2026-03"), 1),
+            Finding("amount", "241 €", text.index("241"), 0),
+        ]
+
+    def test_overlapping_dates_and_amounts_are_all_found(self, validator):
+        # La date et le montant partagent "2025" / "20 €" et "€ 30" partagent le '€'
+        findings = validator.scan("le 15/03/2025 € puis 20 € 30")
+
+        assert [(f.kind, f.text) for f in findings] == [
+            ("date", "15/03/2025"), ("amount", "2025 €"), ("amount", "20 €"), ("amount", "€ 30"),
+        ]
+
+    def test_forbidden_terms_whole_words_only(self, validator):
+        findings = validator.scan("Le deal_id du deal, pas les deals ni l'APIculture")
+
+        assert [f.text for f in findings] == ["deal_id", "deal"]
+
+    def test_term_starting_another_term_is_not_masked(self):
+        validator = ResponseValidator(["cours du", "cours du soir"])
+
+        terms = {f.text for f in validator.scan("Inscription en cours du soir")}
+
+        assert terms == {"cours du", "cours du soir"}
+
+
+class TestResponseValidatorChecks:
+    def test_errors_keep_rule_order_and_positions(self, validator):
+        text = "Bonjour,\nVotre Evalbox BFS: offre à 20€ le 01/01/2020.\nCordialement"
+
+        result = validator.validate(text, make_state())
+
+        assert [e.message for e in result.errors] == [
+            "Terme interdit trouvé: 'BFS'",
+            "Terme interdit trouvé: 'Evalbox'",
+            "Montant 20€ interdit (ne pas mentionner le prix de l'offre)",
+        ]
+        assert result.errors[0].position == text.index("BFS")
+        assert result.to_dict()["errors"][0]["location"].startswith("...")
+        assert [w.error_type for w in result.warnings] == ["past_date"]
+
+    def test_dates_checked_against_proposed_and_context_dates(self, validator):
+        text = "Bonjour, dates: 31/03/2099, 2099-06-30 et 12/05/2099.\nCordialement"
+        state = make_state(context={"date_examen": "2099-03-31"})
+
+        result = validator.validate(text, state, proposed_dates=[{"Date_Examen": "2099-06-30"}])
+
+        assert [w.message for w in result.warnings] == ["Date potentiellement inventée: '12/05/2099'"]
+        assert result.warnings[0].position == text.index("12/05/2099")
+
+    def test_invalid_calendar_dates_are_ignored(self, validator):
+        result = validator.validate("Bonjour, le 31/02/2020 ou le 2020-13-01.\nCordialement", make_state(),
+                                    proposed_dates=[{"Date_Examen": "2099-06-30"}])
+
+        assert not result.warnings
+        assert "dates_coherence" in result.checks_passed
+
+    def test_required_and_forbidden_blocks(self, validator):
+        state = make_state(blocks_required=["salutation", "lien_plateforme"], blocks_forbidden=["sessions_formation"])
+
+        result = validator.validate("Bonjour, le cours du soir commence lundi.\nCordialement", state)
+
+        assert [e.error_type for e in result.errors] == ["missing_block", "forbidden_block"]
+        assert "'lien_plateforme'" in result.errors[0].message
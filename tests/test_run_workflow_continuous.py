@@ -0,0 +1,69 @@
+"""Tests for the concurrent mode of run_workflow_continuous."""
+
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def runner(monkeypatch, tmp_path):
+    import run_workflow_continuous
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DOC_JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(run_workflow_continuous, "log", lambda msg: None)
+    return run_workflow_continuous
+
+
+class FakeWorkflow:
+    """Records the order of tickets and detects concurrent runs for one candidate."""
+
+    active = {}
+    order = []
+    lock = threading.Lock()
+
+    def __init__(self, emails):
+        self.emails = emails
+
+    def process_ticket(self, ticket_id, **kwargs):
+        email = self.emails[ticket_id]
+        with self.lock:
+            assert not self.active.get(email), f"concurrent tickets for {email}"
+            self.active[email] = True
+        time.sleep(0.01)
+        with self.lock:
+            self.active[email] = False
+            self.order.append(ticket_id)
+        return {"success": True, "workflow_stage": "COMPLETED"}
+
+
+class TestCandidateLanes:
+    def test_candidate_key(self, runner):
+        assert runner.candidate_key({"id": "1", "contactId": "C1", "email": "a@x.fr"}) == "contact:C1"
+        assert runner.candidate_key({"id": "1", "email": " A@X.fr "}) == "email:a@x.fr"
+        assert runner.candidate_key({"id": "1"}) == "ticket:1"
+
+    def test_group_by_candidate_keeps_order(self, runner):
+        pending = [{"id": "1", "email": "a"}, {"id": "2", "email": "b"}, {"id": "3", "email": "a"}]
+        lanes = runner.group_by_candidate(pending)
+        assert [[t["id"] for t in lane] for lane in lanes] == [["1", "3"], ["2"]]
+
+
+class TestConcurrentProcessing:
+    def test_same_candidate_never_concurrent(self, runner):
+        emails = {str(i): f"c{i % 3}@x.fr" for i in range(12)}
+        pending = [{"id": ticket_id, "email": email} for ticket_id, email in emails.items()]
+        runner.get_ticket_job_store().replace_pending(pending)
+
+        FakeWorkflow.active.clear()
+        FakeWorkflow.order.clear()
+        workflows = [FakeWorkflow(emails) for _ in range(3)]
+        success, errors = runner.process_all_pending(workflows, cycle_num=1)
+
+        assert (success, errors) == (12, 0)
+        assert runner.load_pending() == []
+        assert len(runner.load_processed()) == 12
+        for email in set(emails.values()):
+            ids = [t for t in FakeWorkflow.order if emails[t] == email]
+            assert ids == sorted(ids, key=int)
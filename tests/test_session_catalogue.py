@@ -0,0 +1,106 @@
+"""Tests for the training-session catalogue (Sessions1 interval index)."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from src.utils.session_catalogue import get_session_catalogue, get_session_kind, normalize_session_type
+
+
+def _day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+VISIO_VTC = {"name": "VISIO Zoom VTC", "id": "1"}
+PRESENTIEL = {"name": "Paris 15", "id": "2"}
+
+
+class FakeCRMClient:
+    def __init__(self, records):
+        self.records = records
+        self.calls = 0
+
+    def _make_request(self, method, url, params=None, **kwargs):
+        self.calls += 1
+        return {"data": list(self.records)}
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalogue():
+    get_session_catalogue().clear()
+    yield
+    get_session_catalogue().clear()
+
+
+@pytest.fixture
+def records():
+    return [
+        {"id": "a", "Name": "cdj-mars", "Date_d_but": _day(10), "Date_fin": _day(20), "Lieu_de_formation": VISIO_VTC},
+        {"id": "b", "Name": "cds-mars", "Date_d_but": _day(5), "Date_fin": _day(30), "Lieu_de_formation": VISIO_VTC},
+        {"id": "c", "Name": "cdj-avril", "Date_d_but": _day(35), "Date_fin": _day(45), "Lieu_de_formation": VISIO_VTC},
+        {"id": "d", "Name": "cdj-paris", "Date_d_but": _day(10), "Date_fin": _day(20), "Lieu_de_formation": PRESENTIEL},
+        {"id": "e", "Name": "cdj-started", "Date_d_but": _day(-2), "Date_fin": _day(8), "Lieu_de_formation": VISIO_VTC},
+    ]
+
+
+class TestSessionKind:
+    def test_kind_from_name(self):
+        assert get_session_kind({"Name": "CDJ-xyz"}) == "jour"
+        assert get_session_kind({"Name": "cds-xyz"}) == "soir"
+        assert get_session_kind({"Name": "autre"}) == "autre"
+
+    def test_normalize_session_type(self):
+        assert normalize_session_type("cdj") == "jour"
+        assert normalize_session_type("soir") == "soir"
+        assert normalize_session_type(None) is None
+
+
+class TestSessionCatalogue:
+    def test_ending_between(self, records):
+        client = FakeCRMClient(records)
+        sessions = get_session_catalogue().sessions_ending_between(client, _day(15), _day(31))
+        assert [s["id"] for s in sessions] == ["a", "d", "b"]
+
+    def test_type_and_lieu_partitions(self, records):
+        client = FakeCRMClient(records)
+        sessions = get_session_catalogue().sessions_ending_between(
+            client, _day(0), _day(60), session_type="cdj", lieu_filter=lambda lieu: "VISIO" in lieu
+        )
+        assert [s["id"] for s in sessions] == ["a", "c"]
+
+    def test_started_sessions_excluded(self, records):
+        sessions = get_session_catalogue().sessions_ending_between(FakeCRMClient(records), _day(0), _day(10))
+        assert sessions == []
+
+    def test_overlapping(self, records):
+        client = FakeCRMClient(records)
+        sessions = get_session_catalogue().sessions_overlapping(client, _day(25), _day(36))
+        assert [s["id"] for s in sessions] == ["b", "c"]
+
+    def test_single_load(self, records):
+        client = FakeCRMClient(records)
+        catalogue = get_session_catalogue()
+        catalogue.sessions_ending_between(client, _day(0), _day(60))
+        catalogue.sessions_overlapping(client, _day(0), _day(60))
+        assert client.calls == 1
+
+
+class TestSessionHelpers:
+    def test_multiple_exam_dates_one_load(self, records):
+        from src.utils.session_helper import get_sessions_for_multiple_exam_dates
+
+        client = FakeCRMClient(records)
+        exam_dates = [{"Date_Examen": _day(40)}, {"Date_Examen": _day(50)}, {"Date_Examen": _day(40)}]
+        result = get_sessions_for_multiple_exam_dates(client, exam_dates)
+
+        assert client.calls == 1
+        assert [s["id"] for s in result[_day(40)]["sessions"]] == ["a", "b"]
+        assert [s["id"] for s in result[_day(50)]["sessions"]] == ["c", "b"]
+
+    def test_match_sessions_by_date_range(self, records):
+        from src.utils.session_helper import match_sessions_by_date_range
+
+        result = match_sessions_by_date_range(
+            FakeCRMClient(records), {"start_date": _day(10), "end_date": _day(20)}
+        )
+        assert result["match_type"] == "EXACT"
+        assert [s["id"] for s in result["exact_matches"]] == ["a"]
@@ -0,0 +1,94 @@
+"""Tests for the precompiled state engine bundle (build, reload on change, rendering)."""
+
+import os
+import pickle
+
+import pytest
+
+from src.state_engine import bundle as state_bundle
+from src.state_engine.bundle import load_bundle
+from src.state_engine.pybars_renderer import PybarsRenderer
+from src.state_engine.state_detector import StateDetector
+
+STATES_YAML = """
+config:
+  forbidden_terms: [BFS]
+states:
+  SPAM:
+    id: T1
+    priority: 1
+    severity: BLOCKING
+    detection: {method: triage_agent, triage_action: SPAM}
+  GENERAL:
+    id: G
+    priority: 999
+    detection: {method: fallback}
+"""
+
+
+@pytest.fixture
+def states_path(tmp_path):
+    states = tmp_path / "states"
+    (states / "templates" / "partials" / "common").mkdir(parents=True)
+    (states / "blocks").mkdir()
+    (states / "candidate_states.yaml").write_text(STATES_YAML, encoding="utf-8")
+    (states / "state_intention_matrix.yaml").write_text("matrix: {}\nblocks_registry: {}\n", encoding="utf-8")
+    (states / "templates" / "partials" / "common" / "salutation.html").write_text(
+        "<!-- commentaire -->Bonjour {{prenom}},", encoding="utf-8")
+    (states / "blocks" / "signature.md").write_text("Cordialement, {{agent}}", encoding="utf-8")
+    (states / "templates" / "response_master.html").write_text(
+        "{{> partials/common/salutation}}\n{{#if urgent}}Urgent{{/if}}\n{{> signature}}", encoding="utf-8")
+    return states
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    return tmp_path / "build" / "state_engine.bundle"
+
+
+def render_with_bundle(states_path, bundle_path, context):
+    bundle = load_bundle(states_path, bundle_path)
+    partials, _ = bundle.partials()
+    (source, loader), = bundle.templates().values()
+    return loader()(context, partials=partials)
+
+
+class TestStateEngineBundle:
+    def test_precompiled_render_matches_direct_compilation(self, states_path, bundle_path, monkeypatch):
+        monkeypatch.setattr(state_bundle, "STATE_ENGINE_BUNDLE", False)
+        renderer = PybarsRenderer(states_path)
+        assert renderer.load_all_partials() == 2
+        template = (states_path / "templates" / "response_master.html").read_text(encoding="utf-8")
+        context = {"prenom": "Karim", "urgent": True, "agent": "DOC"}
+
+        expected = renderer.render(template, context)
+        assert render_with_bundle(states_path, bundle_path, context) == expected
+        assert "Bonjour Karim" in expected and "commentaire" not in expected
+
+    def test_bundle_reused_until_sources_change(self, states_path, bundle_path):
+        first = load_bundle(states_path, bundle_path)
+        assert load_bundle(states_path, bundle_path).content_hash == first.content_hash
+
+        # mtime changé sans changement de contenu: pas de reconstruction
+        salutation = states_path / "templates" / "partials" / "common" / "salutation.html"
+        os.utime(salutation, ns=(0, 0))
+        assert load_bundle(states_path, bundle_path).content_hash == first.content_hash
+
+        salutation.write_text("Salut {{prenom}} !", encoding="utf-8")
+        reloaded = load_bundle(states_path, bundle_path)
+        assert reloaded.content_hash != first.content_hash
+        assert reloaded.partials()[1]["partials/common/salutation"] == "Salut {{prenom}} !"
+
+    def test_bundle_of_another_version_is_rebuilt(self, states_path, bundle_path):
+        data = load_bundle(states_path, bundle_path).data
+        bundle_path.write_bytes(pickle.dumps({**data, "format": -1, "matrix": {"stale": True}}))
+
+        assert load_bundle(states_path, bundle_path).matrix == {"matrix": {}, "blocks_registry": {}}
+
+    def test_state_detector_loads_parsed_config_from_bundle(self, states_path, monkeypatch, tmp_path):
+        monkeypatch.setattr(state_bundle, "STATE_ENGINE_BUNDLE_PATH", str(tmp_path / "shared.bundle"))
+        detector = StateDetector(states_path / "candidate_states.yaml")
+
+        assert detector.get_forbidden_terms() == ["BFS"]
+        assert [rule.name for rule in detector.rules.states] == ["SPAM", "GENERAL"]
+        assert (tmp_path / "shared.bundle").exists()
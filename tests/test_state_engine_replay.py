@@ -0,0 +1,103 @@
+"""Tests for the recorded State Engine cases replayed offline (src/state_engine/replay.py)."""
+
+from datetime import date
+
+import pytest
+
+from src.state_engine import replay, template_engine
+from src.state_engine.replay import (
+    iter_cases, load_detected_states, make_case, record_case, replay_detection,
+    replay_response, state_names, write_cases,
+)
+from src.state_engine.state_detector import StateDetector
+from src.state_engine.template_engine import TemplateEngine
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return StateDetector()
+
+
+@pytest.fixture(scope="module")
+def engine():
+    # test_pybars_direct_comparison laisse PYBARS_ENABLED à False
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(template_engine, "PYBARS_ENABLED", True)
+        return TemplateEngine()
+
+
+@pytest.fixture
+def case(detector):
+    detector_inputs = {
+        "deal_data": {"Deal_Name": "Test", "Amount": 20, "Stage": "GAGNÉ", "Evalbox": "VALIDE CMA"},
+        "examt3p_data": {},
+        "triage_result": {"action": "GO", "primary_intent": "STATUT_DOSSIER", "secondary_intents": []},
+        "linking_result": {"deal_id": "1456177000000000001"},
+    }
+    detected_states = detector.detect_all_states(**detector_inputs)
+    # Contexte enrichi par le workflow après la détection
+    detected_states.primary_state.context_data["date_relance"] = date(2026, 3, 31)
+    return make_case("198709000448019181", detector_inputs, detected_states,
+                     detector_inputs["triage_result"], source="test")
+
+
+class TestStateEngineReplay:
+    def test_cases_round_trip_through_jsonl(self, case, tmp_path):
+        path = tmp_path / "cases.jsonl.gz"
+        write_cases(path, [case, case])
+
+        loaded = list(iter_cases(path))
+        assert [c["case_id"] for c in loaded] == ["198709000448019181:test"] * 2
+
+        states = load_detected_states(loaded[0]["detected_states"])
+        original = load_detected_states(case["detected_states"])
+        assert state_names(states) == state_names(original)
+        assert states.primary_state.context_data["date_relance"] == date(2026, 3, 31)
+        # Contexte partagé entre états, comme à la détection
+        assert all(s.context_data is states.primary_state.context_data for s in states.all_states)
+
+    def test_replay_is_repeatable(self, case, detector, engine):
+        first = replay_response(engine, case)
+        second = replay_response(engine, case)
+
+        assert first == second
+        assert first["response_text"]
+        assert state_names(replay_detection(detector, case)) == state_names(
+            load_detected_states(case["detected_states"]))
+
+    def test_record_case_only_when_enabled(self, case, detector, tmp_path, monkeypatch):
+        detected_states = load_detected_states(case["detected_states"])
+        args = ("1", case["detector_inputs"], detected_states, case["triage_result"])
+
+        monkeypatch.setattr(replay, "STATE_ENGINE_RECORD_DIR", None)
+        assert record_case(*args) is None
+
+        monkeypatch.setattr(replay, "STATE_ENGINE_RECORD_DIR", str(tmp_path))
+        path = record_case(*args)
+        record_case(*args)
+        assert [c["source"] for c in iter_cases(path)] == ["workflow", "workflow"]
+
+    def test_recorded_case_contains_no_credentials(self, detector, tmp_path, monkeypatch):
+        detector_inputs = {
+            "deal_data": {"Deal_Name": "Test", "Amount": 20, "Stage": "GAGNÉ", "Evalbox": "VALIDE CMA",
+                          "IDENTIFIANT_EVALBOX": "candidat@mail.fr", "MDP_EVALBOX": "S3cret-Evalbox"},
+            "examt3p_data": {"compte_existe": True, "identifiant": "candidat@mail.fr",
+                             "mot_de_passe": "S3cret-ExamT3P", "password_warning": None},
+            "triage_result": {"action": "GO", "primary_intent": "STATUT_DOSSIER", "secondary_intents": []},
+            "linking_result": {"deal_id": "1456177000000000001"},
+        }
+        detected_states = detector.detect_all_states(**detector_inputs)
+        detected_states.primary_state.context_data["examt3p_password"] = "S3cret-Context"
+
+        monkeypatch.setattr(replay, "STATE_ENGINE_RECORD_DIR", str(tmp_path))
+        path = record_case("1", detector_inputs, detected_states, detector_inputs["triage_result"])
+        line = path.read_text(encoding="utf-8")
+
+        assert "S3cret" not in line
+        assert "candidat@mail.fr" in line
+        recorded = next(iter_cases(path))
+        assert recorded["detector_inputs"]["examt3p_data"]["mot_de_passe"] == replay.REDACTED
+        assert recorded["detector_inputs"]["deal_data"]["MDP_EVALBOX"] == replay.REDACTED
+        assert state_names(replay_detection(detector, recorded)) == state_names(detected_states)
+        # Entrées d'origine intactes (le workflow continue avec)
+        assert detector_inputs["examt3p_data"]["mot_de_passe"] == "S3cret-ExamT3P"
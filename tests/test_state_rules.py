@@ -0,0 +1,80 @@
+"""Tests for the compiled state detection rules (decision table) of StateDetector."""
+
+import itertools
+
+import pytest
+
+from src.state_engine.state_detector import StateDetector
+from src.state_engine.state_rules import compile_condition
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return StateDetector()
+
+
+def make_context(detector, triage=None, deal=None, examt3p=None, linking=None, consistency=None):
+    deal_data = {"Deal_Name": "Test", "Amount": 20, "Stage": "GAGNÉ", "Evalbox": "VALIDE CMA", **(deal or {})}
+    return detector._build_context(
+        deal_data, examt3p or {}, {"action": "GO", **(triage or {})},
+        {"deal_id": "1456177000000000001", **(linking or {})}, None,
+        training_exam_consistency_data=consistency
+    )
+
+
+def legacy_matches(detector, context):
+    return [name for name, config in detector._sorted_states if detector._matches_state(name, config, context)]
+
+
+def compiled_matches(detector, context):
+    return [rule.name for rule in detector.rules.matching(context)]
+
+
+class TestStateRules:
+    @pytest.mark.parametrize("condition, context, expected", [
+        ("deal_amount == 20", {"deal_amount": 20}, True),
+        ("Date_Dossier_re_u == null", {}, True),
+        ("has_consistency_issue == true", {"has_consistency_issue": False}, False),
+        ("consistency_issue_type == 'MISSED'", {"consistency_issue_type": "MISSED"}, True),
+        ("evalbox NOT IN ['VALIDE CMA', 'Refusé CMA']", {"evalbox": "Refusé CMA"}, False),
+        ("no_other_state_matched", {}, False),
+    ])
+    def test_compiled_condition_semantics(self, detector, condition, context, expected):
+        assert compile_condition(condition)(context) is expected
+        assert detector._evaluate_condition(condition, context) is expected
+
+    def test_same_states_as_state_by_state_evaluation(self, detector):
+        triages = [
+            {"action": "SPAM"}, {"action": "ROUTE"},
+            {"primary_intent": "REPORT_DATE", "secondary_intents": ["STATUT_DOSSIER", "STATUT_DOSSIER"]},
+            {"detected_intent": "DEMANDE_IDENTIFIANTS"},
+            {"detected_intent": "CONFIRMATION_DATE"},
+        ]
+        deals = [
+            {}, {"Date_Dossier_re_u": "2025-01-10"},
+            {"Amount": 20, "Stage": "EN ATTENTE"}, {"Amount": 500, "Evalbox": "Refusé CMA"},
+        ]
+        examt3ps = [
+            {}, {"extraction_failed": True, "error_type": "technical"},
+            {"duplicate_payment_alert": True, "should_respond_to_candidate": True},
+        ]
+        linkings = [{}, {"has_duplicate_uber_offer": True}, {"needs_clarification": True}]
+        consistencies = [None, {"has_consistency_issue": True, "issue_type": "MISSED_TRAINING_IMMINENT_EXAM",
+                                "force_majeure_detected": True, "training_missed_exam_imminent": True}]
+
+        for triage, deal, examt3p, linking, consistency in itertools.product(
+                triages, deals, examt3ps, linkings, consistencies):
+            context = make_context(detector, triage, deal, examt3p, linking, consistency)
+            assert compiled_matches(detector, context) == legacy_matches(detector, context)
+
+    def test_only_indexed_states_are_candidates(self, detector):
+        context = make_context(detector, {"primary_intent": "STATUT_DOSSIER", "secondary_intents": ["REPORT_DATE"]})
+        candidates = {rule.name for rule in detector.rules.candidates(context)}
+
+        assert {"STATUT_DOSSIER", "REPORT_DATE_REQUEST"} <= candidates
+        assert not candidates & {"SPAM", "ROUTE_DEPARTMENT", "DEMANDE_IDENTIFIANTS", "DUPLICATE_UBER",
+                                 "DOUBLE_ACCOUNT_PAID", "MISSED_TRAINING_FORCE_MAJEURE"}
+
+    def test_never_matching_states_are_not_compiled(self, detector):
+        # any_of sans 'condition': jamais reconnu par _match_triage_state
+        assert "CONFIRMATION_DATE_EXAMEN" in detector.rules.skipped
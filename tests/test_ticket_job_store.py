@@ -0,0 +1,88 @@
+"""Tests for the SQLite ticket job store."""
+
+import json
+
+import pytest
+
+from src.utils.ticket_job_store import TicketJobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TicketJobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def _tickets(*ids):
+    return [{"id": ticket_id, "subject": f"Sujet {ticket_id}", "email": "a@x.fr"} for ticket_id in ids]
+
+
+class TestPending:
+    def test_replace_pending(self, store):
+        assert store.replace_pending(_tickets("1", "2", "3")) == 3
+        assert store.replace_pending(_tickets("2", "4")) == 2
+        assert [t["id"] for t in store.list_pending()] == ["2", "4"]
+        assert store.list_pending()[0]["subject"] == "Sujet 2"
+
+    def test_in_flight_kept_on_resync(self, store):
+        store.replace_pending(_tickets("1"))
+        assert store.claim("1", "w1")
+        store.replace_pending(_tickets("1"))
+        assert store.list_pending() == []
+        assert store.get_stats()["in_flight"] == 1
+
+
+class TestTransitions:
+    def test_claim_is_exclusive(self, store):
+        store.replace_pending(_tickets("1"))
+        assert store.claim("1", "w1")
+        assert not store.claim("1", "w2")
+
+    def test_expired_lease_is_reclaimed(self, store):
+        store.replace_pending(_tickets("1"))
+        assert store.claim("1", "w1", lease_seconds=-1)
+        assert [t["id"] for t in store.list_pending()] == ["1"]
+        assert store.claim("1", "w2")
+
+    def test_complete_appends_history(self, store):
+        store.replace_pending(_tickets("1"))
+        store.claim("1", "w1")
+        store.complete("1", {"id": "1", "triage_action": "GO", "success": True}, success=True)
+
+        assert store.get_stats()["done"] == 1
+        assert store.history(ticket_id="1")[0]["triage_action"] == "GO"
+
+    def test_fail_retries_then_fails(self, store, monkeypatch):
+        monkeypatch.setattr(store, "MAX_ATTEMPTS", 2)
+        store.replace_pending(_tickets("1"))
+        store.claim("1", "w1")
+        assert store.fail("1", "timeout") == "pending"
+        store.claim("1", "w1")
+        assert store.fail("1", "timeout") == "failed"
+
+
+class TestHistory:
+    def test_latest_only_and_update(self, store):
+        for action in ("ROUTE", "GO"):
+            store.enqueue({"id": "1"})
+            store.claim("1", "w1")
+            store.complete("1", {"id": "1", "triage_action": action}, success=True)
+
+        latest = store.history(latest_only=True)
+        assert [r["triage_action"] for r in latest] == ["GO"]
+
+        route = store.history(triage_action="ROUTE")[0]
+        store.update_history_record(route["_history_id"], {"customer_message": "Bonjour"})
+        assert store.history(triage_action="ROUTE")[0]["customer_message"] == "Bonjour"
+
+    def test_import_legacy_json(self, store, tmp_path):
+        pending_file = tmp_path / "pending.json"
+        processed_file = tmp_path / "processed.json"
+        pending_file.write_text(json.dumps(_tickets("2")), encoding="utf-8")
+        processed_file.write_text(json.dumps([{"id": "1", "success": True, "triage_action": "GO"}]), encoding="utf-8")
+
+        assert store.import_legacy_json(str(pending_file), str(processed_file)) == {"pending": 1, "history": 1}
+        assert store.import_legacy_json(str(pending_file), str(processed_file)) == {"pending": 0, "history": 0}
+        assert [t["id"] for t in store.list_pending()] == ["2"]
+        assert store.get_stats()["done"] == 1
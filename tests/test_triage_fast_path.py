@@ -0,0 +1,99 @@
+"""Tests for the rule-based triage fast path placed in front of the LLM."""
+
+import pytest
+
+from src.utils.triage_fast_path import TriageFastPath
+
+QUOTED_REPLY = (
+    "\n\nLe mar. 27 janv. 2026 à 15:08, doc doc@cab-formations.fr> a écrit :\n"
+    "Bonjour, transmettez-nous vos identifiants. Où en est votre dossier ?"
+)
+
+
+@pytest.fixture
+def fast_path():
+    return TriageFastPath(min_confidence=0.85)
+
+
+class TestTriageFastPath:
+    def test_result_has_triage_agent_format(self, fast_path):
+        result = fast_path.classify("Re: Inscription", "Merci beaucoup !\nKarim", {"Deal_Name": "X"}, "DOC")
+
+        assert fast_path.accepts(result)
+        assert result["action"] == "GO" and result["target_department"] == "DOC"
+        assert result["primary_intent"] == result["detected_intent"] == "REMERCIEMENT"
+        assert result["method"] == "rule_fast_path"
+        assert result["intent_context"]["mentions_force_majeure"] is False
+
+    def test_only_latest_message_is_read(self, fast_path):
+        message = "Voici les identifiants\nMail: jean@gmail.com\nMot de passe: Abc123-" + QUOTED_REPLY
+        result = fast_path.classify("Re: Finaliser votre inscription", message, {"Deal_Name": "X"})
+
+        assert result["primary_intent"] == "ENVOIE_IDENTIFIANTS"
+        assert result["intent_context"]["has_credentials"] is True
+        assert fast_path.latest_message(message).endswith("Abc123-")
+
+    def test_confirmation_patterns_extract_date(self, fast_path):
+        result = fast_path.classify("Re: Dates d'examen", "Bonjour, ok pour le 31/03/2026. Cordialement", {"Deal_Name": "X"})
+
+        assert result["primary_intent"] == "CONFIRMATION_DATE_EXAMEN"
+        assert result["intent_context"]["confirmed_new_exam_date"] == "2026-03-31"
+
+    def test_exam_date_intent_depends_on_assigned_date(self, fast_path):
+        with_date = fast_path.classify("Examen", "Bonjour, quand est mon examen ?", {"_real_exam_date": "2026-03-31"})
+        without_date = fast_path.classify("Examen", "Quelles sont les prochaines dates d'examen ?", {"Deal_Name": "X"})
+
+        assert with_date["primary_intent"] == "DEMANDE_DATE_EXAMEN"
+        assert without_date["primary_intent"] == "DEMANDE_DATES_FUTURES"
+
+    @pytest.mark.parametrize("message", [
+        "Merci. Je serai hospitalisé le jour de l'examen, pouvez-vous reporter ?",
+        "Où en est mon dossier ? Et quand vais-je recevoir ma convocation ?",
+        "Cours du soir svp.\n---\nJe voudrais aussi changer de centre d'examen.",
+        "Je ne veux pas donner mon mot de passe jean@gmail.com, est-ce obligatoire ?",
+    ])
+    def test_ambiguous_messages_fall_through_to_llm(self, fast_path, message):
+        assert not fast_path.accepts(fast_path.classify("Re: Examen VTC", message, {"Deal_Name": "X"}))
+
+    def test_spam_only_without_crm_deal(self, fast_path):
+        message = "Win the lottery at our online casino, click here"
+
+        result = fast_path.classify("Promo", message, None)
+        assert result["action"] == "SPAM" and fast_path.accepts(result)
+        assert fast_path.classify("Promo", message, {"Deal_Name": "X"}) is None
+
+    @pytest.mark.parametrize("subject, message", [
+        ("Inscription", "Bonjour, je travaille chez Casino à Lyon et je voudrais m'inscrire à la formation VTC"),
+        ("Newsletter", "Bonjour, je souhaite des informations.\nClick here to unsubscribe from our newsletter"),
+        ("Casino lottery", "Bonjour, quand puis-je commencer ?"),
+        ("Question", "Bonjour\n\nLe lun. 2 févr. 2026 à 10:00, promo a écrit :\nCasino lottery, click here"),
+        ("Promo", "Casino lottery click here pour votre examen VTC"),
+    ])
+    def test_spam_never_accepted_on_weak_signal(self, fast_path, subject, message):
+        assert not fast_path.accepts(fast_path.classify(subject, message, None))
+
+    @pytest.mark.parametrize("message", [
+        "Merci pas reçu",
+        "Merci mais toujours rien",
+        "Merci, je n'ai rien reçu",
+        "Merci beaucoup mais ce n'est pas le bon",
+    ])
+    def test_negated_thanks_fall_through(self, fast_path, message):
+        assert not fast_path.accepts(fast_path.classify("Re: Inscription", message, {"Deal_Name": "X"}))
+
+    @pytest.mark.parametrize("message", [
+        "je confirme le 15/03/2026 mais je ne pourrai pas venir",
+        "Je ne confirme pas le 15/03/2026",
+        "ok pour le 15/03/2026, toujours pas de convocation",
+    ])
+    def test_negated_confirmation_falls_through(self, fast_path, message):
+        assert not fast_path.accepts(fast_path.classify("Re: Dates d'examen", message, {"Deal_Name": "X"}))
+
+    def test_stats_count_hits_per_rule(self, fast_path):
+        fast_path.classify("Re", "Merci beaucoup", None)
+        fast_path.classify("Re", "J'ai une question sur le permis étranger", None)
+
+        stats = fast_path.get_stats()
+        assert stats["hits_by_rule"] == {"remerciement": 1}
+        assert stats["no_match"] == 1
+        assert stats["hit_rate"] == 0.5
@@ -0,0 +1,86 @@
+"""Tests for the persistent webhook queue and worker pool."""
+
+import threading
+
+import pytest
+
+from src.utils.webhook_queue import WebhookQueue, WebhookWorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WebhookQueue(str(tmp_path / "queue.db"), coalesce_seconds=0)
+    yield queue
+    queue.close()
+
+
+class TestEnqueue:
+    def test_duplicate_and_coalesce(self, queue):
+        assert queue.enqueue("1", "ticket.created", {"id": "1", "v": 1})["status"] == "queued"
+        assert queue.enqueue("1", "ticket.created", {"id": "1", "v": 1})["status"] == "duplicate"
+        result = queue.enqueue("1", "ticket.updated", {"id": "1", "v": 2})
+        assert result == {"status": "coalesced", "depth": 1}
+
+        job = queue.claim_next("w1")
+        assert job["events"] == 3
+        assert job["payload"] == {"id": "1", "v": 2}
+
+    def test_coalescing_window_delays_processing(self, tmp_path):
+        queue = WebhookQueue(str(tmp_path / "window.db"), coalesce_seconds=60)
+        queue.enqueue("1", "ticket.created", {"id": "1"})
+        assert queue.claim_next("w1") is None
+        assert queue.next_ready_in() > 59
+        queue.close()
+
+    def test_event_during_processing_schedules_one_rerun(self, queue):
+        queue.enqueue("1", "ticket.created", {"v": 1})
+        assert queue.claim_next("w1")["ticket_id"] == "1"
+        assert queue.enqueue("1", "ticket.updated", {"v": 2})["status"] == "rerun_scheduled"
+        assert queue.enqueue("1", "ticket.updated", {"v": 3})["status"] == "rerun_scheduled"
+
+        assert queue.complete("1", success=True) == "pending"
+        assert queue.claim_next("w1")["payload"] == {"v": 3}
+        assert queue.complete("1", success=True) == "done"
+
+    def test_redelivery_after_done_is_duplicate(self, queue):
+        queue.enqueue("1", "ticket.created", {"v": 1})
+        queue.claim_next("w1")
+        queue.complete("1", success=True)
+        assert queue.enqueue("1", "ticket.created", {"v": 1})["status"] == "duplicate"
+        assert queue.enqueue("1", "ticket.updated", {"v": 2})["status"] == "queued"
+
+    def test_fail_retries_then_fails(self, queue, monkeypatch):
+        monkeypatch.setattr(queue, "MAX_ATTEMPTS", 2)
+        queue.enqueue("1", "ticket.created", {})
+        queue.claim_next("w1")
+        assert queue.fail("1", "boom") == "pending"
+        queue.claim_next("w1")
+        assert queue.fail("1", "boom") == "failed"
+        assert queue.get_stats()["states"]["failed"] == 1
+
+
+class TestWorkerPool:
+    def test_workers_process_queue(self, queue):
+        processed = []
+        done = threading.Event()
+
+        def handler(job):
+            processed.append(job["ticket_id"])
+            if len(processed) == 3:
+                done.set()
+            return {"success": True}
+
+        pool = WebhookWorkerPool(queue, handler, workers=2)
+        pool.start()
+        try:
+            for ticket_id in ("1", "2", "3"):
+                queue.enqueue(ticket_id, "ticket.created", {"id": ticket_id})
+            assert done.wait(5)
+        finally:
+            pool.stop()
+
+        assert sorted(processed) == ["1", "2", "3"]
+        stats = queue.get_stats()
+        assert stats["depth"] == 0
+        assert stats["processed"] == 3
+        assert stats["queue_wait"]["count"] == 3
@@ -0,0 +1,66 @@
+"""Tests for the async Zoho client (no network: _make_request is stubbed)."""
+
+import asyncio
+
+import pytest
+
+
+class TestRunSync:
+    def test_returns_result(self):
+        from src.zoho_async_client import run_sync
+
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert run_sync(add(1, 2)) == 3
+
+    def test_propagates_exception(self):
+        from src.zoho_async_client import run_sync
+
+        async def boom():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            run_sync(boom())
+
+
+class TestAsyncDeskFanOut:
+    def _client(self, monkeypatch, fail_ids=()):
+        from src.zoho_async_client import AsyncZohoDeskClient
+
+        client = AsyncZohoDeskClient()
+        in_flight = {"now": 0, "max": 0}
+
+        async def fake_request(method, url, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            thread_id = url.rsplit("/", 1)[-1]
+            if thread_id in fail_ids:
+                raise RuntimeError("boom")
+            return {"id": thread_id, "content": f"full-{thread_id}"}
+
+        monkeypatch.setattr(client, "_make_request", fake_request)
+        return client, in_flight
+
+    def test_details_concurrent_and_ordered(self, monkeypatch):
+        from src.zoho_async_client import run_sync
+
+        client, in_flight = self._client(monkeypatch)
+        threads = [{"id": str(i)} for i in range(5)]
+        result = run_sync(client.get_threads_details("T1", threads))
+
+        assert [t["content"] for t in result] == [f"full-{i}" for i in range(5)]
+        assert in_flight["max"] > 1
+
+    def test_failed_detail_falls_back_to_summary(self, monkeypatch):
+        from src.zoho_async_client import run_sync
+
+        client, _ = self._client(monkeypatch, fail_ids={"2"})
+        threads = [{"id": "1"}, {"id": "2", "summary": "court"}]
+        result = run_sync(client.get_threads_details("T1", threads))
+
+        assert result[0]["content"] == "full-1"
+        assert result[1] == {"id": "2", "summary": "court"}
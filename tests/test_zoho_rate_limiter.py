@@ -0,0 +1,91 @@
+"""Tests for the Zoho token-bucket rate limiter."""
+
+import pytest
+
+from src.zoho_rate_limiter import TokenBucket, classify_endpoint, get_rate_limiter
+
+
+class TestClassifyEndpoint:
+    def test_search(self):
+        assert classify_endpoint("GET", "https://www.zohoapis.eu/crm/v3/Deals/search") == "search"
+
+    def test_get(self):
+        assert classify_endpoint("get", "https://desk.zoho.eu/api/v1/tickets/1") == "get"
+
+    def test_write(self):
+        assert classify_endpoint("PATCH", "https://desk.zoho.eu/api/v1/tickets/1") == "write"
+
+
+class TestTokenBucket:
+    def test_burst_without_wait(self):
+        bucket = TokenBucket("test", rate=1.0, capacity=3)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_wait_after_burst(self):
+        bucket = TokenBucket("test", rate=10.0, capacity=2)
+        bucket.reserve()
+        bucket.reserve()
+        wait = bucket.reserve()
+        assert 0.05 < wait <= 0.1
+        stats = bucket.get_stats()
+        assert stats["acquired"] == 3
+        assert stats["waited"] == 1
+        assert stats["max_wait_seconds"] == pytest.approx(wait, abs=1e-3)
+
+    def test_reservations_queue_up(self):
+        bucket = TokenBucket("test", rate=10.0, capacity=1)
+        bucket.reserve()
+        first = bucket.reserve()
+        second = bucket.reserve()
+        assert second > first
+
+    def test_pause(self):
+        bucket = TokenBucket("test", rate=100.0, capacity=10)
+        bucket.pause(5)
+        assert bucket.reserve() > 4.9
+        assert bucket.get_stats()["throttled"] == 1
+
+    def test_drain_to(self):
+        bucket = TokenBucket("test", rate=1.0, capacity=10)
+        bucket.drain_to(0)
+        assert bucket.reserve() > 0.9
+
+
+class TestZohoRateLimiter:
+    @pytest.fixture(autouse=True)
+    def reset_limiter(self):
+        get_rate_limiter().reset()
+        yield
+        get_rate_limiter().reset()
+
+    def test_families_are_independent(self):
+        limiter = get_rate_limiter()
+        limiter.configure("desk", None, rate=1.0, capacity=1)
+        limiter.configure("crm", None, rate=1.0, capacity=1)
+        assert limiter.reserve("desk", "get") == 0.0
+        assert limiter.reserve("crm", "get") == 0.0
+        assert limiter.reserve("desk", "get") > 0.9
+
+    def test_search_bucket_applies_on_top(self):
+        limiter = get_rate_limiter()
+        limiter.configure("crm", None, rate=100.0, capacity=100)
+        limiter.configure("crm", "search", rate=1.0, capacity=1)
+        assert limiter.reserve("crm", "search") == 0.0
+        assert limiter.reserve("crm", "get") == 0.0
+        assert limiter.reserve("crm", "search") > 0.9
+
+    def test_429_pauses_family(self):
+        limiter = get_rate_limiter()
+        limiter.observe_response("crm", "get", 429, {"Retry-After": "3"})
+        assert limiter.reserve("crm", "get") > 2.9
+        assert limiter.reserve("desk", "get") == 0.0
+
+    def test_low_remaining_header_slows_down(self):
+        limiter = get_rate_limiter()
+        limiter.configure("desk", None, rate=1.0, capacity=10)
+        limiter.observe_response("desk", "get", 200, {"X-RATELIMIT-REMAINING": "2"})
+        assert limiter.reserve("desk", "get") > 0
+
+    def test_stats_per_bucket(self):
+        stats = get_rate_limiter().get_stats()
+        assert {"desk", "crm", "desk:search", "crm:search"} <= set(stats)
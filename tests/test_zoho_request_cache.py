@@ -0,0 +1,67 @@
+"""Tests for the request-scoped read cache of the Zoho clients."""
+
+import pytest
+
+
+@pytest.fixture
+def desk(monkeypatch):
+    from src.zoho_client import ZohoDeskClient
+
+    client = ZohoDeskClient()
+    client.sent = []
+
+    def fake_send(method, url, headers=None, **kwargs):
+        client.sent.append((method, url))
+        return {"id": url.rsplit("/", 1)[-1], "data": [{"status": "SENT"}]}
+
+    monkeypatch.setattr(client, "_send_request", fake_send)
+    return client
+
+
+class TestRequestScope:
+    def test_no_scope_no_cache(self, desk):
+        desk.get_ticket("1")
+        desk.get_ticket("1")
+        assert len(desk.sent) == 2
+
+    def test_identical_gets_deduplicated(self, desk):
+        with desk.request_scope("1"):
+            first = desk.get_ticket("1")
+            first["mutated"] = True
+            second = desk.get_ticket("1")
+            desk.get_ticket_threads("1")
+
+        assert len(desk.sent) == 2
+        assert "mutated" not in second
+        stats = desk.get_request_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    def test_write_invalidates_same_record(self, desk):
+        with desk.request_scope("1"):
+            desk.get_ticket("1")
+            desk.get_ticket_threads("1")
+            desk.get_ticket("2")
+            desk.create_ticket_reply_draft("1", "Bonjour")
+            desk.get_ticket("1")
+            desk.get_ticket_threads("1")
+            desk.get_ticket("2")
+
+        gets = [url for method, url in desk.sent if method == "GET"]
+        assert len(gets) == 5
+
+    def test_crm_update_deal_invalidates_deal(self, monkeypatch):
+        from src.zoho_client import ZohoCRMClient
+
+        crm = ZohoCRMClient()
+        sent = []
+        monkeypatch.setattr(
+            crm, "_send_request",
+            lambda method, url, headers=None, **kwargs: sent.append(method) or {"data": [{"id": "9"}]}
+        )
+        with crm.request_scope("1"):
+            crm.get_deal("9")
+            crm.get_deal("9")
+            crm.update_deal("9", {"Stage": "GAGNÉ"})
+            crm.get_deal("9")
+
+        assert sent == ["GET", "PUT", "GET"]
@@ -0,0 +1,71 @@
+"""Tests for the per-ticket thread store."""
+
+import asyncio
+
+import pytest
+
+from src.zoho_thread_store import get_thread_store
+
+
+@pytest.fixture(autouse=True)
+def fresh_store():
+    get_thread_store().clear()
+    yield
+    get_thread_store().clear()
+
+
+class TestZohoThreadStore:
+    def test_lookup_by_version(self):
+        store = get_thread_store()
+        store.put("T1", {"id": "1", "modifiedTime": "v1"}, {"id": "1", "content": "full"})
+
+        assert store.lookup("T1", [{"id": "1", "modifiedTime": "v1"}]) == [{"id": "1", "content": "full"}]
+        assert store.lookup("T1", [{"id": "1", "modifiedTime": "v2"}]) == [None]
+        assert store.lookup("T2", [{"id": "1", "modifiedTime": "v1"}]) == [None]
+
+    def test_created_time_fallback(self):
+        store = get_thread_store()
+        store.put("T1", {"id": "1", "createdTime": "c1"}, {"id": "1"})
+        assert store.lookup("T1", [{"id": "1", "createdTime": "c1"}]) == [{"id": "1"}]
+
+    def test_lru_eviction(self, monkeypatch):
+        store = get_thread_store()
+        monkeypatch.setattr(store, "MAX_TICKETS", 2)
+        for ticket_id in ("T1", "T2", "T3"):
+            store.put(ticket_id, {"id": "1"}, {"id": "1"})
+
+        assert store.lookup("T1", [{"id": "1"}]) == [None]
+        assert store.get_stats()["evictions"] == 1
+
+
+class TestAsyncClientUsesStore:
+    def test_only_new_or_modified_threads_fetched(self, monkeypatch):
+        from src.zoho_async_client import AsyncZohoDeskClient, run_sync
+
+        listing = {"data": [{"id": "1", "modifiedTime": "a"}, {"id": "2", "modifiedTime": "a"}]}
+        detail_calls = []
+
+        async def fake_request(method, url, **kwargs):
+            await asyncio.sleep(0)
+            if url.endswith("/threads"):
+                return listing
+            thread_id = url.rsplit("/", 1)[-1]
+            detail_calls.append(thread_id)
+            return {"id": thread_id, "content": f"full-{thread_id}-{len(detail_calls)}"}
+
+        client = AsyncZohoDeskClient()
+        monkeypatch.setattr(client, "_make_request", fake_request)
+
+        first = run_sync(client.get_all_threads_with_full_content("T1"))
+        assert sorted(detail_calls) == ["1", "2"]
+
+        listing["data"] = [
+            {"id": "1", "modifiedTime": "a"},
+            {"id": "2", "modifiedTime": "b"},
+            {"id": "3", "modifiedTime": "a"},
+        ]
+        second = run_sync(client.get_all_threads_with_full_content("T1"))
+
+        assert sorted(detail_calls[2:]) == ["2", "3"]
+        assert second[0] == first[0]
+        assert [t["id"] for t in second] == ["1", "2", "3"]
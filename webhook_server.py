@@ -2,6 +2,14 @@
 """
 Zoho Desk Webhook Server
 Receives webhook events from Zoho Desk and triggers automation workflows
+
+The webhook endpoint only validates and enqueues the event (persistent
+SQLite queue, see src/utils/webhook_queue.py); a background worker pool
+runs the workflows. Repeated events for the same ticket are coalesced.
+
+The worker pool is started once per process by start_background_services():
+from __main__ for the development server, from the post_worker_init hook of
+gunicorn.conf.py under gunicorn (each forked worker runs its own pool).
 """
 
 import os
@@ -9,13 +17,17 @@ import json
 import hmac
 import hashlib
 import logging
+import threading
 from typing import Dict, Any, Optional
 from flask import Flask, request, jsonify
 from datetime import datetime
 import traceback
 
-from src.orchestrator import ZohoAutomationOrchestrator
 from src.utils.logging_config import setup_logging
+from src.utils.webhook_queue import get_webhook_queue, WebhookWorkerPool
+from src.utils.component_pool import get_orchestrator_pool
+from src.llm_client import get_llm_gateway
+from src.utils.triage_fast_path import get_triage_fast_path
 
 # Setup logging
 setup_logging()
@@ -32,6 +44,66 @@ AUTO_RESPOND = os.getenv('WEBHOOK_AUTO_RESPOND', 'false').lower() == 'true'
 AUTO_UPDATE_TICKET = os.getenv('WEBHOOK_AUTO_UPDATE_TICKET', 'false').lower() == 'true'
 AUTO_UPDATE_DEAL = os.getenv('WEBHOOK_AUTO_UPDATE_DEAL', 'false').lower() == 'true'
 AUTO_ADD_NOTE = os.getenv('WEBHOOK_AUTO_ADD_NOTE', 'false').lower() == 'true'
+WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', '2'))  # 0 = pas de worker (enqueue seulement)
+
+# Warm orchestrators reused across jobs (one per worker + one for /webhook/test)
+ORCHESTRATOR_POOL_SIZE = max(WEBHOOK_WORKERS, 1) + 1
+_worker_pool: Optional[WebhookWorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def process_queued_ticket(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the automation workflow for a queued webhook job (worker thread).
+
+    Args:
+        job: Job from the WebhookQueue (ticket_id, event_type, events, payload...)
+
+    Returns:
+        Dict with success and optional error
+    """
+    ticket_id = job['ticket_id']
+    start_time = datetime.utcnow()
+    logger.info(f"Processing queued ticket {ticket_id} ({job.get('events', 1)} event(s), last: {job.get('event_type')})")
+
+    with get_orchestrator_pool(ORCHESTRATOR_POOL_SIZE).acquire() as orchestrator:
+        result = orchestrator.process_ticket_complete_workflow(
+            ticket_id=ticket_id,
+            auto_dispatch=AUTO_DISPATCH,
+            auto_link=AUTO_LINK,
+            auto_respond=AUTO_RESPOND,
+            auto_update_ticket=AUTO_UPDATE_TICKET,
+            auto_update_deal=AUTO_UPDATE_DEAL,
+            auto_add_note=AUTO_ADD_NOTE
+        )
+
+    processing_time = (datetime.utcnow() - start_time).total_seconds()
+    logger.info(f"✅ Ticket {ticket_id} processed in {processing_time:.2f}s")
+    logger.info(f"Summary: {result.get('summary', {})}")
+
+    return {'success': result.get('success', True), 'error': result.get('error')}
+
+
+def ensure_worker_pool() -> Optional[WebhookWorkerPool]:
+    """Start the background worker pool once per process (no-op if WEBHOOK_WORKERS=0)."""
+    global _worker_pool
+    if WEBHOOK_WORKERS <= 0:
+        return None
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = WebhookWorkerPool(get_webhook_queue(), process_queued_ticket, workers=WEBHOOK_WORKERS)
+        _worker_pool.start()
+        return _worker_pool
+
+
+def start_background_services() -> Optional[WebhookWorkerPool]:
+    """
+    Warm the orchestrators and start the worker pool (process startup).
+
+    The pool also resumes jobs left in the queue by a restart.
+    """
+    get_orchestrator_pool(ORCHESTRATOR_POOL_SIZE).warm(max(WEBHOOK_WORKERS, 1))
+    return ensure_worker_pool()
 
 
 def verify_webhook_signature(payload: bytes, signature: str) -> bool:
@@ -155,7 +227,7 @@ def handle_zoho_desk_webhook():
     - ticket.assigned
 
     Returns:
-        JSON response with success status
+        JSON response (202 once the event is queued; processing is asynchronous)
     """
     start_time = datetime.utcnow()
 
@@ -204,45 +276,12 @@ def handle_zoho_desk_webhook():
             'error': 'No ticket ID found in payload'
         }), 400
 
-    logger.info(f"Processing webhook for ticket {ticket_id}, event: {event_info['event_type']}")
-
-    # Process ticket with orchestrator
-    orchestrator = None
+    # Enqueue (persistent queue) - the workflow runs in the background worker pool
     try:
-        orchestrator = ZohoAutomationOrchestrator()
-
-        result = orchestrator.process_ticket_complete_workflow(
-            ticket_id=ticket_id,
-            auto_dispatch=AUTO_DISPATCH,
-            auto_link=AUTO_LINK,
-            auto_respond=AUTO_RESPOND,
-            auto_update_ticket=AUTO_UPDATE_TICKET,
-            auto_update_deal=AUTO_UPDATE_DEAL,
-            auto_add_note=AUTO_ADD_NOTE
-        )
-
-        # Calculate processing time
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
-
-        logger.info(f"✅ Webhook processed successfully in {processing_time:.2f}s")
-        logger.info(f"Summary: {result.get('summary', {})}")
-
-        return jsonify({
-            'success': True,
-            'ticket_id': ticket_id,
-            'event_type': event_info['event_type'],
-            'processing_time_seconds': processing_time,
-            'result': {
-                'dispatcher': result.get('dispatcher', {}).get('success'),
-                'deal_linking': result.get('deal_linking', {}).get('success'),
-                'desk_agent': result.get('desk_agent', {}).get('success'),
-                'crm_agent': result.get('crm_agent', {}).get('success'),
-                'summary': result.get('summary', {})
-            }
-        }), 200
-
+        queued = get_webhook_queue().enqueue(ticket_id, event_info['event_type'], data)
+        ensure_worker_pool()  # no-op once started; covers WSGI servers without the startup hook
     except Exception as e:
-        logger.error(f"❌ Error processing webhook: {str(e)}")
+        logger.error(f"❌ Error enqueuing webhook: {str(e)}")
         logger.error(traceback.format_exc())
 
         return jsonify({
@@ -252,12 +291,17 @@ def handle_zoho_desk_webhook():
             'error_type': type(e).__name__
         }), 500
 
-    finally:
-        if orchestrator:
-            try:
-                orchestrator.close()
-            except:
-                pass
+    enqueue_time = (datetime.utcnow() - start_time).total_seconds()
+    logger.info(f"Webhook for ticket {ticket_id} {queued['status']} in {enqueue_time * 1000:.1f}ms (depth: {queued['depth']})")
+
+    return jsonify({
+        'success': True,
+        'ticket_id': ticket_id,
+        'event_type': event_info['event_type'],
+        'queue_status': queued['status'],
+        'queue_depth': queued['depth'],
+        'enqueue_time_seconds': enqueue_time
+    }), 202
 
 
 @app.route('/webhook/test', methods=['POST'])
@@ -282,8 +326,7 @@ def test_webhook():
 
         logger.info(f"Test webhook triggered for ticket {ticket_id}")
 
-        orchestrator = ZohoAutomationOrchestrator()
-        try:
+        with get_orchestrator_pool(ORCHESTRATOR_POOL_SIZE).acquire() as orchestrator:
             result = orchestrator.process_ticket_complete_workflow(
                 ticket_id=ticket_id,
                 auto_dispatch=data.get('auto_dispatch', AUTO_DISPATCH),
@@ -294,14 +337,11 @@ def test_webhook():
                 auto_add_note=data.get('auto_add_note', AUTO_ADD_NOTE)
             )
 
-            return jsonify({
-                'success': True,
-                'ticket_id': ticket_id,
-                'result': result
-            }), 200
-
-        finally:
-            orchestrator.close()
+        return jsonify({
+            'success': True,
+            'ticket_id': ticket_id,
+            'result': result
+        }), 200
 
     except Exception as e:
         logger.error(f"Test webhook error: {str(e)}")
@@ -317,11 +357,21 @@ def webhook_stats():
     """
     Get webhook statistics and configuration
 
-    Returns current configuration and status
+    Returns current configuration, queue depth and latencies
     """
+    pool = _worker_pool
+    fast_path = get_triage_fast_path()
     return jsonify({
         'service': 'a-level-saver-webhook',
         'status': 'running',
+        'queue': get_webhook_queue().get_stats(),
+        'workers': {
+            'configured': WEBHOOK_WORKERS,
+            'running': bool(pool and pool.running)
+        },
+        'orchestrators': get_orchestrator_pool(ORCHESTRATOR_POOL_SIZE).get_stats(),
+        'llm': get_llm_gateway().get_stats(),
+        'triage_fast_path': fast_path.get_stats() if fast_path else None,
         'configuration': {
             'auto_dispatch': AUTO_DISPATCH,
             'auto_link': AUTO_LINK,
@@ -376,6 +426,7 @@ if __name__ == '__main__':
     logger.info(f"Auto Update Ticket: {AUTO_UPDATE_TICKET}")
     logger.info(f"Auto Update Deal: {AUTO_UPDATE_DEAL}")
     logger.info(f"Auto Add Note: {AUTO_ADD_NOTE}")
+    logger.info(f"Workers: {WEBHOOK_WORKERS}")
     logger.info(f"Signature Verification: {'Enabled' if WEBHOOK_SECRET else 'Disabled (WARNING!)'}")
     logger.info("=" * 60)
 
@@ -383,6 +434,9 @@ if __name__ == '__main__':
         logger.warning("⚠️  ZOHO_WEBHOOK_SECRET not set - signature verification disabled!")
         logger.warning("⚠️  This is INSECURE for production use!")
 
+    # Build the orchestrators and start the worker pool before the first event arrives
+    start_background_services()
+
     # Run Flask app
     app.run(
         host=host,